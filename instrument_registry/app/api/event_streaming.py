@@ -8,6 +8,7 @@ broker settings, ordering guarantees, retry policies, and dead letter queue supp
 import logging
 import time
 import uuid
+from dataclasses import asdict
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
@@ -60,6 +61,11 @@ class EventPayload(BaseModel):
 class PublishEventRequest(BaseModel):
     """Request model for publishing events"""
     events: List[EventPayload] = Field(..., description="List of events to publish")
+    atomic: bool = Field(
+        False,
+        description="Write each pipeline of events contiguously in one MULTI/EXEC block "
+                    "(no rollback: events that fail are reported individually)"
+    )
     
     @validator('events')
     def validate_events_count(cls, v):
@@ -69,6 +75,14 @@ class PublishEventRequest(BaseModel):
             raise ValueError("Maximum 100 events per request")
         return v
 
+class PublishEventResult(BaseModel):
+    """Outcome of one published event"""
+    event_id: str
+    success: bool
+    stream_key: Optional[str] = None
+    message_id: Optional[str] = None
+    error: Optional[str] = None
+
 class PublishEventResponse(BaseModel):
     """Response model for event publishing"""
     success: bool
@@ -76,6 +90,7 @@ class PublishEventResponse(BaseModel):
     failed_count: int
     event_ids: List[str]
     errors: List[str] = []
+    results: List[PublishEventResult] = []
 
 class EventStatusResponse(BaseModel):
     """Response model for event status"""
@@ -117,41 +132,39 @@ async def publish_events(
     Publish events to the event stream with ordering guarantees
     
     - **events**: List of events to publish
-    - Returns published event IDs and success/failure counts
+    - **atomic**: Write each pipeline of events contiguously in MULTI/EXEC;
+      not all-or-nothing, failed events are reported in the per-event results
+    - Returns published event IDs, success/failure counts and per-event results
     """
     start_time = time.time()
     
     try:
-        published_count = 0
-        failed_count = 0
-        event_ids = []
+        stream_events = []
         errors = []
         
         for event_payload in request.events:
             try:
                 # Create stream event
-                event_id = str(uuid.uuid4())
-                stream_event = StreamEvent(
-                    event_id=event_id,
+                stream_events.append(StreamEvent(
+                    event_id=str(uuid.uuid4()),
                     event_type=event_payload.event_type,
                     payload=event_payload.data,
                     partition_key=event_payload.partition_key
-                )
-                
-                # Publish event
-                success = await streaming_service.publish_event(stream_event)
-                
-                if success:
-                    published_count += 1
-                    event_ids.append(event_id)
-                else:
-                    failed_count += 1
-                    errors.append(f"Failed to publish event {event_id}")
-                    
+                ))
             except Exception as e:
-                failed_count += 1
                 errors.append(f"Error processing event: {str(e)}")
         
+        # Publish all events in pipelined round trips
+        results = await streaming_service.publish_batch(stream_events, atomic=request.atomic)
+        
+        event_ids = [result.event_id for result in results if result.success]
+        errors.extend(
+            f"Failed to publish event {result.event_id}: {result.error}"
+            for result in results if not result.success
+        )
+        published_count = len(event_ids)
+        failed_count = len(request.events) - published_count
+        
         # Record request metrics  
         duration = time.time() - start_time
         logger.info(f"Published {published_count}/{len(request.events)} events in {duration:.3f}s")
@@ -161,7 +174,8 @@ async def publish_events(
             published_count=published_count,
             failed_count=failed_count,
             event_ids=event_ids,
-            errors=errors
+            errors=errors,
+            results=[PublishEventResult(**asdict(result)) for result in results]
         )
         
     except Exception as e:
@@ -286,6 +300,8 @@ async def get_streaming_configuration(
             "batch_size": streaming_service.batch_size,
             "ordering_guarantee": streaming_service.ordering_guarantee.value,
             "dlq_retention_hours": streaming_service.dlq_retention_hours,
+            "consumer_concurrency": streaming_service.consumer_concurrency,
+            "claim_idle_ms": streaming_service.claim_idle_ms,
             "service_running": streaming_service._running
         }
         
@@ -294,4 +310,24 @@ async def get_streaming_configuration(
         raise HTTPException(
             status_code=500,
             detail=f"Failed to get configuration: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@router.get("/consumers")
+async def get_consumer_stats(
+    streaming_service: EventStreamingService = Depends(get_event_streaming_service)
+):
+    """
+    Get event consumer statistics
+    
+    - Returns per-partition processed, failed, reclaimed and DLQ counts
+    - Includes consumer group lag and pending entries per partition
+    """
+    try:
+        return streaming_service.get_consumer_stats()
+        
+    except Exception as e:
+        logger.error(f"Failed to get consumer stats: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to get consumer stats: {str(e)}"
+        )
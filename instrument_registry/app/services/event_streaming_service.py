@@ -11,7 +11,7 @@ import json
 import logging
 import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
 
@@ -20,6 +20,20 @@ from prometheus_client import Counter, Histogram, Gauge
 
 logger = logging.getLogger(__name__)
 
+STREAM_KEY_PREFIX = "instrument_registry:events"
+STREAM_REGISTRY_PREFIX = "instrument_registry:streams"
+
+
+def _stream_registry_key(event_type: str) -> str:
+    """Redis set holding the concrete stream keys published for an event type"""
+    return f"{STREAM_REGISTRY_PREFIX}:{event_type}"
+
+
+def _partition_label(stream_key: str, event_type: str) -> str:
+    """Partition part of a stream key ("partition:NSE", "3"), or "global" for the base stream"""
+    base_key = f"{STREAM_KEY_PREFIX}:{event_type}"
+    return stream_key[len(base_key) + 1:] or "global"
+
 
 class OrderingGuarantee(Enum):
     NONE = "none"
@@ -58,14 +72,38 @@ class StreamEvent:
         data["status"] = self.status.value
         return data
     
+    def to_stream_fields(self) -> Dict[str, str]:
+        """Flat string fields for XADD (stream fields cannot hold dicts or None)"""
+        data = self.to_dict()
+        data["payload"] = json.dumps(self.payload, default=str)
+        data["partition_key"] = self.partition_key or ""
+        return {key: str(value) for key, value in data.items()}
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'StreamEvent':
-        """Create from dictionary from Redis"""
+        """Create from dictionary from Redis (stream fields or to_dict output)"""
+        data = {key: value for key, value in data.items() if key in cls.__dataclass_fields__}
         data["timestamp"] = datetime.fromisoformat(data["timestamp"])
         data["status"] = EventStatus(data["status"])
+        if isinstance(data.get("payload"), str):
+            data["payload"] = json.loads(data["payload"])
+        for field in ("retry_count", "max_retries"):
+            if field in data:
+                data[field] = int(data[field])
+        data["partition_key"] = data.get("partition_key") or None
         return cls(**data)
 
 
+@dataclass
+class PublishResult:
+    """Outcome of publishing one event"""
+    event_id: str
+    success: bool
+    stream_key: Optional[str] = None
+    message_id: Optional[str] = None
+    error: Optional[str] = None
+
+
 class EventStreamingService:
     """Production-ready event streaming service with config integration"""
     
@@ -87,9 +125,15 @@ class EventStreamingService:
         self.batch_size: int = 100
         self.ordering_guarantee: OrderingGuarantee = OrderingGuarantee.PARTITION
         self.dlq_retention_hours: int = 72
+        self.consumer_concurrency: int = 8
+        self.claim_idle_ms: int = 60000
+        self.stream_refresh_interval: float = 5.0
+        self.publish_pipeline_size: int = 1000
         
         # Runtime state
         self._consumer_tasks: Dict[str, asyncio.Task] = {}
+        self._consumers: Dict[str, "PartitionedStreamConsumer"] = {}
+        self._registered_streams: Set[str] = set()
         self._running = False
         
     async def initialize(self) -> bool:
@@ -147,9 +191,20 @@ class EventStreamingService:
                 default=72
             )
             
+            self.consumer_concurrency = self.config_client.get_int(
+                'INSTRUMENT_REGISTRY_EVENT_CONSUMER_CONCURRENCY',
+                default=8
+            )
+            
+            self.claim_idle_ms = self.config_client.get_int(
+                'INSTRUMENT_REGISTRY_EVENT_CLAIM_IDLE_MS',
+                default=60000
+            )
+            
             logger.info(f"Loaded event streaming config: broker={self.broker_url[:20]}..., "
                        f"retries={self.retry_attempts}, batch_size={self.batch_size}, "
-                       f"ordering={self.ordering_guarantee.value}, dlq_retention={self.dlq_retention_hours}h")
+                       f"ordering={self.ordering_guarantee.value}, dlq_retention={self.dlq_retention_hours}h, "
+                       f"consumer_concurrency={self.consumer_concurrency}, claim_idle={self.claim_idle_ms}ms")
                        
         except Exception as e:
             logger.error(f"Failed to load configuration: {e}")
@@ -209,6 +264,24 @@ class EventStreamingService:
             'Total event retry attempts',
             ['event_type', 'retry_count']
         )
+        
+        self.event_partition_lag = Gauge(
+            'instrument_registry_event_partition_lag',
+            'Entries in a partition stream not yet delivered to the consumer group',
+            ['event_type', 'partition']
+        )
+        
+        self.event_partition_pending = Gauge(
+            'instrument_registry_event_partition_pending',
+            'Entries delivered to the consumer group but not yet acknowledged',
+            ['event_type', 'partition']
+        )
+        
+        self.events_reclaimed_total = Counter(
+            'instrument_registry_events_reclaimed_total',
+            'Pending events reclaimed with XAUTOCLAIM',
+            ['event_type']
+        )
     
     async def publish_event(self, event: StreamEvent) -> bool:
         """
@@ -220,62 +293,141 @@ class EventStreamingService:
         Returns:
             bool: True if published successfully
         """
+        result = (await self.publish_batch([event]))[0]
+        if result.success:
+            logger.debug(f"Published event {event.event_id} to {result.stream_key}")
+        return result.success
+    
+    async def publish_batch(self, events: List[StreamEvent], atomic: bool = False) -> List[PublishResult]:
+        """
+        Publish events in pipelined round trips with ordering guarantees
+        
+        Events are grouped by stream key, keeping their order within each
+        stream, and written in pipelines of up to publish_pipeline_size
+        events. Metrics are recorded once per batch.
+        
+        Args:
+            events: Events to publish
+            atomic: Wrap each pipeline in MULTI/EXEC, so the events in one
+                pipeline are written contiguously, with nothing interleaved.
+                This is not all-or-nothing: Redis doesn't roll back, so an
+                XADD that fails at run time fails alone (see the per-event
+                results), and separate pipelines are separate transactions
+            
+        Returns:
+            List[PublishResult]: One outcome per event, in input order
+        """
         if not self._running:
             logger.error("Event streaming service not running")
-            return False
+            return [
+                PublishResult(event_id=event.event_id, success=False, error="Event streaming service not running")
+                for event in events
+            ]
         
         start_time = time.time()
+        results: List[Optional[PublishResult]] = [None] * len(events)
         
-        try:
-            # Set up event metadata
+        # Determine stream keys based on ordering guarantee
+        groups: Dict[str, List[int]] = {}
+        for index, event in enumerate(events):
             event.max_retries = self.retry_attempts
-            
-            # Determine stream key based on ordering guarantee
-            stream_key = self._get_stream_key(event)
-            
-            # Serialize event
-            event_data = event.to_dict()
-            
-            # Publish to Redis Stream
-            await self.redis_client.xadd(
-                stream_key,
-                event_data,
-                maxlen=10000,  # Prevent unbounded growth
-                approximate=True
-            )
-            
-            # Update metrics
-            duration = time.time() - start_time
-            partition = event.partition_key or "default"
-            
+            groups.setdefault(self._get_stream_key(event), []).append(index)
+        
+        for chunk in self._pipeline_chunks(groups):
+            await self._publish_chunk(events, chunk, results, atomic)
+        
+        self._record_publish_metrics(events, results, time.time() - start_time)
+        return results
+    
+    def _pipeline_chunks(self, groups: Dict[str, List[int]]):
+        """Pack stream key groups into pipelines, splitting only groups larger than one pipeline"""
+        chunk: List[Tuple[str, List[int]]] = []
+        size = 0
+        for stream_key, indexes in groups.items():
+            for start in range(0, len(indexes), self.publish_pipeline_size):
+                part = indexes[start:start + self.publish_pipeline_size]
+                if chunk and size + len(part) > self.publish_pipeline_size:
+                    yield chunk
+                    chunk, size = [], 0
+                chunk.append((stream_key, part))
+                size += len(part)
+        if chunk:
+            yield chunk
+    
+    async def _publish_chunk(self, events: List[StreamEvent], chunk: List[Tuple[str, List[int]]],
+                             results: List[Optional[PublishResult]], atomic: bool):
+        """Write one pipeline of events and fill in their results"""
+        new_streams: List[str] = []
+        
+        try:
+            async with self.redis_client.pipeline(transaction=atomic) as pipe:
+                for stream_key, indexes in chunk:
+                    for index in indexes:
+                        pipe.xadd(
+                            stream_key,
+                            events[index].to_stream_fields(),
+                            maxlen=10000,  # Prevent unbounded growth
+                            approximate=True
+                        )
+                    if stream_key not in self._registered_streams and stream_key not in new_streams:
+                        pipe.sadd(_stream_registry_key(events[indexes[0]].event_type), stream_key)
+                        new_streams.append(stream_key)
+                replies = iter(await pipe.execute(raise_on_error=False))
+                
+        except Exception as e:
+            logger.error(f"Failed to publish {sum(len(indexes) for _, indexes in chunk)} events: {e}")
+            for stream_key, indexes in chunk:
+                for index in indexes:
+                    results[index] = PublishResult(
+                        event_id=events[index].event_id, success=False,
+                        stream_key=stream_key, error=str(e)
+                    )
+            return
+        
+        for stream_key, indexes in chunk:
+            for index in indexes:
+                reply = next(replies)
+                if isinstance(reply, Exception):
+                    logger.error(f"Failed to publish event {events[index].event_id}: {reply}")
+                    results[index] = PublishResult(
+                        event_id=events[index].event_id, success=False,
+                        stream_key=stream_key, error=str(reply)
+                    )
+                else:
+                    results[index] = PublishResult(
+                        event_id=events[index].event_id, success=True,
+                        stream_key=stream_key, message_id=reply
+                    )
+            if stream_key in new_streams:
+                new_streams.remove(stream_key)
+                if not isinstance(next(replies), Exception):
+                    self._registered_streams.add(stream_key)
+    
+    def _record_publish_metrics(self, events: List[StreamEvent],
+                                results: List[PublishResult], duration: float):
+        """Update publish metrics once per batch"""
+        counts: Dict[Tuple[str, str, str], int] = {}
+        for event, result in zip(events, results):
+            key = (event.event_type, event.partition_key or "default", "success" if result.success else "error")
+            counts[key] = counts.get(key, 0) + 1
+        
+        for (event_type, partition, status), count in counts.items():
             self.events_published_total.labels(
-                event_type=event.event_type,
+                event_type=event_type,
                 partition=partition,
-                status="success"
-            ).inc()
-            
+                status=status
+            ).inc(count)
+        
+        for event_type in {event.event_type for event, result in zip(events, results) if result.success}:
             self.event_processing_duration_seconds.labels(
-                event_type=event.event_type
+                event_type=event_type
             ).observe(duration)
             
             # Record monitoring metrics
             if self.monitoring_service:
                 self.monitoring_service.record_operation_duration(
-                    f"event_publish_{event.event_type}", duration
+                    f"event_publish_{event_type}", duration
                 )
-            
-            logger.debug(f"Published event {event.event_id} to {stream_key}")
-            return True
-            
-        except Exception as e:
-            self.events_published_total.labels(
-                event_type=event.event_type,
-                partition=event.partition_key or "default",
-                status="error"
-            ).inc()
-            
-            logger.error(f"Failed to publish event {event.event_id}: {e}")
-            return False
     
     def _get_stream_key(self, event: StreamEvent) -> str:
         """
@@ -287,7 +439,7 @@ class EventStreamingService:
         Returns:
             str: Redis stream key
         """
-        base_key = f"instrument_registry:events:{event.event_type}"
+        base_key = f"{STREAM_KEY_PREFIX}:{event.event_type}"
         
         if self.ordering_guarantee == OrderingGuarantee.NONE:
             # Round-robin across multiple streams for parallel processing
@@ -339,81 +491,80 @@ class EventStreamingService:
             return False
     
     async def _consumer_loop(self, event_type: str, handler_func: callable, consumer_id: str):
-        """Main consumer loop with retry logic and DLQ handling"""
-        consumer_group = f"instrument_registry_{event_type}_group"
-        stream_pattern = f"instrument_registry:events:{event_type}*"
+        """Main consumer loop: partition-aware reads with batched acks and pending reclaim"""
+        consumer = PartitionedStreamConsumer(self, event_type, handler_func, consumer_id)
+        self._consumers[consumer_id] = consumer
         
         try:
-            # Create consumer group if doesn't exist
-            await self._create_consumer_group(stream_pattern, consumer_group)
-            
-            while self._running:
-                try:
-                    # Read from stream
-                    messages = await self.redis_client.xreadgroup(
-                        consumer_group,
-                        consumer_id,
-                        {stream_pattern: '>'},
-                        count=self.batch_size,
-                        block=1000  # 1 second timeout
-                    )
-                    
-                    if not messages:
-                        continue
-                    
-                    # Process messages
-                    for stream_name, stream_messages in messages:
-                        for message_id, fields in stream_messages:
-                            await self._process_message(
-                                stream_name, message_id, fields, 
-                                handler_func, consumer_group, event_type
-                            )
-                
-                except Exception as e:
-                    logger.error(f"Consumer loop error for {consumer_id}: {e}")
-                    await asyncio.sleep(5)  # Back off on errors
-                    
+            await consumer.run()
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             logger.error(f"Fatal consumer error for {consumer_id}: {e}")
         finally:
             logger.info(f"Consumer {consumer_id} stopped")
     
-    async def _create_consumer_group(self, stream_pattern: str, group_name: str):
-        """Create Redis consumer group if it doesn't exist"""
+    async def _register_stream(self, event_type: str, stream_key: str):
+        """Record a concrete stream key so consumers can find it without KEYS"""
+        if stream_key in self._registered_streams:
+            return
+        await self.redis_client.sadd(_stream_registry_key(event_type), stream_key)
+        self._registered_streams.add(stream_key)
+    
+    async def _discover_streams(self, event_type: str) -> Set[str]:
+        """Registered stream keys for an event type"""
+        return set(await self.redis_client.smembers(_stream_registry_key(event_type)))
+    
+    async def _register_existing_streams(self, event_type: str):
+        """Register streams published before the stream registry existed (one SCAN, not KEYS)"""
+        base_key = f"{STREAM_KEY_PREFIX}:{event_type}"
+        streams = [
+            key async for key in self.redis_client.scan_iter(match=f"{base_key}*", _type="STREAM")
+            if key == base_key or key.startswith(f"{base_key}:")
+        ]
+        if streams:
+            await self.redis_client.sadd(_stream_registry_key(event_type), *streams)
+    
+    async def _create_consumer_group(self, stream_key: str, group_name: str):
+        """Create Redis consumer group on a stream if it doesn't exist"""
         try:
-            # Get all streams matching pattern
-            streams = await self.redis_client.keys(stream_pattern)
-            
-            for stream in streams:
-                try:
-                    await self.redis_client.xgroup_create(
-                        stream, group_name, id='0', mkstream=True
-                    )
-                except redis.RedisError as e:
-                    if "BUSYGROUP" not in str(e):
-                        raise
-                        
-        except Exception as e:
-            logger.error(f"Failed to create consumer group {group_name}: {e}")
+            await self.redis_client.xgroup_create(
+                stream_key, group_name, id='0', mkstream=True
+            )
+        except redis.RedisError as e:
+            if "BUSYGROUP" not in str(e):
+                logger.error(f"Failed to create consumer group {group_name} on {stream_key}: {e}")
+                raise
     
     async def _process_message(self, stream_name: str, message_id: str, 
                              fields: Dict, handler_func: callable, 
-                             consumer_group: str, event_type: str):
-        """Process individual message with retry and DLQ logic"""
+                             event_type: str, attempts: int = 0) -> Tuple[bool, Optional[Dict[str, str]]]:
+        """
+        Process individual message with retry and DLQ logic
+        
+        The message is not acknowledged here; the caller acknowledges the
+        whole batch in one pipeline.
+        
+        Args:
+            attempts: Earlier deliveries of this message (XPENDING delivery
+                count minus one)
+            
+        Returns:
+            (ack, dlq_entry): whether to acknowledge the message, and the DLQ
+            fields to write first if it ran out of retries or can't be decoded
+        """
         start_time = time.time()
         
         try:
             # Reconstruct event
             event = StreamEvent.from_dict(fields)
+            event.retry_count += attempts
             event.status = EventStatus.PROCESSING
             
             # Call handler function
             success = await handler_func(event)
             
             if success:
-                # Acknowledge successful processing
-                await self.redis_client.xack(stream_name, consumer_group, message_id)
-                
                 event.status = EventStatus.COMPLETED
                 duration = time.time() - start_time
                 
@@ -427,12 +578,10 @@ class EventStreamingService:
                 ).observe(duration)
                 
                 logger.debug(f"Successfully processed event {event.event_id}")
+                return True, None
                 
-            else:
-                # Handle failure with retry logic
-                await self._handle_processing_failure(
-                    stream_name, message_id, event, consumer_group, event_type
-                )
+            # Handle failure with retry logic
+            return self._handle_processing_failure(stream_name, message_id, event, event_type)
                 
         except Exception as e:
             logger.error(f"Error processing message {message_id}: {e}")
@@ -440,15 +589,19 @@ class EventStreamingService:
             # Attempt to handle as processing failure
             try:
                 event = StreamEvent.from_dict(fields)
-                await self._handle_processing_failure(
-                    stream_name, message_id, event, consumer_group, event_type
-                )
-            except:
-                logger.error(f"Failed to handle processing failure for {message_id}")
+                event.retry_count += attempts
+            except Exception:
+                # Retrying can't fix a malformed entry
+                self.events_consumed_total.labels(
+                    event_type=event_type,
+                    status="dlq"
+                ).inc()
+                logger.warning(f"Failed to decode message {message_id}, sending it to DLQ")
+                return True, self._dlq_fields(dict(fields), stream_name, message_id)
+            return self._handle_processing_failure(stream_name, message_id, event, event_type)
     
-    async def _handle_processing_failure(self, stream_name: str, message_id: str,
-                                       event: StreamEvent, consumer_group: str,
-                                       event_type: str):
+    def _handle_processing_failure(self, stream_name: str, message_id: str,
+                                   event: StreamEvent, event_type: str) -> Tuple[bool, Optional[Dict[str, str]]]:
         """Handle processing failure with retry logic and DLQ"""
         event.retry_count += 1
         
@@ -458,56 +611,75 @@ class EventStreamingService:
         ).inc()
         
         if event.retry_count >= event.max_retries:
-            # Send to Dead Letter Queue
-            await self._send_to_dlq(event, stream_name, message_id)
-            
-            # Acknowledge to remove from main stream
-            await self.redis_client.xack(stream_name, consumer_group, message_id)
-            
+            # Send to Dead Letter Queue and acknowledge to remove from main stream
             self.events_consumed_total.labels(
                 event_type=event_type,
                 status="dlq"
             ).inc()
             
             logger.warning(f"Event {event.event_id} sent to DLQ after {event.retry_count} retries")
+            return True, self._dlq_entry(event, stream_name, message_id)
             
-        else:
-            # Requeue for retry (by not acknowledging)
-            self.events_consumed_total.labels(
-                event_type=event_type,
-                status="retry"
-            ).inc()
-            
-            logger.info(f"Event {event.event_id} scheduled for retry {event.retry_count}/{event.max_retries}")
-    
-    async def _send_to_dlq(self, event: StreamEvent, original_stream: str, message_id: str):
-        """Send failed event to Dead Letter Queue"""
-        dlq_key = f"instrument_registry:dlq:{event.event_type}"
+        # Requeue for retry (by not acknowledging; reclaimed with XAUTOCLAIM)
+        self.events_consumed_total.labels(
+            event_type=event_type,
+            status="retry"
+        ).inc()
         
-        # Add DLQ metadata
-        dlq_data = event.to_dict()
+        logger.info(f"Event {event.event_id} scheduled for retry {event.retry_count}/{event.max_retries}")
+        return False, None
+    
+    def _dlq_entry(self, event: StreamEvent, original_stream: str, message_id: str) -> Dict[str, str]:
+        """DLQ fields for a failed event"""
+        return self._dlq_fields(event.to_stream_fields(), original_stream, message_id)
+    
+    def _dlq_fields(self, dlq_data: Dict[str, str], original_stream: str, message_id: str) -> Dict[str, str]:
+        """Add the original location and DLQ status to a message's fields"""
         dlq_data.update({
             "original_stream": original_stream,
             "original_message_id": message_id,
             "dlq_timestamp": datetime.utcnow().isoformat(),
             "status": EventStatus.DLQ.value
         })
+        return dlq_data
+    
+    async def _ack_messages(self, stream_name: str, consumer_group: str, event_type: str,
+                            message_ids: List[str], dlq_entries: List[Dict[str, str]]):
+        """Write DLQ entries and acknowledge a batch of messages in one pipeline"""
+        if not message_ids:
+            return
         
-        try:
-            await self.redis_client.xadd(dlq_key, dlq_data)
-            
-            # Set expiration based on retention policy
-            expire_seconds = self.dlq_retention_hours * 3600
-            await self.redis_client.expire(dlq_key, expire_seconds)
-            
-            # Update DLQ metrics
-            self.events_in_dlq_total.inc()
-            
-            logger.info(f"Event {event.event_id} added to DLQ with {self.dlq_retention_hours}h retention")
-            
-        except Exception as e:
-            logger.error(f"Failed to send event {event.event_id} to DLQ: {e}")
+        dlq_key = f"instrument_registry:dlq:{event_type}"
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for dlq_data in dlq_entries:
+                pipe.xadd(dlq_key, dlq_data)
+            if dlq_entries:
+                # Set expiration based on retention policy
+                pipe.expire(dlq_key, self.dlq_retention_hours * 3600)
+            pipe.xack(stream_name, consumer_group, *message_ids)
+            await pipe.execute()
+        
+        if dlq_entries:
+            self.events_in_dlq_total.inc(len(dlq_entries))
+            logger.info(f"{len(dlq_entries)} events added to DLQ with {self.dlq_retention_hours}h retention")
+    
+    def _record_partition_lag(self, event_type: str, stream_key: str,
+                              lag: Optional[int], pending: Optional[int]):
+        """Export consumer group lag for one partition stream"""
+        partition = _partition_label(stream_key, event_type)
+        if lag is not None:
+            self.event_partition_lag.labels(event_type=event_type, partition=partition).set(lag)
+        if pending is not None:
+            self.event_partition_pending.labels(event_type=event_type, partition=partition).set(pending)
     
+    def get_consumer_stats(self) -> Dict[str, Any]:
+        """Per-consumer, per-partition processing and lag statistics"""
+        return {
+            consumer_id: consumer.get_stats()
+            for consumer_id, consumer in self._consumers.items()
+        }
+    
+
     async def get_dlq_events(self, event_type: str, limit: int = 100) -> List[Dict]:
         """Retrieve events from Dead Letter Queue for manual processing"""
         dlq_key = f"instrument_registry:dlq:{event_type}"
@@ -552,8 +724,9 @@ class EventStreamingService:
             event_data["status"] = EventStatus.PENDING.value
             
             # Republish to main stream
-            stream_key = f"instrument_registry:events:{event_type}"
+            stream_key = f"{STREAM_KEY_PREFIX}:{event_type}"
             await self.redis_client.xadd(stream_key, event_data)
+            await self._register_stream(event_type, stream_key)
             
             # Remove from DLQ
             await self.redis_client.xdel(dlq_key, message_id)
@@ -601,7 +774,9 @@ class EventStreamingService:
                 "retry_attempts": self.retry_attempts,
                 "batch_size": self.batch_size,
                 "ordering_guarantee": self.ordering_guarantee.value,
-                "dlq_retention_hours": self.dlq_retention_hours
+                "dlq_retention_hours": self.dlq_retention_hours,
+                "consumer_concurrency": self.consumer_concurrency,
+                "claim_idle_ms": self.claim_idle_ms
             },
             "active_consumers": len(self._consumer_tasks),
             "broker_connected": False
@@ -616,4 +791,265 @@ class EventStreamingService:
                 health["status"] = "degraded"
                 health["error"] = "Broker connection failed"
         
-        return health
\ No newline at end of file
+        return health
+
+
+class PartitionedStreamConsumer:
+    """
+    Consumer group reader for every partition stream of one event type.
+    
+    - Reads the concrete streams produced by _get_stream_key (tracked in a
+      registry set) instead of a key pattern, which XREADGROUP cannot take
+    - At most one batch per partition is in flight, so each partition keeps
+      its order while different partitions are handled concurrently (up to
+      consumer_concurrency at a time)
+    - Each batch is acknowledged with a single pipelined XACK
+    - A failed entry stops its batch: the entries after it stay pending and
+      the partition is not read again until XAUTOCLAIM (after
+      claim_idle_ms) has retried the failed entry and then the rest, so a
+      retry never overtakes later events of its partition. A batch that
+      raises (e.g. its XACK pipeline fails) blocks its partition the same way
+    - Retries are counted from the XPENDING delivery count, so they add up
+      across consumers; entries held back behind a failure have that extra
+      delivery counted too
+    - Entries left pending by dead consumers are reclaimed the same way
+    - Consumer group lag and pending counts are tracked per partition
+    """
+    
+    def __init__(self, service: EventStreamingService, event_type: str,
+                 handler_func: callable, consumer_id: str):
+        self.service = service
+        self.event_type = event_type
+        self.handler_func = handler_func
+        self.consumer_id = consumer_id
+        self.consumer_group = f"instrument_registry_{event_type}_group"
+        
+        self.streams: Set[str] = set()
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._slots = asyncio.Semaphore(service.consumer_concurrency)
+        # Partitions waiting for a failed entry to be retried
+        self._blocked: Set[str] = set()
+        self._last_refresh = float("-inf")
+        self._last_claim = float("-inf")
+        
+        # Statistics per partition stream
+        self.partitions: Dict[str, Dict[str, Any]] = {}
+    
+    @property
+    def redis_client(self) -> redis.Redis:
+        return self.service.redis_client
+    
+    async def run(self):
+        """Read and dispatch until the service stops"""
+        await self.service._register_existing_streams(self.event_type)
+        
+        try:
+            while self.service._running:
+                try:
+                    await self._poll()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Consumer loop error for {self.consumer_id}: {e}")
+                    await asyncio.sleep(5)  # Back off on errors
+        finally:
+            # Unacknowledged entries stay pending and are reclaimed later
+            for task in list(self._in_flight.values()):
+                task.cancel()
+    
+    async def _poll(self):
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        
+        if now - self._last_refresh >= self.service.stream_refresh_interval:
+            self._last_refresh = now
+            await self.refresh_streams()
+        
+        if now - self._last_claim >= self.service.claim_idle_ms / 2000:
+            self._last_claim = now
+            for stream in self._idle_streams():
+                self._dispatch(stream)
+        
+        idle = [stream for stream in self._idle_streams() if stream not in self._blocked]
+        if idle:
+            # Only block on Redis when no batch is running, so finished
+            # partitions are read again promptly
+            messages = await self.redis_client.xreadgroup(
+                self.consumer_group,
+                self.consumer_id,
+                {stream: '>' for stream in idle},
+                count=self.service.batch_size,
+                block=None if self._in_flight else 1000
+            )
+            dispatched = False
+            for stream_name, stream_messages in messages or []:
+                if stream_messages:
+                    self._dispatch(stream_name, stream_messages)
+                    dispatched = True
+            if dispatched:
+                return
+        
+        if self._in_flight:
+            await asyncio.wait(
+                list(self._in_flight.values()), timeout=0.1,
+                return_when=asyncio.FIRST_COMPLETED
+            )
+        elif not idle:
+            await asyncio.sleep(1)  # Nothing to read yet, or every partition is blocked
+    
+    def _idle_streams(self) -> List[str]:
+        return [stream for stream in sorted(self.streams) if stream not in self._in_flight]
+    
+    async def refresh_streams(self):
+        """Pick up newly published partitions and update lag"""
+        for stream in await self.service._discover_streams(self.event_type) - self.streams:
+            await self.service._create_consumer_group(stream, self.consumer_group)
+            self.streams.add(stream)
+        await self._update_lag()
+    
+    async def _update_lag(self):
+        streams = sorted(self.streams)
+        if not streams:
+            return
+        
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for stream in streams:
+                pipe.xinfo_groups(stream)
+            results = await pipe.execute(raise_on_error=False)
+        
+        for stream, groups in zip(streams, results):
+            if isinstance(groups, Exception):
+                continue
+            info = next((group for group in groups if group.get("name") == self.consumer_group), None)
+            if info is None:
+                continue
+            # "lag" is reported by Redis 7+ and may be None when it cannot be computed
+            lag, pending = info.get("lag"), info.get("pending")
+            stats = self._partition(stream)
+            stats["lag"], stats["pending"] = lag, pending
+            self.service._record_partition_lag(self.event_type, stream, lag, pending)
+    
+    def _partition(self, stream: str) -> Dict[str, Any]:
+        return self.partitions.setdefault(stream, {
+            "processed": 0, "failed": 0, "reclaimed": 0, "dlq": 0,
+            "lag": None, "pending": None,
+        })
+    
+    def _dispatch(self, stream: str, messages: Optional[List] = None):
+        """Start one batch for a partition (messages=None reclaims pending entries)"""
+        task = asyncio.create_task(self._run_batch(stream, messages))
+        self._in_flight[stream] = task
+        task.add_done_callback(lambda _task, stream=stream: self._in_flight.pop(stream, None))
+    
+    async def _run_batch(self, stream: str, messages: Optional[List]):
+        async with self._slots:
+            try:
+                if messages is None:
+                    await self._reclaim(stream)
+                elif not await self._process_batch(stream, messages):
+                    self._blocked.add(stream)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Unacknowledged entries must be retried before newer ones are read
+                self._blocked.add(stream)
+                logger.error(f"Batch failed on {stream} for {self.consumer_id}: {e}")
+    
+    async def _reclaim(self, stream: str):
+        """Retry entries pending longer than claim_idle_ms, oldest first
+        
+        A blocked partition retries its failed entry on its own, then drains
+        the entries held back behind it before new entries are read again.
+        """
+        blocked = stream in self._blocked
+        count = 1 if blocked else self.service.batch_size
+        while True:
+            messages, attempts = await self._claim(stream, count)
+            if messages and not await self._process_batch(stream, messages, attempts):
+                self._blocked.add(stream)
+                return
+            if not blocked:
+                return
+            if not messages:
+                if not await self._has_pending(stream):
+                    self._blocked.discard(stream)
+                return
+            count = self.service.batch_size
+    
+    async def _claim(self, stream: str, count: int) -> Tuple[List, Dict[str, int]]:
+        """Take over entries pending longer than claim_idle_ms, with their earlier deliveries"""
+        result = await self.redis_client.xautoclaim(
+            stream, self.consumer_group, self.consumer_id,
+            min_idle_time=self.service.claim_idle_ms,
+            start_id="0-0",
+            count=count
+        )
+        # Entries deleted from the stream come back without fields
+        messages = [(message_id, fields) for message_id, fields in result[1] if fields]
+        if not messages:
+            return [], {}
+        
+        self._partition(stream)["reclaimed"] += len(messages)
+        self.service.events_reclaimed_total.labels(event_type=self.event_type).inc(len(messages))
+        pending = await self.redis_client.xpending_range(
+            stream, self.consumer_group,
+            min=messages[0][0], max=messages[-1][0], count=len(messages),
+            consumername=self.consumer_id
+        )
+        attempts = {entry["message_id"]: entry["times_delivered"] - 1 for entry in pending}
+        return messages, attempts
+    
+    async def _has_pending(self, stream: str) -> bool:
+        pending = await self.redis_client.xpending_range(
+            stream, self.consumer_group, min="-", max="+", count=1,
+            consumername=self.consumer_id
+        )
+        return bool(pending)
+    
+    async def _process_batch(self, stream: str, messages: List,
+                             attempts: Optional[Dict[str, int]] = None) -> bool:
+        """
+        Process a partition's messages in order, then acknowledge them together
+        
+        Stops at the first entry that should be retried, leaving it and the
+        entries after it pending.
+        
+        Returns:
+            False if an entry was left for retry
+        """
+        stats = self._partition(stream)
+        acks: List[str] = []
+        dlq_entries: List[Dict[str, str]] = []
+        completed = True
+        
+        for message_id, fields in messages:
+            ack, dlq_entry = await self.service._process_message(
+                stream, message_id, fields, self.handler_func,
+                self.event_type, attempts=(attempts or {}).get(message_id, 0)
+            )
+            if not ack:
+                stats["failed"] += 1
+                completed = False
+                break
+            acks.append(message_id)
+            if dlq_entry is not None:
+                dlq_entries.append(dlq_entry)
+                stats["dlq"] += 1
+            else:
+                stats["processed"] += 1
+        
+        await self.service._ack_messages(stream, self.consumer_group, self.event_type, acks, dlq_entries)
+        return completed
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Consumer statistics with per-partition counters and lag"""
+        return {
+            "event_type": self.event_type,
+            "consumer_group": self.consumer_group,
+            "streams": len(self.streams),
+            "in_flight": len(self._in_flight),
+            "partitions": {
+                _partition_label(stream, self.event_type): dict(stats)
+                for stream, stats in sorted(self.partitions.items())
+            },
+        }
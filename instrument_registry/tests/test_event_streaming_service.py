@@ -0,0 +1,391 @@
+"""
+Tests for event stream publishing and the partition-aware consumer
+
+Uses an in-memory stand-in for the Redis stream commands the service needs,
+so they run without a Redis server.
+"""
+
+import asyncio
+import fnmatch
+import time
+import uuid
+
+import pytest
+import redis.asyncio as redis
+from unittest.mock import MagicMock, patch
+
+from app.services.event_streaming_service import EventStreamingService, StreamEvent
+
+
+class FakePipeline:
+    def __init__(self, client, transaction):
+        self.client = client
+        self.transaction = transaction
+        self.queued = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.queued.append((name, args, kwargs))
+
+    async def execute(self, raise_on_error=True):
+        self.client.calls.append(("pipeline", self.transaction, [name for name, _, _ in self.queued]))
+        results = []
+        for name, args, kwargs in self.queued:
+            try:
+                results.append(await getattr(self.client, name)(*args, **kwargs))
+            except redis.RedisError as e:
+                if raise_on_error:
+                    raise
+                results.append(e)
+        return results
+
+
+class FakeStreamRedis:
+    """Just enough of Redis streams and consumer groups for the consumer"""
+
+    def __init__(self):
+        self.streams = {}
+        self.sets = {}
+        self.groups = {}
+        self.calls = []
+        self.failing_streams = set()
+        self._sequence = 0
+
+    async def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+
+    async def smembers(self, key):
+        return set(self.sets.get(key, ()))
+
+    async def scan_iter(self, match=None, _type=None):
+        for key in list(self.streams):
+            if fnmatch.fnmatchcase(key, match):
+                yield key
+
+    async def xadd(self, key, fields, maxlen=None, approximate=True):
+        if key in self.failing_streams:
+            raise redis.ResponseError("OOM command not allowed")
+        self._sequence += 1
+        message_id = f"{self._sequence}-0"
+        self.streams.setdefault(key, []).append((message_id, dict(fields)))
+        return message_id
+
+    async def xgroup_create(self, key, group, id="0", mkstream=False):
+        self.streams.setdefault(key, [])
+        if (key, group) in self.groups:
+            raise redis.ResponseError("BUSYGROUP Consumer Group name already exists")
+        self.groups[(key, group)] = {"delivered": 0, "pending": {}}
+
+    async def xreadgroup(self, group, consumer, streams, count=None, block=None):
+        result = []
+        for key in streams:
+            state = self.groups[(key, group)]
+            entries = self.streams[key][state["delivered"]:state["delivered"] + count]
+            state["delivered"] += len(entries)
+            for message_id, _ in entries:
+                state["pending"][message_id] = {"since": time.monotonic(), "consumer": consumer, "deliveries": 1}
+            if entries:
+                result.append([key, entries])
+        if not result and block:
+            await asyncio.sleep(0.01)
+        return result
+
+    async def xack(self, key, group, *message_ids):
+        self.calls.append(("xack", key, message_ids))
+        for message_id in message_ids:
+            self.groups[(key, group)]["pending"].pop(message_id, None)
+        return len(message_ids)
+
+    async def xautoclaim(self, key, group, consumer, min_idle_time, start_id="0-0", count=None):
+        pending = self.groups[(key, group)]["pending"]
+        now = time.monotonic()
+        claimed = [mid for mid, entry in pending.items() if (now - entry["since"]) * 1000 >= min_idle_time][:count]
+        for message_id in claimed:
+            entry = pending[message_id]
+            entry.update(since=now, consumer=consumer, deliveries=entry["deliveries"] + 1)
+        return ["0-0", [entry for entry in self.streams[key] if entry[0] in claimed], []]
+
+    async def xpending_range(self, key, group, min, max, count, consumername=None):
+        def position(message_id, default):
+            return default if message_id in ("-", "+") else int(message_id.split("-")[0])
+
+        low, high = position(min, 0), position(max, float("inf"))
+        return [
+            {"message_id": mid, "consumer": entry["consumer"], "times_delivered": entry["deliveries"]}
+            for mid, entry in sorted(self.groups[(key, group)]["pending"].items(), key=lambda item: position(item[0], 0))
+            if low <= position(mid, 0) <= high and consumername in (None, entry["consumer"])
+        ][:count]
+
+    async def xinfo_groups(self, key):
+        return [
+            {"name": group, "pending": len(state["pending"]), "lag": len(self.streams[key]) - state["delivered"]}
+            for (stream, group), state in self.groups.items() if stream == key
+        ]
+
+    async def expire(self, key, seconds):
+        return True
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self, transaction)
+
+    async def close(self):
+        pass
+
+
+def make_service(**settings) -> EventStreamingService:
+    with patch.multiple(
+        "app.services.event_streaming_service",
+        Counter=MagicMock(), Histogram=MagicMock(), Gauge=MagicMock()
+    ):
+        service = EventStreamingService()
+        service._setup_metrics()
+    service.redis_client = FakeStreamRedis()
+    service._running = True
+    service.stream_refresh_interval = 0.01
+    for name, value in settings.items():
+        setattr(service, name, value)
+    return service
+
+
+def make_event(partition_key: str, sequence: int) -> StreamEvent:
+    return StreamEvent(
+        event_id=str(uuid.uuid4()),
+        event_type="instrument_updated",
+        payload={"sequence": sequence, "partition": partition_key},
+        partition_key=partition_key
+    )
+
+
+async def wait_until(predicate, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+class TestPublishBatch:
+    """Pipelined batch publishing"""
+
+    @pytest.mark.asyncio
+    async def test_batch_is_grouped_by_partition_in_one_pipeline(self):
+        service = make_service()
+        events = [make_event(key, sequence) for sequence, key in enumerate(["NSE", "BSE", "NSE", "BSE", "NSE"])]
+        service.events_published_total.reset_mock()
+
+        results = await service.publish_batch(events)
+
+        assert [result.event_id for result in results] == [event.event_id for event in events]
+        assert all(result.success and result.message_id for result in results)
+        pipelines = [call for call in service.redis_client.calls if call[0] == "pipeline"]
+        assert pipelines == [("pipeline", False, ["xadd", "xadd", "xadd", "sadd", "xadd", "xadd", "sadd"])]
+
+        nse = service.redis_client.streams["instrument_registry:events:instrument_updated:partition:NSE"]
+        assert [StreamEvent.from_dict(fields).payload["sequence"] for _, fields in nse] == [0, 2, 4]
+        # Metrics once per (event type, partition, status), not per event
+        assert service.events_published_total.labels.call_count == 2
+
+        # Registered streams are not re-added
+        await service.publish_batch([make_event("NSE", 5)])
+        assert service.redis_client.calls[-1] == ("pipeline", False, ["xadd"])
+
+    @pytest.mark.asyncio
+    async def test_atomic_batch_reports_per_event_outcomes(self):
+        service = make_service()
+        service.redis_client.failing_streams.add("instrument_registry:events:instrument_updated:partition:BSE")
+
+        results = await service.publish_batch(
+            [make_event("NSE", 0), make_event("BSE", 1), make_event("NSE", 2)], atomic=True
+        )
+
+        assert [result.success for result in results] == [True, False, True]
+        assert "OOM" in results[1].error
+        assert service.redis_client.calls[-1][:2] == ("pipeline", True)
+        assert await service.publish_event(make_event("NSE", 3))
+        assert not await service.publish_event(make_event("BSE", 4))
+
+    @pytest.mark.asyncio
+    async def test_large_batches_are_split_into_pipelines_in_order(self):
+        service = make_service(publish_pipeline_size=2)
+
+        results = await service.publish_batch([make_event("NSE", sequence) for sequence in range(5)])
+
+        assert all(result.success for result in results)
+        assert len([call for call in service.redis_client.calls if call[0] == "pipeline"]) == 3
+        nse = service.redis_client.streams["instrument_registry:events:instrument_updated:partition:NSE"]
+        assert [StreamEvent.from_dict(fields).payload["sequence"] for _, fields in nse] == list(range(5))
+
+
+class TestPartitionedStreamConsumer:
+    """Concurrency, ordering, acknowledgement and reclaim behaviour"""
+
+    @pytest.mark.asyncio
+    async def test_partitions_run_concurrently_and_keep_order(self):
+        service = make_service()
+        for sequence in range(3):
+            await service.publish_event(make_event("NSE", sequence))
+            await service.publish_event(make_event("BSE", sequence))
+
+        gate = asyncio.Event()
+        handled = {"NSE": [], "BSE": []}
+
+        async def handler(event):
+            if event.partition_key == "NSE" and event.payload["sequence"] == 0:
+                await gate.wait()
+            handled[event.partition_key].append(event.payload["sequence"])
+            return True
+
+        assert await service.start_consumer("instrument_updated", handler)
+
+        # A stalled NSE handler does not hold back BSE
+        await wait_until(lambda: handled["BSE"] == [0, 1, 2])
+        assert handled["NSE"] == []
+
+        gate.set()
+        await wait_until(lambda: handled["NSE"] == [0, 1, 2])
+
+        # One XACK per partition batch, sent in a pipeline
+        await wait_until(lambda: len([c for c in service.redis_client.calls if c[0] == "xack"]) == 2)
+        acks = [call for call in service.redis_client.calls if call[0] == "xack"]
+        assert sorted(len(ids) for _, _, ids in acks) == [3, 3]
+
+        stats = service.get_consumer_stats()
+        partitions = next(iter(stats.values()))["partitions"]
+        assert partitions["partition:NSE"]["processed"] == 3
+        assert partitions["partition:BSE"]["processed"] == 3
+        await service.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_failed_event_is_reclaimed_then_sent_to_dlq(self):
+        service = make_service(retry_attempts=2, claim_idle_ms=20)
+        await service.publish_event(make_event("NSE", 0))
+        attempts = []
+
+        async def handler(event):
+            attempts.append(event.retry_count)
+            return False
+
+        await service.start_consumer("instrument_updated", handler)
+
+        dlq_key = "instrument_registry:dlq:instrument_updated"
+        await wait_until(lambda: service.redis_client.streams.get(dlq_key))
+        assert attempts == [0, 1]
+
+        consumer = next(iter(service._consumers.values()))
+        await wait_until(lambda: consumer.partitions[next(iter(consumer.streams))]["pending"] == 0)
+        partition = consumer.get_stats()["partitions"]["partition:NSE"]
+        assert partition["failed"] == 1 and partition["reclaimed"] == 1 and partition["dlq"] == 1
+        assert partition["lag"] == 0
+
+        dlq_fields = service.redis_client.streams[dlq_key][0][1]
+        assert StreamEvent.from_dict(dlq_fields).payload == {"sequence": 0, "partition": "NSE"}
+        await service.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_failure_holds_back_later_events_of_its_partition(self):
+        service = make_service(claim_idle_ms=50)
+        for sequence in range(3):
+            await service.publish_event(make_event("NSE", sequence))
+        handled = []
+        failed = asyncio.Event()
+
+        async def handler(event):
+            sequence = event.payload["sequence"]
+            if sequence == 1 and not failed.is_set():
+                failed.set()
+                return False
+            handled.append((sequence, event.retry_count))
+            return True
+
+        await service.start_consumer("instrument_updated", handler)
+        await failed.wait()
+        # Published while the partition waits for its retry
+        await service.publish_event(make_event("NSE", 3))
+        await asyncio.sleep(0.02)
+        assert handled == [(0, 0)]
+
+        await wait_until(lambda: len(handled) == 4)
+        # Retry count comes from the delivery count; 2 was delivered once before, behind the failure
+        assert handled == [(0, 0), (1, 1), (2, 1), (3, 0)]
+        consumer = next(iter(service._consumers.values()))
+        assert not consumer._blocked
+        partition = consumer.get_stats()["partitions"]["partition:NSE"]
+        assert partition["failed"] == 1 and partition["reclaimed"] == 2 and partition["processed"] == 4
+        await service.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_failed_ack_blocks_partition_until_batch_is_reclaimed(self):
+        service = make_service(claim_idle_ms=50)
+        for sequence in range(2):
+            await service.publish_event(make_event("NSE", sequence))
+        handled = []
+        ack_failed = asyncio.Event()
+        ack_messages = service._ack_messages
+
+        async def flaky_ack(*args, **kwargs):
+            if not ack_failed.is_set():
+                ack_failed.set()
+                raise redis.ConnectionError("Connection reset by peer")
+            await ack_messages(*args, **kwargs)
+
+        async def handler(event):
+            handled.append((event.payload["sequence"], event.retry_count))
+            return True
+
+        service._ack_messages = flaky_ack
+        await service.start_consumer("instrument_updated", handler)
+        await ack_failed.wait()
+        # Published while the unacknowledged batch waits to be reclaimed
+        await service.publish_event(make_event("NSE", 2))
+        await asyncio.sleep(0.02)
+        assert handled == [(0, 0), (1, 0)]
+
+        await wait_until(lambda: len(handled) == 5)
+        assert handled == [(0, 0), (1, 0), (0, 1), (1, 1), (2, 0)]
+        consumer = next(iter(service._consumers.values()))
+        assert not consumer._blocked
+        await service.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_undecodable_entry_goes_straight_to_dlq(self):
+        service = make_service(claim_idle_ms=20)
+        stream = "instrument_registry:events:instrument_updated:partition:NSE"
+        await service.publish_event(make_event("NSE", 0))
+        bad_id = await service.redis_client.xadd(stream, {"event_id": "broken"})
+        await service.publish_event(make_event("NSE", 1))
+        handled = []
+
+        async def handler(event):
+            handled.append(event.payload["sequence"])
+            return True
+
+        await service.start_consumer("instrument_updated", handler)
+
+        dlq_key = "instrument_registry:dlq:instrument_updated"
+        await wait_until(lambda: handled == [0, 1])
+        dlq_fields = service.redis_client.streams[dlq_key][0][1]
+        assert dlq_fields["event_id"] == "broken" and dlq_fields["original_message_id"] == bad_id
+        await asyncio.sleep(0.05)
+        partition = next(iter(service._consumers.values())).get_stats()["partitions"]["partition:NSE"]
+        assert partition["dlq"] == 1 and partition["reclaimed"] == 0 and partition["failed"] == 0
+        assert not service.redis_client.groups[(stream, "instrument_registry_instrument_updated_group")]["pending"]
+        await service.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_streams_published_before_registry_are_discovered(self):
+        service = make_service()
+        legacy_stream = "instrument_registry:events:instrument_updated:partition:NSE"
+        await service.redis_client.xadd(legacy_stream, make_event("NSE", 0).to_stream_fields())
+        handled = []
+
+        async def handler(event):
+            handled.append(event.event_id)
+            return True
+
+        await service.start_consumer("instrument_updated", handler)
+        await wait_until(lambda: len(handled) == 1)
+        await service.shutdown()
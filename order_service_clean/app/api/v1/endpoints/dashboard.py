@@ -8,13 +8,14 @@ import logging
 from datetime import datetime, date
 from typing import List, Optional
 from fastapi import APIRouter, Depends, Header
-from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from pydantic import BaseModel, Field
 from ....auth import get_current_user
-from ....database.connection import get_db
+from ....config.settings import settings
+from ....database.connection import get_db, get_session_maker
 from ....clients.user_service_client import UserServiceClient, UserServiceClientError
+from ....services.dashboard_summary import get_dashboard_summaries
 
 logger = logging.getLogger(__name__)
 
@@ -116,240 +117,6 @@ async def get_user_trading_accounts(db: Session, user_id: int) -> List[dict]:
     ]
 
 
-async def get_orders_summary(db: Session, user_id: int, trading_account_id: str, today: date) -> OrdersSummary:
-    """Get orders summary for a trading account"""
-    query = text("""
-        SELECT
-            COUNT(*) as total_orders_today,
-            COUNT(*) FILTER (WHERE status IN ('PENDING', 'OPEN', 'TRIGGER_PENDING')) as pending_orders,
-            COUNT(*) FILTER (WHERE status = 'COMPLETE') as executed_orders,
-            COUNT(*) FILTER (WHERE status = 'REJECTED') as rejected_orders,
-            COUNT(*) FILTER (WHERE status = 'CANCELLED') as cancelled_orders
-        FROM order_service.orders
-        WHERE user_id = :user_id
-          AND trading_account_id = :trading_account_id
-          AND DATE(created_at) = :today
-    """)
-
-    result = (await db.execute(query, {
-        "user_id": user_id,
-        "trading_account_id": trading_account_id,
-        "today": today
-    })).fetchone()
-
-    if result:
-        return OrdersSummary(
-            total_orders_today=result.total_orders_today or 0,
-            pending_orders=result.pending_orders or 0,
-            executed_orders=result.executed_orders or 0,
-            rejected_orders=result.rejected_orders or 0,
-            cancelled_orders=result.cancelled_orders or 0
-        )
-    return OrdersSummary()
-
-
-async def get_positions_summary(db: Session, user_id: int, trading_account_id: str) -> PositionsSummary:
-    """Get positions summary for a trading account
-
-    Uses DISTINCT ON to get only the latest trading_day per symbol+product_type.
-    This prevents counting duplicate rows for NRML positions that carry forward across days.
-    """
-    query = text("""
-        WITH latest_positions AS (
-            SELECT DISTINCT ON (symbol, product_type)
-                quantity
-            FROM order_service.positions
-            WHERE user_id = :user_id
-              AND trading_account_id = :trading_account_id
-            ORDER BY symbol, product_type, trading_day DESC
-        )
-        SELECT
-            COUNT(*) as total_positions,
-            COUNT(*) FILTER (WHERE quantity > 0) as long_positions,
-            COUNT(*) FILTER (WHERE quantity < 0) as short_positions,
-            COUNT(*) FILTER (WHERE quantity != 0) as active_positions,
-            COUNT(*) FILTER (WHERE quantity = 0) as closed_positions
-        FROM latest_positions
-    """)
-
-    result = (await db.execute(query, {
-        "user_id": user_id,
-        "trading_account_id": trading_account_id
-    })).fetchone()
-
-    if result:
-        return PositionsSummary(
-            total_positions=result.total_positions or 0,
-            long_positions=result.long_positions or 0,
-            short_positions=result.short_positions or 0,
-            active_positions=result.active_positions or 0,
-            closed_positions=result.closed_positions or 0
-        )
-    return PositionsSummary()
-
-
-async def get_pnl_summary(db: Session, user_id: int, trading_account_id: str, today: date) -> PnLSummary:
-    """Get P&L summary for a trading account"""
-    # Get overall P&L
-    query = text("""
-        SELECT
-            COALESCE(SUM(realized_pnl), 0) as realized_pnl,
-            COALESCE(SUM(unrealized_pnl), 0) as unrealized_pnl,
-            COALESCE(SUM(total_pnl), 0) as total_pnl
-        FROM order_service.positions
-        WHERE user_id = :user_id
-          AND trading_account_id = :trading_account_id
-    """)
-
-    result = (await db.execute(query, {
-        "user_id": user_id,
-        "trading_account_id": trading_account_id
-    })).fetchone()
-
-    # Get today's P&L from trades
-    day_pnl_query = text("""
-        SELECT COALESCE(SUM(
-            CASE
-                WHEN transaction_type = 'SELL' THEN price * quantity
-                WHEN transaction_type = 'BUY' THEN -price * quantity
-                ELSE 0
-            END
-        ), 0) as day_pnl
-        FROM order_service.trades
-        WHERE user_id = :user_id
-          AND trading_account_id = :trading_account_id
-          AND DATE(trade_time) = :today
-    """)
-
-    day_result = (await db.execute(day_pnl_query, {
-        "user_id": user_id,
-        "trading_account_id": trading_account_id,
-        "today": today
-    })).fetchone()
-
-    if result:
-        total_pnl = float(result.total_pnl or 0)
-        realized_pnl = float(result.realized_pnl or 0)
-        unrealized_pnl = float(result.unrealized_pnl or 0)
-        day_pnl = float(day_result.day_pnl or 0) if day_result else 0.0
-
-        # Calculate percentage (avoiding division by zero)
-        pnl_percentage = None
-        if realized_pnl != 0:
-            pnl_percentage = (total_pnl / abs(realized_pnl)) * 100
-
-        return PnLSummary(
-            total_pnl=total_pnl,
-            realized_pnl=realized_pnl,
-            unrealized_pnl=unrealized_pnl,
-            pnl_percentage=pnl_percentage,
-            day_pnl=day_pnl
-        )
-
-    return PnLSummary()
-
-
-async def get_holdings_summary(db: Session, user_id: int, trading_account_id: str) -> HoldingsSummary:
-    """Get holdings summary for a trading account from real data"""
-    try:
-        # Get holdings from positions table (open positions are current holdings)
-        from ...models.position import Position
-        
-        open_positions = db.query(Position).filter(
-            Position.trading_account_id == trading_account_id,
-            Position.is_open == True
-        ).all()
-        
-        if not open_positions:
-            return HoldingsSummary()
-        
-        total_holdings_value = sum(
-            pos.quantity * pos.last_price for pos in open_positions 
-            if pos.last_price and pos.quantity > 0  # Long positions only for holdings
-        )
-        
-        total_unrealized_pnl = sum(pos.unrealized_pnl for pos in open_positions)
-        holdings_count = len([pos for pos in open_positions if pos.quantity > 0])
-        
-        day_pnl = sum(
-            (pos.last_price - pos.average_price) * pos.quantity 
-            for pos in open_positions 
-            if pos.last_price and pos.average_price and pos.quantity > 0
-        )
-        
-        return HoldingsSummary(
-            total_value=total_holdings_value,
-            day_pnl=day_pnl,
-            total_pnl=total_unrealized_pnl,
-            holdings_count=holdings_count
-        )
-        
-    except Exception as e:
-        logger.error(f"Failed to get holdings summary for {trading_account_id}: {e}")
-        return HoldingsSummary()
-
-
-async def get_margins_summary(db: Session, user_id: int, trading_account_id: str) -> MarginsSummary:
-    """Get margins summary for a trading account from real broker data"""
-    try:
-        # Get real margin data from broker API
-        from ...services.kite_client import get_kite_client_sync
-        import asyncio
-        
-        kite_client = get_kite_client_sync()
-        margins = await asyncio.to_thread(kite_client.margins)
-        
-        equity_margin = margins.get("equity", {})
-        commodity_margin = margins.get("commodity", {})
-        
-        available_cash = float(equity_margin.get("available", {}).get("cash", 0.0))
-        used_margin = float(equity_margin.get("utilised", {}).get("debits", 0.0))
-        available_margin = float(equity_margin.get("available", {}).get("intraday_payin", 0.0))
-        
-        # Calculate additional metrics
-        total_margin = available_cash + available_margin
-        margin_utilization = (used_margin / total_margin * 100) if total_margin > 0 else 0.0
-        
-        return MarginsSummary(
-            available_cash=available_cash,
-            used_margin=used_margin,
-            available_margin=available_margin,
-            total_margin=total_margin,
-            margin_utilization=margin_utilization
-        )
-        
-    except Exception as e:
-        logger.error(f"Failed to get margins summary for {trading_account_id}: {e}")
-        
-        # Fallback: Calculate from positions
-        try:
-            from ...models.position import Position
-            
-            open_positions = db.query(Position).filter(
-                Position.trading_account_id == trading_account_id,
-                Position.is_open == True
-            ).all()
-            
-            # Estimate margin usage based on positions
-            estimated_margin_used = sum(
-                abs(pos.quantity * pos.last_price * 0.2) for pos in open_positions 
-                if pos.last_price  # Assume 20% margin requirement
-            )
-            
-            estimated_cash = max(50000.0, estimated_margin_used * 2)  # Conservative estimate
-            
-            return MarginsSummary(
-                available_cash=estimated_cash - estimated_margin_used,
-                used_margin=estimated_margin_used,
-                available_margin=estimated_cash,
-                total_margin=estimated_cash + estimated_margin_used
-            )
-            
-        except Exception as fallback_error:
-            logger.error(f"Fallback margin calculation failed: {fallback_error}")
-            return MarginsSummary()
-
-
 # ==========================================
 # ENDPOINT
 # ==========================================
@@ -377,8 +144,9 @@ async def get_dashboard_summary(
 
     **Performance:**
     - Uses SQL aggregation (COUNT, SUM) for efficiency
-    - Single database query per account per data type
-    - Much faster than N*5 separate API calls
+    - One GROUP BY trading_account_id query per data type across all accounts
+    - Data types are queried concurrently
+    - Per-user, per-account results cached until the account changes
     """
     try:
         # Get integer user_id (gateway auth uses "user_id_int", JWT uses "sub" as integer)
@@ -398,29 +166,31 @@ async def get_dashboard_summary(
                 if acc["trading_account_id"] == x_entity_id
             ]
 
-        # Gather summary data for each account
+        # Gather summary data for all accounts at once
+        summaries = await get_dashboard_summaries(
+            get_session_maker(),
+            user_id,
+            [account["trading_account_id"] for account in trading_accounts],
+            today,
+            cache_ttl=settings.dashboard_cache_ttl
+        )
+
         account_summaries = []
 
         for account in trading_accounts:
             account_id = account["trading_account_id"]
-
-            # Get all summaries in parallel (async)
-            orders_summary = await get_orders_summary(db, user_id, account_id, today)
-            positions_summary = await get_positions_summary(db, user_id, account_id)
-            pnl_summary = await get_pnl_summary(db, user_id, account_id, today)
-            holdings_summary = await get_holdings_summary(db, user_id, account_id)
-            margins_summary = await get_margins_summary(db, user_id, account_id)
+            summary = summaries.get(account_id, {})
 
             account_summaries.append(AccountSummary(
                 trading_account_id=account_id,
                 account_name=account["account_name"] or f"Account {account_id}",
                 broker=account["broker"] or "unknown",
                 broker_user_id=account.get("broker_user_id"),
-                orders=orders_summary,
-                positions=positions_summary,
-                holdings=holdings_summary,
-                margins=margins_summary,
-                pnl=pnl_summary
+                orders=OrdersSummary(**summary.get("orders", {})),
+                positions=PositionsSummary(**summary.get("positions", {})),
+                holdings=HoldingsSummary(**summary.get("holdings", {})),
+                margins=MarginsSummary(**summary.get("margins", {})),
+                pnl=PnLSummary(**summary.get("pnl", {}))
             ))
 
         return DashboardSummaryResponse(
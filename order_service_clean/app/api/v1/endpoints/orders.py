@@ -17,6 +17,7 @@ from ....services import OrderService
 from ....services.idempotency import get_idempotency_service
 from ....utils.user_id import extract_user_id
 from ....utils.acl_helpers import ACLHelper
+from ....utils.pagination import InvalidCursorError, decode_cursor, next_cursor
 from ....services.market_hours import MarketHoursService
 from ..schemas import (
     PlaceOrderRequest,
@@ -588,6 +589,8 @@ async def list_orders(
     limit: int = Query(100, ge=1, le=1000, description="Maximum orders to return"),
     offset: int = Query(0, ge=0, description="Number of orders to skip"),
     today_only: bool = Query(True, description="Only return today's orders (default: True). Set to False for all orders."),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor (replaces offset)"),
+    approximate_count: bool = Query(False, description="Return an estimated total for large result sets"),
     current_user: dict = Depends(get_current_user),
     trading_account_id: Optional[str] = Depends(get_trading_account_id),
     db: AsyncSession = Depends(get_db)
@@ -604,11 +607,26 @@ async def list_orders(
     - **position_id**: Filter by position ID
     - **limit**: Maximum number of orders to return (1-1000, default 100)
     - **offset**: Number of orders to skip for pagination
+    - **cursor**: Keyset cursor for the next page (returned as next_cursor); preferred over offset.
+      Single-account only (requires X-Trading-Account-ID)
+    - **approximate_count**: Return a planner estimate as total when the result set is large
 
     Orders are returned in descending order by creation time (newest first).
     """
     user_id = extract_user_id(current_user)
 
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        if trading_account_id is None:
+            # Aggregated listings are not paginated
+            raise HTTPException(
+                status_code=400,
+                detail="cursor pagination requires the X-Trading-Account-ID header"
+            )
+
     # Check if this is "All Accounts" mode (Issue #439)
     if trading_account_id is None:
         logger.info(f"All Accounts mode: aggregating orders for user {user_id}")
@@ -672,7 +690,8 @@ async def list_orders(
             position_id=position_id,
             limit=limit,
             offset=offset,
-            today_only=today_only
+            today_only=today_only,
+            cursor=cursor
         )
     else:
         # Granular access - filter to specific orders
@@ -687,7 +706,8 @@ async def list_orders(
             limit=limit,
             offset=offset,
             today_only=today_only,
-            order_ids=accessible_order_ids  # Filter to accessible orders
+            order_ids=accessible_order_ids,  # Filter to accessible orders
+            cursor=cursor
         )
 
     total = await service.count_orders(
@@ -695,14 +715,16 @@ async def list_orders(
         status=status,
         position_id=position_id,
         today_only=today_only,
-        order_ids=accessible_order_ids if not has_account_access else None
+        order_ids=accessible_order_ids if not has_account_access else None,
+        approximate=approximate_count
     )
 
     return OrderListResponse(
         orders=[OrderResponse.from_orm(order) for order in orders],
         total=total,
         limit=limit,
-        offset=offset
+        offset=offset,
+        next_cursor=next_cursor(orders, limit, "created_at")
     )
 
 
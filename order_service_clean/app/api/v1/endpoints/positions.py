@@ -14,6 +14,7 @@ from ....database.connection import get_db
 from ....services.position_service import PositionService
 from ....utils.user_id import extract_user_id
 from ....utils.acl_helpers import ACLHelper
+from ....utils.pagination import InvalidCursorError, decode_cursor, next_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -65,6 +66,7 @@ class PositionListResponse(BaseModel):
     total: int
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
 
 class PositionSummaryResponse(BaseModel):
@@ -124,6 +126,8 @@ async def list_positions(
     trading_day: Optional[date] = Query(None, description="Filter by trading day"),
     limit: int = Query(100, ge=1, le=500, description="Maximum positions to return"),
     offset: int = Query(0, ge=0, description="Number of positions to skip"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor (replaces offset)"),
+    approximate_count: bool = Query(False, description="Return an estimated total for large result sets"),
     current_user: dict = Depends(get_current_user),
     trading_account_id: Optional[str] = Depends(get_trading_account_id),
     db = Depends(get_db)
@@ -142,6 +146,9 @@ async def list_positions(
     - **trading_day**: Filter by trading day (default: today)
     - **limit**: Maximum number of positions to return
     - **offset**: Number of positions to skip for pagination
+    - **cursor**: Keyset cursor for the next page (returned as next_cursor); preferred over offset.
+      Single-account only (requires X-Trading-Account-ID)
+    - **approximate_count**: Return a planner estimate as total when the result set is large
 
     Returns:
     - **aggregated**: True if data is from multiple accounts
@@ -151,6 +158,18 @@ async def list_positions(
 
     user_id = extract_user_id(current_user)
 
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        if trading_account_id is None:
+            # Aggregated listings are not paginated
+            raise HTTPException(
+                status_code=400,
+                detail="cursor pagination requires the X-Trading-Account-ID header"
+            )
+
     # Check if this is "All Accounts" mode (Issue #439)
     if trading_account_id is None:
         # All Accounts mode - use ACL to get accessible trading accounts
@@ -221,7 +240,8 @@ async def list_positions(
             only_open=only_open,
             trading_day=trading_day,
             limit=limit,
-            offset=offset
+            offset=offset,
+            cursor=cursor
         )
     else:
         # Granular access - filter to specific positions
@@ -236,14 +256,25 @@ async def list_positions(
             trading_day=trading_day,
             limit=limit,
             offset=offset,
-            position_ids=accessible_position_ids  # Filter to accessible positions
+            position_ids=accessible_position_ids,  # Filter to accessible positions
+            cursor=cursor
         )
 
+    total = await service.count_positions(
+        symbol=symbol,
+        exchange=exchange,
+        only_open=only_open,
+        trading_day=trading_day,
+        position_ids=accessible_position_ids if not has_account_access else None,
+        approximate=approximate_count
+    )
+
     return PositionListResponse(
         positions=[PositionResponse.model_validate(p) for p in positions],
-        total=len(positions),
+        total=total,
         limit=limit,
-        offset=offset
+        offset=offset,
+        next_cursor=next_cursor(positions, limit, "opened_at")
     )
 
 
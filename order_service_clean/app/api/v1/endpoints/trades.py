@@ -14,6 +14,7 @@ from ....database.connection import get_db
 from ....services.trade_service import TradeService
 from ....utils.user_id import extract_user_id
 from ....utils.acl_helpers import ACLHelper
+from ....utils.pagination import InvalidCursorError, decode_cursor, next_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +53,7 @@ class TradeListResponse(BaseModel):
     total: int
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
 
 class SymbolBreakdown(BaseModel):
@@ -113,6 +115,8 @@ async def list_trades(
     end_date: Optional[date] = Query(None, description="Filter trades until this date"),
     limit: int = Query(100, ge=1, le=500, description="Maximum trades to return"),
     offset: int = Query(0, ge=0, description="Number of trades to skip"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor (replaces offset)"),
+    approximate_count: bool = Query(False, description="Return an estimated total for large result sets"),
     current_user: dict = Depends(get_current_user),
     trading_account_id: Optional[str] = Depends(get_trading_account_id),
     db = Depends(get_db)
@@ -134,11 +138,26 @@ async def list_trades(
     - **end_date**: Filter trades until this date
     - **limit**: Maximum number of trades to return
     - **offset**: Number of trades to skip for pagination
+    - **cursor**: Keyset cursor for the next page (returned as next_cursor); preferred over offset.
+      Single-account only (requires X-Trading-Account-ID)
+    - **approximate_count**: Return a planner estimate as total when the result set is large
     """
     from ....services.account_aggregation import aggregate_trades
 
     user_id = extract_user_id(current_user)
 
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        if trading_account_id is None:
+            # Aggregated listings are not paginated
+            raise HTTPException(
+                status_code=400,
+                detail="cursor pagination requires the X-Trading-Account-ID header"
+            )
+
     # Check if this is "All Accounts" mode (Issue #439)
     if trading_account_id is None:
         logger.info(f"All Accounts mode: aggregating trades for user {user_id}")
@@ -203,7 +222,8 @@ async def list_trades(
             start_date=start_date,
             end_date=end_date,
             limit=limit,
-            offset=offset
+            offset=offset,
+            cursor=cursor
         )
     else:
         # Granular access - filter to specific trades
@@ -219,14 +239,26 @@ async def list_trades(
             end_date=end_date,
             limit=limit,
             offset=offset,
-            trade_ids=accessible_trade_ids  # Filter to accessible trades
+            trade_ids=accessible_trade_ids,  # Filter to accessible trades
+            cursor=cursor
         )
 
+    total = await service.count_trades(
+        symbol=symbol,
+        exchange=exchange,
+        transaction_type=transaction_type,
+        start_date=start_date,
+        end_date=end_date,
+        trade_ids=accessible_trade_ids if not has_account_access else None,
+        approximate=approximate_count
+    )
+
     return TradeListResponse(
         trades=[TradeResponse.model_validate(t) for t in trades],
-        total=len(trades),
+        total=total,
         limit=limit,
-        offset=offset
+        offset=offset,
+        next_cursor=next_cursor(trades, limit, "trade_time")
     )
 
 
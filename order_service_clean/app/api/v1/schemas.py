@@ -149,6 +149,7 @@ class OrderListResponse(BaseModel):
     total: int
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
 
 # ==========================================
@@ -15,6 +15,8 @@ import logging
 from typing import List, Optional
 import httpx
 
+from ..services.http_client_registry import get_http_client
+
 logger = logging.getLogger(__name__)
 
 # Configuration from order service config-compliant settings
@@ -100,32 +102,33 @@ async def validate_account_access(
         return False
 
     try:
-        async with httpx.AsyncClient(timeout=PERMISSION_CHECK_TIMEOUT) as client:
-            response = await client.post(
-                f"{USER_SERVICE_URL}/api/v1/permissions/check",
-                json={
-                    "user_id": user_id,
-                    "trading_account_id": trading_account_id,
-                    "required_permissions": required_permissions
-                },
-                headers={"X-Internal-API-Key": INTERNAL_API_KEY}
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                has_access = data.get("has_access", False)
-                access_level = data.get("access_level", "none")
-                permissions = data.get("permissions", [])
-
-                if has_access:
-                    logger.info(f"✅ Slow path: user {user_id} has {access_level} access to account {trading_account_id} with permissions {permissions}")
-                else:
-                    logger.warning(f"❌ Slow path: user {user_id} does NOT have access to account {trading_account_id}")
-
-                return has_access
+        client = get_http_client("user_service")
+        response = await client.post(
+            f"{USER_SERVICE_URL}/api/v1/permissions/check",
+            json={
+                "user_id": user_id,
+                "trading_account_id": trading_account_id,
+                "required_permissions": required_permissions
+            },
+            headers={"X-Internal-API-Key": INTERNAL_API_KEY},
+            timeout=PERMISSION_CHECK_TIMEOUT
+        )
+
+        if response.status_code == 200:
+            data = response.json()
+            has_access = data.get("has_access", False)
+            access_level = data.get("access_level", "none")
+            permissions = data.get("permissions", [])
+
+            if has_access:
+                logger.info(f"✅ Slow path: user {user_id} has {access_level} access to account {trading_account_id} with permissions {permissions}")
             else:
-                logger.error(f"Permission check failed: HTTP {response.status_code} - {response.text}")
-                return False
+                logger.warning(f"❌ Slow path: user {user_id} does NOT have access to account {trading_account_id}")
+
+            return has_access
+        else:
+            logger.error(f"Permission check failed: HTTP {response.status_code} - {response.text}")
+            return False
 
     except httpx.TimeoutException:
         logger.error(f"Permission check timeout after {PERMISSION_CHECK_TIMEOUT}s")
@@ -162,13 +165,7 @@ async def get_user_accessible_accounts(user_id: int, jwt_claims: Optional[dict]
 
     # Slow path: Call user-service dashboard endpoint
     # (This returns trading accounts list)
-    try:
-        async with httpx.AsyncClient(timeout=PERMISSION_CHECK_TIMEOUT) as client:
-            # Note: We need a valid JWT to call dashboard endpoint
-            # For now, return empty list and let caller handle
-            logger.warning(f"No JWT acct_ids for user {user_id}, cannot fetch account list without auth")
-            return []
-
-    except Exception as e:
-        logger.exception(f"Error fetching accessible accounts: {e}")
-        return []
+    # Note: We need a valid JWT to call dashboard endpoint
+    # For now, return empty list and let caller handle
+    logger.warning(f"No JWT acct_ids for user {user_id}, cannot fetch account list without auth")
+    return []
@@ -10,6 +10,7 @@ import httpx
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from ..config.settings import _get_service_port
+from ..services.http_client_registry import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -64,16 +65,14 @@ class AccountServiceClient:
                 return "http://user-service:8002"  # Default fallback
 
     async def _get_http_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client"""
-        if self._http_client is None:
-            self._http_client = httpx.AsyncClient(timeout=self.timeout)
+        """Get the shared pooled HTTP client for account_service"""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = get_http_client("account_service", timeout=self.timeout)
         return self._http_client
 
     async def close(self):
-        """Close HTTP client"""
-        if self._http_client:
-            await self._http_client.aclose()
-            self._http_client = None
+        """Release HTTP client (the shared pool is closed on service shutdown)"""
+        self._http_client = None
 
     async def update_account_tier(
         self, 
@@ -12,6 +12,7 @@ from datetime import date, datetime
 from decimal import Decimal
 
 from ..config.settings import _get_service_port
+from ..services.http_client_registry import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -64,16 +65,14 @@ class AnalyticsServiceClient:
                 return "http://analytics:8004"  # Default fallback
 
     async def _get_http_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client"""
-        if self._http_client is None:
-            self._http_client = httpx.AsyncClient(timeout=self.timeout)
+        """Get the shared pooled HTTP client for analytics_service"""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = get_http_client("analytics_service", timeout=self.timeout)
         return self._http_client
 
     async def close(self):
-        """Close HTTP client"""
-        if self._http_client:
-            await self._http_client.aclose()
-            self._http_client = None
+        """Release HTTP client (the shared pool is closed on service shutdown)"""
+        self._http_client = None
 
     async def calculate_and_store_pnl_metrics(
         self,
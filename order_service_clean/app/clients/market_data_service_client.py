@@ -5,13 +5,19 @@ Handles all communication with the market data service for instrument registry,
 price data, and market information. Replaces direct public.instrument_registry access.
 """
 
+import asyncio
 import logging
 import httpx
-from typing import Optional, Dict, Any, List
+from datetime import date, datetime
+from typing import Optional, Dict, Any, Iterable, List, Tuple
+from zoneinfo import ZoneInfo
 from ..config.settings import _get_service_port
+from ..services.http_client_registry import get_http_client
 
 logger = logging.getLogger(__name__)
 
+IST = ZoneInfo("Asia/Kolkata")
+
 
 class MarketDataServiceError(Exception):
     """Market data service communication error"""
@@ -43,6 +49,10 @@ class MarketDataServiceClient:
         self.base_url = base_url
         self.timeout = timeout
         self._http_client: Optional[httpx.AsyncClient] = None
+        # Instrument tokens are stable for the trading day; cache resolved ones
+        # and start over at the IST date boundary
+        self._token_cache: Dict[Tuple[str, str], int] = {}
+        self._token_cache_day: Optional[date] = None
 
     async def _get_base_url(self) -> str:
         """Get market data service base URL via service discovery"""
@@ -63,16 +73,14 @@ class MarketDataServiceClient:
                 return "http://market-data-service:8005"  # Default fallback
 
     async def _get_http_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client"""
-        if self._http_client is None:
-            self._http_client = httpx.AsyncClient(timeout=self.timeout)
+        """Get the shared pooled HTTP client for market_data_service"""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = get_http_client("market_data_service", timeout=self.timeout)
         return self._http_client
 
     async def close(self):
-        """Close HTTP client"""
-        if self._http_client:
-            await self._http_client.aclose()
-            self._http_client = None
+        """Release HTTP client (the shared pool is closed on service shutdown)"""
+        self._http_client = None
 
     async def get_instrument_token(
         self, 
@@ -117,6 +125,65 @@ class MarketDataServiceClient:
             logger.error(f"Market data service request failed: {e}")
             raise MarketDataServiceError(f"Market data service request failed: {e}")
 
+    def _tokens_for_today(self) -> Dict[Tuple[str, str], int]:
+        today = datetime.now(IST).date()
+        if today != self._token_cache_day:
+            self._token_cache_day = today
+            self._token_cache.clear()
+        return self._token_cache
+
+    async def get_instrument_tokens(
+        self,
+        instruments: Iterable[Tuple[str, str]],
+        max_concurrency: int = 8
+    ) -> Dict[Tuple[str, str], Optional[int]]:
+        """
+        Resolve instrument tokens for many symbol/exchange pairs at once.
+
+        Cached tokens are returned without a request; the rest are looked up
+        concurrently over the shared HTTP client. Failed lookups map to None.
+
+        Args:
+            instruments: (symbol, exchange) pairs
+            max_concurrency: Maximum concurrent lookups
+
+        Returns:
+            Dict mapping (symbol, exchange) to instrument token (or None)
+        """
+        token_cache = self._tokens_for_today()
+        tokens: Dict[Tuple[str, str], Optional[int]] = {}
+        pending = []
+        for key in dict.fromkeys(instruments):
+            if key in token_cache:
+                tokens[key] = token_cache[key]
+            else:
+                pending.append(key)
+
+        if not pending:
+            return tokens
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def lookup(symbol: str, exchange: str) -> Optional[int]:
+            async with semaphore:
+                return await self.get_instrument_token(symbol, exchange)
+
+        results = await asyncio.gather(
+            *[lookup(symbol, exchange) for symbol, exchange in pending],
+            return_exceptions=True
+        )
+
+        for key, result in zip(pending, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Instrument token lookup failed for {key[0]}/{key[1]}: {result}")
+                tokens[key] = None
+                continue
+            tokens[key] = result
+            if result:
+                token_cache[key] = result
+
+        return tokens
+
     async def get_instrument_info(
         self, 
         symbol: str, 
@@ -9,6 +9,7 @@ import logging
 import httpx
 from typing import Optional, Dict, Any
 from ..config.settings import _get_service_port
+from ..services.http_client_registry import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -57,16 +58,14 @@ class PortfolioServiceClient:
             return "http://backend:8001"
 
     async def _get_http_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client"""
-        if self._http_client is None:
-            self._http_client = httpx.AsyncClient(timeout=self.timeout)
+        """Get the shared pooled HTTP client for portfolio_service"""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = get_http_client("portfolio_service", timeout=self.timeout)
         return self._http_client
 
     async def close(self):
-        """Close HTTP client"""
-        if self._http_client:
-            await self._http_client.aclose()
-            self._http_client = None
+        """Release HTTP client (the shared pool is closed on service shutdown)"""
+        self._http_client = None
 
     async def get_or_create_default_portfolio(
         self, 
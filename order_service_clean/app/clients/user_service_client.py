@@ -9,6 +9,8 @@ from typing import Any, Dict, List, Optional
 
 import httpx
 
+from ..services.http_client_registry import get_http_client
+
 # Handle missing common module in test environment
 try:
     from common.service_registry import get_user_service_url
@@ -65,17 +67,16 @@ class UserServiceClient:
         if self.api_key:
             headers["X-Internal-API-Key"] = self.api_key
         base_url = await self._get_base_url()
-        return httpx.AsyncClient(base_url=base_url, timeout=self.timeout, headers=headers)
+        return get_http_client("user_service", base_url=base_url, headers=headers, timeout=self.timeout)
 
     async def _get_client(self) -> httpx.AsyncClient:
-        if self._client is None:
+        if self._client is None or self._client.is_closed:
             self._client = await self._build_client()
         return self._client
 
     async def close(self) -> None:
-        if self._client:
-            await self._client.aclose()
-            self._client = None
+        # The pooled client is shared; it is closed on service shutdown
+        self._client = None
 
     async def get_trading_account_basic_info(self, trading_account_id: int) -> Dict[str, Any]:
         client = await self._get_client()
@@ -12,11 +12,23 @@ Bootstrap Pattern:
 - Docker-compose provides: ENVIRONMENT, CONFIG_SERVICE_URL, INTERNAL_API_KEY
 - Config-service provides: All database URLs, secrets, service-specific config
 - Service code fetches everything (except bootstrap triad) from config-service APIs
+
+Config Snapshot:
+- Values are fetched from config-service once per key and kept in an
+  immutable in-process snapshot, so `settings.<property>` on hot paths is a
+  dict lookup rather than a config-service call
+- Values are coerced to the type of their declared default ("true" -> True)
+- warm_config_snapshot() loads every property at startup; the background
+  ConfigRefresher (services/config_refresher.py) re-fetches known keys and
+  swaps in a new snapshot atomically when anything changed
 """
 import os
 import logging
 import sys
-from typing import List, Optional, Dict, Any
+import threading
+import time
+from types import MappingProxyType
+from typing import Callable, List, Mapping, Optional, Dict, Any, Tuple
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -114,7 +126,163 @@ def _get_config_client():
         sys.exit(1)
 
 
+# =============================================================================
+# CONFIG SNAPSHOT
+# =============================================================================
+
+class ConfigSnapshot:
+    """Immutable, typed config-service values at one point in time."""
+
+    __slots__ = ("values", "version", "loaded_at")
+
+    def __init__(self, values: Dict[str, Any], version: int = 0):
+        self.values: Mapping[str, Any] = MappingProxyType(dict(values))
+        self.version = version
+        self.loaded_at = time.time()
+
+
+# Readers use the current snapshot lock-free; writers swap it under the lock
+_snapshot = ConfigSnapshot({})
+_snapshot_lock = threading.Lock()
+_MISSING = object()
+
+# Keys read so far -> (is_secret, default_value), re-fetched on refresh
+_config_keys: Dict[str, Tuple[bool, Any]] = {}
+
+# Config-service fetch counts by (reason, result); reason is "miss" or "refresh"
+_fetch_counts: Dict[Tuple[str, str], int] = {}
+# Callback signature: (reason, result, count)
+ConfigFetchObserver = Callable[[str, str, int], None]
+_fetch_observer: Optional[ConfigFetchObserver] = None
+
+
+def _count_fetch(reason: str, result: str) -> None:
+    _fetch_counts[(reason, result)] = _fetch_counts.get((reason, result), 0) + 1
+    if _fetch_observer is not None:
+        try:
+            _fetch_observer(reason, result, 1)
+        except Exception as e:
+            logger.debug(f"Config fetch observer failed: {e}")
+
+
+def set_config_fetch_observer(observer: Optional[ConfigFetchObserver]) -> None:
+    """Register a metrics hook; fetches counted before registration are replayed."""
+    global _fetch_observer
+    _fetch_observer = observer
+    if observer is not None:
+        for (reason, result), count in list(_fetch_counts.items()):
+            observer(reason, result, count)
+
+
+def _coerce(value: Any, default_value: Any) -> Any:
+    """Coerce config-service strings to the type of the declared default."""
+    if not isinstance(value, str) or default_value is None or isinstance(default_value, str):
+        return value
+    try:
+        if isinstance(default_value, bool):
+            return value.strip().lower() in ("true", "1", "yes", "on")
+        if isinstance(default_value, int):
+            return int(value)
+        if isinstance(default_value, float):
+            return float(value)
+    except ValueError:
+        logger.warning(f"Config value {value!r} does not match type {type(default_value).__name__}")
+    return value
+
+
+def _store_config_values(values: Dict[str, Any], bump_version: bool) -> ConfigSnapshot:
+    """Swap in a new snapshot containing `values` on top of the current one."""
+    global _snapshot
+    with _snapshot_lock:
+        merged = dict(_snapshot.values)
+        merged.update(values)
+        _snapshot = ConfigSnapshot(merged, _snapshot.version + (1 if bump_version else 0))
+        return _snapshot
+
+
+def get_config_snapshot() -> ConfigSnapshot:
+    """Get the current config snapshot."""
+    return _snapshot
+
+
+def refresh_config_snapshot() -> List[str]:
+    """
+    Re-fetch every known key and atomically swap in a new snapshot if anything
+    changed. Keys that fail to fetch keep their current value.
+
+    Blocking (the config-service client is synchronous) - run it in a thread.
+
+    Returns:
+        Keys whose value changed
+    """
+    client = _get_config_client()
+    if not client:
+        return []
+
+    fetched: Dict[str, Any] = {}
+    for key, (is_secret, default_value) in list(_config_keys.items()):
+        try:
+            value = client.get_secret(key, required=False) if is_secret else client.get_config(key)
+        except Exception as e:
+            _count_fetch("refresh", "error")
+            logger.warning(f"Config refresh failed for {key}: {e}")
+            continue
+        _count_fetch("refresh", "ok")
+        if value is not None:
+            fetched[key] = _coerce(value, default_value)
+
+    current = _snapshot.values
+    changed = [key for key, value in fetched.items() if current.get(key, _MISSING) != value]
+    if changed:
+        snapshot = _store_config_values({key: fetched[key] for key in changed}, bump_version=True)
+        logger.info(
+            f"Config snapshot v{snapshot.version}: "
+            + ", ".join(key if _config_keys[key][0] else f"{key}={fetched[key]}" for key in changed)
+        )
+    return changed
+
+
+def warm_config_snapshot() -> ConfigSnapshot:
+    """Load every Settings property into the snapshot (called once at startup)."""
+    for name, attr in vars(Settings).items():
+        if isinstance(attr, property):
+            try:
+                getattr(settings, name)
+            except Exception as e:
+                logger.warning(f"Failed to load setting {name}: {e}")
+    return _snapshot
+
+
+def get_config_stats() -> Dict[str, Any]:
+    """Get config snapshot statistics."""
+    snapshot = _snapshot
+    return {
+        "version": snapshot.version,
+        "keys": len(snapshot.values),
+        "age_seconds": round(time.time() - snapshot.loaded_at, 1),
+        "fetches": {f"{reason}:{result}": count for (reason, result), count in _fetch_counts.items()},
+    }
+
+
 def _get_config_value(key: str, required: bool = True, is_secret: bool = False, default_value: Any = None) -> Any:
+    """
+    Get a config value from the in-process snapshot.
+
+    The first read of a key fetches it from config service and adds it to the
+    snapshot; later reads never leave the process. The refresher keeps
+    snapshot values current.
+    """
+    value = _snapshot.values.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    value = _coerce(_fetch_config_value(key, required, is_secret, default_value), default_value)
+    _config_keys[key] = (is_secret, default_value)
+    _store_config_values({key: value}, bump_version=False)
+    return value
+
+
+def _fetch_config_value(key: str, required: bool = True, is_secret: bool = False, default_value: Any = None) -> Any:
     """
     Get value from config service (MANDATORY - no fallbacks).
 
@@ -160,6 +328,7 @@ def _get_config_value(key: str, required: bool = True, is_secret: bool = False,
             value = client.get_secret(key, required=required)
         else:
             value = client.get_config(key)
+        _count_fetch("miss", "ok")
 
         if value is not None:
             if is_secret:
@@ -174,6 +343,7 @@ def _get_config_value(key: str, required: bool = True, is_secret: bool = False,
         return default_value
 
     except Exception as e:
+        _count_fetch("miss", "error")
         logger.error(f"Failed to fetch {key} from config service: {e}")
         if required:
             logger.critical(f"Required config not available: {key}")
@@ -313,6 +483,14 @@ class Settings(BaseSettings):
     def redis_required(self) -> bool:
         return _get_config_value("ORDER_SERVICE_REDIS_REQUIRED", required=False, default_value=True)
 
+    @property
+    def redis_usage_monitor_interval(self) -> int:
+        return _get_config_value("ORDER_SERVICE_REDIS_USAGE_MONITOR_INTERVAL", required=False, default_value=60)
+
+    @property
+    def redis_usage_monitor_max_keys_per_prefix(self) -> int:
+        return _get_config_value("ORDER_SERVICE_REDIS_USAGE_MONITOR_MAX_KEYS_PER_PREFIX", required=False, default_value=10000)
+
     # Cache Encryption
     @property
     def cache_encryption_key(self) -> Optional[str]:
@@ -456,6 +634,10 @@ class Settings(BaseSettings):
     def daily_loss_limit(self) -> float:
         return _get_config_value("ORDER_SERVICE_DAILY_LOSS_LIMIT", required=False, default_value=-50000.0)
 
+    @property
+    def risk_snapshot_ttl_seconds(self) -> float:
+        return _get_config_value("ORDER_SERVICE_RISK_SNAPSHOT_TTL_SECONDS", required=False, default_value=2.0)
+
     # Position Tracking
     @property
     def enable_position_tracking(self) -> bool:
@@ -465,6 +647,126 @@ class Settings(BaseSettings):
     def position_sync_interval(self) -> int:
         return _get_config_value("ORDER_SERVICE_POSITION_SYNC_INTERVAL", required=False, default_value=60)
 
+    # Tick Listener
+    @property
+    def tick_listener_bulk_flush(self) -> bool:
+        return _get_config_value("ORDER_SERVICE_TICK_LISTENER_BULK_FLUSH", required=False, default_value=True)
+
+    @property
+    def tick_listener_shards(self) -> int:
+        return _get_config_value("ORDER_SERVICE_TICK_LISTENER_SHARDS", required=False, default_value=4)
+
+    @property
+    def tick_listener_max_pending_tokens(self) -> int:
+        return _get_config_value("ORDER_SERVICE_TICK_LISTENER_MAX_PENDING_TOKENS", required=False, default_value=20000)
+
+    @property
+    def position_book_enabled(self) -> bool:
+        return _get_config_value("ORDER_SERVICE_POSITION_BOOK_ENABLED", required=False, default_value=True)
+
+    @property
+    def position_book_persist_interval_ms(self) -> int:
+        return _get_config_value("ORDER_SERVICE_POSITION_BOOK_PERSIST_INTERVAL_MS", required=False, default_value=5000)
+
+    @property
+    def position_book_persist_threshold_pct(self) -> float:
+        return _get_config_value("ORDER_SERVICE_POSITION_BOOK_PERSIST_THRESHOLD_PCT", required=False, default_value=0.5)
+
+    # Trade Sync
+    @property
+    def trade_sync_bulk(self) -> bool:
+        return _get_config_value("ORDER_SERVICE_TRADE_SYNC_BULK", required=False, default_value=True)
+
+    # Trading Account Registry
+    @property
+    def account_registry_ttl_seconds(self) -> float:
+        return _get_config_value("ORDER_SERVICE_ACCOUNT_REGISTRY_TTL_SECONDS", required=False, default_value=60.0)
+
+    @property
+    def account_registry_refresh_interval(self) -> float:
+        return _get_config_value("ORDER_SERVICE_ACCOUNT_REGISTRY_REFRESH_INTERVAL", required=False, default_value=30.0)
+
+    # Sync Worker Fan-Out
+    @property
+    def sync_fanout_max_concurrency(self) -> int:
+        return _get_config_value("ORDER_SERVICE_SYNC_FANOUT_MAX_CONCURRENCY", required=False, default_value=16)
+
+    @property
+    def sync_fanout_account_timeout(self) -> float:
+        return _get_config_value("ORDER_SERVICE_SYNC_FANOUT_ACCOUNT_TIMEOUT", required=False, default_value=45.0)
+
+    # Kite Call Executor
+    @property
+    def kite_executor_max_workers(self) -> int:
+        return _get_config_value("ORDER_SERVICE_KITE_EXECUTOR_MAX_WORKERS", required=False, default_value=32)
+
+    @property
+    def kite_executor_per_account_concurrency(self) -> int:
+        return _get_config_value("ORDER_SERVICE_KITE_EXECUTOR_PER_ACCOUNT_CONCURRENCY", required=False, default_value=4)
+
+    # Kite Rate Limiter
+    @property
+    def kite_rate_limit_distributed(self) -> bool:
+        return _get_config_value("ORDER_SERVICE_KITE_RATE_LIMIT_DISTRIBUTED", required=False, default_value=True)
+
+    @property
+    def kite_rate_limit_lease_size(self) -> int:
+        return _get_config_value("ORDER_SERVICE_KITE_RATE_LIMIT_LEASE_SIZE", required=False, default_value=3)
+
+    @property
+    def kite_rate_limit_burst(self) -> int:
+        return _get_config_value("ORDER_SERVICE_KITE_RATE_LIMIT_BURST", required=False, default_value=1)
+
+    # HTTP Client Pool
+    @property
+    def http_pool_max_connections(self) -> int:
+        return _get_config_value("ORDER_SERVICE_HTTP_POOL_MAX_CONNECTIONS", required=False, default_value=50)
+
+    @property
+    def http_pool_max_keepalive_connections(self) -> int:
+        return _get_config_value("ORDER_SERVICE_HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS", required=False, default_value=20)
+
+    @property
+    def http_pool_keepalive_expiry(self) -> float:
+        return _get_config_value("ORDER_SERVICE_HTTP_POOL_KEEPALIVE_EXPIRY", required=False, default_value=30.0)
+
+    @property
+    def http_pool_http2(self) -> bool:
+        return _get_config_value("ORDER_SERVICE_HTTP_POOL_HTTP2", required=False, default_value=True)
+
+    # Config Snapshot
+    @property
+    def config_refresh_interval_seconds(self) -> float:
+        return _get_config_value("ORDER_SERVICE_CONFIG_REFRESH_INTERVAL_SECONDS", required=False, default_value=30.0)
+
+    # Handoff Acknowledgements
+    @property
+    def handoff_ack_fallback_poll_seconds(self) -> float:
+        return _get_config_value("ORDER_SERVICE_HANDOFF_ACK_FALLBACK_POLL_SECONDS", required=False, default_value=5.0)
+
+    @property
+    def handoff_emergency_ack_timeout(self) -> float:
+        return _get_config_value("ORDER_SERVICE_HANDOFF_EMERGENCY_ACK_TIMEOUT", required=False, default_value=2.0)
+
+    # Capital Ledger
+    @property
+    def capital_balance_reconcile_interval(self) -> int:
+        return _get_config_value("ORDER_SERVICE_CAPITAL_BALANCE_RECONCILE_INTERVAL", required=False, default_value=3600)
+
+    # Dashboard
+    @property
+    def dashboard_cache_ttl(self) -> int:
+        return _get_config_value("ORDER_SERVICE_DASHBOARD_CACHE_TTL", required=False, default_value=30)
+
+    # Secure Cache
+    @property
+    def secure_cache_l1_max_entries(self) -> int:
+        return _get_config_value("ORDER_SERVICE_SECURE_CACHE_L1_MAX_ENTRIES", required=False, default_value=1024)
+
+    @property
+    def secure_cache_l1_ttl(self) -> float:
+        return _get_config_value("ORDER_SERVICE_SECURE_CACHE_L1_TTL", required=False, default_value=30.0)
+
     # System
     @property
     def system_user_id(self) -> int:
@@ -5,10 +5,14 @@ Provides async Redis connection for:
 - Order caching
 - Rate limiting
 - Pub/sub for order updates
+
+Cached entities are indexed under owner tags (per user / per trading
+account) so a whole group can be invalidated without pattern scans; nothing
+here issues KEYS.
 """
 import logging
 import json
-from typing import Optional
+from typing import Iterable, List, Optional
 import redis.asyncio as aioredis
 
 from ..config.settings import settings
@@ -111,11 +115,125 @@ async def get_redis_health() -> dict:
         }
 
 
+# =========================================
+# TAG-INDEXED INVALIDATION
+# =========================================
+
+def _tag_key(tag: str) -> str:
+    """Set holding the cache keys indexed under a tag"""
+    return f"tags:{tag}"
+
+
+def _owner_tags(
+    kind: str,
+    user_id: Optional[int] = None,
+    trading_account_id: Optional[str] = None
+) -> List[str]:
+    """Tags for an entity cached on behalf of a user and/or trading account"""
+    tags = []
+    if user_id is not None:
+        tags.append(f"{kind}:user:{user_id}")
+    if trading_account_id is not None:
+        tags.append(f"{kind}:account:{trading_account_id}")
+    return tags
+
+
+async def _setex_tagged(redis, key: str, ttl: int, value: str, tags: Iterable[str]) -> None:
+    """SETEX a key and index it under each tag, in one round trip"""
+    pipe = redis.pipeline(transaction=False)
+    pipe.setex(key, ttl, value)
+    for tag in tags:
+        tag_key = _tag_key(tag)
+        pipe.sadd(tag_key, key)
+        pipe.expire(tag_key, ttl)
+    await pipe.execute()
+
+
+async def invalidate_cache_tags(*tags: str, keys: Iterable[str] = ()) -> int:
+    """
+    Delete every cache key indexed under the given tags.
+
+    Reads the tag sets in one pipelined round trip, then deletes the members
+    and removes exactly those members from the sets in a second one, so keys
+    indexed concurrently are left for the next invalidation rather than lost.
+
+    Args:
+        *tags: Tags to invalidate (e.g. "order:user:1")
+        keys: Extra keys to delete in the same round trip
+
+    Returns:
+        Number of cache keys deleted
+    """
+    redis = get_redis()
+    tag_keys = [_tag_key(tag) for tag in tags]
+
+    pipe = redis.pipeline(transaction=False)
+    for tag_key in tag_keys:
+        pipe.smembers(tag_key)
+    members = await pipe.execute() if tag_keys else []
+
+    doomed = set(keys)
+    for tag_members in members:
+        doomed.update(tag_members)
+    if not doomed:
+        return 0
+
+    pipe = redis.pipeline(transaction=False)
+    pipe.delete(*doomed)
+    for tag_key, tag_members in zip(tag_keys, members):
+        if tag_members:
+            pipe.srem(tag_key, *tag_members)
+    results = await pipe.execute()
+    return int(results[0] or 0)
+
+
+async def _delete_matching(redis, pattern: str, batch_size: int = 500) -> int:
+    """Delete keys matching an ad-hoc glob with incremental SCAN (maintenance use only)"""
+    deleted = 0
+    batch = []
+    async for key in redis.scan_iter(match=pattern, count=batch_size):
+        batch.append(key)
+        if len(batch) >= batch_size:
+            deleted += await redis.delete(*batch)
+            batch = []
+    if batch:
+        deleted += await redis.delete(*batch)
+    return deleted
+
+
+async def _invalidate_entity_cache(kind: str, cache_key: str) -> None:
+    """
+    Shared invalidation for order/position/trade caches.
+
+    cache_key is one of:
+    - an entity ID ("123") -> deletes "<kind>:123"
+    - an owner ("user:1" or "account:ACC1") -> deletes every entry tagged to it
+    - a glob ("<kind>:*") -> incremental SCAN delete; not for request paths
+    """
+    redis = get_redis()
+
+    if cache_key.startswith(("user:", "account:")):
+        deleted = await invalidate_cache_tags(f"{kind}:{cache_key}")
+        logger.debug(f"Invalidated {deleted} {kind} caches for {cache_key}")
+    elif '*' in cache_key:
+        deleted = await _delete_matching(redis, cache_key)
+        logger.debug(f"Invalidated {deleted} {kind} caches matching {cache_key}")
+    else:
+        await redis.delete(f"{kind}:{cache_key}")
+        logger.debug(f"Invalidated cache for {kind} {cache_key}")
+
+
 # =========================================
 # ORDER CACHING UTILITIES
 # =========================================
 
-async def cache_order(order_id: str, order_data: dict, ttl: int = None) -> None:
+async def cache_order(
+    order_id: str,
+    order_data: dict,
+    ttl: int = None,
+    user_id: Optional[int] = None,
+    trading_account_id: Optional[str] = None
+) -> None:
     """
     Cache order data in Redis.
 
@@ -123,6 +241,8 @@ async def cache_order(order_id: str, order_data: dict, ttl: int = None) -> None:
         order_id: Order ID
         order_data: Order data dictionary
         ttl: Time-to-live in seconds (default from settings)
+        user_id: Index the entry under this user (for invalidate_order_cache("user:<id>"))
+        trading_account_id: Index the entry under this trading account
     """
     redis = get_redis()
     ttl = ttl or settings.redis_order_ttl
@@ -130,10 +250,12 @@ async def cache_order(order_id: str, order_data: dict, ttl: int = None) -> None:
     key = f"order:{order_id}"
 
     try:
-        await redis.setex(
+        await _setex_tagged(
+            redis,
             key,
             ttl,
-            json.dumps(order_data)
+            json.dumps(order_data, default=str),
+            _owner_tags("order", user_id, trading_account_id)
         )
         logger.debug(f"Cached order {order_id}")
 
@@ -167,22 +289,18 @@ async def get_cached_order(order_id: str) -> Optional[dict]:
         return None
 
 
-async def invalidate_order_cache(order_id: str) -> None:
+async def invalidate_order_cache(cache_key: str) -> None:
     """
-    Invalidate (delete) cached order.
+    Invalidate (delete) cached order(s).
 
     Args:
-        order_id: Order ID
+        cache_key: Order ID ('123'), owner tag ('user:1' / 'account:ACC1'),
+            or a glob pattern for maintenance ('order:*', SCAN-based)
     """
-    redis = get_redis()
-    key = f"order:{order_id}"
-
     try:
-        await redis.delete(key)
-        logger.debug(f"Invalidated cache for order {order_id}")
-
+        await _invalidate_entity_cache("order", cache_key)
     except Exception as e:
-        logger.error(f"Failed to invalidate cache for order {order_id}: {e}")
+        logger.error(f"Failed to invalidate cache for {cache_key}: {e}")
 
 
 # =========================================
@@ -323,23 +441,11 @@ async def invalidate_position_cache(cache_key: str) -> None:
     Invalidate (delete) cached position(s).
 
     Args:
-        cache_key: Cache key pattern (e.g., 'position:123' or 'user:1')
+        cache_key: Position ID ('123'), owner tag ('user:1' / 'account:ACC1'),
+            or a glob pattern for maintenance ('position:*', SCAN-based)
     """
-    redis = get_redis()
-
     try:
-        if '*' in cache_key:
-            # Pattern-based deletion
-            keys = await redis.keys(cache_key)
-            if keys:
-                await redis.delete(*keys)
-                logger.debug(f"Invalidated {len(keys)} position caches matching {cache_key}")
-        else:
-            # Single key deletion
-            key = f"position:{cache_key}"
-            await redis.delete(key)
-            logger.debug(f"Invalidated cache for position {cache_key}")
-
+        await _invalidate_entity_cache("position", cache_key)
     except Exception as e:
         logger.error(f"Failed to invalidate cache for {cache_key}: {e}")
 
@@ -405,23 +511,11 @@ async def invalidate_trade_cache(cache_key: str) -> None:
     Invalidate (delete) cached trade(s).
 
     Args:
-        cache_key: Cache key pattern (e.g., 'trade:123' or 'user:1')
+        cache_key: Trade ID ('123'), owner tag ('user:1' / 'account:ACC1'),
+            or a glob pattern for maintenance ('trade:*', SCAN-based)
     """
-    redis = get_redis()
-
     try:
-        if '*' in cache_key:
-            # Pattern-based deletion
-            keys = await redis.keys(cache_key)
-            if keys:
-                await redis.delete(*keys)
-                logger.debug(f"Invalidated {len(keys)} trade caches matching {cache_key}")
-        else:
-            # Single key deletion
-            key = f"trade:{cache_key}"
-            await redis.delete(key)
-            logger.debug(f"Invalidated cache for trade {cache_key}")
-
+        await _invalidate_entity_cache("trade", cache_key)
     except Exception as e:
         logger.error(f"Failed to invalidate cache for {cache_key}: {e}")
 
@@ -430,7 +524,23 @@ async def invalidate_trade_cache(cache_key: str) -> None:
 # DASHBOARD CACHING UTILITIES (Issue #419)
 # =========================================
 
-async def cache_dashboard_overview(trading_account_id: int, data: dict, ttl: int = 300) -> None:
+def _dashboard_key(trading_account_id, user_id: Optional[int] = None) -> str:
+    if user_id is None:
+        return f"dashboard:{trading_account_id}"
+    return f"dashboard:{trading_account_id}:user:{user_id}"
+
+
+def _dashboard_tag(trading_account_id) -> str:
+    """Tag indexing every dashboard entry cached for an account"""
+    return f"dashboard:account:{trading_account_id}"
+
+
+async def cache_dashboard_overview(
+    trading_account_id: int,
+    data: dict,
+    ttl: int = 300,
+    user_id: Optional[int] = None
+) -> None:
     """
     Cache dashboard overview data in Redis.
 
@@ -438,35 +548,39 @@ async def cache_dashboard_overview(trading_account_id: int, data: dict, ttl: int
         trading_account_id: Trading account ID
         data: Dashboard overview data
         ttl: Time-to-live in seconds (default: 300 = 5 minutes)
+        user_id: Scope the entry to one user (summaries of shared accounts are per user)
     """
-    redis = get_redis()
-    key = f"dashboard:{trading_account_id}"
+    key = _dashboard_key(trading_account_id, user_id)
 
     try:
-        await redis.setex(
-            key,
-            ttl,
-            json.dumps(data, default=str)
+        redis = get_redis()
+        # Index per-user keys under the account so invalidation can find them
+        await _setex_tagged(
+            redis, key, ttl, json.dumps(data, default=str), [_dashboard_tag(trading_account_id)]
         )
         logger.debug(f"Cached dashboard overview for account {trading_account_id}")
     except Exception as e:
         logger.error(f"Failed to cache dashboard for account {trading_account_id}: {e}")
 
 
-async def get_cached_dashboard_overview(trading_account_id: int) -> Optional[dict]:
+async def get_cached_dashboard_overview(
+    trading_account_id: int,
+    user_id: Optional[int] = None
+) -> Optional[dict]:
     """
     Get cached dashboard overview data.
 
     Args:
         trading_account_id: Trading account ID
+        user_id: User the entry was cached for (None for the account-wide entry)
 
     Returns:
         Dashboard data dict or None if not found/expired
     """
-    redis = get_redis()
-    key = f"dashboard:{trading_account_id}"
+    key = _dashboard_key(trading_account_id, user_id)
 
     try:
+        redis = get_redis()
         data = await redis.get(key)
         if data:
             logger.debug(f"Cache HIT for dashboard account {trading_account_id}")
@@ -482,14 +596,16 @@ async def invalidate_dashboard_cache(trading_account_id: int) -> None:
     """
     Invalidate dashboard cache when positions or orders change.
 
+    Removes the account-wide entry and every per-user entry for the account.
+
     Args:
         trading_account_id: Trading account ID
     """
-    redis = get_redis()
-    key = f"dashboard:{trading_account_id}"
-
     try:
-        await redis.delete(key)
+        await invalidate_cache_tags(
+            _dashboard_tag(trading_account_id),
+            keys=[_dashboard_key(trading_account_id)]
+        )
         logger.debug(f"Invalidated dashboard cache for account {trading_account_id}")
     except Exception as e:
         logger.error(f"Failed to invalidate dashboard cache for account {trading_account_id}: {e}")
@@ -92,6 +92,118 @@ positions_pnl_total = Gauge(
     'Total P&L across all positions'
 )
 
+# Kite call executor metrics
+kite_executor_queue_depth = Gauge(
+    'order_service_kite_executor_queue_depth',
+    'Kite calls waiting for an account slot or a worker thread'
+)
+
+kite_executor_in_flight = Gauge(
+    'order_service_kite_executor_in_flight',
+    'Kite calls currently executing on worker threads'
+)
+
+kite_call_wait_seconds = Histogram(
+    'order_service_kite_call_wait_seconds',
+    'Time a Kite call waited before a worker thread picked it up',
+    ['operation']
+)
+
+kite_call_duration_seconds = Histogram(
+    'order_service_kite_call_duration_seconds',
+    'Kite call execution time on the worker thread',
+    ['operation', 'status']
+)
+
+
+def _observe_kite_call(operation: str, status: str, wait_seconds: float, call_seconds: float):
+    """Export a completed Kite call to Prometheus (runs on the executor thread)."""
+    kite_call_wait_seconds.labels(operation=operation).observe(wait_seconds)
+    kite_call_duration_seconds.labels(operation=operation, status=status).observe(call_seconds)
+
+# Secure cache metrics
+secure_cache_lookups_total = Counter(
+    'order_service_secure_cache_lookups_total',
+    'Secure cache lookups by tier (l1 = in-process, l2 = Redis) and result',
+    ['tier', 'result']
+)
+
+secure_cache_lookup_seconds = Histogram(
+    'order_service_secure_cache_lookup_seconds',
+    'Secure cache lookup latency by tier',
+    ['tier'],
+    buckets=(0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1)
+)
+
+
+def _observe_cache_lookup(tier: str, result: str, seconds: float):
+    """Export a secure cache lookup to Prometheus."""
+    secure_cache_lookups_total.labels(tier=tier, result=result).inc()
+    secure_cache_lookup_seconds.labels(tier=tier).observe(seconds)
+
+# Upstream HTTP client pool metrics
+upstream_http_requests_total = Counter(
+    'order_service_upstream_http_requests_total',
+    'Requests to upstream services over the pooled HTTP clients',
+    ['upstream', 'status', 'connection']
+)
+
+upstream_http_request_seconds = Histogram(
+    'order_service_upstream_http_request_seconds',
+    'Upstream request latency to response headers',
+    ['upstream'],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 10.0)
+)
+
+
+def _observe_upstream_request(upstream: str, reused: bool, status: str, seconds: float):
+    """Export a pooled upstream HTTP request to Prometheus."""
+    connection = "reused" if reused else "new"
+    upstream_http_requests_total.labels(upstream=upstream, status=status, connection=connection).inc()
+    upstream_http_request_seconds.labels(upstream=upstream).observe(seconds)
+
+# Config snapshot metrics
+config_fetches_total = Counter(
+    'order_service_config_fetches_total',
+    'Config-service fetches (miss = first read of a key, refresh = background re-fetch)',
+    ['reason', 'result']
+)
+
+config_refreshes_total = Counter(
+    'order_service_config_refreshes_total',
+    'Background config snapshot refreshes by outcome',
+    ['result']
+)
+
+config_refresh_seconds = Histogram(
+    'order_service_config_refresh_seconds',
+    'Time to re-fetch every known config key and rebuild the snapshot',
+    ['result']
+)
+
+config_changed_keys_total = Counter(
+    'order_service_config_changed_keys_total',
+    'Config keys whose value changed on a background refresh'
+)
+
+config_snapshot_version = Gauge(
+    'order_service_config_snapshot_version',
+    'Version of the in-process config snapshot (bumped when a refresh changes a value)'
+)
+
+
+def _observe_config_fetch(reason: str, result: str, count: int):
+    """Export config-service fetches to Prometheus."""
+    config_fetches_total.labels(reason=reason, result=result).inc(count)
+
+
+def _observe_config_refresh(result: str, changed_keys: int, seconds: float):
+    """Export a config snapshot refresh to Prometheus."""
+    config_refreshes_total.labels(result=result).inc()
+    config_refresh_seconds.labels(result=result).observe(seconds)
+    if changed_keys:
+        config_changed_keys_total.inc(changed_keys)
+
 # =========================================
 # LIFESPAN CONTEXT
 # =========================================
@@ -101,14 +213,26 @@ async def lifespan(app: FastAPI):
     """Application lifespan manager"""
 
     # Startup
+    # Load every setting into the in-process snapshot before anything reads config
+    from .config.settings import get_config_snapshot, set_config_fetch_observer, warm_config_snapshot
+    set_config_fetch_observer(_observe_config_fetch)
+    snapshot = warm_config_snapshot()
+    config_snapshot_version.set_function(lambda: get_config_snapshot().version)
+
     logger.info("=" * 60)
     logger.info(f"Starting {settings.app_name} v{settings.version}")
     logger.info(f"Environment: {settings.environment}")
     logger.info(f"Port: {settings.port}")
     logger.info(f"Auth Enabled: {settings.auth_enabled}")
     logger.info(f"Rate Limiting: {settings.rate_limit_enabled}")
+    logger.info(f"Config snapshot: {len(snapshot.values)} keys")
     logger.info("=" * 60)
 
+    from .services.config_refresher import get_config_refresher
+    config_refresher = get_config_refresher()
+    config_refresher.on_refresh = _observe_config_refresh
+    await config_refresher.start()
+
     # Initialize database connection pool
     try:
         await init_db()
@@ -156,9 +280,11 @@ async def lifespan(app: FastAPI):
                 redis_client=redis_client,
                 encryption_key=settings.cache_encryption_key.encode()
             )
+            cache_service.on_lookup = _observe_cache_lookup
+            await cache_service.start()
             app.state.cache_service = cache_service
             cache_initialized = True
-            logger.info("✓ Encrypted cache service initialized (key from config_service)")
+            logger.info("✓ Encrypted cache service initialized (key from config_service, L1 + pub/sub invalidation)")
         else:
             if settings.environment.lower() == "production":
                 raise RuntimeError("CACHE_ENCRYPTION_KEY is required in production to protect cached PII")
@@ -202,15 +328,45 @@ async def lifespan(app: FastAPI):
     rate_limiter_initialized = False
     try:
         daily_counter = await create_daily_counter()
-        await init_rate_limiter_manager(daily_counter=daily_counter)
+        distributed_backend = None
+        if redis_initialized and settings.kite_rate_limit_distributed:
+            from .services.gcra_limiter import RedisGcraBackend
+            from .database.redis_client import get_redis
+            distributed_backend = RedisGcraBackend(
+                get_redis(), lease_size=settings.kite_rate_limit_lease_size
+            )
+        await init_rate_limiter_manager(
+            daily_counter=daily_counter,
+            distributed_backend=distributed_backend
+        )
         rate_limiter_initialized = True
-        logger.info("✅ Kite account rate limiter initialized (10/sec, 200/min, 3000/day)")
+        logger.info(
+            "✅ Kite account rate limiter initialized (10/sec, 200/min, 3000/day, "
+            f"{'shared across replicas' if distributed_backend else 'per process'})"
+        )
     except Exception as e:
         logger.error(f"Failed to initialize Kite rate limiter: {e}")
         # Rate limiter is important but not critical - service can operate without it
         # Orders will go through without rate limiting (risk of 429 from Kite)
         logger.warning("⚠️  Kite rate limiter disabled - risk of 429 errors from Kite API")
 
+    # Initialize Kite call executor (blocking KiteConnect calls run off the event loop)
+    from .services.kite_call_executor import get_kite_call_executor
+    kite_executor = get_kite_call_executor()
+    kite_executor.on_call_complete = _observe_kite_call
+    kite_executor_queue_depth.set_function(lambda: kite_executor.queue_depth)
+    kite_executor_in_flight.set_function(lambda: kite_executor.in_flight)
+    logger.info(
+        f"✅ Kite call executor initialized ({kite_executor.max_workers} workers, "
+        f"{kite_executor.per_account_concurrency} per account)"
+    )
+
+    # Initialize shared HTTP client pools (token_manager, user_service, ...)
+    from .services.http_client_registry import get_http_client_registry
+    http_client_registry = get_http_client_registry()
+    http_client_registry.on_request = _observe_upstream_request
+    logger.info(f"✅ HTTP client registry initialized (http2={http_client_registry.http2})")
+
     # Initialize calendar service client (optional - for dynamic holidays)
     try:
         from .services.market_hours import initialize_calendar_client
@@ -222,6 +378,15 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Calendar service initialization skipped: {e}")
 
+    # Start trading account registry (cached account resolution for workers)
+    try:
+        from .services.account_registry import get_account_registry
+        await get_account_registry().start()
+        logger.info("✅ Trading account registry started")
+    except Exception as e:
+        logger.error(f"Failed to start trading account registry: {e}")
+        # Don't raise - registry falls back to on-demand resolution
+
     # Start background workers
     try:
         from .workers.sync_workers import start_workers
@@ -239,6 +404,15 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to start reconciliation worker: {e}")
         # Don't raise - reconciliation is not critical for API operation
 
+    # Start handoff ack listener (algo engine acknowledgements via Redis pub/sub)
+    try:
+        from .services.handoff_ack_listener import get_handoff_ack_listener
+        await get_handoff_ack_listener().start()
+        logger.info("Handoff ack listener started")
+    except Exception as e:
+        logger.error(f"Failed to start handoff ack listener: {e}")
+        # Don't raise - handoffs fall back to polling execution_contexts
+
     # Start tick listener for real-time P&L updates
     try:
         from .workers.tick_listener import start_tick_listener
@@ -331,6 +505,26 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"✗ Error stopping sync workers: {e}")
 
+        # Stop external trade attribution consumer (2s timeout)
+        try:
+            from .services.trade_attribution_queue import shutdown_attribution_queue
+            await asyncio.wait_for(shutdown_attribution_queue(), timeout=2.0)
+            logger.info("✓ Trade attribution queue stopped")
+        except asyncio.TimeoutError:
+            logger.warning("⚠ Trade attribution queue shutdown timed out")
+        except Exception as e:
+            logger.warning(f"⚠ Trade attribution queue shutdown error: {e}")
+
+        # Stop trading account registry (2s timeout)
+        try:
+            from .services.account_registry import shutdown_account_registry
+            await asyncio.wait_for(shutdown_account_registry(), timeout=2.0)
+            logger.info("✓ Trading account registry stopped")
+        except asyncio.TimeoutError:
+            logger.warning("⚠ Trading account registry shutdown timed out")
+        except Exception as e:
+            logger.warning(f"⚠ Trading account registry shutdown error: {e}")
+
         # Stop reconciliation worker (5s timeout)
         logger.info("Stopping reconciliation worker...")
         try:
@@ -342,6 +536,26 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"✗ Error stopping reconciliation worker: {e}")
 
+        # Stop secure cache invalidation listener
+        try:
+            from .services.cache_service import shutdown_cache_service
+            await asyncio.wait_for(shutdown_cache_service(), timeout=2.0)
+            logger.info("✓ Secure cache service stopped")
+        except asyncio.TimeoutError:
+            logger.error("✗ Secure cache service shutdown timed out")
+        except Exception as e:
+            logger.error(f"✗ Error stopping secure cache service: {e}")
+
+        # Stop handoff ack listener
+        try:
+            from .services.handoff_ack_listener import shutdown_handoff_ack_listener
+            await asyncio.wait_for(shutdown_handoff_ack_listener(), timeout=2.0)
+            logger.info("✓ Handoff ack listener stopped")
+        except asyncio.TimeoutError:
+            logger.error("✗ Handoff ack listener shutdown timed out")
+        except Exception as e:
+            logger.error(f"✗ Error stopping handoff ack listener: {e}")
+
         # Stop tick listener (5s timeout)
         logger.info("Stopping tick listener...")
         try:
@@ -400,6 +614,34 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.warning(f"⚠ Rate limiter shutdown error: {e}")
 
+        # Shutdown Kite call executor (non-blocking)
+        try:
+            from .services.kite_call_executor import shutdown_kite_call_executor
+            shutdown_kite_call_executor()
+            logger.info("✓ Kite call executor stopped")
+        except Exception as e:
+            logger.warning(f"⚠ Kite call executor shutdown error: {e}")
+
+        # Stop config refresher
+        try:
+            from .services.config_refresher import shutdown_config_refresher
+            await asyncio.wait_for(shutdown_config_refresher(), timeout=2.0)
+            logger.info("✓ Config refresher stopped")
+        except asyncio.TimeoutError:
+            logger.warning("⚠ Config refresher shutdown timed out")
+        except Exception as e:
+            logger.warning(f"⚠ Config refresher shutdown error: {e}")
+
+        # Close pooled HTTP clients (2s timeout)
+        try:
+            from .services.http_client_registry import shutdown_http_client_registry
+            await asyncio.wait_for(shutdown_http_client_registry(), timeout=2.0)
+            logger.info("✓ HTTP client pools closed")
+        except asyncio.TimeoutError:
+            logger.warning("⚠ HTTP client pool shutdown timed out")
+        except Exception as e:
+            logger.warning(f"⚠ HTTP client pool shutdown error: {e}")
+
         # Stop Redis monitoring (2s timeout)
         logger.info("Stopping Redis monitoring...")
         try:
@@ -787,6 +1029,39 @@ async def rate_limiter_health():
     )
 
 
+@app.get("/health/kite-executor")
+async def kite_executor_health():
+    """Health check for the KiteConnect call executor (queue depth and latency)"""
+    from .services.kite_call_executor import get_kite_call_executor
+
+    stats = get_kite_call_executor().get_stats()
+
+    # Saturated when more calls are waiting than there are worker threads
+    is_healthy = stats["queue_depth"] <= stats["max_workers"]
+
+    return JSONResponse(
+        status_code=200 if is_healthy else 503,
+        content={
+            "status": "healthy" if is_healthy else "saturated",
+            "kite_executor": stats
+        }
+    )
+
+
+@app.get("/health/http-clients")
+async def http_clients_health():
+    """Pooled upstream HTTP clients (connection reuse and latency per upstream)"""
+    from .services.http_client_registry import get_http_client_registry
+
+    return JSONResponse(
+        status_code=200,
+        content={
+            "status": "healthy",
+            "http_clients": get_http_client_registry().get_stats()
+        }
+    )
+
+
 @app.get("/health/redis")
 async def redis_health_check():
     """Redis usage and saturation monitoring endpoint"""
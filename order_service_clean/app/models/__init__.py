@@ -7,7 +7,7 @@ from .position import Position
 from .sync_job import SyncJob
 from .gtt_order import GttOrder
 from .order_state_history import OrderStateHistory
-from .capital_ledger import CapitalLedger
+from .capital_ledger import CapitalLedger, PortfolioCapitalBalance
 from .order_event import OrderEvent
 from .portfolio_config import PortfolioConfig
 from .portfolio_allocation import PortfolioAllocation
@@ -27,6 +27,7 @@ __all__ = [
     "GttOrder",
     "OrderStateHistory",
     "CapitalLedger",
+    "PortfolioCapitalBalance",
     "OrderEvent",
     "PortfolioConfig",
     "PortfolioAllocation",
@@ -191,4 +191,38 @@ class CapitalLedger(Base):
         """Complete reconciliation and commit"""
         self.status = "COMMITTED"
         self.reconciled_at = reconciled_at or datetime.utcnow()
-        self.updated_at = datetime.utcnow()
\ No newline at end of file
+        self.updated_at = datetime.utcnow()
+
+class PortfolioCapitalBalance(Base):
+    """
+    Running committed-capital balance per portfolio.
+
+    Maintained in the same transaction as every COMMITTED ledger write so
+    available capital is a single-row read instead of a SUM over the
+    portfolio's ledger. Reconciled periodically against the full ledger.
+
+    committed_capital = committed_reserves + committed_allocations - committed_releases
+    """
+    __tablename__ = "portfolio_capital_balances"
+    __table_args__ = (
+        {"schema": "order_service"},
+    )
+
+    portfolio_id = Column(String(255), primary_key=True, comment="Portfolio identifier")
+
+    committed_reserves = Column(Numeric(20, 8), nullable=False, default=0, comment="Sum of COMMITTED RESERVE amounts")
+    committed_allocations = Column(Numeric(20, 8), nullable=False, default=0, comment="Sum of COMMITTED ALLOCATE amounts")
+    committed_releases = Column(Numeric(20, 8), nullable=False, default=0, comment="Sum of COMMITTED RELEASE amounts")
+    committed_capital = Column(Numeric(20, 8), nullable=False, default=0, comment="Reserves + allocations - releases")
+    committed_entries = Column(BigInteger, nullable=False, default=0, comment="Number of COMMITTED ledger entries")
+
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=func.now(), comment="Last balance change")
+    reconciled_at = Column(DateTime(timezone=True), nullable=True, comment="Last reconciliation against the ledger")
+
+    def __repr__(self):
+        return (
+            f"<PortfolioCapitalBalance("
+            f"portfolio_id='{self.portfolio_id}', "
+            f"committed={self.committed_capital}"
+            f")>"
+        )
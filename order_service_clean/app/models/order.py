@@ -69,6 +69,7 @@ class Order(Base):
         Index("idx_orders_symbol", "symbol"),
         Index("idx_orders_status", "status"),
         Index("idx_orders_created_at", "created_at"),
+        Index("idx_orders_account_created_id", "trading_account_id", "created_at", "id"),  # Keyset pagination
         Index("idx_orders_broker_order_id", "broker_order_id"),
         Index("idx_orders_source", "source"),
     )
@@ -6,7 +6,7 @@ Positions are updated in real-time as trades are executed.
 """
 from datetime import datetime
 from sqlalchemy import (
-    Column, Integer, BigInteger, String, Numeric, DateTime, Boolean, Index
+    Column, Integer, BigInteger, String, Numeric, DateTime, Boolean, Index, UniqueConstraint
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.ext.declarative import declarative_base
@@ -31,11 +31,16 @@ class Position(Base):
         Index("idx_positions_trading_account_id", "trading_account_id"),
         Index("idx_positions_symbol", "symbol"),
         Index("idx_positions_updated_at", "updated_at"),
+        Index("idx_positions_account_opened_id", "trading_account_id", "opened_at", "id"),  # Keyset pagination
         Index("idx_positions_user_symbol", "user_id", "symbol", "product_type"),  # Composite index
         Index("idx_positions_strategy_id", "strategy_id"),
         Index("idx_positions_execution_id", "execution_id"),
         Index("idx_positions_portfolio_id", "portfolio_id"),
         Index("idx_positions_source", "source"),
+        UniqueConstraint(
+            "trading_account_id", "symbol", "exchange", "product_type", "trading_day",
+            name="unique_account_position"
+        ),
     )
 
     # Primary Key
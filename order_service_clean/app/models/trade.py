@@ -23,6 +23,7 @@ class Trade(Base):
         Index("idx_trades_user_id", "user_id"),
         Index("idx_trades_symbol", "symbol"),
         Index("idx_trades_trade_time", "trade_time"),
+        Index("idx_trades_account_time_id", "trading_account_id", "trade_time", "id"),  # Keyset pagination
         Index("idx_trades_broker_trade_id", "broker_trade_id"),
     )
 
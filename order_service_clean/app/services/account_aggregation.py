@@ -10,11 +10,13 @@ Date: 2025-12-03
 """
 
 import logging
+from decimal import Decimal
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
 from ..clients.user_service_client import UserServiceClient, UserServiceClientError
+from .position_book import get_position_book
 
 logger = logging.getLogger(__name__)
 
@@ -109,7 +111,9 @@ async def aggregate_positions(db: AsyncSession, account_ids: List[int]) -> dict:
                 SUM(realized_pnl) as total_realized_pnl,
                 SUM(unrealized_pnl) as total_unrealized_pnl,
                 MAX(last_price) as last_price,
-                ARRAY_AGG(DISTINCT trading_account_id) as account_ids
+                ARRAY_AGG(DISTINCT trading_account_id) as account_ids,
+                ARRAY_AGG(id) as position_ids,
+                ARRAY_AGG(unrealized_pnl) as position_unrealized_pnls
             FROM order_service.positions
             WHERE trading_account_id = ANY(:account_ids)
             AND is_open = true
@@ -120,13 +124,30 @@ async def aggregate_positions(db: AsyncSession, account_ids: List[int]) -> dict:
         result = await db.execute(query, {"account_ids": account_ids_str})
         rows = result.fetchall()
 
+        position_book = get_position_book()
+
         positions = []
         for row in rows:
             # Calculate weighted average buy/sell prices
             buy_price = (row.total_buy_value / row.total_buy_quantity) if row.total_buy_quantity > 0 else None
             sell_price = (row.total_sell_value / row.total_sell_quantity) if row.total_sell_quantity > 0 else None
 
-            total_pnl = (row.total_realized_pnl or 0) + (row.total_unrealized_pnl or 0)
+            unrealized_pnl = Decimal(row.total_unrealized_pnl or 0)
+            last_price = float(row.last_price) if row.last_price else None
+
+            # Prefer live tick marks from the in-memory book over persisted values
+            if position_book.is_ready:
+                unrealized_pnl = Decimal(0)
+                for position_id, persisted_pnl in zip(row.position_ids, row.position_unrealized_pnls):
+                    mark = position_book.get_mark(position_id)
+                    if mark is None:
+                        unrealized_pnl += Decimal(persisted_pnl or 0)
+                        continue
+                    unrealized_pnl += mark["unrealized_pnl"]
+                    # Same instrument across accounts - the live LTP wins
+                    last_price = float(mark["last_price"])
+
+            total_pnl = Decimal(row.total_realized_pnl or 0) + unrealized_pnl
 
             positions.append({
                 "symbol": row.symbol,
@@ -138,9 +159,9 @@ async def aggregate_positions(db: AsyncSession, account_ids: List[int]) -> dict:
                 "buy_price": float(buy_price) if buy_price else None,
                 "sell_price": float(sell_price) if sell_price else None,
                 "realized_pnl": float(row.total_realized_pnl or 0),
-                "unrealized_pnl": float(row.total_unrealized_pnl or 0),
+                "unrealized_pnl": float(unrealized_pnl),
                 "total_pnl": float(total_pnl),
-                "last_price": float(row.last_price) if row.last_price else None,
+                "last_price": last_price,
                 "accounts": row.account_ids,
                 "is_aggregated": True
             })
@@ -21,6 +21,7 @@ from ..models.position import Position
 from ..models.order import Order
 from ..models.trade import Trade
 from ..config.settings import settings
+from .account_registry import get_account_registry
 
 logger = logging.getLogger(__name__)
 
@@ -91,6 +92,9 @@ class OrderServiceAccountEventHandler:
 
     async def handle_account_deleted(self, event: AccountEvent):
         """Handle account deletion - cleanup all related data with proper async patterns"""
+        # Stop sync workers from polling the account before cleanup starts
+        get_account_registry().remove(event.trading_account_id)
+
         try:
             logger.info(
                 f"Handling account deletion for account {event.trading_account_id}",
@@ -185,6 +189,8 @@ class OrderServiceAccountEventHandler:
 
     async def handle_account_deactivated(self, event: AccountEvent):
         """Handle account deactivation - stop trading but keep data"""
+        get_account_registry().remove(event.trading_account_id)
+
         try:
             logger.info(
                 f"Handling account deactivation for account {event.trading_account_id}",
@@ -320,6 +326,9 @@ class OrderServiceAccountEventHandler:
 
     async def handle_account_created(self, event: AccountEvent):
         """Handle account creation - setup initial state"""
+        # Pick the new account up on the next registry refresh
+        get_account_registry().invalidate(event.trading_account_id)
+
         try:
             logger.info(
                 f"Handling account creation for account {event.trading_account_id}",
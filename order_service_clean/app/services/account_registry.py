@@ -0,0 +1,305 @@
+"""
+Trading Account Registry
+
+Caches token_manager account resolution for get_all_trading_accounts().
+
+Every sync worker asks for the full account mapping on every cycle. Resolving
+it serially (one fresh HTTP client and one round trip per account) put N
+token_manager calls in front of every worker tick. The registry instead:
+
+- Keeps the resolved mapping in memory with a TTL
+- Refreshes it in the background before it expires
+- Resolves all accounts concurrently over the shared token_manager pool
+  (see http_client_registry)
+- Serves stale entries when token_manager errors (stale-while-revalidate),
+  so a token_manager blip does not make accounts disappear from sync
+- Exposes invalidate()/remove() hooks for account lifecycle events
+
+Usage:
+    registry = get_account_registry()
+    accounts = await registry.get_all()
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterable, Optional, Set
+
+from .http_client_registry import get_http_client
+
+logger = logging.getLogger(__name__)
+
+
+class TradingAccountRegistry:
+    """
+    TTL cache of trading account configs with background refresh.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 60.0,
+        refresh_interval: float = 30.0,
+        max_concurrency: int = 16,
+    ):
+        """
+        Initialize registry.
+
+        Args:
+            ttl_seconds: Age after which the mapping is considered stale
+            refresh_interval: Background refresh cadence (should be < ttl_seconds)
+            max_concurrency: Maximum concurrent token_manager resolutions
+        """
+        self.ttl_seconds = ttl_seconds
+        self.refresh_interval = refresh_interval
+        self.max_concurrency = max_concurrency
+
+        self._accounts: Dict[int, Dict[str, Any]] = {}
+        self._loaded_at: Optional[float] = None
+        self._removed: Set[int] = set()
+
+        self._refresh_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._background_task: Optional[asyncio.Task] = None
+
+        # Statistics
+        self._hits = 0
+        self._misses = 0
+        self._stale_served = 0
+        self._refreshes = 0
+        self._resolve_errors = 0
+        self._invalidations = 0
+        self._last_refresh_ms = 0.0
+
+    # ==========================================
+    # LIFECYCLE
+    # ==========================================
+
+    async def start(self):
+        """Load the mapping and start the background refresh loop."""
+        if self._background_task and not self._background_task.done():
+            return
+
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning(f"Initial account registry load failed: {e}")
+
+        self._background_task = asyncio.create_task(self._refresh_loop())
+        logger.info(
+            f"Trading account registry started "
+            f"(ttl={self.ttl_seconds}s, refresh={self.refresh_interval}s, accounts={len(self._accounts)})"
+        )
+
+    async def stop(self):
+        """Stop background refresh."""
+        for task in (self._background_task, self._refresh_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._background_task = None
+        self._refresh_task = None
+
+    async def _refresh_loop(self):
+        while True:
+            try:
+                await asyncio.sleep(self.refresh_interval)
+                await self.refresh()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.warning(f"Account registry background refresh failed: {e}")
+
+    # ==========================================
+    # READERS
+    # ==========================================
+
+    def _is_fresh(self) -> bool:
+        return self._loaded_at is not None and (time.monotonic() - self._loaded_at) < self.ttl_seconds
+
+    async def get_all(self) -> Dict[int, Dict[str, Any]]:
+        """
+        Get all trading accounts.
+
+        Fresh cache is returned directly. A stale cache is returned immediately
+        while a single background refresh revalidates it. An empty cache is
+        loaded synchronously.
+
+        Returns:
+            Dict mapping trading_account_id to account config
+        """
+        if self._is_fresh():
+            self._hits += 1
+            return dict(self._accounts)
+
+        if self._loaded_at is not None:
+            self._stale_served += 1
+            self._schedule_refresh()
+            return dict(self._accounts)
+
+        self._misses += 1
+        await self.refresh()
+        return dict(self._accounts)
+
+    async def get(self, trading_account_id: int) -> Optional[Dict[str, Any]]:
+        """Get one account's config, resolving it if it is not cached."""
+        config = self._accounts.get(trading_account_id)
+        if config is not None:
+            self._hits += 1
+            return config
+
+        self._misses += 1
+        accounts = await self.get_all()
+        return accounts.get(trading_account_id)
+
+    def _schedule_refresh(self):
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_quietly())
+
+    async def _refresh_quietly(self):
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning(f"Account registry revalidation failed, serving stale data: {e}")
+
+    # ==========================================
+    # REFRESH
+    # ==========================================
+
+    async def refresh(self, account_ids: Optional[Iterable[int]] = None) -> Dict[int, Dict[str, Any]]:
+        """
+        Re-resolve accounts from token_manager concurrently.
+
+        Accounts that fail to resolve keep their previous entry (if any), so
+        token_manager errors degrade to stale data rather than missing accounts.
+
+        Args:
+            account_ids: Accounts to resolve (defaults to the configured account IDs)
+
+        Returns:
+            The refreshed mapping
+        """
+        from .kite_client_multi import get_configured_trading_account_ids, resolve_trading_account_config
+
+        async with self._refresh_lock:
+            start = time.perf_counter()
+            full_refresh = account_ids is None
+            ids = list(account_ids) if account_ids is not None else get_configured_trading_account_ids()
+
+            client = get_http_client("token_manager")
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+
+            async def resolve(account_id: int):
+                async with semaphore:
+                    return await resolve_trading_account_config(account_id, client=client)
+
+            results = await asyncio.gather(*[resolve(account_id) for account_id in ids], return_exceptions=True)
+
+            now = time.monotonic()
+            accounts = {} if full_refresh else dict(self._accounts)
+            for account_id, result in zip(ids, results):
+                if isinstance(result, asyncio.CancelledError):
+                    raise result
+                if isinstance(result, BaseException):
+                    self._resolve_errors += 1
+                    previous = self._accounts.get(account_id)
+                    if previous is not None:
+                        logger.warning(f"Failed to resolve trading_account {account_id}, keeping cached config: {result}")
+                        accounts[account_id] = previous
+                    else:
+                        # Skip failed accounts rather than breaking entirely
+                        logger.error(f"Failed to resolve trading_account {account_id}: {result}")
+                    continue
+
+                accounts[account_id] = result
+
+            # Accounts removed by lifecycle events stay out until re-admitted by invalidate()
+            for account_id in self._removed:
+                accounts.pop(account_id, None)
+
+            self._accounts = accounts
+            self._loaded_at = now
+            self._refreshes += 1
+            self._last_refresh_ms = (time.perf_counter() - start) * 1000
+
+            logger.debug(
+                f"Account registry refreshed {len(accounts)}/{len(ids)} accounts in {self._last_refresh_ms:.1f}ms"
+            )
+            return dict(accounts)
+
+    # ==========================================
+    # INVALIDATION HOOKS
+    # ==========================================
+
+    def invalidate(self, trading_account_id: Optional[int] = None):
+        """
+        Mark cached data stale so the next read revalidates it.
+
+        Args:
+            trading_account_id: Account that changed (None invalidates everything)
+        """
+        self._invalidations += 1
+        if trading_account_id is not None:
+            self._removed.discard(int(trading_account_id))
+        if self._accounts and self._loaded_at is not None:
+            # Keep serving current data while one background refresh revalidates
+            self._loaded_at -= self.ttl_seconds
+        else:
+            self._loaded_at = None
+
+        logger.info(f"Account registry invalidated (account={trading_account_id or 'all'})")
+
+    def remove(self, trading_account_id: int):
+        """
+        Drop an account immediately (deleted or deactivated) so workers stop
+        syncing it before the next refresh.
+        """
+        account_id = int(trading_account_id)
+        self.invalidate(account_id)
+        self._accounts.pop(account_id, None)
+        self._removed.add(account_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get registry statistics."""
+        return {
+            "accounts": len(self._accounts),
+            "fresh": self._is_fresh(),
+            "age_seconds": round(time.monotonic() - self._loaded_at, 1) if self._loaded_at else None,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self._hits,
+            "misses": self._misses,
+            "stale_served": self._stale_served,
+            "refreshes": self._refreshes,
+            "resolve_errors": self._resolve_errors,
+            "invalidations": self._invalidations,
+            "last_refresh_ms": round(self._last_refresh_ms, 3),
+            "background_refresh": self._background_task is not None and not self._background_task.done(),
+        }
+
+
+# Singleton instance
+_account_registry: Optional[TradingAccountRegistry] = None
+
+
+def get_account_registry() -> TradingAccountRegistry:
+    """Get or create the trading account registry singleton."""
+    global _account_registry
+
+    if _account_registry is None:
+        from ..config.settings import settings
+        _account_registry = TradingAccountRegistry(
+            ttl_seconds=settings.account_registry_ttl_seconds,
+            refresh_interval=settings.account_registry_refresh_interval,
+        )
+
+    return _account_registry
+
+
+async def shutdown_account_registry():
+    """Shutdown the trading account registry (called on service shutdown)."""
+    global _account_registry
+
+    if _account_registry is not None:
+        await _account_registry.stop()
+        _account_registry = None
@@ -9,22 +9,87 @@ Security:
 - TTL: 300 seconds (5 minutes)
 - Automatic invalidation on secret updates/deletes
 
+Tiers:
+- L1: small in-process LRU of already-decrypted values with a short TTL, so
+  repeat reads are a dict lookup instead of a Redis round trip + decrypt
+- L2: Redis (async client), values encrypted at rest
+- Writes, deletes and pattern invalidations are broadcast on a pub/sub
+  channel so every replica evicts its L1 copy; the short L1 TTL bounds
+  staleness if a notification is lost
+
 Architecture Compliance:
 - Based on common/service_template pattern
-- Metrics tracking (hits, misses, errors)
+- Metrics tracking per tier (hits, misses, errors, latency)
 - Fail-open: Database fallback if cache unavailable
 """
 
+import asyncio
 import json
 import logging
-from typing import Optional, Any, Dict
+import time
+import uuid
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import Optional, Any, Callable, Dict, Tuple
 
-import redis
+import redis.asyncio as redis
 from redis.exceptions import RedisError
 from cryptography.fernet import Fernet
 
 logger = logging.getLogger(__name__)
 
+INVALIDATION_CHANNEL = "secure_cache:invalidate"
+
+
+class LocalCache:
+    """
+    Bounded LRU of decrypted values with per-entry expiry.
+
+    Values are stored as their JSON plaintext and decoded on every hit so
+    callers can't mutate each other's cached objects.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, plaintext = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return plaintext
+
+    def set(self, key: str, plaintext: str, ttl: Optional[float] = None):
+        if self.max_entries <= 0:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._entries[key] = (time.monotonic() + ttl, plaintext)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: str) -> bool:
+        return self._entries.pop(key, None) is not None
+
+    def evict_pattern(self, pattern: str) -> int:
+        """Evict keys matching a Redis-style glob pattern."""
+        matched = [key for key in self._entries if fnmatchcase(key, pattern)]
+        for key in matched:
+            del self._entries[key]
+        return len(matched)
+
+    def clear(self):
+        self._entries.clear()
+
 
 class SecureCacheService:
     """
@@ -32,8 +97,9 @@ class SecureCacheService:
 
     Features:
     - Automatic encryption/decryption of all cached values
+    - In-process L1 in front of Redis, kept coherent via pub/sub
     - TTL support
-    - Hit/miss/error metrics
+    - Per-tier hit/miss/error/latency metrics
     - Pattern-based invalidation
     """
 
@@ -42,20 +108,25 @@ class SecureCacheService:
         redis_client: Optional[redis.Redis] = None,
         encryption_key: Optional[bytes] = None,
         cache_ttl: int = 300,
-        enable_cache: bool = True
+        enable_cache: bool = True,
+        l1_max_entries: int = 1024,
+        l1_ttl: float = 30.0
     ):
         """
         Initialize secure cache service.
 
         Args:
-            redis_client: Redis client (if None, creates new connection)
+            redis_client: Async Redis client (if None, creates new connection)
             encryption_key: Fernet encryption key (required for production)
             cache_ttl: Default TTL in seconds (default: 300s = 5min)
             enable_cache: Whether caching is enabled
+            l1_max_entries: In-process cache capacity (0 disables L1)
+            l1_ttl: Maximum age of an in-process entry in seconds
         """
         self.cache_ttl = cache_ttl
         self.enable_cache = enable_cache
         self._redis: Optional[redis.Redis] = redis_client
+        self.local = LocalCache(max_entries=l1_max_entries, ttl=l1_ttl)
 
         # Initialize encryption
         if encryption_key:
@@ -71,12 +142,41 @@ class SecureCacheService:
             self.cipher = None
             self.enable_cache = False
 
+        # Invalidation fan-out
+        self.instance_id = uuid.uuid4().hex
+        self._pubsub = None
+        self._listen_task: Optional[asyncio.Task] = None
+        # Bumped on every invalidation; an L2 read only fills L1 if no
+        # invalidation landed while it was in flight
+        self._generation = 0
+
+        # Optional observer: on_lookup(tier, result, seconds), set by main.py
+        self.on_lookup: Optional[Callable[[str, str, float], None]] = None
+
         # Metrics
-        self.cache_hits = 0
-        self.cache_misses = 0
+        self.l1_hits = 0
+        self.l1_misses = 0
+        self.l2_hits = 0
+        self.l2_misses = 0
         self.cache_errors = 0
+        self.invalidations_published = 0
+        self.invalidations_received = 0
+        self._l1_seconds = 0.0
+        self._l2_seconds = 0.0
+
+    @property
+    def cache_hits(self) -> int:
+        return self.l1_hits + self.l2_hits
 
-    def _get_redis(self) -> Optional[redis.Redis]:
+    @property
+    def cache_misses(self) -> int:
+        return self.l2_misses
+
+    @property
+    def is_listening(self) -> bool:
+        return self._listen_task is not None and not self._listen_task.done()
+
+    async def _get_redis(self) -> Optional[redis.Redis]:
         """Get or create Redis connection"""
         if not self.enable_cache:
             return None
@@ -100,7 +200,7 @@ class SecureCacheService:
                     import os
                     redis_url = os.getenv("REDIS_URL", "redis://localhost:8202")
 
-                self._redis = redis.from_url(
+                client = redis.from_url(
                     redis_url,
                     decode_responses=False,  # Binary mode for encryption
                     socket_connect_timeout=2,
@@ -108,7 +208,8 @@ class SecureCacheService:
                 )
 
                 # Test connection
-                self._redis.ping()
+                await client.ping()
+                self._redis = client
                 logger.info(f"Cache service connected to Redis: {redis_url}")
 
             except Exception as e:
@@ -130,7 +231,103 @@ class SecureCacheService:
             raise RuntimeError("Decryption not initialized")
         return self.cipher.decrypt(ciphertext).decode()
 
-    def get(self, key: str) -> Optional[Any]:
+    def _observe(self, tier: str, result: str, seconds: float):
+        if tier == "l1":
+            self._l1_seconds += seconds
+        else:
+            self._l2_seconds += seconds
+        if self.on_lookup is not None:
+            try:
+                self.on_lookup(tier, result, seconds)
+            except Exception as e:
+                logger.debug(f"Cache lookup observer failed: {e}")
+
+    # ==========================================
+    # LIFECYCLE
+    # ==========================================
+
+    async def start(self):
+        """Subscribe to the invalidation channel so this replica's L1 stays coherent."""
+        if self.is_listening or not self.enable_cache:
+            return
+
+        r = await self._get_redis()
+        if not r:
+            return
+
+        self._pubsub = r.pubsub()
+        await self._pubsub.subscribe(INVALIDATION_CHANNEL)
+        self._listen_task = asyncio.create_task(self._listen())
+        logger.info(f"Secure cache subscribed to {INVALIDATION_CHANNEL}")
+
+    async def stop(self):
+        """Stop listening for invalidations and drop the L1 tier."""
+        if self._listen_task and not self._listen_task.done():
+            self._listen_task.cancel()
+            try:
+                await self._listen_task
+            except asyncio.CancelledError:
+                pass
+        self._listen_task = None
+
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.unsubscribe()
+                await self._pubsub.close()
+            except Exception as e:
+                logger.warning(f"Error closing secure cache pubsub: {e}")
+            self._pubsub = None
+
+        self.local.clear()
+
+    async def _listen(self):
+        try:
+            async for message in self._pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                self._apply_invalidation(message.get("data"))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Without notifications L1 entries could outlive remote writes
+            logger.error(f"Secure cache invalidation listener stopped, clearing L1: {e}", exc_info=True)
+            self.local.clear()
+
+    def _apply_invalidation(self, data: Any):
+        try:
+            payload = json.loads(data)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Ignoring malformed cache invalidation: {e}")
+            return
+
+        if payload.get("origin") == self.instance_id:
+            return
+
+        self.invalidations_received += 1
+        self._generation += 1
+        if payload.get("pattern"):
+            self.local.evict_pattern(payload["pattern"])
+        for key in payload.get("keys") or ():
+            self.local.pop(key)
+
+    async def _publish_invalidation(self, r: redis.Redis, keys=None, pattern: Optional[str] = None):
+        message = {"origin": self.instance_id}
+        if keys:
+            message["keys"] = list(keys)
+        if pattern:
+            message["pattern"] = pattern
+        try:
+            await r.publish(INVALIDATION_CHANNEL, json.dumps(message))
+            self.invalidations_published += 1
+        except RedisError as e:
+            self.cache_errors += 1
+            logger.warning(f"Failed to publish cache invalidation: {e}")
+
+    # ==========================================
+    # CACHE OPERATIONS
+    # ==========================================
+
+    async def get(self, key: str) -> Optional[Any]:
         """
         Get value from cache with automatic decryption.
 
@@ -141,39 +338,57 @@ class SecureCacheService:
             Cached value (decrypted) or None if not found
         """
         if not self.enable_cache:
-            self.cache_misses += 1
+            self.l2_misses += 1
             return None
 
+        start = time.perf_counter()
+        plaintext = self.local.get(key)
+        if plaintext is not None:
+            self.l1_hits += 1
+            self._observe("l1", "hit", time.perf_counter() - start)
+            return json.loads(plaintext)
+        self.l1_misses += 1
+        self._observe("l1", "miss", time.perf_counter() - start)
+
+        generation = self._generation
+        start = time.perf_counter()
         try:
-            r = self._get_redis()
+            r = await self._get_redis()
             if not r:
                 self.cache_errors += 1
                 return None
 
-            encrypted_data = r.get(key)
+            encrypted_data = await r.get(key)
             if encrypted_data:
                 # Decrypt and deserialize
                 decrypted_json = self._decrypt(encrypted_data)
                 value = json.loads(decrypted_json)
 
-                self.cache_hits += 1
+                if generation == self._generation:
+                    self.local.set(key, decrypted_json)
+
+                self.l2_hits += 1
+                self._observe("l2", "hit", time.perf_counter() - start)
                 logger.debug(f"Cache HIT: {key}")
                 return value
 
-            self.cache_misses += 1
+            self.l2_misses += 1
+            self._observe("l2", "miss", time.perf_counter() - start)
             logger.debug(f"Cache MISS: {key}")
             return None
 
         except RedisError as e:
             self.cache_errors += 1
+            self._observe("l2", "error", time.perf_counter() - start)
             logger.warning(f"Redis cache read error for key {key}: {e}")
             return None
         except Exception as e:
             self.cache_errors += 1
+            self._observe("l2", "error", time.perf_counter() - start)
             logger.warning(f"Cache decryption error for key {key}: {e}")
             return None
 
-    def set(
+    async def set(
         self,
         key: str,
         value: Any,
@@ -194,7 +409,7 @@ class SecureCacheService:
             return False
 
         try:
-            r = self._get_redis()
+            r = await self._get_redis()
             if not r:
                 return False
 
@@ -204,7 +419,11 @@ class SecureCacheService:
 
             # Store with TTL
             ttl = ttl or self.cache_ttl
-            r.setex(key, ttl, encrypted_data)
+            await r.setex(key, ttl, encrypted_data)
+
+            self._generation += 1
+            self.local.set(key, json_data, ttl)
+            await self._publish_invalidation(r, keys=[key])
 
             logger.debug(f"Cache SET: {key} (TTL: {ttl}s)")
             return True
@@ -218,7 +437,7 @@ class SecureCacheService:
             logger.warning(f"Cache encryption error for key {key}: {e}")
             return False
 
-    def delete(self, key: str) -> bool:
+    async def delete(self, key: str) -> bool:
         """
         Delete key from cache.
 
@@ -231,12 +450,16 @@ class SecureCacheService:
         if not self.enable_cache:
             return False
 
+        self._generation += 1
+        self.local.pop(key)
+
         try:
-            r = self._get_redis()
+            r = await self._get_redis()
             if not r:
                 return False
 
-            r.delete(key)
+            await r.delete(key)
+            await self._publish_invalidation(r, keys=[key])
             logger.debug(f"Cache DELETE: {key}")
             return True
 
@@ -245,7 +468,7 @@ class SecureCacheService:
             logger.warning(f"Redis cache delete error for key {key}: {e}")
             return False
 
-    def invalidate_pattern(self, pattern: str) -> int:
+    async def invalidate_pattern(self, pattern: str) -> int:
         """
         Invalidate all keys matching pattern.
 
@@ -253,26 +476,30 @@ class SecureCacheService:
             pattern: Redis key pattern (e.g., "secret:prod:*")
 
         Returns:
-            Number of keys deleted
+            Number of keys deleted from Redis
         """
         if not self.enable_cache:
             return 0
 
+        self._generation += 1
+        self.local.evict_pattern(pattern)
+
         try:
-            r = self._get_redis()
+            r = await self._get_redis()
             if not r:
                 return 0
 
             deleted = 0
-            cursor = 0
-
-            while True:
-                cursor, keys = r.scan(cursor, match=pattern, count=100)
-                if keys:
-                    deleted += r.delete(*keys)
+            batch = []
+            async for key in r.scan_iter(match=pattern, count=100):
+                batch.append(key)
+                if len(batch) >= 100:
+                    deleted += await r.delete(*batch)
+                    batch = []
+            if batch:
+                deleted += await r.delete(*batch)
 
-                if cursor == 0:
-                    break
+            await self._publish_invalidation(r, pattern=pattern)
 
             logger.info(f"Cache invalidated pattern '{pattern}': {deleted} keys deleted")
             return deleted
@@ -287,10 +514,12 @@ class SecureCacheService:
         Get cache statistics.
 
         Returns:
-            Dict with cache metrics
+            Dict with cache metrics (overall and per tier)
         """
         total = self.cache_hits + self.cache_misses
         hit_rate = (self.cache_hits / total * 100) if total > 0 else 0
+        l1_lookups = self.l1_hits + self.l1_misses
+        l2_lookups = self.l2_hits + self.l2_misses
 
         return {
             "cache_enabled": self.enable_cache,
@@ -299,7 +528,22 @@ class SecureCacheService:
             "cache_errors": self.cache_errors,
             "total_requests": total,
             "hit_rate_percent": round(hit_rate, 2),
-            "encryption_enabled": self.cipher is not None
+            "encryption_enabled": self.cipher is not None,
+            "l1": {
+                "size": len(self.local),
+                "max_entries": self.local.max_entries,
+                "hits": self.l1_hits,
+                "misses": self.l1_misses,
+                "avg_latency_ms": round(self._l1_seconds / l1_lookups * 1000, 4) if l1_lookups else 0.0,
+            },
+            "l2": {
+                "hits": self.l2_hits,
+                "misses": self.l2_misses,
+                "avg_latency_ms": round(self._l2_seconds / l2_lookups * 1000, 3) if l2_lookups else 0.0,
+            },
+            "invalidation_listening": self.is_listening,
+            "invalidations_published": self.invalidations_published,
+            "invalidations_received": self.invalidations_received,
         }
 
 
@@ -315,7 +559,7 @@ def get_cache_service(
     Get global cache service instance (singleton).
 
     Args:
-        redis_client: Redis client (optional, only used on first call)
+        redis_client: Async Redis client (optional, only used on first call)
         encryption_key: Encryption key (optional, only used on first call)
 
     Returns:
@@ -324,30 +568,35 @@ def get_cache_service(
     global _cache_service
 
     if _cache_service is None:
-        # Get encryption key from config service if not provided
-        if encryption_key is None:
-            try:
-                # Try to use order service config-compliant settings
-                import sys
-                import os
-                # Check if we're in order service context
-                if 'app.config.settings' in sys.modules or any('order_service' in path for path in sys.path):
-                    from ..config.settings import settings
+        l1_options: Dict[str, Any] = {}
+        try:
+            # Try to use order service config-compliant settings
+            import sys
+            import os
+            # Check if we're in order service context
+            if 'app.config.settings' in sys.modules or any('order_service' in path for path in sys.path):
+                from ..config.settings import settings
+                l1_options = {
+                    "l1_max_entries": settings.secure_cache_l1_max_entries,
+                    "l1_ttl": settings.secure_cache_l1_ttl,
+                }
+                if encryption_key is None:
                     key_str = settings.cache_encryption_key
                     if key_str:
                         encryption_key = key_str.encode()
                     else:
                         logger.warning("CACHE_ENCRYPTION_KEY not set in config service - caching disabled")
-                else:
-                    # Fallback for standalone usage (config service itself)
-                    key_b64 = os.getenv("CACHE_ENCRYPTION_KEY")
-                    if key_b64:
-                        encryption_key = key_b64.encode()
-                    else:
-                        logger.warning("CACHE_ENCRYPTION_KEY not set - caching disabled")
-            except ImportError:
+            elif encryption_key is None:
                 # Fallback for standalone usage (config service itself)
-                import os
+                key_b64 = os.getenv("CACHE_ENCRYPTION_KEY")
+                if key_b64:
+                    encryption_key = key_b64.encode()
+                else:
+                    logger.warning("CACHE_ENCRYPTION_KEY not set - caching disabled")
+        except ImportError:
+            # Fallback for standalone usage (config service itself)
+            import os
+            if encryption_key is None:
                 key_b64 = os.getenv("CACHE_ENCRYPTION_KEY")
                 if key_b64:
                     encryption_key = key_b64.encode()
@@ -356,7 +605,17 @@ def get_cache_service(
 
         _cache_service = SecureCacheService(
             redis_client=redis_client,
-            encryption_key=encryption_key
+            encryption_key=encryption_key,
+            **l1_options
         )
 
     return _cache_service
+
+
+async def shutdown_cache_service():
+    """Stop the cache invalidation listener (called on service shutdown)."""
+    global _cache_service
+
+    if _cache_service is not None:
+        await _cache_service.stop()
+        _cache_service = None
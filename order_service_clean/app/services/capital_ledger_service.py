@@ -6,27 +6,37 @@ management for order-level capital operations.
 
 Key Features:
 - Capital reservation and allocation state management
-- Transaction lifecycle (RESERVE  ALLOCATE  RELEASE/FAIL)
+- Transaction lifecycle (RESERVE → ALLOCATE → RELEASE/FAIL)
 - Reconciliation and audit trail support
 - Risk-based capital allocation
 - Portfolio-level capital constraints
+- Running committed-capital balance per portfolio, updated in the same
+  transaction as each committed entry and reconciled against the ledger
 """
 import logging
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any, Tuple
 from decimal import Decimal
 from sqlalchemy import select, and_, func, or_, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from fastapi import HTTPException
 
-from ..models.capital_ledger import CapitalLedger
+from ..models.capital_ledger import CapitalLedger, PortfolioCapitalBalance
 from ..models.portfolio_config import PortfolioConfig
 from ..database.redis_client import get_redis
 import json
 
 logger = logging.getLogger(__name__)
 
+# Balance column moved by each committed transaction type (FAIL moves nothing)
+_BALANCE_COLUMNS = {
+    "RESERVE": "committed_reserves",
+    "ALLOCATE": "committed_allocations",
+    "RELEASE": "committed_releases",
+}
+
 
 class CapitalLedgerService:
     """
@@ -86,9 +96,12 @@ class CapitalLedgerService:
         Raises:
             HTTPException: If insufficient capital or validation fails
         """
-        # Validate available capital
-        available_capital = await self.get_available_capital(portfolio_id)
+        # Lock the balance row so the check and the reservation are atomic
+        balance = await self._lock_balance(portfolio_id)
+        total_capital = await self._get_total_capital(portfolio_id)
+        available_capital = max(total_capital - balance.committed_capital, Decimal('0'))
         if available_capital < amount:
+            await self.db.rollback()
             raise HTTPException(
                 400,
                 f"Insufficient available capital. Required: {amount}, Available: {available_capital}"
@@ -108,13 +121,8 @@ class CapitalLedgerService:
             created_at=datetime.utcnow()
         )
 
-        self.db.add(ledger_entry)
-        await self.db.commit()
-        await self.db.refresh(ledger_entry)
-
-        # Commit the reservation
-        ledger_entry.commit()
-        await self.db.commit()
+        # Commit the reservation together with the balance update
+        await self._commit_ledger_entry(ledger_entry)
 
         logger.info(
             f"Reserved capital: portfolio={portfolio_id}, amount={amount}, "
@@ -165,13 +173,8 @@ class CapitalLedgerService:
             created_at=datetime.utcnow()
         )
 
-        self.db.add(ledger_entry)
-        await self.db.commit()
-        await self.db.refresh(ledger_entry)
-
-        # Commit allocation
-        ledger_entry.commit()
-        await self.db.commit()
+        # Commit allocation together with the balance update
+        await self._commit_ledger_entry(ledger_entry)
 
         logger.info(
             f"Allocated capital: portfolio={portfolio_id}, amount={amount}, "
@@ -216,13 +219,8 @@ class CapitalLedgerService:
             created_at=datetime.utcnow()
         )
 
-        self.db.add(ledger_entry)
-        await self.db.commit()
-        await self.db.refresh(ledger_entry)
-
-        # Commit release
-        ledger_entry.commit()
-        await self.db.commit()
+        # Commit release together with the balance update
+        await self._commit_ledger_entry(ledger_entry)
 
         logger.info(
             f"Released capital: portfolio={portfolio_id}, amount={amount}, "
@@ -257,40 +255,25 @@ class CapitalLedgerService:
         except Exception as e:
             logger.warning(f"Redis cache error: {e}")
 
-        # Get portfolio configuration for total capital
-        portfolio_config = await self.db.execute(
-            select(PortfolioConfig).where(PortfolioConfig.portfolio_id == portfolio_id)
+        # Total capital and running committed balance in one single-row read
+        result = await self.db.execute(
+            select(PortfolioConfig.total_capital, PortfolioCapitalBalance.committed_capital)
+            .outerjoin(
+                PortfolioCapitalBalance,
+                PortfolioCapitalBalance.portfolio_id == PortfolioConfig.portfolio_id
+            )
+            .where(PortfolioConfig.portfolio_id == portfolio_id)
         )
-        config = portfolio_config.scalar_one_or_none()
-        
-        if not config:
+        row = result.first()
+
+        if not row:
             logger.warning(f"No portfolio config found for {portfolio_id}")
             return Decimal('0')
 
-        total_capital = config.total_capital
+        total_capital, committed_capital = row
+        # No balance row yet means nothing has been committed
+        committed_capital = committed_capital or Decimal('0')
 
-        # Calculate committed capital (RESERVE + ALLOCATE - RELEASE)
-        committed_query = select(
-            func.coalesce(
-                func.sum(
-                    func.case(
-                        (CapitalLedger.transaction_type.in_(["RESERVE", "ALLOCATE"]), CapitalLedger.amount),
-                        (CapitalLedger.transaction_type == "RELEASE", -CapitalLedger.amount),
-                        else_=0
-                    )
-                ),
-                0
-            )
-        ).where(
-            and_(
-                CapitalLedger.portfolio_id == portfolio_id,
-                CapitalLedger.status == "COMMITTED"
-            )
-        )
-
-        result = await self.db.execute(committed_query)
-        committed_capital = result.scalar() or Decimal('0')
-        
         available_capital = total_capital - committed_capital
 
         # Cache result for 30 seconds
@@ -330,45 +313,41 @@ class CapitalLedgerService:
                 "error": "Portfolio configuration not found"
             }
 
-        # Get capital breakdown by transaction type
-        breakdown_query = select(
+        # Committed totals come from the running balance
+        balance_result = await self.db.execute(
+            select(PortfolioCapitalBalance).where(PortfolioCapitalBalance.portfolio_id == portfolio_id)
+        )
+        balance = balance_result.scalar_one_or_none()
+
+        reserves = Decimal(str(balance.committed_reserves)) if balance else Decimal('0')
+        allocations = Decimal(str(balance.committed_allocations)) if balance else Decimal('0')
+        releases = Decimal(str(balance.committed_releases)) if balance else Decimal('0')
+
+        # Only non-committed entries are aggregated from the ledger
+        pending_query = select(
             CapitalLedger.transaction_type,
-            CapitalLedger.status,
-            func.sum(CapitalLedger.amount).label('total_amount'),
-            func.count(CapitalLedger.id).label('transaction_count')
+            func.sum(CapitalLedger.amount).label('total_amount')
         ).where(
-            CapitalLedger.portfolio_id == portfolio_id
+            and_(
+                CapitalLedger.portfolio_id == portfolio_id,
+                CapitalLedger.status != "COMMITTED"
+            )
         ).group_by(
-            CapitalLedger.transaction_type,
-            CapitalLedger.status
+            CapitalLedger.transaction_type
         )
 
-        breakdown_result = await self.db.execute(breakdown_query)
-        breakdown_rows = breakdown_result.all()
+        pending_result = await self.db.execute(pending_query)
 
-        # Process breakdown
-        reserves = Decimal('0')
-        allocations = Decimal('0')
-        releases = Decimal('0')
         pending_reserves = Decimal('0')
         pending_allocations = Decimal('0')
 
-        for row in breakdown_rows:
+        for row in pending_result.all():
             amount = Decimal(str(row.total_amount))
-            
+
             if row.transaction_type == "RESERVE":
-                if row.status == "COMMITTED":
-                    reserves += amount
-                else:
-                    pending_reserves += amount
+                pending_reserves += amount
             elif row.transaction_type == "ALLOCATE":
-                if row.status == "COMMITTED":
-                    allocations += amount
-                else:
-                    pending_allocations += amount
-            elif row.transaction_type == "RELEASE":
-                if row.status == "COMMITTED":
-                    releases += amount
+                pending_allocations += amount
 
         committed_capital = reserves + allocations - releases
         available_capital = config.total_capital - committed_capital
@@ -488,8 +467,15 @@ class CapitalLedgerService:
         if not ledger_entry:
             raise HTTPException(404, f"Capital ledger entry {ledger_id} not found")
 
+        # A committed entry under reconciliation no longer counts towards the balance
+        if ledger_entry.is_committed:
+            await self._apply_balance_delta(
+                ledger_entry.portfolio_id, ledger_entry.transaction_type, ledger_entry.amount, sign=-1
+            )
+
         ledger_entry.start_reconciliation(notes)
         await self.db.commit()
+        await self._invalidate_capital_cache(ledger_entry.portfolio_id)
 
         logger.info(f"Started reconciliation for capital ledger {ledger_id}")
         return ledger_entry
@@ -517,12 +503,87 @@ class CapitalLedgerService:
         if not ledger_entry:
             raise HTTPException(404, f"Capital ledger entry {ledger_id} not found")
 
+        if not ledger_entry.is_committed:
+            await self._apply_balance_delta(
+                ledger_entry.portfolio_id, ledger_entry.transaction_type, ledger_entry.amount
+            )
+
         ledger_entry.complete_reconciliation(reconciled_at)
         await self.db.commit()
+        await self._invalidate_capital_cache(ledger_entry.portfolio_id)
 
         logger.info(f"Completed reconciliation for capital ledger {ledger_id}")
         return ledger_entry
 
+    async def reconcile_balances(
+        self,
+        portfolio_ids: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Recompute running balances from the full ledger and correct any drift.
+
+        Args:
+            portfolio_ids: Portfolios to check (all portfolios with ledger entries if None)
+
+        Returns:
+            Dictionary with checked/drifted counts and the corrections applied
+        """
+        if portfolio_ids is None:
+            result = await self.db.execute(select(CapitalLedger.portfolio_id).distinct())
+            portfolio_ids = [row[0] for row in result.all()]
+
+        corrections = []
+        for portfolio_id in portfolio_ids:
+            balance = await self._lock_balance(portfolio_id)
+
+            totals_result = await self.db.execute(
+                select(
+                    CapitalLedger.transaction_type,
+                    func.sum(CapitalLedger.amount).label('total_amount'),
+                    func.count(CapitalLedger.id).label('transaction_count')
+                ).where(
+                    and_(
+                        CapitalLedger.portfolio_id == portfolio_id,
+                        CapitalLedger.status == "COMMITTED",
+                        CapitalLedger.transaction_type.in_(list(_BALANCE_COLUMNS))
+                    )
+                ).group_by(CapitalLedger.transaction_type)
+            )
+
+            expected = {column: Decimal('0') for column in _BALANCE_COLUMNS.values()}
+            entries = 0
+            for row in totals_result.all():
+                expected[_BALANCE_COLUMNS[row.transaction_type]] = Decimal(str(row.total_amount or 0))
+                entries += row.transaction_count
+            expected["committed_capital"] = (
+                expected["committed_reserves"] + expected["committed_allocations"] - expected["committed_releases"]
+            )
+
+            drift = {
+                column: float(value - Decimal(str(getattr(balance, column) or 0)))
+                for column, value in expected.items()
+                if Decimal(str(getattr(balance, column) or 0)) != value
+            }
+            if drift or balance.committed_entries != entries:
+                logger.warning(f"Capital balance drift for portfolio {portfolio_id}: {drift}")
+                for column, value in expected.items():
+                    setattr(balance, column, value)
+                balance.committed_entries = entries
+                balance.updated_at = datetime.utcnow()
+                corrections.append({"portfolio_id": portfolio_id, "drift": drift})
+
+            balance.reconciled_at = datetime.utcnow()
+            await self.db.commit()
+
+            if drift:
+                await self._invalidate_capital_cache(portfolio_id)
+
+        return {
+            "checked": len(portfolio_ids),
+            "drifted": len(corrections),
+            "corrections": corrections,
+        }
+
     async def get_reconciliation_items(
         self,
         portfolio_id: Optional[str] = None,
@@ -552,6 +613,86 @@ class CapitalLedgerService:
     # UTILITY METHODS
     # =================================
 
+    async def _get_total_capital(self, portfolio_id: str) -> Decimal:
+        """Get configured total capital for a portfolio (0 if unconfigured)"""
+        result = await self.db.execute(
+            select(PortfolioConfig.total_capital).where(PortfolioConfig.portfolio_id == portfolio_id)
+        )
+        return result.scalar() or Decimal('0')
+
+    async def _lock_balance(self, portfolio_id: str) -> PortfolioCapitalBalance:
+        """Ensure the portfolio balance row exists and lock it for this transaction"""
+        await self.db.execute(
+            pg_insert(PortfolioCapitalBalance.__table__)
+            .values(portfolio_id=portfolio_id)
+            .on_conflict_do_nothing(index_elements=["portfolio_id"])
+        )
+        result = await self.db.execute(
+            select(PortfolioCapitalBalance)
+            .where(PortfolioCapitalBalance.portfolio_id == portfolio_id)
+            .with_for_update()
+        )
+        return result.scalar_one()
+
+    async def _apply_balance_delta(
+        self,
+        portfolio_id: str,
+        transaction_type: str,
+        amount: Decimal,
+        sign: int = 1
+    ) -> Optional[Decimal]:
+        """
+        Apply a committed ledger entry to the running balance.
+
+        Runs inside the caller's transaction; sign=-1 backs an entry out.
+
+        Returns:
+            Committed capital after the update (None for types that don't move capital)
+        """
+        column = _BALANCE_COLUMNS.get(transaction_type)
+        if column is None:
+            return None
+
+        delta = Decimal(str(amount)) * sign
+        capital_delta = -delta if transaction_type == "RELEASE" else delta
+
+        table = PortfolioCapitalBalance.__table__
+        stmt = pg_insert(table).values(
+            portfolio_id=portfolio_id,
+            committed_capital=capital_delta,
+            committed_entries=sign,
+            updated_at=datetime.utcnow(),
+            **{column: delta}
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["portfolio_id"],
+            set_={
+                column: table.c[column] + delta,
+                "committed_capital": table.c.committed_capital + capital_delta,
+                "committed_entries": table.c.committed_entries + sign,
+                "updated_at": stmt.excluded.updated_at,
+            }
+        ).returning(table.c.committed_capital)
+
+        result = await self.db.execute(stmt)
+        return result.scalar()
+
+    async def _commit_ledger_entry(self, ledger_entry: CapitalLedger) -> CapitalLedger:
+        """Insert a ledger entry as COMMITTED and apply it to the balance in one transaction"""
+        self.db.add(ledger_entry)
+        await self.db.flush()
+
+        ledger_entry.commit()
+        running_balance = await self._apply_balance_delta(
+            ledger_entry.portfolio_id, ledger_entry.transaction_type, ledger_entry.amount
+        )
+        if running_balance is not None:
+            ledger_entry.running_balance = running_balance
+
+        await self.db.commit()
+        await self.db.refresh(ledger_entry)
+        return ledger_entry
+
     async def _invalidate_capital_cache(self, portfolio_id: str):
         """Invalidate capital-related cache entries"""
         try:
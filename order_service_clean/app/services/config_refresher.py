@@ -0,0 +1,145 @@
+"""
+Config Refresher
+
+Keeps the in-process settings snapshot current.
+
+Settings properties read from an immutable snapshot (see config/settings.py)
+instead of calling config-service on every access. This worker re-fetches
+every key read so far on a fixed interval - off the event loop, since the
+config-service client is synchronous - and swaps in a new snapshot only when
+a value changed. A failed refresh keeps serving the current snapshot.
+
+Usage:
+    refresher = get_config_refresher()
+    await refresher.start()
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from ..config.settings import get_config_stats, refresh_config_snapshot, settings
+
+logger = logging.getLogger(__name__)
+
+# Callback signature: (result, changed_keys, seconds)
+RefreshObserver = Callable[[str, int, float], None]
+
+
+class ConfigRefresher:
+    """
+    Background poller that refreshes the config snapshot.
+    """
+
+    def __init__(self, interval_seconds: float = 30.0):
+        """
+        Initialize refresher.
+
+        Args:
+            interval_seconds: Seconds between refreshes
+        """
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+        # Statistics
+        self._refreshes = 0
+        self._errors = 0
+        self._changed_keys = 0
+        self._last_refresh_ms = 0.0
+
+        # Optional metrics hook, wired by main.py
+        self.on_refresh: Optional[RefreshObserver] = None
+
+    async def start(self):
+        """Start the background refresh loop."""
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._refresh_loop())
+        logger.info(f"Config refresher started (interval={self.interval_seconds}s)")
+
+    async def stop(self):
+        """Stop the background refresh loop."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _refresh_loop(self):
+        while True:
+            try:
+                await asyncio.sleep(self.interval_seconds)
+                await self.refresh()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.warning(f"Config refresh failed: {e}")
+
+    async def refresh(self) -> List[str]:
+        """
+        Re-fetch known config keys and swap in a new snapshot if anything changed.
+
+        Returns:
+            Keys whose value changed
+        """
+        start = time.perf_counter()
+        result = "unchanged"
+        changed: List[str] = []
+        try:
+            changed = await asyncio.to_thread(refresh_config_snapshot)
+            if changed:
+                result = "changed"
+                self._changed_keys += len(changed)
+            return changed
+        except Exception:
+            result = "error"
+            self._errors += 1
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            self._refreshes += 1
+            self._last_refresh_ms = seconds * 1000
+            if self.on_refresh is not None:
+                try:
+                    self.on_refresh(result, len(changed), seconds)
+                except Exception as e:
+                    logger.debug(f"Config refresh observer failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get refresher and snapshot statistics."""
+        return {
+            "interval_seconds": self.interval_seconds,
+            "refreshes": self._refreshes,
+            "errors": self._errors,
+            "changed_keys": self._changed_keys,
+            "last_refresh_ms": round(self._last_refresh_ms, 3),
+            "running": self._task is not None and not self._task.done(),
+            "snapshot": get_config_stats(),
+        }
+
+
+# Singleton instance
+_config_refresher: Optional[ConfigRefresher] = None
+
+
+def get_config_refresher() -> ConfigRefresher:
+    """Get or create the config refresher singleton."""
+    global _config_refresher
+
+    if _config_refresher is None:
+        _config_refresher = ConfigRefresher(
+            interval_seconds=settings.config_refresh_interval_seconds,
+        )
+
+    return _config_refresher
+
+
+async def shutdown_config_refresher():
+    """Stop the config refresher (called on service shutdown)."""
+    global _config_refresher
+
+    if _config_refresher is not None:
+        await _config_refresher.stop()
+        _config_refresher = None
@@ -0,0 +1,371 @@
+"""
+Dashboard Summary Aggregation
+
+Builds per-account dashboard summaries for many trading accounts at once.
+
+Each data type is one `GROUP BY trading_account_id` query over all requested
+accounts, and the data types run concurrently on their own sessions, so a
+user with N accounts costs four queries and one broker margin call instead
+of 5*N serial round trips.
+
+get_dashboard_summaries() adds a per-user, per-account Redis cache in front;
+entries are dropped by invalidate_dashboard_cache() when an account's orders
+or positions change, so only changed accounts are recomputed.
+
+Usage:
+    summaries = await get_dashboard_summaries(get_session_maker(), user_id, account_ids)
+    summaries["42"]["orders"]["pending_orders"]
+"""
+import asyncio
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+
+from ..database.redis_client import cache_dashboard_overview, get_cached_dashboard_overview
+
+logger = logging.getLogger(__name__)
+
+# Assumed margin requirement when broker margins are unavailable
+FALLBACK_MARGIN_RATE = 0.2
+
+
+def _day_bounds(today: date) -> Dict[str, datetime]:
+    day_start = datetime.combine(today, time.min)
+    return {"day_start": day_start, "day_end": day_start + timedelta(days=1)}
+
+
+async def summarize_orders_by_account(
+    session_maker,
+    user_id: int,
+    account_ids: List[str],
+    today: date
+) -> Dict[str, Dict[str, int]]:
+    """Today's order counts by status, per account"""
+    async with session_maker() as db:
+        result = await db.execute(
+            text("""
+                SELECT
+                    trading_account_id,
+                    COUNT(*) as total_orders_today,
+                    COUNT(*) FILTER (WHERE status IN ('PENDING', 'OPEN', 'TRIGGER_PENDING')) as pending_orders,
+                    COUNT(*) FILTER (WHERE status = 'COMPLETE') as executed_orders,
+                    COUNT(*) FILTER (WHERE status = 'REJECTED') as rejected_orders,
+                    COUNT(*) FILTER (WHERE status = 'CANCELLED') as cancelled_orders
+                FROM order_service.orders
+                WHERE user_id = :user_id
+                  AND trading_account_id = ANY(:account_ids)
+                  AND created_at >= :day_start
+                  AND created_at < :day_end
+                GROUP BY trading_account_id
+            """),
+            {"user_id": user_id, "account_ids": account_ids, **_day_bounds(today)}
+        )
+        return {
+            str(row.trading_account_id): {
+                "total_orders_today": row.total_orders_today or 0,
+                "pending_orders": row.pending_orders or 0,
+                "executed_orders": row.executed_orders or 0,
+                "rejected_orders": row.rejected_orders or 0,
+                "cancelled_orders": row.cancelled_orders or 0,
+            }
+            for row in result.fetchall()
+        }
+
+
+async def summarize_positions_by_account(
+    session_maker,
+    user_id: int,
+    account_ids: List[str]
+) -> Dict[str, Dict[str, int]]:
+    """
+    Position counts per account.
+
+    Uses DISTINCT ON to take only the latest trading_day per symbol+product_type,
+    so NRML positions carried forward across days are counted once.
+    """
+    async with session_maker() as db:
+        result = await db.execute(
+            text("""
+                WITH latest_positions AS (
+                    SELECT DISTINCT ON (trading_account_id, symbol, product_type)
+                        trading_account_id,
+                        quantity
+                    FROM order_service.positions
+                    WHERE user_id = :user_id
+                      AND trading_account_id = ANY(:account_ids)
+                    ORDER BY trading_account_id, symbol, product_type, trading_day DESC
+                )
+                SELECT
+                    trading_account_id,
+                    COUNT(*) as total_positions,
+                    COUNT(*) FILTER (WHERE quantity > 0) as long_positions,
+                    COUNT(*) FILTER (WHERE quantity < 0) as short_positions,
+                    COUNT(*) FILTER (WHERE quantity != 0) as active_positions,
+                    COUNT(*) FILTER (WHERE quantity = 0) as closed_positions
+                FROM latest_positions
+                GROUP BY trading_account_id
+            """),
+            {"user_id": user_id, "account_ids": account_ids}
+        )
+        return {
+            str(row.trading_account_id): {
+                "total_positions": row.total_positions or 0,
+                "long_positions": row.long_positions or 0,
+                "short_positions": row.short_positions or 0,
+                "active_positions": row.active_positions or 0,
+                "closed_positions": row.closed_positions or 0,
+            }
+            for row in result.fetchall()
+        }
+
+
+async def summarize_pnl_by_account(
+    session_maker,
+    user_id: int,
+    account_ids: List[str],
+    today: date
+) -> Dict[str, Dict[str, Any]]:
+    """Overall P&L from positions and today's P&L from trades, per account"""
+    async with session_maker() as db:
+        params = {"user_id": user_id, "account_ids": account_ids, **_day_bounds(today)}
+
+        result = await db.execute(
+            text("""
+                SELECT
+                    trading_account_id,
+                    COALESCE(SUM(realized_pnl), 0) as realized_pnl,
+                    COALESCE(SUM(unrealized_pnl), 0) as unrealized_pnl,
+                    COALESCE(SUM(total_pnl), 0) as total_pnl
+                FROM order_service.positions
+                WHERE user_id = :user_id
+                  AND trading_account_id = ANY(:account_ids)
+                GROUP BY trading_account_id
+            """),
+            params
+        )
+        totals = {str(row.trading_account_id): row for row in result.fetchall()}
+
+        result = await db.execute(
+            text("""
+                SELECT
+                    trading_account_id,
+                    COALESCE(SUM(
+                        CASE
+                            WHEN transaction_type = 'SELL' THEN price * quantity
+                            WHEN transaction_type = 'BUY' THEN -price * quantity
+                            ELSE 0
+                        END
+                    ), 0) as day_pnl
+                FROM order_service.trades
+                WHERE user_id = :user_id
+                  AND trading_account_id = ANY(:account_ids)
+                  AND trade_time >= :day_start
+                  AND trade_time < :day_end
+                GROUP BY trading_account_id
+            """),
+            params
+        )
+        day_pnl = {str(row.trading_account_id): float(row.day_pnl or 0) for row in result.fetchall()}
+
+    summaries = {}
+    for account_id in totals.keys() | day_pnl.keys():
+        row = totals.get(account_id)
+        total_pnl = float(row.total_pnl or 0) if row else 0.0
+        realized_pnl = float(row.realized_pnl or 0) if row else 0.0
+
+        # Calculate percentage (avoiding division by zero)
+        pnl_percentage = None
+        if realized_pnl != 0:
+            pnl_percentage = (total_pnl / abs(realized_pnl)) * 100
+
+        summaries[account_id] = {
+            "total_pnl": total_pnl,
+            "realized_pnl": realized_pnl,
+            "unrealized_pnl": float(row.unrealized_pnl or 0) if row else 0.0,
+            "pnl_percentage": pnl_percentage,
+            "day_pnl": day_pnl.get(account_id, 0.0),
+        }
+    return summaries
+
+
+async def summarize_open_positions_by_account(
+    session_maker,
+    account_ids: List[str]
+) -> Dict[str, Dict[str, float]]:
+    """
+    Open-position aggregates per account.
+
+    Feeds the holdings summary (long open positions) and the margin estimate
+    used when broker margins are unavailable.
+    """
+    async with session_maker() as db:
+        result = await db.execute(
+            text("""
+                SELECT
+                    trading_account_id,
+                    COUNT(*) FILTER (WHERE quantity > 0) as long_positions,
+                    COALESCE(SUM(quantity * last_price)
+                        FILTER (WHERE quantity > 0 AND last_price IS NOT NULL), 0) as long_value,
+                    COALESCE(SUM(quantity * buy_price)
+                        FILTER (WHERE quantity > 0 AND buy_price IS NOT NULL), 0) as long_invested,
+                    COALESCE(SUM(unrealized_pnl), 0) as unrealized_pnl,
+                    COALESCE(SUM(ABS(quantity * last_price))
+                        FILTER (WHERE last_price IS NOT NULL), 0) as gross_exposure
+                FROM order_service.positions
+                WHERE trading_account_id = ANY(:account_ids)
+                  AND is_open = true
+                GROUP BY trading_account_id
+            """),
+            {"account_ids": account_ids}
+        )
+        return {
+            str(row.trading_account_id): {
+                "long_positions": row.long_positions or 0,
+                "long_value": float(row.long_value or 0),
+                "long_invested": float(row.long_invested or 0),
+                "unrealized_pnl": float(row.unrealized_pnl or 0),
+                "gross_exposure": float(row.gross_exposure or 0),
+            }
+            for row in result.fetchall()
+        }
+
+
+async def fetch_broker_margins() -> Optional[Dict[str, float]]:
+    """Fetch equity margins from the broker (None if unavailable)"""
+    try:
+        from .kite_client import get_kite_client_sync
+
+        kite_client = get_kite_client_sync()
+        margins = await kite_client.get_margins()
+    except Exception as e:
+        logger.error(f"Failed to fetch broker margins for dashboard: {e}")
+        return None
+
+    equity_margin = margins.get("equity", {})
+    available_cash = float(equity_margin.get("available", {}).get("cash", 0.0))
+    used_margin = float(equity_margin.get("utilised", {}).get("debits", 0.0))
+    available_margin = float(equity_margin.get("available", {}).get("intraday_payin", 0.0))
+
+    total_margin = available_cash + available_margin
+    return {
+        "available_margin": available_margin,
+        "used_margin": used_margin,
+        "total_margin": total_margin,
+        "utilized_percentage": (used_margin / total_margin * 100) if total_margin > 0 else 0.0,
+    }
+
+
+def _holdings_summary(open_positions: Optional[Dict[str, float]]) -> Dict[str, Any]:
+    if not open_positions:
+        return {}
+
+    total_invested = open_positions["long_invested"]
+    total_pnl = open_positions["unrealized_pnl"]
+    return {
+        "total_holdings": open_positions["long_positions"],
+        "total_value": open_positions["long_value"],
+        "total_invested": total_invested,
+        "total_pnl": total_pnl,
+        "pnl_percentage": (total_pnl / total_invested * 100) if total_invested else None,
+    }
+
+
+def _estimated_margins(open_positions: Optional[Dict[str, float]]) -> Dict[str, float]:
+    """Conservative margin estimate from open positions"""
+    estimated_margin_used = (open_positions or {}).get("gross_exposure", 0.0) * FALLBACK_MARGIN_RATE
+    estimated_cash = max(50000.0, estimated_margin_used * 2)
+    return {
+        "available_margin": estimated_cash,
+        "used_margin": estimated_margin_used,
+        "total_margin": estimated_cash + estimated_margin_used,
+    }
+
+
+async def build_dashboard_summaries(
+    session_maker,
+    user_id: int,
+    account_ids: List[str],
+    today: Optional[date] = None
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Build dashboard summaries for many accounts concurrently.
+
+    Args:
+        session_maker: Async session factory (each data type gets its own session)
+        user_id: User ID (orders, positions and P&L are scoped to the user)
+        account_ids: Trading account IDs
+        today: Trading day for today's orders and P&L (defaults to today)
+
+    Returns:
+        Dict of account_id -> {"orders", "positions", "pnl", "holdings", "margins"};
+        sections with no data are empty dicts
+    """
+    if today is None:
+        today = date.today()
+
+    account_ids = [str(account_id) for account_id in account_ids]
+    if not account_ids:
+        return {}
+
+    orders, positions, pnl, open_positions, broker_margins = await asyncio.gather(
+        summarize_orders_by_account(session_maker, user_id, account_ids, today),
+        summarize_positions_by_account(session_maker, user_id, account_ids),
+        summarize_pnl_by_account(session_maker, user_id, account_ids, today),
+        summarize_open_positions_by_account(session_maker, account_ids),
+        fetch_broker_margins()
+    )
+
+    return {
+        account_id: {
+            "orders": orders.get(account_id, {}),
+            "positions": positions.get(account_id, {}),
+            "pnl": pnl.get(account_id, {}),
+            "holdings": _holdings_summary(open_positions.get(account_id)),
+            "margins": broker_margins or _estimated_margins(open_positions.get(account_id)),
+        }
+        for account_id in account_ids
+    }
+
+
+async def get_dashboard_summaries(
+    session_maker,
+    user_id: int,
+    account_ids: List[str],
+    today: Optional[date] = None,
+    cache_ttl: int = 30
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Get dashboard summaries, serving unchanged accounts from the cache.
+
+    Args:
+        session_maker: Async session factory
+        user_id: User ID
+        account_ids: Trading account IDs
+        today: Trading day (defaults to today)
+        cache_ttl: Cache TTL in seconds (upper bound on staleness for
+            changes that don't invalidate explicitly)
+
+    Returns:
+        Same shape as build_dashboard_summaries()
+    """
+    account_ids = [str(account_id) for account_id in account_ids]
+
+    cached = await asyncio.gather(*(
+        get_cached_dashboard_overview(account_id, user_id=user_id) for account_id in account_ids
+    ))
+    summaries = {
+        account_id: data for account_id, data in zip(account_ids, cached) if data is not None
+    }
+
+    missing = [account_id for account_id in account_ids if account_id not in summaries]
+    if missing:
+        computed = await build_dashboard_summaries(session_maker, user_id, missing, today)
+        await asyncio.gather(*(
+            cache_dashboard_overview(account_id, data, ttl=cache_ttl, user_id=user_id)
+            for account_id, data in computed.items()
+        ))
+        summaries.update(computed)
+
+    return summaries
@@ -0,0 +1,221 @@
+"""
+Incremental External Order Detector
+
+Detects broker orders that were placed outside this service (Kite web/app,
+other tools) and tags them to the account's default strategy.
+
+The previous approach loaded every broker_order_id ever recorded for the
+account on every poll and diffed it against the day's orderbook, so the
+query grew with account age. This detector instead:
+
+- Keeps a per-account seen-set of broker order IDs for the current trading
+  day (reset at the IST date boundary); orders already seen are skipped
+  without touching the database
+- Looks up only the unseen IDs from the orderbook with a single
+  `broker_order_id = ANY(:ids)` query
+- Resolves default strategy/execution/portfolio once per batch and inserts
+  all new external orders in one transaction with
+  `ON CONFLICT (broker_order_id) DO NOTHING`, so concurrent pollers or
+  retries can never double-tag an order
+"""
+import logging
+import uuid
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Set
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config.settings import settings
+from ..models.order import Order, OrderSource
+
+logger = logging.getLogger(__name__)
+
+IST = ZoneInfo("Asia/Kolkata")
+
+
+class ExternalOrderDetector:
+    """
+    Per-account, per-trading-day incremental external order detection.
+    """
+
+    def __init__(self, normalize_status: Optional[Callable[[str], str]] = None):
+        """
+        Initialize detector.
+
+        Args:
+            normalize_status: Maps broker status to DB status (identity if not given)
+        """
+        self._normalize_status = normalize_status or (lambda status: status)
+        self._trading_day: Optional[date] = None
+        self._seen: Dict[str, Set[str]] = {}
+
+        # Statistics
+        self._total_checked = 0
+        self._total_skipped_seen = 0
+        self._total_lookups = 0
+        self._total_tagged = 0
+        self._total_errors = 0
+
+    def _seen_for(self, trading_account_id: str) -> Set[str]:
+        today = datetime.now(IST).date()
+        if today != self._trading_day:
+            self._trading_day = today
+            self._seen.clear()
+        return self._seen.setdefault(trading_account_id, set())
+
+    async def detect_and_tag(
+        self,
+        session: AsyncSession,
+        trading_account_id: str,
+        broker_orders: List[Dict[str, Any]]
+    ) -> int:
+        """
+        Detect and tag external orders in today's broker orderbook.
+
+        Args:
+            session: Database session
+            trading_account_id: Trading account ID
+            broker_orders: Orders from the broker API
+
+        Returns:
+            Number of external orders tagged
+        """
+        seen = self._seen_for(trading_account_id)
+
+        candidates: Dict[str, Dict[str, Any]] = {}
+        for broker_order in broker_orders:
+            broker_order_id = str(broker_order.get('order_id') or '')
+            if broker_order_id and broker_order_id not in seen:
+                candidates[broker_order_id] = broker_order
+
+        self._total_checked += len(broker_orders)
+        self._total_skipped_seen += len(broker_orders) - len(candidates)
+
+        if not candidates:
+            return 0
+
+        # One indexed lookup for just the unseen IDs
+        self._total_lookups += 1
+        result = await session.execute(
+            text("""
+                SELECT broker_order_id
+                FROM order_service.orders
+                WHERE broker_order_id = ANY(:ids)
+            """),
+            {"ids": list(candidates)}
+        )
+        known_ids = {str(row[0]) for row in result.fetchall()}
+        seen.update(known_ids)
+
+        external = {oid: order for oid, order in candidates.items() if oid not in known_ids}
+        if not external:
+            return 0
+
+        for broker_order_id, broker_order in external.items():
+            logger.info(
+                f"Detected external order: {broker_order_id} "
+                f"({broker_order.get('tradingsymbol', 'N/A')})"
+            )
+
+        try:
+            tagged_ids = await self._tag_batch(session, trading_account_id, external)
+        except Exception as e:
+            # Leave IDs unseen so the next poll retries them
+            self._total_errors += 1
+            logger.error(f"Failed to tag {len(external)} external orders for account {trading_account_id}: {e}")
+            await session.rollback()
+            return 0
+
+        seen.update(external)
+        self._total_tagged += len(tagged_ids)
+        return len(tagged_ids)
+
+    async def _tag_batch(
+        self,
+        session: AsyncSession,
+        trading_account_id: str,
+        external: Dict[str, Dict[str, Any]]
+    ) -> List[str]:
+        """Insert all new external orders in one transaction."""
+        from .default_strategy_service import get_or_create_default_strategy
+        from .default_portfolio_service import DefaultPortfolioService
+
+        # Get default strategy and user-managed execution for this account (once per batch)
+        default_strategy_id, default_execution_id = await get_or_create_default_strategy(
+            session, trading_account_id
+        )
+
+        # Get default portfolio for external orders (returns tuple: portfolio_id, strategy_id)
+        portfolio_service = DefaultPortfolioService(session)
+        portfolio_id, _ = await portfolio_service.get_or_create_default_portfolio(
+            trading_account_id=trading_account_id,
+            user_id=settings.system_user_id
+        )
+
+        execution_id = uuid.UUID(str(default_execution_id)) if default_execution_id else None
+        now = datetime.utcnow()
+
+        rows = [
+            {
+                "user_id": settings.system_user_id,
+                "trading_account_id": trading_account_id,
+                "broker_order_id": broker_order_id,
+                "strategy_id": default_strategy_id,
+                "execution_id": execution_id,
+                "portfolio_id": portfolio_id,
+                "source": OrderSource.EXTERNAL,
+                "symbol": broker_order.get('tradingsymbol', ''),
+                "exchange": broker_order.get('exchange', ''),
+                "transaction_type": broker_order.get('transaction_type', 'BUY'),
+                "order_type": broker_order.get('order_type', 'MARKET'),
+                "product_type": broker_order.get('product', 'MIS'),
+                "variety": broker_order.get('variety', 'regular'),
+                "quantity": broker_order.get('quantity', 0),
+                "filled_quantity": broker_order.get('filled_quantity', 0),
+                "pending_quantity": broker_order.get('pending_quantity', 0),
+                "cancelled_quantity": broker_order.get('cancelled_quantity', 0),
+                "price": broker_order.get('price'),
+                "trigger_price": broker_order.get('trigger_price'),
+                "average_price": broker_order.get('average_price'),
+                "status": self._normalize_status(broker_order.get('status', 'OPEN')),
+                "status_message": broker_order.get('status_message'),
+                "validity": broker_order.get('validity', 'DAY'),
+                "risk_check_passed": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for broker_order_id, broker_order in external.items()
+        ]
+
+        stmt = (
+            pg_insert(Order)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[Order.broker_order_id])
+            .returning(Order.broker_order_id)
+        )
+        result = await session.execute(stmt)
+        tagged_ids = [str(row[0]) for row in result.fetchall()]
+        await session.commit()
+
+        logger.info(
+            f"Tagged {len(tagged_ids)} external orders to default strategy {default_strategy_id}, "
+            f"execution {default_execution_id}, and portfolio {portfolio_id} "
+            f"(account={trading_account_id}, already_tagged={len(rows) - len(tagged_ids)})"
+        )
+        return tagged_ids
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get detector statistics."""
+        return {
+            "trading_day": self._trading_day.isoformat() if self._trading_day else None,
+            "accounts": len(self._seen),
+            "seen_orders": sum(len(ids) for ids in self._seen.values()),
+            "total_checked": self._total_checked,
+            "total_skipped_seen": self._total_skipped_seen,
+            "total_lookups": self._total_lookups,
+            "total_tagged": self._total_tagged,
+            "total_errors": self._total_errors,
+        }
@@ -0,0 +1,362 @@
+"""
+Generic Cell Rate Algorithm (GCRA) Rate Limiter
+
+O(1) rate limiting with FIFO waiters, locally or shared across replicas.
+
+GCRA keeps a single number per limit - the theoretical arrival time (TAT) of
+the next request. A request at time t conforms when TAT - L + T <= t, where T
+is the emission interval and L = burst * T the burst tolerance. GCRA admits
+up to burst + window / T - 1 requests in any window, so T is derived as
+window / (max_requests - burst + 1) to keep every sliding window of
+window_seconds at or below max_requests. The default burst of 1 gives strict
+spacing at the full rate; a larger burst trades sustained rate for it.
+
+Acquiring *reserves* a slot by advancing TAT, then sleeps until that slot,
+so waiters are released in arrival order at exactly the rate the limit
+allows - no lock, no deque of timestamps, and no retry stampede when the
+window frees up. Several limits (e.g. 10/s and 200/min) are acquired
+together by reserving every one of them at the latest of their earliest
+conformant times.
+
+Distributed mode runs the same arithmetic in a Redis Lua script keyed per
+account/limit, so replicas share one budget. When the shared budget is
+ample the script can lease a few slots at once, letting the next requests
+on this replica skip the round trip.
+
+Usage:
+    per_second = GcraLimiter(10, 1.0)
+    per_minute = GcraLimiter(200, 60.0)
+    await acquire_all([per_second, per_minute], wait=True, timeout=5.0)
+"""
+
+import asyncio
+import logging
+import math
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Delays below this are float drift in TAT arithmetic, not real throttling
+_CLOCK_EPSILON = 1e-6
+
+
+class RateLimitExceeded(Exception):
+    """Raised when rate limit is exceeded and wait=False."""
+
+    def __init__(
+        self,
+        message: str,
+        limit_type: str,
+        limit: int,
+        current: int,
+        retry_after: float = 0
+    ):
+        super().__init__(message)
+        self.limit_type = limit_type
+        self.limit = limit
+        self.current = current
+        self.retry_after = retry_after
+
+
+class GcraLimiter:
+    """
+    GCRA limiter for one limit (max_requests per window_seconds).
+
+    Allows bursts of up to `burst` requests, then spaces requests one
+    emission interval apart, so no sliding window of window_seconds ever
+    holds more than max_requests.
+    """
+
+    def __init__(self, max_requests: int, window_seconds: float, burst: int = 1):
+        """
+        Initialize rate limiter.
+
+        Args:
+            max_requests: Maximum requests allowed in window
+            window_seconds: Time window in seconds
+            burst: Requests allowed back to back (1..max_requests); each one
+                above 1 lowers the sustained rate by one request per window
+        """
+        if not 1 <= burst <= max_requests:
+            raise ValueError(f"burst must be between 1 and {max_requests}, got {burst}")
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.burst = burst
+        self.emission_interval = window_seconds / (max_requests - burst + 1)
+        self.tolerance = burst * self.emission_interval
+        self._tat = 0.0
+
+        # Statistics
+        self._total_requests = 0
+        self._total_throttled = 0
+
+    @property
+    def limit_type(self) -> str:
+        return f"per_{int(self.window_seconds)}s"
+
+    def earliest(self, now: float) -> float:
+        """Earliest time at which one more request conforms."""
+        return max(now, self._tat + self.emission_interval - self.tolerance)
+
+    def reserve(self, at: float, count: int = 1) -> None:
+        """Reserve `count` slots starting at `at` (which must be >= earliest())."""
+        self._tat = max(self._tat, at) + count * self.emission_interval
+
+    def refund(self, count: int = 1) -> None:
+        """Return reserved slots (a waiter gave up before its slot)."""
+        self._tat -= count * self.emission_interval
+
+    def record_throttle(self) -> None:
+        """Count a request that had to wait for its slot."""
+        self._total_throttled += 1
+
+    def in_use(self, now: float) -> int:
+        """Requests currently counted against the window."""
+        pending = max(0.0, self._tat - now)
+        return min(self.max_requests, math.ceil(pending / self.emission_interval - 1e-9))
+
+    async def check_limit(self) -> Tuple[bool, float]:
+        """
+        Check if a request is allowed without consuming capacity.
+
+        Returns:
+            Tuple of (allowed, wait_time_seconds)
+        """
+        now = time.monotonic()
+        wait_time = self.earliest(now) - now
+        if wait_time <= _CLOCK_EPSILON:
+            return True, 0.0
+        return False, wait_time
+
+    async def acquire(self, wait: bool = True, timeout: Optional[float] = None) -> bool:
+        """
+        Acquire permission to make a request.
+
+        Args:
+            wait: If True, wait for permission. If False, raise exception.
+            timeout: Maximum time to wait (None = no timeout)
+
+        Returns:
+            True if permission granted
+
+        Raises:
+            RateLimitExceeded: If wait=False and limit exceeded
+            asyncio.TimeoutError: If timeout exceeded
+        """
+        await acquire_all([self], wait=wait, timeout=timeout)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get current statistics."""
+        current = self.in_use(time.monotonic())
+
+        return {
+            "limit": self.max_requests,
+            "window_seconds": self.window_seconds,
+            "current": current,
+            "available": self.max_requests - current,
+            "utilization": current / self.max_requests if self.max_requests > 0 else 0,
+            "total_requests": self._total_requests,
+            "total_throttled": self._total_throttled,
+        }
+
+
+def _binding_limiter(limiters: Sequence[GcraLimiter], now: float) -> GcraLimiter:
+    return max(limiters, key=lambda limiter: limiter.earliest(now))
+
+
+def reserve_all(limiters: Sequence[GcraLimiter], at: float) -> None:
+    """Record a request granted at `at` (e.g. by the distributed backend) in local state."""
+    for limiter in limiters:
+        limiter.reserve(at)
+        limiter._total_requests += 1
+
+
+async def acquire_all(
+    limiters: Sequence[GcraLimiter],
+    wait: bool = True,
+    timeout: Optional[float] = None
+) -> float:
+    """
+    Acquire one request from every limiter, waiting in FIFO order if needed.
+
+    The slot is reserved synchronously (no await between check and update),
+    so concurrent callers are granted in the order they called.
+
+    Returns:
+        Seconds waited
+
+    Raises:
+        RateLimitExceeded: If wait=False and a limit is exhausted
+        asyncio.TimeoutError: If the reserved slot is further away than timeout
+    """
+    now = time.monotonic()
+    at = max(limiter.earliest(now) for limiter in limiters)
+    delay = at - now
+    if delay <= _CLOCK_EPSILON:
+        at, delay = now, 0.0
+
+    if delay > 0:
+        binding = _binding_limiter(limiters, now)
+        if not wait:
+            raise RateLimitExceeded(
+                f"Rate limit exceeded: {binding.max_requests} per {binding.window_seconds}s",
+                limit_type=binding.limit_type,
+                limit=binding.max_requests,
+                current=binding.in_use(now),
+                retry_after=delay
+            )
+        if timeout is not None and delay > timeout:
+            raise asyncio.TimeoutError(
+                f"Rate limit wait would exceed timeout ({timeout}s)"
+            )
+
+    reserve_all(limiters, at)
+    if delay <= 0:
+        return 0.0
+
+    for limiter in limiters:
+        limiter.record_throttle()
+    logger.debug(f"Rate limit reached, waiting {delay:.3f}s for reserved slot")
+
+    try:
+        await asyncio.sleep(delay)
+    except asyncio.CancelledError:
+        for limiter in limiters:
+            limiter.refund()
+        raise
+    return delay
+
+
+# KEYS: one TAT key per limit
+# ARGV: max_delay_us, lease, then (emission_interval_us, tolerance_us) per key
+# Returns: {granted (0/1), delay_us, slots}
+_GCRA_SCRIPT = """
+if redis.replicate_commands then pcall(redis.replicate_commands) end
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000000 + tonumber(t[2])
+local max_delay = tonumber(ARGV[1])
+local lease = tonumber(ARGV[2])
+
+local tats = {}
+local at = now
+for i, key in ipairs(KEYS) do
+    local emission = tonumber(ARGV[1 + 2 * i])
+    local tolerance = tonumber(ARGV[2 + 2 * i])
+    local tat = tonumber(redis.call('GET', key)) or now
+    tats[i] = tat
+    local earliest = tat + emission - tolerance
+    if earliest > at then at = earliest end
+end
+
+local delay = at - now
+if delay > max_delay then
+    return {0, math.floor(delay), 0}
+end
+
+-- Lease extra slots only when the budget is ample: at most half of what is free now
+local slots = 1
+if delay == 0 and lease > 1 then
+    slots = lease
+    for i, key in ipairs(KEYS) do
+        local emission = tonumber(ARGV[1 + 2 * i])
+        local tolerance = tonumber(ARGV[2 + 2 * i])
+        local free = math.floor((now + tolerance - math.max(tats[i], now)) / emission)
+        slots = math.min(slots, math.floor(free / 2))
+    end
+    if slots < 1 then slots = 1 end
+end
+
+for i, key in ipairs(KEYS) do
+    local emission = tonumber(ARGV[1 + 2 * i])
+    local new_tat = math.max(tats[i], at) + slots * emission
+    local ttl_ms = math.ceil((new_tat - now) / 1000) + 1
+    redis.call('SET', key, string.format('%.0f', new_tat), 'PX', ttl_ms)
+end
+return {1, math.floor(delay), slots}
+"""
+
+
+class RedisGcraBackend:
+    """
+    Shares GCRA budgets across replicas through an atomic Redis Lua script.
+
+    Time comes from the Redis server (TIME), so replica clock skew doesn't
+    matter. With lease_size > 1, callers may be granted several slots at once
+    when the shared budget is ample, which needs limiters with burst > 1;
+    leased slots must be used within one emission interval, and the burst
+    tolerance of such limiters is reduced by one interval so late use of a
+    lease can't push a window over its limit.
+    """
+
+    KEY_PREFIX = "kite:gcra"
+
+    def __init__(self, redis_client, lease_size: int = 1):
+        """
+        Initialize backend.
+
+        Args:
+            redis_client: Async Redis client
+            lease_size: Max slots granted per round trip when budget is ample
+        """
+        self.redis = redis_client
+        self.lease_size = max(1, lease_size)
+        self._script = redis_client.register_script(_GCRA_SCRIPT)
+
+        # Statistics
+        self._round_trips = 0
+        self._leased_slots = 0
+        self._errors = 0
+
+    def key(self, scope: str, limiter: GcraLimiter) -> str:
+        return f"{self.KEY_PREFIX}:{scope}:{limiter.max_requests}:{int(limiter.window_seconds)}"
+
+    async def reserve(
+        self,
+        scope: str,
+        limiters: Sequence[GcraLimiter],
+        max_delay: float
+    ) -> Tuple[bool, float, int]:
+        """
+        Reserve a slot in every limiter's shared budget.
+
+        Args:
+            scope: Budget owner (e.g. trading account ID)
+            limiters: Limits to reserve (their sizes define the shared budgets)
+            max_delay: Don't reserve if the slot is further away than this
+
+        Returns:
+            Tuple of (granted, delay_seconds, slots). When not granted, delay is
+            how long until a slot would be available.
+        """
+        args: List[Any] = [int(max_delay * 1_000_000), self.lease_size]
+        for limiter in limiters:
+            tolerance = limiter.tolerance
+            if self.lease_size > 1 and limiter.burst > 1:
+                tolerance -= limiter.emission_interval
+            args.extend([limiter.emission_interval * 1_000_000, tolerance * 1_000_000])
+
+        self._round_trips += 1
+        try:
+            granted, delay_us, slots = await self._script(
+                keys=[self.key(scope, limiter) for limiter in limiters],
+                args=args
+            )
+        except Exception:
+            self._errors += 1
+            raise
+
+        slots = int(slots)
+        if slots > 1:
+            self._leased_slots += slots - 1
+        return bool(int(granted)), int(delay_us) / 1_000_000, slots
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get backend statistics."""
+        return {
+            "lease_size": self.lease_size,
+            "round_trips": self._round_trips,
+            "leased_slots": self._leased_slots,
+            "errors": self._errors,
+        }
@@ -0,0 +1,296 @@
+"""
+Handoff Acknowledgement Listener
+
+Resolves algo engine acknowledgements for in-flight handoffs from a Redis
+pub/sub channel instead of polling execution_contexts.
+
+HandoffStateMachine used to poll order_service.execution_contexts every 1-2s
+for up to 30-90s per handoff, holding a session for the whole wait and adding
+up to a poll interval of latency after the ack had landed. With the listener:
+
+- One shared pattern subscription (`algo_engine:ack:*`) serves every
+  in-flight handoff in the process
+- Waiters register a future per execution_id; a matching message resolves
+  it immediately
+- The database is checked once up front (ack may already be there) and then
+  only at a slow fallback interval, in case a notification is lost
+- If the listener is not running (Redis down), waits fall back to polling at
+  the caller's original interval
+
+Algo engine contract: after updating execution_contexts.status, publish
+`{"execution_id": ..., "status": ..., "data": {...}}` to
+`algo_engine:ack:<execution_id>`.
+
+Usage:
+    listener = get_handoff_ack_listener()
+    ack = await listener.wait_for_status(db, execution_id, {"ready", "failed"}, timeout_seconds=30)
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+ACK_CHANNEL_PREFIX = "algo_engine:ack:"
+
+
+def ack_channel(execution_id: str) -> str:
+    """Channel the algo engine publishes acknowledgements for an execution to."""
+    return f"{ACK_CHANNEL_PREFIX}{execution_id}"
+
+
+class HandoffAckListener:
+    """
+    Shared Redis pub/sub listener that resolves handoff acknowledgement waiters.
+    """
+
+    def __init__(self, fallback_poll_interval: float = 5.0):
+        """
+        Initialize listener.
+
+        Args:
+            fallback_poll_interval: DB poll interval while notifications are available
+        """
+        self.fallback_poll_interval = fallback_poll_interval
+
+        self._pubsub = None
+        self._listen_task: Optional[asyncio.Task] = None
+        self._waiters: Dict[str, List[Tuple[Set[str], asyncio.Future]]] = {}
+
+        # Statistics
+        self._messages = 0
+        self._resolved_by_notify = 0
+        self._resolved_by_poll = 0
+        self._timeouts = 0
+        self._db_polls = 0
+        self._last_wait_ms = 0.0
+
+    @property
+    def is_listening(self) -> bool:
+        return self._listen_task is not None and not self._listen_task.done()
+
+    # ==========================================
+    # LIFECYCLE
+    # ==========================================
+
+    async def start(self):
+        """Subscribe to the acknowledgement channels and start dispatching."""
+        if self.is_listening:
+            return
+
+        from ..database.redis_client import get_redis
+
+        self._pubsub = get_redis().pubsub()
+        await self._pubsub.psubscribe(f"{ACK_CHANNEL_PREFIX}*")
+        self._listen_task = asyncio.create_task(self._listen())
+        logger.info(f"Handoff ack listener subscribed to {ACK_CHANNEL_PREFIX}*")
+
+    async def stop(self):
+        """Stop dispatching; pending waiters fall back to DB polling."""
+        if self._listen_task and not self._listen_task.done():
+            self._listen_task.cancel()
+            try:
+                await self._listen_task
+            except asyncio.CancelledError:
+                pass
+        self._listen_task = None
+
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.punsubscribe()
+                await self._pubsub.close()
+            except Exception as e:
+                logger.warning(f"Error closing handoff ack pubsub: {e}")
+            self._pubsub = None
+
+    async def _listen(self):
+        try:
+            async for message in self._pubsub.listen():
+                if message.get("type") != "pmessage":
+                    continue
+                self._messages += 1
+                self._dispatch(message.get("channel"), message.get("data"))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Handoff ack listener stopped: {e}", exc_info=True)
+
+    def _dispatch(self, channel: Optional[str], data: Any):
+        try:
+            payload = json.loads(data) if isinstance(data, (str, bytes)) else dict(data or {})
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Ignoring malformed handoff ack on {channel}: {e}")
+            return
+
+        execution_id = payload.get("execution_id")
+        if not execution_id and channel and channel.startswith(ACK_CHANNEL_PREFIX):
+            execution_id = channel[len(ACK_CHANNEL_PREFIX):]
+        status = payload.get("status")
+        if execution_id and status:
+            self.resolve(str(execution_id), status, payload.get("data") or {})
+
+    # ==========================================
+    # WAITERS
+    # ==========================================
+
+    def expect(self, execution_id: str, statuses: Iterable[str]) -> asyncio.Future:
+        """
+        Register interest in an execution reaching one of `statuses`.
+
+        Register before signalling the algo engine so an immediate ack can't be
+        missed; pass the returned future to wait_for_status().
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(execution_id, []).append((set(statuses), future))
+        return future
+
+    def discard(self, execution_id: str, future: asyncio.Future):
+        """Remove a waiter (called when its wait finishes)."""
+        waiters = self._waiters.get(execution_id)
+        if not waiters:
+            return
+        waiters[:] = [(statuses, f) for statuses, f in waiters if f is not future]
+        if not waiters:
+            self._waiters.pop(execution_id, None)
+
+    def resolve(self, execution_id: str, status: str, data: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Resolve waiters for an execution that are waiting on `status`.
+
+        Returns:
+            Number of waiters resolved
+        """
+        resolved = 0
+        for statuses, future in list(self._waiters.get(execution_id, ())):
+            if status in statuses and not future.done():
+                future.set_result({"status": status, "data": data or {}})
+                resolved += 1
+        return resolved
+
+    async def _poll(
+        self,
+        db: AsyncSession,
+        execution_id: str,
+        statuses: Set[str]
+    ) -> Optional[Dict[str, Any]]:
+        self._db_polls += 1
+        result = await db.execute(
+            text("""
+                SELECT status, ack_data
+                FROM order_service.execution_contexts
+                WHERE execution_id = :execution_id::uuid
+                  AND status = ANY(:statuses)
+            """),
+            {"execution_id": execution_id, "statuses": list(statuses)}
+        )
+        row = result.fetchone()
+        if row:
+            status, ack_data = row
+            return {"status": status, "data": ack_data or {}}
+        return None
+
+    async def wait_for_status(
+        self,
+        db: Optional[AsyncSession],
+        execution_id: str,
+        statuses: Iterable[str],
+        timeout_seconds: float,
+        poll_interval: float = 1.0,
+        future: Optional[asyncio.Future] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Wait for an execution to reach one of `statuses`.
+
+        Args:
+            db: Session for the fallback poll (None waits on notifications only)
+            execution_id: Execution ID
+            statuses: Terminal statuses to wait for
+            timeout_seconds: Maximum wait
+            poll_interval: DB poll interval when the listener is not running
+            future: Waiter from expect() (registered here if not given)
+
+        Returns:
+            {"status", "data"} or None on timeout
+        """
+        statuses = set(statuses)
+        if future is None:
+            future = self.expect(execution_id, statuses)
+
+        start = time.monotonic()
+        deadline = start + timeout_seconds
+        try:
+            # The ack may have landed before we started waiting
+            if db is not None and not future.done():
+                ack = await self._poll(db, execution_id, statuses)
+                if ack:
+                    self._resolved_by_poll += 1
+                    return ack
+
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    return None
+
+                interval = self.fallback_poll_interval if self.is_listening else poll_interval
+                try:
+                    ack = await asyncio.wait_for(asyncio.shield(future), timeout=min(interval, remaining))
+                    self._resolved_by_notify += 1
+                    return ack
+                except asyncio.TimeoutError:
+                    pass
+
+                if db is not None:
+                    ack = await self._poll(db, execution_id, statuses)
+                    if ack:
+                        self._resolved_by_poll += 1
+                        return ack
+        finally:
+            self._last_wait_ms = (time.monotonic() - start) * 1000
+            self.discard(execution_id, future)
+            if not future.done():
+                future.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get listener statistics."""
+        return {
+            "listening": self.is_listening,
+            "in_flight": sum(len(waiters) for waiters in self._waiters.values()),
+            "messages": self._messages,
+            "resolved_by_notify": self._resolved_by_notify,
+            "resolved_by_poll": self._resolved_by_poll,
+            "timeouts": self._timeouts,
+            "db_polls": self._db_polls,
+            "last_wait_ms": round(self._last_wait_ms, 3),
+        }
+
+
+# Singleton instance
+_handoff_ack_listener: Optional[HandoffAckListener] = None
+
+
+def get_handoff_ack_listener() -> HandoffAckListener:
+    """Get or create the handoff ack listener singleton."""
+    global _handoff_ack_listener
+
+    if _handoff_ack_listener is None:
+        from ..config.settings import settings
+        _handoff_ack_listener = HandoffAckListener(
+            fallback_poll_interval=settings.handoff_ack_fallback_poll_seconds
+        )
+
+    return _handoff_ack_listener
+
+
+async def shutdown_handoff_ack_listener():
+    """Stop the handoff ack listener (called on service shutdown)."""
+    global _handoff_ack_listener
+
+    if _handoff_ack_listener is not None:
+        await _handoff_ack_listener.stop()
+        _handoff_ack_listener = None
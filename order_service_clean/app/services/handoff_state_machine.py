@@ -21,8 +21,15 @@ from uuid import uuid4
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..config.settings import settings
+from .handoff_ack_listener import ack_channel, get_handoff_ack_listener
+
 logger = logging.getLogger(__name__)
 
+# execution_contexts statuses that end a wait
+ACK_STATUSES = ("ready", "failed", "error")
+SHUTDOWN_STATUSES = ("stopped", "failed", "error")
+
 
 class HandoffMode(str, Enum):
     """Handoff modes for position control."""
@@ -1266,21 +1273,39 @@ class HandoffStateMachine:
                 "force": True
             }
             
-            # Fire-and-forget emergency signal (don't wait for response)
+            # Register for the engine's stop confirmation before signalling so it can't be missed
+            ack_listener = get_handoff_ack_listener()
+            stop_confirmation = ack_listener.expect(execution_id, SHUTDOWN_STATUSES)
+
+            # Emergency signal does not block on a response
             await self._signal_algo_engine_emergency_stop(execution_id, emergency_signal)
             
             # Step 2: Cancel ALL orders from this execution immediately
             cancelled_orders = await self._cancel_execution_orders(execution_id, "emergency_stop")
             logger.warning(f"Emergency cancelled {len(cancelled_orders)} orders for execution {execution_id}")
             
-            # Step 3: Mark execution as emergency stopped
+            # Step 3: Collect the engine's confirmation (notification only, short timeout)
+            engine_ack = await ack_listener.wait_for_status(
+                None,
+                execution_id,
+                SHUTDOWN_STATUSES,
+                timeout_seconds=settings.handoff_emergency_ack_timeout,
+                future=stop_confirmation
+            )
+            if engine_ack:
+                logger.warning(f"Algo engine confirmed emergency stop for execution {execution_id}: {engine_ack['status']}")
+            else:
+                logger.critical(f"Algo engine did not confirm emergency stop for execution {execution_id}")
+
+            # Step 4: Mark execution as emergency stopped
             await self._mark_execution_stopped(execution_id, "emergency_stop")
             
-            # Step 4: Alert administrators via notification system
+            # Step 5: Alert administrators via notification system
             await self._send_emergency_alert(execution_id, {
                 "alert_type": "emergency_stop",
                 "execution_id": execution_id,
                 "orders_cancelled": len(cancelled_orders),
+                "engine_confirmed": engine_ack is not None,
                 "timestamp": datetime.now(timezone.utc).isoformat(),
                 "severity": "critical"
             })
@@ -1402,7 +1427,8 @@ class HandoffStateMachine:
                     "execution_id": execution_id,
                     "handoff_data": handoff_data,
                     "timestamp": datetime.now(timezone.utc).isoformat(),
-                    "source": "handoff_state_machine"
+                    "source": "handoff_state_machine",
+                    "ack_channel": ack_channel(execution_id)
                 }
                 
                 # Test Redis connectivity
@@ -1460,35 +1486,22 @@ class HandoffStateMachine:
         execution_id: str,
         timeout_seconds: int = 30
     ) -> Dict[str, Any]:
-        """Wait for algo engine acknowledgment with timeout."""
-        import asyncio
-        import time
-        
-        start_time = time.time()
-        while time.time() - start_time < timeout_seconds:
-            # Check database for acknowledgment
-            result = await self.db.execute(
-                text("""
-                    SELECT status, ack_data
-                    FROM order_service.execution_contexts
-                    WHERE execution_id = :execution_id::uuid
-                      AND status IN ('ready', 'failed', 'error')
-                """),
-                {"execution_id": execution_id}
-            )
-            
-            row = result.fetchone()
-            if row:
-                status, ack_data = row
-                return {
-                    "status": status,
-                    "data": ack_data or {},
-                    "execution_id": execution_id
-                }
-            
-            # Wait before next check
-            await asyncio.sleep(1)
-        
+        """
+        Wait for algo engine acknowledgment with timeout.
+
+        Resolved by the shared ack listener as soon as the engine publishes;
+        execution_contexts is only polled as a slow fallback.
+        """
+        ack = await get_handoff_ack_listener().wait_for_status(
+            self.db,
+            execution_id,
+            ACK_STATUSES,
+            timeout_seconds=timeout_seconds,
+            poll_interval=1.0
+        )
+        if ack:
+            return {**ack, "execution_id": execution_id}
+
         # Timeout - return failure
         return {
             "status": "timeout",
@@ -1565,7 +1578,8 @@ class HandoffStateMachine:
             message = {
                 **stop_signal,
                 "source": "handoff_state_machine",
-                "priority": "high"
+                "priority": "high",
+                "ack_channel": ack_channel(execution_id)
             }
             
             # Send to execution-specific queue (highest priority)
@@ -1592,33 +1606,16 @@ class HandoffStateMachine:
         timeout_seconds: int = 90
     ) -> Dict[str, Any]:
         """Wait for algo engine shutdown confirmation."""
-        import asyncio
-        import time
-        
-        start_time = time.time()
-        while time.time() - start_time < timeout_seconds:
-            # Check execution context status
-            result = await self.db.execute(
-                text("""
-                    SELECT status, ack_data
-                    FROM order_service.execution_contexts
-                    WHERE execution_id = :execution_id::uuid
-                """),
-                {"execution_id": execution_id}
-            )
-            
-            row = result.fetchone()
-            if row:
-                status, ack_data = row
-                if status in ["stopped", "failed", "error"]:
-                    return {
-                        "status": status,
-                        "data": ack_data or {},
-                        "execution_id": execution_id
-                    }
-            
-            await asyncio.sleep(2)  # Check every 2 seconds for shutdown
-        
+        ack = await get_handoff_ack_listener().wait_for_status(
+            self.db,
+            execution_id,
+            SHUTDOWN_STATUSES,
+            timeout_seconds=timeout_seconds,
+            poll_interval=2.0
+        )
+        if ack:
+            return {**ack, "execution_id": execution_id}
+
         return {
             "status": "timeout",
             "error": f"Algo engine did not confirm shutdown within {timeout_seconds} seconds",
@@ -1644,7 +1641,8 @@ class HandoffStateMachine:
             message = {
                 **emergency_signal,
                 "source": "handoff_state_machine",
-                "priority": "emergency"
+                "priority": "emergency",
+                "ack_channel": ack_channel(execution_id)
             }
             
             # Send to multiple channels for maximum reliability
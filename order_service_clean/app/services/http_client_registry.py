@@ -0,0 +1,276 @@
+"""
+HTTP Client Registry
+
+One pooled httpx.AsyncClient per upstream service, shared by every caller.
+
+Opening a fresh AsyncClient per call pays TCP (and TLS) setup on every
+request - including token fetches and account resolutions that sit directly
+on the order placement path. The registry instead:
+
+- Keeps one long-lived client per destination with keep-alive connections
+- Applies per-upstream connection limits (UPSTREAM_LIMITS) so one slow
+  upstream cannot exhaust sockets needed by another
+- Negotiates HTTP/2 when enabled, the `h2` package is installed and the
+  upstream offers it (ALPN); otherwise HTTP/1.1 keep-alive is used
+- Tracks per-upstream requests, connection reuse and latency via get_stats();
+  main.py exports them to Prometheus through on_request
+- Closes every pool on service shutdown
+
+Usage:
+    client = get_http_client("token_manager")
+    response = await client.get(url, headers=headers, timeout=10.0)
+"""
+import logging
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
+
+# Callback signature: (upstream, reused_connection, status, seconds)
+RequestObserver = Callable[[str, bool, str, float], None]
+
+# Per-upstream overrides of the default pool limits
+UPSTREAM_LIMITS: Dict[str, Dict[str, int]] = {
+    # Token fetches and account resolutions are on the order placement path
+    "token_manager": {"max_connections": 32, "max_keepalive_connections": 32},
+    # Permission checks run on the request path for accounts missing from the JWT
+    "user_service": {"max_connections": 32, "max_keepalive_connections": 16},
+    # Fire-and-forget subscription refreshes
+    "ticker_service": {"max_connections": 4, "max_keepalive_connections": 2},
+}
+
+
+class _UpstreamStats:
+    """Request counters for one upstream."""
+
+    def __init__(self):
+        self.requests = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "reuse_ratio": round(self.reused_connections / self.requests, 4) if self.requests else 0.0,
+            "errors": self.errors,
+            "avg_latency_ms": round(self.total_seconds / self.requests * 1000, 3) if self.requests else 0.0,
+            "max_latency_ms": round(self.max_seconds * 1000, 3),
+        }
+
+
+class _InstrumentedTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps the pooled transport to time requests and detect connection reuse.
+
+    httpcore reports a `connect_tcp` trace event only when it opens a new
+    connection, so a request without one was served from the keep-alive pool.
+    Latency is measured to response headers (body streaming is the caller's).
+    """
+
+    def __init__(self, upstream: str, inner: httpx.AsyncBaseTransport, registry: "HttpClientRegistry"):
+        self.upstream = upstream
+        self.inner = inner
+        self.registry = registry
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        connected = False
+        outer_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            nonlocal connected
+            if event_name.endswith("connect_tcp.started"):
+                connected = True
+            if outer_trace is not None:
+                await outer_trace(event_name, info)
+
+        request.extensions = {**request.extensions, "trace": trace}
+
+        start = time.perf_counter()
+        try:
+            response = await self.inner.handle_async_request(request)
+        except Exception:
+            self.registry._record(self.upstream, connected, "error", time.perf_counter() - start)
+            raise
+
+        self.registry._record(self.upstream, connected, str(response.status_code), time.perf_counter() - start)
+        return response
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+class HttpClientRegistry:
+    """
+    Shared, pooled httpx.AsyncClient per upstream service.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 50,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        timeout: float = 10.0,
+    ):
+        """
+        Initialize registry.
+
+        Args:
+            max_connections: Default per-upstream connection cap
+            max_keepalive_connections: Default idle connections kept per upstream
+            keepalive_expiry: Seconds an idle connection is kept open
+            http2: Negotiate HTTP/2 where the upstream supports it (needs `h2`)
+            timeout: Default request timeout (callers may override per request)
+        """
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2 and H2_AVAILABLE
+        self.timeout = timeout
+
+        if http2 and not H2_AVAILABLE:
+            logger.info("h2 package not installed - pooled HTTP clients use HTTP/1.1 keep-alive")
+
+        self._clients: Dict[Tuple[str, Optional[str]], httpx.AsyncClient] = {}
+        self._stats: Dict[str, _UpstreamStats] = {}
+
+        # Optional metrics hook, wired by main.py
+        self.on_request: Optional[RequestObserver] = None
+
+    def _limits(self, upstream: str) -> httpx.Limits:
+        overrides = UPSTREAM_LIMITS.get(upstream, {})
+        return httpx.Limits(
+            max_connections=overrides.get("max_connections", self.max_connections),
+            max_keepalive_connections=overrides.get("max_keepalive_connections", self.max_keepalive_connections),
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def get_client(
+        self,
+        upstream: str,
+        base_url: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> httpx.AsyncClient:
+        """
+        Get the pooled client for an upstream, creating it on first use.
+
+        base_url, headers and timeout only apply when the client is created;
+        clients for different base URLs of the same upstream share its stats.
+
+        Args:
+            upstream: Upstream service name (e.g. "token_manager")
+            base_url: Optional base URL for relative request paths
+            headers: Optional default headers
+            timeout: Default request timeout (registry default if None)
+
+        Returns:
+            Shared httpx.AsyncClient - callers must not close it
+        """
+        key = (upstream, base_url)
+        client = self._clients.get(key)
+        if client is not None and not client.is_closed:
+            return client
+
+        transport = _InstrumentedTransport(
+            upstream,
+            httpx.AsyncHTTPTransport(limits=self._limits(upstream), http2=self.http2),
+            self,
+        )
+        client = httpx.AsyncClient(
+            base_url=base_url or "",
+            headers=headers,
+            timeout=timeout if timeout is not None else self.timeout,
+            transport=transport,
+        )
+        self._clients[key] = client
+        self._stats.setdefault(upstream, _UpstreamStats())
+        logger.debug(f"Created pooled HTTP client for {upstream} (http2={self.http2})")
+        return client
+
+    def _record(self, upstream: str, connected: bool, status: str, seconds: float) -> None:
+        stats = self._stats.setdefault(upstream, _UpstreamStats())
+        stats.requests += 1
+        if connected:
+            stats.new_connections += 1
+        else:
+            stats.reused_connections += 1
+        if status == "error":
+            stats.errors += 1
+        stats.total_seconds += seconds
+        stats.max_seconds = max(stats.max_seconds, seconds)
+
+        if self.on_request is not None:
+            try:
+                self.on_request(upstream, not connected, status, seconds)
+            except Exception as e:
+                logger.debug(f"HTTP client request observer failed: {e}")
+
+    async def close(self) -> None:
+        """Close every pooled client."""
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing pooled HTTP client: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get registry statistics."""
+        return {
+            "http2": self.http2,
+            "clients": len(self._clients),
+            "upstreams": {name: stats.to_dict() for name, stats in self._stats.items()},
+        }
+
+
+# Singleton instance
+_http_client_registry: Optional[HttpClientRegistry] = None
+
+
+def get_http_client_registry() -> HttpClientRegistry:
+    """Get or create the HTTP client registry singleton."""
+    global _http_client_registry
+
+    if _http_client_registry is None:
+        from ..config.settings import settings
+        _http_client_registry = HttpClientRegistry(
+            max_connections=settings.http_pool_max_connections,
+            max_keepalive_connections=settings.http_pool_max_keepalive_connections,
+            keepalive_expiry=settings.http_pool_keepalive_expiry,
+            http2=settings.http_pool_http2,
+        )
+
+    return _http_client_registry
+
+
+def get_http_client(
+    upstream: str,
+    base_url: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+) -> httpx.AsyncClient:
+    """Get the shared pooled client for an upstream service."""
+    return get_http_client_registry().get_client(upstream, base_url=base_url, headers=headers, timeout=timeout)
+
+
+async def shutdown_http_client_registry():
+    """Close all pooled HTTP clients (called on service shutdown)."""
+    global _http_client_registry
+
+    if _http_client_registry is not None:
+        await _http_client_registry.close()
+        _http_client_registry = None
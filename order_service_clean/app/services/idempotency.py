@@ -284,8 +284,8 @@ class IdempotencyService:
             return {"error": "Not connected"}
 
         try:
-            # Count active idempotency keys
-            keys = await self._redis_client.keys("idempotency:*")
+            # Count active idempotency keys (incremental SCAN - KEYS blocks the shared Redis)
+            keys = [key async for key in self._redis_client.scan_iter(match="idempotency:*", count=1000)]
             pending_keys = [k for k in keys if k.endswith(":pending")]
             stored_keys = [k for k in keys if not k.endswith(":pending")]
 
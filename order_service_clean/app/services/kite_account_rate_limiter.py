@@ -12,7 +12,9 @@ Rate Limits (per Kite API docs):
 
 Architecture:
 - Each trading account has its own rate limiter instance
-- Per-second/minute limits use in-memory sliding windows
+- Per-second/minute limits use GCRA limiters (O(1), FIFO waiters)
+- With a distributed backend, per-second/minute budgets are shared across
+  replicas through Redis; local limits are the fallback if Redis fails
 - Per-day limits use Redis for persistence across restarts
 - Manager class provides centralized access
 """
@@ -23,10 +25,22 @@ import time
 from collections import deque
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Dict, Optional, Tuple, Deque, Any
+from typing import Dict, List, Optional, Tuple, Deque, Any
+
+from ..config.settings import settings
+from .gcra_limiter import (
+    GcraLimiter,
+    RateLimitExceeded,
+    RedisGcraBackend,
+    acquire_all,
+    reserve_all,
+)
 
 logger = logging.getLogger(__name__)
 
+# Longest a distributed acquire may be scheduled ahead when the caller sets no timeout
+MAX_DISTRIBUTED_WAIT_SECONDS = 300.0
+
 
 class KiteOperation(str, Enum):
     """Kite API operation types with their rate limit categories."""
@@ -38,24 +52,6 @@ class KiteOperation(str, Enum):
     HISTORICAL = "historical"        # Historical data API
 
 
-class RateLimitExceeded(Exception):
-    """Raised when rate limit is exceeded and wait=False."""
-
-    def __init__(
-        self,
-        message: str,
-        limit_type: str,
-        limit: int,
-        current: int,
-        retry_after: float = 0
-    ):
-        super().__init__(message)
-        self.limit_type = limit_type
-        self.limit = limit
-        self.current = current
-        self.retry_after = retry_after
-
-
 class DailyLimitExceeded(RateLimitExceeded):
     """Raised when daily order limit is exceeded."""
 
@@ -66,128 +62,6 @@ class DailyLimitExceeded(RateLimitExceeded):
         self.reset_at = reset_at
 
 
-class SlidingWindowLimiter:
-    """
-    Sliding window rate limiter.
-
-    Tracks actual request timestamps within a time window.
-    More accurate than token bucket for short windows.
-    """
-
-    def __init__(self, max_requests: int, window_seconds: float):
-        """
-        Initialize rate limiter.
-
-        Args:
-            max_requests: Maximum requests allowed in window
-            window_seconds: Time window in seconds
-        """
-        self.max_requests = max_requests
-        self.window_seconds = window_seconds
-        self._request_times: Deque[float] = deque()
-        self._lock = asyncio.Lock()
-
-        # Statistics
-        self._total_requests = 0
-        self._total_throttled = 0
-
-    def _clean_old_requests(self, now: float) -> None:
-        """Remove requests outside the current window."""
-        cutoff_time = now - self.window_seconds
-        while self._request_times and self._request_times[0] < cutoff_time:
-            self._request_times.popleft()
-
-    async def check_limit(self) -> Tuple[bool, float]:
-        """
-        Check if a request is allowed without consuming capacity.
-
-        Returns:
-            Tuple of (allowed, wait_time_seconds)
-        """
-        async with self._lock:
-            now = time.time()
-            self._clean_old_requests(now)
-
-            if len(self._request_times) < self.max_requests:
-                return True, 0.0
-            else:
-                # Calculate when oldest request will expire
-                oldest_time = self._request_times[0]
-                wait_time = (oldest_time + self.window_seconds) - now
-                return False, max(0.0, wait_time)
-
-    async def acquire(self, wait: bool = True, timeout: Optional[float] = None) -> bool:
-        """
-        Acquire permission to make a request.
-
-        Args:
-            wait: If True, wait for permission. If False, raise exception.
-            timeout: Maximum time to wait (None = no timeout)
-
-        Returns:
-            True if permission granted
-
-        Raises:
-            RateLimitExceeded: If wait=False and limit exceeded
-            asyncio.TimeoutError: If timeout exceeded
-        """
-        start_time = time.time()
-
-        while True:
-            async with self._lock:
-                now = time.time()
-                self._clean_old_requests(now)
-
-                if len(self._request_times) < self.max_requests:
-                    self._request_times.append(now)
-                    self._total_requests += 1
-                    return True
-
-                if not wait:
-                    raise RateLimitExceeded(
-                        f"Rate limit exceeded: {self.max_requests} per {self.window_seconds}s",
-                        limit_type=f"per_{int(self.window_seconds)}s",
-                        limit=self.max_requests,
-                        current=len(self._request_times),
-                        retry_after=self._request_times[0] + self.window_seconds - now
-                    )
-
-                # Calculate wait time
-                oldest_time = self._request_times[0]
-                wait_time = (oldest_time + self.window_seconds) - now
-
-            # Check timeout
-            if timeout is not None:
-                elapsed = time.time() - start_time
-                if elapsed + wait_time > timeout:
-                    raise asyncio.TimeoutError(
-                        f"Rate limit wait would exceed timeout ({timeout}s)"
-                    )
-
-            if wait_time > 0:
-                self._total_throttled += 1
-                logger.debug(
-                    f"Rate limit reached ({len(self._request_times)}/{self.max_requests}), "
-                    f"waiting {wait_time:.3f}s"
-                )
-                await asyncio.sleep(wait_time + 0.01)  # Small buffer
-
-    def get_stats(self) -> Dict[str, Any]:
-        """Get current statistics."""
-        now = time.time()
-        self._clean_old_requests(now)
-
-        return {
-            "limit": self.max_requests,
-            "window_seconds": self.window_seconds,
-            "current": len(self._request_times),
-            "available": self.max_requests - len(self._request_times),
-            "utilization": len(self._request_times) / self.max_requests if self.max_requests > 0 else 0,
-            "total_requests": self._total_requests,
-            "total_throttled": self._total_throttled,
-        }
-
-
 class AccountRateLimiter:
     """
     Rate limiter for a single trading account.
@@ -208,6 +82,7 @@ class AccountRateLimiter:
         api_per_second: int = 10,
         quote_per_second: int = 1,
         historical_per_second: int = 3,
+        burst: int = 1,
     ):
         """
         Initialize account rate limiter.
@@ -220,36 +95,59 @@ class AccountRateLimiter:
             api_per_second: Max API GET requests per second (default: 10)
             quote_per_second: Max quote requests per second (default: 1)
             historical_per_second: Max historical requests per second (default: 3)
+            burst: Requests allowed back to back per limit (default: 1). Needed
+                above 1 for distributed leasing, but each extra request lowers
+                the sustained rate by one per window; capped at half of each limit
         """
         self.trading_account_id = trading_account_id
         self.created_at = datetime.now(timezone.utc)
 
         # Order limiters
-        self.orders_per_second = SlidingWindowLimiter(orders_per_second, 1.0)
-        self.orders_per_minute = SlidingWindowLimiter(orders_per_minute, 60.0)
+        self.orders_per_second = self._limiter(orders_per_second, 1.0, burst)
+        self.orders_per_minute = self._limiter(orders_per_minute, 60.0, burst)
 
         # API limiters
-        self.api_per_second = SlidingWindowLimiter(api_per_second, 1.0)
-        self.quote_per_second = SlidingWindowLimiter(quote_per_second, 1.0)
-        self.historical_per_second = SlidingWindowLimiter(historical_per_second, 1.0)
+        self.api_per_second = self._limiter(api_per_second, 1.0, burst)
+        self.quote_per_second = self._limiter(quote_per_second, 1.0, burst)
+        self.historical_per_second = self._limiter(historical_per_second, 1.0, burst)
 
         # Daily limit (to be set by manager with Redis counter)
         self._daily_limit = orders_per_day
         self._daily_counter = None  # Set by manager
 
+        # Shared cross-replica budget (set by manager); leased slots per limit group
+        self._distributed: Optional[RedisGcraBackend] = None
+        self._distributed_fallback = False
+        self._leases: Dict[str, Tuple[int, float]] = {}
+
         # Statistics
         self._last_access = datetime.now(timezone.utc)
         self._requests_by_operation: Dict[str, int] = {}
 
-    def _get_limiters_for_operation(self, operation: KiteOperation) -> list:
-        """Get list of limiters to check for an operation."""
+    @staticmethod
+    def _limiter(max_requests: int, window_seconds: float, burst: int) -> GcraLimiter:
+        """GCRA limiter whose burst never takes more than half the limit's sustained rate."""
+        return GcraLimiter(max_requests, window_seconds, burst=max(1, min(burst, max_requests // 2)))
+
+    def _get_limit_group(self, operation: KiteOperation) -> str:
+        """Name of the budget an operation draws from."""
         if operation in [KiteOperation.ORDER_PLACE, KiteOperation.ORDER_MODIFY, KiteOperation.ORDER_CANCEL]:
-            return [self.orders_per_second, self.orders_per_minute]
-        elif operation == KiteOperation.API_GET:
-            return [self.api_per_second]
+            return "orders"
         elif operation == KiteOperation.QUOTE:
-            return [self.quote_per_second]
+            return "quote"
         elif operation == KiteOperation.HISTORICAL:
+            return "historical"
+        else:
+            return "api"
+
+    def _get_limiters_for_operation(self, operation: KiteOperation) -> List[GcraLimiter]:
+        """Get list of limiters to check for an operation."""
+        group = self._get_limit_group(operation)
+        if group == "orders":
+            return [self.orders_per_second, self.orders_per_minute]
+        elif group == "quote":
+            return [self.quote_per_second]
+        elif group == "historical":
             return [self.historical_per_second]
         else:
             return [self.api_per_second]
@@ -276,7 +174,7 @@ class AccountRateLimiter:
         operation: KiteOperation,
         wait: bool = True,
         timeout: Optional[float] = None
-    ) -> bool:
+    ) -> float:
         """
         Acquire permission to execute operation.
 
@@ -286,7 +184,7 @@ class AccountRateLimiter:
             timeout: Maximum wait time
 
         Returns:
-            True if permission granted
+            Seconds spent waiting for the slot (0.0 if granted immediately)
 
         Raises:
             RateLimitExceeded: If limit exceeded and wait=False
@@ -310,17 +208,83 @@ class AccountRateLimiter:
                     reset_at=reset_at
                 )
 
-        # Acquire from all applicable limiters
+        # Acquire from all applicable limiters at once
         limiters = self._get_limiters_for_operation(operation)
 
-        for limiter in limiters:
-            await limiter.acquire(wait=wait, timeout=timeout)
+        if self._distributed is not None:
+            waited = await self._acquire_distributed(operation, limiters, wait, timeout)
+        else:
+            waited = await acquire_all(limiters, wait=wait, timeout=timeout)
 
         # Increment daily counter for order placements
         if operation == KiteOperation.ORDER_PLACE and self._daily_counter:
             await self._daily_counter.increment(self.trading_account_id)
 
-        return True
+        return waited
+
+    async def _acquire_distributed(
+        self,
+        operation: KiteOperation,
+        limiters: List[GcraLimiter],
+        wait: bool,
+        timeout: Optional[float]
+    ) -> float:
+        """
+        Acquire from the budget shared by all replicas.
+
+        Uses a leased slot if one is still valid (no round trip); otherwise
+        reserves through the Redis script. Local limiters mirror this replica's
+        usage and take over if Redis is unavailable.
+        """
+        group = self._get_limit_group(operation)
+        now = time.monotonic()
+
+        leased, expires_at = self._leases.get(group, (0, 0.0))
+        if leased > 0 and now < expires_at:
+            self._leases[group] = (leased - 1, expires_at)
+            reserve_all(limiters, now)
+            return 0.0
+
+        max_delay = 0.0 if not wait else (timeout if timeout is not None else MAX_DISTRIBUTED_WAIT_SECONDS)
+        try:
+            granted, delay, slots = await self._distributed.reserve(
+                f"{self.trading_account_id}:{group}", limiters, max_delay
+            )
+        except Exception as e:
+            if not self._distributed_fallback:
+                self._distributed_fallback = True
+                logger.warning(
+                    f"Distributed rate limit unavailable, using local limits: {e}",
+                    extra={"trading_account_id": self.trading_account_id}
+                )
+            return await acquire_all(limiters, wait=wait, timeout=timeout)
+
+        self._distributed_fallback = False
+        if not granted:
+            binding = max(limiters, key=lambda limiter: limiter.earliest(now))
+            if not wait:
+                raise RateLimitExceeded(
+                    f"Rate limit exceeded: {binding.max_requests} per {binding.window_seconds}s (all replicas)",
+                    limit_type=binding.limit_type,
+                    limit=binding.max_requests,
+                    current=binding.max_requests,
+                    retry_after=delay
+                )
+            raise asyncio.TimeoutError(
+                f"Rate limit wait would exceed timeout ({timeout}s)"
+            )
+
+        if slots > 1:
+            # Leased slots are only valid for one emission interval
+            lease_window = min(limiter.emission_interval for limiter in limiters)
+            self._leases[group] = (slots - 1, time.monotonic() + lease_window)
+
+        reserve_all(limiters, now + delay)
+        if delay > 0:
+            for limiter in limiters:
+                limiter.record_throttle()
+            await asyncio.sleep(delay)
+        return delay
 
     def get_stats(self) -> Dict[str, Any]:
         """Get account rate limiter statistics."""
@@ -358,6 +322,7 @@ class KiteAccountRateLimiterManager:
         orders_per_minute: int = 200,
         orders_per_day: int = 3000,
         api_per_second: int = 10,
+        burst: int = 1,
     ):
         """
         Initialize manager.
@@ -369,12 +334,14 @@ class KiteAccountRateLimiterManager:
             orders_per_minute: Default orders per minute limit
             orders_per_day: Default orders per day limit
             api_per_second: Default API requests per second limit
+            burst: Default burst per limit (see AccountRateLimiter)
         """
         self._limiters: Dict[int, AccountRateLimiter] = {}
         self._access_order: Deque[int] = deque()
         self._lock = asyncio.Lock()
 
         self._daily_counter = daily_counter
+        self._distributed: Optional[RedisGcraBackend] = None
         self._max_cached = max_cached_accounts
 
         # Default limits
@@ -382,6 +349,7 @@ class KiteAccountRateLimiterManager:
         self._orders_per_minute = orders_per_minute
         self._orders_per_day = orders_per_day
         self._api_per_second = api_per_second
+        self._burst = burst
 
         # Statistics
         self._total_requests = 0
@@ -412,11 +380,13 @@ class KiteAccountRateLimiterManager:
                 orders_per_minute=self._orders_per_minute,
                 orders_per_day=self._orders_per_day,
                 api_per_second=self._api_per_second,
+                burst=self._burst,
             )
 
             # Set daily counter
             limiter._daily_counter = self._daily_counter
             limiter._daily_limit = self._orders_per_day
+            limiter._distributed = self._distributed
 
             # Add to cache
             self._limiters[trading_account_id] = limiter
@@ -472,21 +442,19 @@ class KiteAccountRateLimiterManager:
         limiter = await self._get_or_create_limiter(trading_account_id)
 
         try:
-            # Check if we'll need to wait
-            allowed, wait_time = await limiter.check_limit(operation)
-            if not allowed and wait_time > 0:
+            wait_time = await limiter.acquire(operation, wait=wait, timeout=timeout)
+            if wait_time > 0:
                 self._total_throttled += 1
                 logger.info(
-                    f"Rate limit throttling account {trading_account_id} "
-                    f"for {operation.value}: waiting {wait_time:.2f}s",
+                    f"Rate limit throttled account {trading_account_id} "
+                    f"for {operation.value}: waited {wait_time:.2f}s",
                     extra={
                         "trading_account_id": trading_account_id,
                         "operation": operation.value,
                         "wait_time": wait_time,
                     }
                 )
-
-            return await limiter.acquire(operation, wait=wait, timeout=timeout)
+            return True
 
         except (RateLimitExceeded, DailyLimitExceeded) as e:
             self._total_rejected += 1
@@ -522,6 +490,7 @@ class KiteAccountRateLimiterManager:
             "rejection_rate": (
                 self._total_rejected / max(1, self._total_requests)
             ),
+            "distributed": self._distributed.get_stats() if self._distributed else None,
         }
 
     def set_daily_counter(self, daily_counter) -> None:
@@ -530,6 +499,12 @@ class KiteAccountRateLimiterManager:
         for limiter in self._limiters.values():
             limiter._daily_counter = daily_counter
 
+    def set_distributed_backend(self, backend: Optional[RedisGcraBackend]) -> None:
+        """Share per-second/minute budgets across replicas (None = per-process limits)."""
+        self._distributed = backend
+        for limiter in self._limiters.values():
+            limiter._distributed = backend
+
 
 # Global instance
 _rate_limiter_manager: Optional[KiteAccountRateLimiterManager] = None
@@ -552,18 +527,24 @@ async def get_rate_limiter_manager() -> KiteAccountRateLimiterManager:
             orders_per_minute=200,
             orders_per_day=3000,
             api_per_second=10,
+            burst=settings.kite_rate_limit_burst,
         )
 
     return _rate_limiter_manager
 
 
-async def init_rate_limiter_manager(daily_counter=None) -> KiteAccountRateLimiterManager:
+async def init_rate_limiter_manager(
+    daily_counter=None,
+    distributed_backend: Optional[RedisGcraBackend] = None
+) -> KiteAccountRateLimiterManager:
     """Initialize the rate limiter manager with dependencies."""
     global _rate_limiter_manager
 
     manager = await get_rate_limiter_manager()
     if daily_counter:
         manager.set_daily_counter(daily_counter)
+    if distributed_backend:
+        manager.set_distributed_backend(distributed_backend)
 
     logger.info("Kite account rate limiter manager initialized")
     return manager
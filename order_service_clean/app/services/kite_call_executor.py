@@ -0,0 +1,231 @@
+"""
+Kite Call Executor
+
+KiteConnect is a synchronous `requests`-based SDK. Calling it from an
+`async def` blocks the event loop for the whole broker round trip, so one
+slow Kite response stalls every request and worker in the process.
+
+This module runs all broker calls on a dedicated, sized thread pool:
+- Global cap: max_workers threads shared by every account
+- Per-account cap: at most per_account_concurrency calls in flight for one
+  trading account, so a single busy account cannot take the whole pool
+- Metrics: queue depth, in-flight calls, wait and call latency via
+  get_stats(); main.py exports them to Prometheus through on_call_complete
+
+Usage:
+    executor = get_kite_call_executor()
+    orders = await executor.run(trading_account_id, kite.orders, operation="orders")
+"""
+import asyncio
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Callback signature: (operation, status, wait_seconds, call_seconds)
+CallObserver = Callable[[str, str, float, float], None]
+
+
+class KiteCallExecutor:
+    """
+    Sized thread pool for blocking KiteConnect calls with per-account caps.
+    """
+
+    def __init__(self, max_workers: int = 32, per_account_concurrency: int = 4):
+        """
+        Initialize executor.
+
+        Args:
+            max_workers: Worker threads shared by all accounts
+            per_account_concurrency: Maximum concurrent calls per trading account
+        """
+        self.max_workers = max_workers
+        self.per_account_concurrency = per_account_concurrency
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="kite-call"
+        )
+        self._account_slots: Dict[int, asyncio.Semaphore] = {}
+
+        # Counters touched from worker threads are guarded by _lock
+        self._lock = threading.Lock()
+        self._waiting_for_slot = 0
+        self._queued = 0
+        self._in_flight = 0
+        self._total_calls = 0
+        self._total_errors = 0
+        self._total_wait_ms = 0.0
+        self._total_call_ms = 0.0
+        self._max_wait_ms = 0.0
+        self._max_call_ms = 0.0
+        self._account_calls: Dict[int, int] = {}
+
+        # Optional metrics hook, invoked on the worker thread after each call
+        self.on_call_complete: Optional[CallObserver] = None
+
+        logger.info(
+            f"KiteCallExecutor initialized (workers={max_workers}, "
+            f"per_account={per_account_concurrency})"
+        )
+
+    @property
+    def in_flight(self) -> int:
+        """Calls currently executing on worker threads."""
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """Calls waiting for an account slot or a free worker thread."""
+        return self._waiting_for_slot + self._queued
+
+    def _slot_for(self, trading_account_id: int) -> asyncio.Semaphore:
+        semaphore = self._account_slots.get(trading_account_id)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_account_concurrency)
+            self._account_slots[trading_account_id] = semaphore
+        return semaphore
+
+    async def run(
+        self,
+        trading_account_id: int,
+        func: Callable[..., T],
+        *args: Any,
+        operation: str = "kite_call",
+        **kwargs: Any
+    ) -> T:
+        """
+        Run a blocking Kite call on the pool without blocking the event loop.
+
+        Args:
+            trading_account_id: Account the call is made for (per-account cap)
+            func: Blocking callable (e.g. kite.orders)
+            *args: Positional arguments for func
+            operation: Operation name for metrics
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Result of func
+        """
+        semaphore = self._slot_for(trading_account_id)
+        submitted_at = time.perf_counter()
+
+        self._waiting_for_slot += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting_for_slot -= 1
+
+        try:
+            with self._lock:
+                self._queued += 1
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor,
+                functools.partial(
+                    self._invoke, trading_account_id, operation, submitted_at, func, args, kwargs
+                )
+            )
+        finally:
+            semaphore.release()
+
+    def _invoke(
+        self,
+        trading_account_id: int,
+        operation: str,
+        submitted_at: float,
+        func: Callable[..., T],
+        args: tuple,
+        kwargs: Dict[str, Any]
+    ) -> T:
+        """Execute func on a worker thread and record timings."""
+        started_at = time.perf_counter()
+        wait_ms = (started_at - submitted_at) * 1000
+
+        with self._lock:
+            self._queued -= 1
+            self._in_flight += 1
+
+        status = "success"
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            call_ms = (time.perf_counter() - started_at) * 1000
+
+            with self._lock:
+                self._in_flight -= 1
+                self._total_calls += 1
+                if status == "error":
+                    self._total_errors += 1
+                self._total_wait_ms += wait_ms
+                self._total_call_ms += call_ms
+                self._max_wait_ms = max(self._max_wait_ms, wait_ms)
+                self._max_call_ms = max(self._max_call_ms, call_ms)
+                self._account_calls[trading_account_id] = self._account_calls.get(trading_account_id, 0) + 1
+
+            if self.on_call_complete is not None:
+                try:
+                    self.on_call_complete(operation, status, wait_ms / 1000, call_ms / 1000)
+                except Exception as e:
+                    logger.debug(f"Kite call observer failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get executor statistics."""
+        with self._lock:
+            total = self._total_calls
+            return {
+                "max_workers": self.max_workers,
+                "per_account_concurrency": self.per_account_concurrency,
+                "queue_depth": self.queue_depth,
+                "waiting_for_account_slot": self._waiting_for_slot,
+                "waiting_for_worker": self._queued,
+                "in_flight": self._in_flight,
+                "total_calls": total,
+                "total_errors": self._total_errors,
+                "avg_wait_ms": round(self._total_wait_ms / total, 3) if total else 0.0,
+                "avg_call_ms": round(self._total_call_ms / total, 3) if total else 0.0,
+                "max_wait_ms": round(self._max_wait_ms, 3),
+                "max_call_ms": round(self._max_call_ms, 3),
+                "accounts": len(self._account_calls),
+            }
+
+    def shutdown(self):
+        """Stop accepting work and release worker threads."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        logger.info(f"KiteCallExecutor shutdown - total calls: {self._total_calls}")
+
+
+# Singleton instance
+_kite_call_executor: Optional[KiteCallExecutor] = None
+
+
+def get_kite_call_executor() -> KiteCallExecutor:
+    """Get or create the Kite call executor singleton."""
+    global _kite_call_executor
+
+    if _kite_call_executor is None:
+        from ..config.settings import settings
+        _kite_call_executor = KiteCallExecutor(
+            max_workers=settings.kite_executor_max_workers,
+            per_account_concurrency=settings.kite_executor_per_account_concurrency
+        )
+
+    return _kite_call_executor
+
+
+def shutdown_kite_call_executor():
+    """Shutdown the Kite call executor (called on service shutdown)."""
+    global _kite_call_executor
+
+    if _kite_call_executor is not None:
+        _kite_call_executor.shutdown()
+        _kite_call_executor = None
@@ -7,20 +7,27 @@ and uses ONLY the KiteConnect REST API (no WebSocket connections).
 The WebSocket connection is maintained exclusively by ticker_service_v2
 for market data streaming.
 
+KiteConnect is synchronous, so every SDK call runs on the shared Kite call
+executor (per-account concurrency cap) instead of the event loop.
+
 Config Service Integration:
 - TOKEN_MANAGER_URL and TOKEN_MANAGER_INTERNAL_API_KEY can be fetched from config service
 - Falls back to environment variables if config service unavailable
 """
 import re
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, TypeVar
 import httpx
 from kiteconnect import KiteConnect
 
 from ..config.settings import settings
+from .http_client_registry import get_http_client
+from .kite_call_executor import get_kite_call_executor
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
 # =============================================================================
 # INPUT VALIDATION PATTERNS
 # =============================================================================
@@ -152,27 +159,27 @@ class KiteOrderClient:
             if self.internal_api_key:
                 headers["X-Internal-API-Key"] = self.internal_api_key
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.token_manager_url}/api/v1/tokens/{self.account_id}",
-                    headers=headers,
-                    timeout=10.0
-                )
-                response.raise_for_status()
+            client = get_http_client("token_manager")
+            response = await client.get(
+                f"{self.token_manager_url}/api/v1/tokens/{self.account_id}",
+                headers=headers,
+                timeout=10.0
+            )
+            response.raise_for_status()
 
-                data = response.json()
-                access_token = data.get("access_token")
-                api_key = data.get("api_key")
+            data = response.json()
+            access_token = data.get("access_token")
+            api_key = data.get("api_key")
 
-                if not access_token:
-                    raise ValueError("No access_token in response from Token Manager")
+            if not access_token:
+                raise ValueError("No access_token in response from Token Manager")
 
-                # Update API key if returned by token manager
-                if api_key:
-                    self.api_key = api_key
+            # Update API key if returned by token manager
+            if api_key:
+                self.api_key = api_key
 
-                logger.info(f"Fetched access token from Token Manager for account: {self.account_id}")
-                return access_token
+            logger.info(f"Fetched access token from Token Manager for account: {self.account_id}")
+            return access_token
 
         except httpx.HTTPStatusError as e:
             logger.error(f"Token Manager returned error: {e.response.status_code} - {e.response.text}")
@@ -207,6 +214,23 @@ class KiteOrderClient:
             self._kite.set_access_token(self._access_token)
             logger.info("Access token refreshed")
 
+    async def _run_blocking(self, func: Callable[..., T], *args: Any, operation: str, **kwargs: Any) -> T:
+        """
+        Run a blocking KiteConnect call on the Kite call executor.
+
+        Args:
+            func: Blocking callable (KiteConnect method)
+            *args: Positional arguments for func
+            operation: Operation name for metrics
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Result of func
+        """
+        return await get_kite_call_executor().run(
+            self.account_id, func, *args, operation=operation, **kwargs
+        )
+
     # ==========================================
     # ORDER OPERATIONS (REST API ONLY)
     # ==========================================
@@ -286,7 +310,7 @@ class KiteOrderClient:
             logger.info(f"Placing order: {order_params}")
 
             # Place order via REST API
-            order_id = kite.place_order(**order_params)
+            order_id = await self._run_blocking(kite.place_order, operation="place_order", **order_params)
 
             logger.info(f"Order placed successfully: {order_id}")
             return order_id
@@ -324,7 +348,7 @@ class KiteOrderClient:
                 try:
                     await self.refresh_token()
                     kite = await self._get_kite_client()
-                    order_id = kite.place_order(**order_params)
+                    order_id = await self._run_blocking(kite.place_order, operation="place_order", **order_params)
                     logger.info(f"Order placed successfully after token refresh: {order_id}")
                     return order_id
                 except Exception as retry_error:
@@ -382,7 +406,7 @@ class KiteOrderClient:
 
             logger.info(f"Modifying order {order_id}: {modify_params}")
 
-            result = kite.modify_order(**modify_params)
+            result = await self._run_blocking(kite.modify_order, operation="modify_order", **modify_params)
 
             logger.info(f"Order modified successfully: {result}")
             return result
@@ -407,7 +431,9 @@ class KiteOrderClient:
 
             logger.info(f"Cancelling order: {order_id}")
 
-            result = kite.cancel_order(order_id=order_id, variety=variety)
+            result = await self._run_blocking(
+                kite.cancel_order, order_id=order_id, variety=variety, operation="cancel_order"
+            )
 
             logger.info(f"Order cancelled successfully: {result}")
             return result
@@ -426,7 +452,7 @@ class KiteOrderClient:
         try:
             kite = await self._get_kite_client()
 
-            orders = kite.orders()
+            orders = await self._run_blocking(kite.orders, operation="get_orders")
 
             logger.debug(f"Fetched {len(orders)} orders")
             return orders
@@ -448,7 +474,7 @@ class KiteOrderClient:
         try:
             kite = await self._get_kite_client()
 
-            history = kite.order_history(order_id=order_id)
+            history = await self._run_blocking(kite.order_history, order_id=order_id, operation="get_order_history")
 
             logger.debug(f"Fetched history for order {order_id}: {len(history)} entries")
             return history
@@ -483,7 +509,7 @@ class KiteOrderClient:
         try:
             kite = await self._get_kite_client()
 
-            trades = kite.trades()
+            trades = await self._run_blocking(kite.trades, operation="get_trades")
 
             logger.debug(f"Fetched {len(trades)} trades")
             return trades
@@ -502,7 +528,7 @@ class KiteOrderClient:
         try:
             kite = await self._get_kite_client()
 
-            positions = kite.positions()
+            positions = await self._run_blocking(kite.positions, operation="get_positions")
 
             logger.debug(f"Fetched positions: net={len(positions.get('net', []))}, day={len(positions.get('day', []))}")
             return positions
@@ -521,7 +547,7 @@ class KiteOrderClient:
         try:
             kite = await self._get_kite_client()
 
-            holdings = kite.holdings()
+            holdings = await self._run_blocking(kite.holdings, operation="get_holdings")
 
             logger.debug(f"Fetched {len(holdings)} holdings")
             return holdings
@@ -544,9 +570,9 @@ class KiteOrderClient:
             kite = await self._get_kite_client()
 
             if segment:
-                margins = kite.margins(segment=segment)
+                margins = await self._run_blocking(kite.margins, segment=segment, operation="get_margins")
             else:
-                margins = kite.margins()
+                margins = await self._run_blocking(kite.margins, operation="get_margins")
 
             logger.debug(f"Fetched margins for segment: {segment}")
             return margins
@@ -568,7 +594,7 @@ class KiteOrderClient:
         try:
             kite = await self._get_kite_client()
 
-            margins = kite.order_margins(orders)
+            margins = await self._run_blocking(kite.order_margins, orders, operation="calculate_order_margins")
 
             logger.debug(f"Calculated margins for {len(orders)} orders")
             return margins
@@ -597,10 +623,12 @@ class KiteOrderClient:
         try:
             kite = await self._get_kite_client()
 
-            margins = kite.basket_order_margins(
+            margins = await self._run_blocking(
+                kite.basket_order_margins,
                 orders,
                 consider_positions=consider_positions,
-                mode=mode
+                mode=mode,
+                operation="calculate_basket_margins"
             )
 
             logger.debug(f"Calculated basket margins for {len(orders)} orders")
@@ -691,13 +719,15 @@ class KiteOrderClient:
                 }
 
             # Place GTT via Kite API
-            gtt_id = kite.place_gtt(
+            gtt_id = await self._run_blocking(
+                kite.place_gtt,
                 trigger_type=gtt_type,
                 tradingsymbol=tradingsymbol,
                 exchange=exchange,
                 trigger_values=trigger_values,
                 last_price=last_price,
-                orders=orders
+                orders=orders,
+                operation="place_gtt"
             )
 
             logger.info(f"GTT order placed successfully: trigger_id={gtt_id}")
@@ -717,7 +747,7 @@ class KiteOrderClient:
         try:
             kite = await self._get_kite_client()
 
-            gtts = kite.get_gtts()
+            gtts = await self._run_blocking(kite.get_gtts, operation="get_gtts")
 
             logger.debug(f"Fetched {len(gtts)} GTT orders")
             return gtts
@@ -739,7 +769,7 @@ class KiteOrderClient:
         try:
             kite = await self._get_kite_client()
 
-            gtt = kite.get_gtt(gtt_id)
+            gtt = await self._run_blocking(kite.get_gtt, gtt_id, operation="get_gtt")
 
             logger.debug(f"Fetched GTT order: {gtt_id}")
             return gtt
@@ -772,11 +802,13 @@ class KiteOrderClient:
 
             logger.info(f"Modifying GTT order: {gtt_id}")
 
-            result = kite.modify_gtt(
+            result = await self._run_blocking(
+                kite.modify_gtt,
                 trigger_id=gtt_id,
                 trigger_values=trigger_values,
                 last_price=last_price,
-                orders=orders
+                orders=orders,
+                operation="modify_gtt"
             )
 
             logger.info(f"GTT order modified successfully: {gtt_id}")
@@ -801,7 +833,7 @@ class KiteOrderClient:
 
             logger.info(f"Deleting GTT order: {gtt_id}")
 
-            result = kite.delete_gtt(gtt_id)
+            result = await self._run_blocking(kite.delete_gtt, gtt_id, operation="delete_gtt")
 
             logger.info(f"GTT order deleted successfully: {gtt_id}")
             return result
@@ -14,6 +14,10 @@ Config Service Integration:
 - TOKEN_MANAGER_URL and TOKEN_MANAGER_INTERNAL_API_KEY can be fetched from config service
 - Falls back to environment variables if config service unavailable
 
+Blocking Calls:
+- KiteConnect is synchronous; every broker call runs on the shared
+  KiteCallExecutor thread pool so the event loop is never blocked
+
 Rate Limiting (Kite API limits):
 - Order operations: 10/sec, 200/min, 3000/day per account
 - API GET operations: 10/sec
@@ -25,7 +29,7 @@ Usage:
     order_id = await client.place_order(...)
 """
 import logging
-from typing import Optional, Dict, Any, Union, Callable, TypeVar
+from typing import Optional, Dict, Any, List, Union, Callable, TypeVar
 import httpx
 from kiteconnect import KiteConnect
 from kiteconnect.exceptions import TokenException
@@ -35,13 +39,18 @@ from .kite_account_rate_limiter import (
     KiteOperation,
     get_rate_limiter_manager_sync,
 )
+from .kite_call_executor import get_kite_call_executor
+from .http_client_registry import get_http_client
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
 
-async def resolve_trading_account_config(trading_account_id: int) -> Dict[str, str]:
+async def resolve_trading_account_config(
+    trading_account_id: int,
+    client: Optional[httpx.AsyncClient] = None
+) -> Dict[str, str]:
     """
     Resolve trading_account_id to broker configuration via token_manager API.
     
@@ -49,6 +58,7 @@ async def resolve_trading_account_config(trading_account_id: int) -> Dict[str, s
     
     Args:
         trading_account_id: User service trading account ID
+        client: Optional HTTP client (the shared token_manager pool is used otherwise)
         
     Returns:
         Dict with nickname, api_key, broker, and other account config
@@ -70,35 +80,34 @@ async def resolve_trading_account_config(trading_account_id: int) -> Dict[str, s
         "Content-Type": "application/json"
     }
     
+    url = f"{token_manager_url}/api/v1/accounts/resolve/{trading_account_id}"
+
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{token_manager_url}/api/v1/accounts/resolve/{trading_account_id}",
-                headers=headers,
-                timeout=10.0
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"Account resolution failed with status {response.status_code}: {response.text}")
-                raise ValueError(f"Account resolution failed: HTTP {response.status_code}")
-            
-            data = response.json()
-            if not data.get("success") or not data.get("account"):
-                error_msg = data.get("error", "Unknown error")
-                logger.error(f"Account resolution unsuccessful: {error_msg}")
-                raise ValueError(f"Account resolution failed: {error_msg}")
-            
-            account = data["account"]
-            
-            # Extract configuration in format expected by MultiAccountKiteClient
-            return {
-                "nickname": account["account_nickname"],
-                "api_key": account["api_key"],
-                "broker": account["broker"],
-                "segment": account.get("segment", "equity"),
-                "is_active": account.get("is_active", True)
-            }
-            
+        if client is None:
+            client = get_http_client("token_manager")
+        response = await client.get(url, headers=headers, timeout=10.0)
+
+        if response.status_code != 200:
+            logger.error(f"Account resolution failed with status {response.status_code}: {response.text}")
+            raise ValueError(f"Account resolution failed: HTTP {response.status_code}")
+
+        data = response.json()
+        if not data.get("success") or not data.get("account"):
+            error_msg = data.get("error", "Unknown error")
+            logger.error(f"Account resolution unsuccessful: {error_msg}")
+            raise ValueError(f"Account resolution failed: {error_msg}")
+
+        account = data["account"]
+
+        # Extract configuration in format expected by MultiAccountKiteClient
+        return {
+            "nickname": account["account_nickname"],
+            "api_key": account["api_key"],
+            "broker": account["broker"],
+            "segment": account.get("segment", "equity"),
+            "is_active": account.get("is_active", True)
+        }
+
     except httpx.HTTPError as e:
         logger.error(f"HTTP error during account resolution for {trading_account_id}: {e}")
         raise ValueError(f"Network error resolving trading account: {e}")
@@ -107,16 +116,12 @@ async def resolve_trading_account_config(trading_account_id: int) -> Dict[str, s
         raise ValueError(f"Failed to resolve trading account: {e}")
 
 
-async def get_all_trading_accounts() -> Dict[int, Dict[str, str]]:
+def get_configured_trading_account_ids() -> List[int]:
     """
-    Get all trading accounts via dynamic resolution.
-    
+    Get the trading account IDs this service should sync.
+
     Sprint 1: Uses config-driven account IDs instead of hardcoding.
-    
-    Returns:
-        Dict mapping trading_account_id to account config
     """
-    # Get trading account IDs from configuration
     # Try config service first, fallback to settings, then minimal default
     try:
         from ..config.settings import settings
@@ -145,18 +150,23 @@ async def get_all_trading_accounts() -> Dict[int, Dict[str, str]]:
         logger.error(f"Failed to load trading account IDs from config: {e}")
         # Emergency fallback
         known_account_ids = [1]
+
+    return list(known_account_ids)
+
+
+async def get_all_trading_accounts() -> Dict[int, Dict[str, str]]:
+    """
+    Get all trading accounts via dynamic resolution.
     
-    accounts = {}
-    for account_id in known_account_ids:
-        try:
-            config = await resolve_trading_account_config(account_id)
-            accounts[account_id] = config
-        except Exception as e:
-            logger.error(f"Failed to resolve trading_account {account_id}: {e}")
-            # Skip failed accounts rather than breaking entirely
-            continue
+    Served from the TradingAccountRegistry cache (TTL + background refresh),
+    so sync workers do not pay one token_manager round trip per account
+    on every cycle.
     
-    return accounts
+    Returns:
+        Dict mapping trading_account_id to account config
+    """
+    from .account_registry import get_account_registry
+    return await get_account_registry().get_all()
 
 
 class MultiAccountKiteClient:
@@ -300,31 +310,31 @@ class MultiAccountKiteClient:
             if self.token_manager_api_key:
                 headers["X-Internal-API-Key"] = self.token_manager_api_key
 
-            async with httpx.AsyncClient() as client:
-                # Sprint 1: Use new trading_account_id based endpoint
-                response = await client.get(
-                    f"{self.token_manager_url}/api/v1/tokens/by-trading-account/{self.trading_account_id}",
-                    headers=headers,
-                    timeout=10.0
-                )
-                response.raise_for_status()
+            client = get_http_client("token_manager")
+            # Sprint 1: Use new trading_account_id based endpoint
+            response = await client.get(
+                f"{self.token_manager_url}/api/v1/tokens/by-trading-account/{self.trading_account_id}",
+                headers=headers,
+                timeout=10.0
+            )
+            response.raise_for_status()
 
-                data = response.json()
-                access_token = data.get("access_token")
-                api_key = data.get("api_key")
+            data = response.json()
+            access_token = data.get("access_token")
+            api_key = data.get("api_key")
 
-                if not access_token:
-                    raise ValueError(f"No access_token for account {self.account_nickname}")
+            if not access_token:
+                raise ValueError(f"No access_token for account {self.account_nickname}")
 
-                # Update API key if returned by token manager
-                if api_key:
-                    self.api_key = api_key
+            # Update API key if returned by token manager
+            if api_key:
+                self.api_key = api_key
 
-                logger.info(
-                    f"Fetched access token for {self.account_nickname} "
-                    f"(trading_account={self.trading_account_id})"
-                )
-                return access_token
+            logger.info(
+                f"Fetched access token for {self.account_nickname} "
+                f"(trading_account={self.trading_account_id})"
+            )
+            return access_token
 
         except httpx.HTTPStatusError as e:
             logger.error(
@@ -362,6 +372,27 @@ class MultiAccountKiteClient:
             self._kite.set_access_token(self._access_token)
             logger.info(f"Token refreshed for {self.account_nickname}")
 
+    async def _run_blocking(self, func: Callable[..., T], *args: Any, operation: str, **kwargs: Any) -> T:
+        """
+        Run a blocking KiteConnect call on the Kite call executor.
+
+        Args:
+            func: Blocking callable (KiteConnect method or closure)
+            *args: Positional arguments for func
+            operation: Operation name for metrics (argument suffixes are stripped)
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Result of func
+        """
+        return await get_kite_call_executor().run(
+            self.trading_account_id,
+            func,
+            *args,
+            operation=operation.split("(", 1)[0],
+            **kwargs
+        )
+
     async def _with_token_refresh(self, operation: Callable[[], T], operation_name: str) -> T:
         """
         Execute a Kite API operation with automatic token refresh on auth errors.
@@ -378,7 +409,7 @@ class MultiAccountKiteClient:
         """
         try:
             kite = await self._get_kite_client()
-            return operation(kite)
+            return await self._run_blocking(operation, kite, operation=operation_name)
         except (TokenException, Exception) as e:
             error_msg = str(e).lower()
             # Check if it's a token/session error
@@ -389,7 +420,7 @@ class MultiAccountKiteClient:
                 )
                 await self.refresh_token()
                 kite = await self._get_kite_client()
-                return operation(kite)
+                return await self._run_blocking(operation, kite, operation=operation_name)
             else:
                 logger.error(f"Failed to {operation_name} ({self.account_nickname}): {e}")
                 raise
@@ -456,7 +487,7 @@ class MultiAccountKiteClient:
                 f"{transaction_type} {quantity} {tradingsymbol} @ {order_type}"
             )
 
-            order_id = kite.place_order(**order_params)
+            order_id = await self._run_blocking(kite.place_order, operation="place_order", **order_params)
 
             logger.info(
                 f"Order placed: {order_id} "
@@ -473,7 +504,7 @@ class MultiAccountKiteClient:
                 await self.refresh_token()
 
                 kite = await self._get_kite_client()
-                order_id = kite.place_order(**order_params)
+                order_id = await self._run_blocking(kite.place_order, operation="place_order", **order_params)
                 logger.info(f"Order placed after token refresh: {order_id}")
                 return order_id
 
@@ -515,7 +546,7 @@ class MultiAccountKiteClient:
 
             logger.info(f"Modifying order {order_id} ({self.account_nickname})")
 
-            result = kite.modify_order(**modify_params)
+            result = await self._run_blocking(kite.modify_order, operation="modify_order", **modify_params)
             logger.info(f"Order modified: {order_id}")
             return result
 
@@ -537,7 +568,9 @@ class MultiAccountKiteClient:
 
             logger.info(f"Cancelling order {order_id} ({self.account_nickname})")
 
-            result = kite.cancel_order(order_id=order_id, variety=variety)
+            result = await self._run_blocking(
+                kite.cancel_order, operation="cancel_order", order_id=order_id, variety=variety
+            )
             logger.info(f"Order cancelled: {order_id}")
             return result
 
@@ -662,7 +695,9 @@ class MultiAccountKiteClient:
                 f"type={gtt_type}, symbol={tradingsymbol}, triggers={trigger_values}"
             )
 
-            result = kite.place_gtt(
+            result = await self._run_blocking(
+                kite.place_gtt,
+                operation="place_gtt",
                 trigger_type=kite.GTT_TYPE_OCO if gtt_type == 'two-leg' else kite.GTT_TYPE_SINGLE,
                 tradingsymbol=tradingsymbol,
                 exchange=exchange,
@@ -727,7 +762,9 @@ class MultiAccountKiteClient:
 
             logger.info(f"Modifying GTT {trigger_id} ({self.account_nickname})")
 
-            result = kite.modify_gtt(
+            result = await self._run_blocking(
+                kite.modify_gtt,
+                operation="modify_gtt",
                 trigger_id=trigger_id,
                 trigger_type=kite.GTT_TYPE_OCO if gtt_type == 'two-leg' else kite.GTT_TYPE_SINGLE,
                 tradingsymbol=tradingsymbol,
@@ -758,7 +795,7 @@ class MultiAccountKiteClient:
 
             logger.info(f"Deleting GTT {trigger_id} ({self.account_nickname})")
 
-            result = kite.delete_gtt(trigger_id)
+            result = await self._run_blocking(kite.delete_gtt, trigger_id, operation="delete_gtt")
             deleted_id = result.get('trigger_id')
             logger.info(f"GTT deleted: trigger_id={deleted_id}")
             return deleted_id
@@ -6,7 +6,7 @@ Handles order placement, modification, cancellation, and tracking.
 import logging
 from datetime import datetime, date
 from typing import List, Optional, Dict, Any
-from sqlalchemy import select, and_, func, literal
+from sqlalchemy import select, and_, func, case
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 
@@ -17,8 +17,15 @@ from ..database.redis_client import (
     cache_order,
     get_cached_order,
     invalidate_order_cache,
+    invalidate_dashboard_cache,
     publish_order_update
 )
+from ..utils.pagination import (
+    APPROXIMATE_COUNT_THRESHOLD,
+    day_bounds,
+    estimate_count,
+    keyset_condition,
+)
 from .kite_client_multi import get_kite_client_for_account
 from .circuit_breaker import (
     CircuitBreaker,
@@ -31,6 +38,7 @@ from .lot_size_service import LotSizeService
 from .margin_service import MarginService
 from .market_hours import MarketHoursService
 from .audit_service import OrderAuditService
+from .risk_snapshot import RiskSnapshot, SymbolExposure, get_risk_snapshot_cache
 
 logger = logging.getLogger(__name__)
 
@@ -279,11 +287,23 @@ class OrderService:
                 f"broker_order_id={broker_order_id}"
             )
 
+            # Reserve the accepted order in the cached risk snapshot
+            reservation = self._risk_reservation(symbol, quantity, price)
+            if reservation:
+                get_risk_snapshot_cache().record_order(self.trading_account_id, *reservation)
+
+            await invalidate_dashboard_cache(self.trading_account_id)
+
             # Convert to dict before session closes to avoid lazy-loading issues
             order_dict = order.to_dict()
 
             # Cache order
-            await cache_order(str(order.id), order_dict)
+            await cache_order(
+                str(order.id),
+                order_dict,
+                user_id=self.user_id,
+                trading_account_id=self.trading_account_id
+            )
 
             # Publish order created event
             await publish_order_update(
@@ -419,6 +439,7 @@ class OrderService:
 
             # Invalidate cache
             await invalidate_order_cache(str(order_id))
+            await invalidate_dashboard_cache(self.trading_account_id)
 
             # Publish order updated event
             await publish_order_update(
@@ -500,6 +521,7 @@ class OrderService:
 
             # Invalidate cache
             await invalidate_order_cache(str(order_id))
+            await invalidate_dashboard_cache(self.trading_account_id)
 
             # Publish order cancelled event
             await publish_order_update(
@@ -558,7 +580,8 @@ class OrderService:
         limit: int = 100,
         offset: int = 0,
         today_only: bool = True,
-        order_ids: Optional[List[int]] = None
+        order_ids: Optional[List[int]] = None,
+        cursor: Optional[str] = None
     ) -> List[Order]:
         """
         List user's orders with optional filtering.
@@ -568,12 +591,16 @@ class OrderService:
             status: Filter by status
             position_id: Filter by position ID
             limit: Maximum number of orders to return
-            offset: Number of orders to skip
+            offset: Number of orders to skip (ignored when cursor is given)
             today_only: If True, only return today's orders (default: True)
             order_ids: Optional list of order IDs to filter to (for granular ACL)
+            cursor: Opaque keyset cursor from the previous page
 
         Returns:
             List of Order objects
+
+        Raises:
+            InvalidCursorError: If cursor is malformed
         """
         # ACL check already verified at endpoint level - only filter by trading_account_id
         # user_id represents who created/placed the order, not who owns the account
@@ -592,11 +619,15 @@ class OrderService:
         query = (
             select(Order)
             .where(*filters)
-            .order_by(Order.created_at.desc())
+            .order_by(Order.created_at.desc(), Order.id.desc())
             .limit(limit)
-            .offset(offset)
         )
 
+        if cursor:
+            query = query.where(keyset_condition(Order.created_at, Order.id, cursor))
+        elif offset:
+            query = query.offset(offset)
+
         result = await self.db.execute(query)
         orders = result.scalars().all()
         logger.debug(f"Retrieved {len(orders)} orders for user {self.user_id}")
@@ -621,8 +652,9 @@ class OrderService:
             conditions.append(Order.id.in_(order_ids))
 
         if today_only:
-            today = date.today()
-            conditions.append(func.date(Order.created_at) == today)
+            day_start, day_end = day_bounds(date.today())
+            conditions.append(Order.created_at >= day_start)
+            conditions.append(Order.created_at < day_end)
 
         if symbol:
             conditions.append(Order.symbol == symbol)
@@ -641,9 +673,15 @@ class OrderService:
         status: Optional[str] = None,
         position_id: Optional[int] = None,
         today_only: bool = True,
-        order_ids: Optional[List[int]] = None
+        order_ids: Optional[List[int]] = None,
+        approximate: bool = False
     ) -> int:
-        """Count orders matching the same filters (ignoring pagination)."""
+        """
+        Count orders matching the same filters (ignoring pagination).
+
+        With approximate=True the planner's estimate is returned for large
+        result sets instead of running COUNT(*) over every matching row.
+        """
         filters = self._build_order_filter_conditions(
             symbol=symbol,
             status=status,
@@ -655,6 +693,11 @@ class OrderService:
         if filters is None:
             return 0
 
+        if approximate:
+            estimate = await estimate_count(self.db, select(Order.id).where(*filters))
+            if estimate >= APPROXIMATE_COUNT_THRESHOLD:
+                return estimate
+
         query = select(func.count()).where(*filters)
         result = await self.db.execute(query)
         total = result.scalar()
@@ -895,16 +938,27 @@ class OrderService:
         transaction_type: str,
         quantity: int,
         price: float,
+        snapshot: Optional[RiskSnapshot] = None,
     ) -> tuple[bool, str]:
         """
         Perform risk checks on order.
 
+        Checks run against the account's cached risk snapshot, so a check
+        normally costs no database round trips.
+
+        Args:
+            snapshot: Snapshot to check against (defaults to the shared cached one;
+                batches pass their own copy so accepted legs are reserved in it)
+
         Returns:
             Tuple of (passed: bool, details: str)
         """
         if not settings.enable_risk_checks:
             return True, "Risk checks disabled"
 
+        if snapshot is None:
+            snapshot = await self._get_risk_snapshot()
+
         errors: List[str] = []
 
         order_value = quantity * price
@@ -915,13 +969,8 @@ class OrderService:
 
         if price > 0:
             segment = MarketHoursService.get_segment_from_symbol(symbol)
-            margin_service = MarginService(
-                self.db,
-                user_id=self.user_id,
-                trading_account_id=self.trading_account_id_int
-            )
             required_margin = order_value * settings.risk_margin_multiplier
-            available_margin = await margin_service.get_available_margin(segment=segment.value)
+            available_margin = await self._get_available_margin(snapshot, segment.value)
 
             if available_margin < required_margin:
                 errors.append(
@@ -929,8 +978,8 @@ class OrderService:
                     f"need {required_margin:.2f}, available {available_margin:.2f}"
                 )
 
-            symbol_exposure = await self._get_symbol_exposure(symbol, price)
-            total_exposure = await self._get_total_exposure(price)
+            symbol_exposure = snapshot.symbol_exposure(symbol, price)
+            total_exposure = snapshot.total_exposure(price)
             new_symbol_exposure = symbol_exposure + order_value
 
             if new_symbol_exposure > settings.max_position_exposure_value:
@@ -948,7 +997,7 @@ class OrderService:
                         f"{settings.max_position_concentration_pct:.2%}"
                     )
 
-        today_pnl = await self._get_today_net_pnl()
+        today_pnl = snapshot.today_net_pnl
         if today_pnl <= settings.daily_loss_limit:
             errors.append(
                 f"Daily loss limit breached (today_pnl={today_pnl:.2f}, "
@@ -962,52 +1011,68 @@ class OrderService:
 
         return True, "All checks passed"
 
-    def _price_coalesce_expression(self, fallback_price: float):
-        """Helper to choose best price for exposure calculations."""
-        fallback_literal = literal(fallback_price or 0.0)
-        return func.coalesce(
+    async def _get_risk_snapshot(self) -> RiskSnapshot:
+        """Get the account's shared risk snapshot (loaded at most once per TTL)."""
+        return await get_risk_snapshot_cache().get(self.trading_account_id, self._load_risk_snapshot)
+
+    async def _load_risk_snapshot(self) -> RiskSnapshot:
+        """
+        Load exposure and today's net P&L for the account in one grouped query.
+
+        Quantity with no known price is summed separately so the order price
+        can be applied as the fallback price at check time.
+        """
+        price_expr = func.coalesce(
             Position.last_price,
             Position.close_price,
             Position.buy_price,
-            Position.sell_price,
-            fallback_literal,
-            0.0
-        )
-
-    async def _get_symbol_exposure(self, symbol: str, fallback_price: float) -> float:
-        """Calculate current exposure for a symbol (abs(quantity) * price)."""
-        price_expr = self._price_coalesce_expression(fallback_price)
-        query = select(
-            func.coalesce(func.sum(func.abs(Position.quantity) * price_expr), 0.0)
-        ).where(
-            Position.trading_account_id == self.trading_account_id,
-            Position.symbol == symbol
+            Position.sell_price
         )
-        result = await self.db.execute(query)
-        return float(result.scalar() or 0.0)
-
-    async def _get_total_exposure(self, fallback_price: float) -> float:
-        """Calculate total exposure across all open positions."""
-        price_expr = self._price_coalesce_expression(fallback_price)
+        abs_quantity = func.abs(Position.quantity)
         query = select(
-            func.coalesce(func.sum(func.abs(Position.quantity) * price_expr), 0.0)
+            Position.symbol,
+            func.coalesce(func.sum(abs_quantity * func.coalesce(price_expr, 0.0)), 0.0),
+            func.coalesce(func.sum(case((price_expr.is_(None), abs_quantity), else_=0)), 0),
+            func.coalesce(
+                func.sum(case((func.date(Position.trading_day) == date.today(), Position.net_pnl), else_=0)),
+                0.0
+            ),
         ).where(
             Position.trading_account_id == self.trading_account_id
-        )
-        result = await self.db.execute(query)
-        return float(result.scalar() or 0.0)
+        ).group_by(Position.symbol)
 
-    async def _get_today_net_pnl(self) -> float:
-        """Return today's net profit/loss for the account."""
-        today = date.today()
-        query = select(
-            func.coalesce(func.sum(Position.net_pnl), 0.0)
-        ).where(
-            Position.trading_account_id == self.trading_account_id,
-            func.date(Position.trading_day) == today
-        )
         result = await self.db.execute(query)
-        return float(result.scalar() or 0.0)
+
+        snapshot = RiskSnapshot(trading_account_id=self.trading_account_id)
+        for symbol, priced_value, unpriced_quantity, net_pnl in result.all():
+            snapshot.symbols[symbol] = SymbolExposure(
+                priced_value=float(priced_value or 0.0),
+                unpriced_quantity=float(unpriced_quantity or 0.0)
+            )
+            snapshot.today_net_pnl += float(net_pnl or 0.0)
+
+        return snapshot
+
+    async def _get_available_margin(self, snapshot: RiskSnapshot, segment: str) -> float:
+        """Available margin for a segment, fetched once per snapshot."""
+        if segment not in snapshot.available_margin:
+            margin_service = MarginService(
+                self.db,
+                user_id=self.user_id,
+                trading_account_id=self.trading_account_id_int
+            )
+            snapshot.available_margin[segment] = float(
+                await margin_service.get_available_margin(segment=segment)
+            )
+        return snapshot.available_margin[segment]
+
+    def _risk_reservation(self, symbol: str, quantity: int, price: Optional[float]) -> Optional[tuple]:
+        """(symbol, order_value, segment, required_margin) to apply to a snapshot for an accepted order."""
+        if not settings.enable_risk_checks or not price:
+            return None
+        order_value = quantity * price
+        segment = MarketHoursService.get_segment_from_symbol(symbol)
+        return symbol, order_value, segment.value, order_value * settings.risk_margin_multiplier
 
     # ==========================================
     # BATCH ORDER EXECUTION
@@ -1062,6 +1127,11 @@ class OrderService:
         placed_broker_ids = []  # Track broker IDs for rollback
         db_orders = []  # Track database order objects
 
+        # One risk snapshot for the whole batch; each accepted leg is reserved in
+        # this copy so later legs are checked against it
+        risk_snapshot = (await self._get_risk_snapshot()).copy() if settings.enable_risk_checks else None
+        reservations: Dict[int, tuple] = {}
+
         # Phase 1: Validate all orders upfront
         for idx, order_data in enumerate(orders):
             try:
@@ -1097,8 +1167,17 @@ class OrderService:
                     transaction_type=order_data["transaction_type"],
                     quantity=order_data["quantity"],
                     price=order_data.get("price", 0),
+                    snapshot=risk_snapshot,
                 )
 
+                if risk_passed:
+                    reservation = self._risk_reservation(
+                        order_data["symbol"], order_data["quantity"], order_data.get("price")
+                    )
+                    if reservation:
+                        risk_snapshot.reserve(*reservation)
+                        reservations[idx] = reservation
+
                 if not risk_passed:
                     if atomic:
                         raise HTTPException(
@@ -1306,6 +1385,15 @@ class OrderService:
             # Phase 4: Commit all changes
             await self.db.commit()
 
+            # Reserve submitted orders in the shared risk snapshot
+            risk_cache = get_risk_snapshot_cache()
+            for idx in successful_orders:
+                if idx in reservations:
+                    risk_cache.record_order(self.trading_account_id, *reservations[idx])
+
+            if successful_orders:
+                await invalidate_dashboard_cache(self.trading_account_id)
+
             # Refresh orders to get final state
             for result in results:
                 if result.get("success") and result.get("order"):
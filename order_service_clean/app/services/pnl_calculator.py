@@ -3,16 +3,36 @@ P&L Calculator Service
 
 Calculates realized and unrealized P&L for strategies from trades and positions.
 Updates public.strategy_pnl_metrics table in real-time.
+
+Strategy-level metrics are computed by a fused engine
+(calculate_strategy_metrics_batch) that reads each strategy-day once: one
+grouped query over positions and one over trades, for any number of
+strategies. The per-metric calculate_* methods remain for ad-hoc use.
 """
+import asyncio
 import logging
-from datetime import date
+from datetime import date, datetime, time, timedelta
 from decimal import Decimal
-from typing import Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = logging.getLogger(__name__)
 
+# Per-group aggregates feeding build_strategy_metrics()
+_POSITION_METRICS_COLUMNS = """
+    COALESCE(SUM(realized_pnl) FILTER (WHERE is_open = false), 0) as realized_pnl,
+    COALESCE(SUM(unrealized_pnl) FILTER (WHERE is_open = true), 0) as unrealized_pnl,
+    COUNT(*) FILTER (WHERE is_open = true) as open_positions,
+    COUNT(*) FILTER (WHERE is_open = false) as closed_positions,
+    COUNT(*) FILTER (WHERE is_open = false AND realized_pnl > 0) as winning_trades,
+    COUNT(*) FILTER (WHERE is_open = false AND realized_pnl < 0) as losing_trades,
+    COALESCE(AVG(buy_value + sell_value), 0) as avg_position_size,
+    COALESCE(SUM(buy_value), 0) as capital_deployed,
+    ARRAY_AGG(realized_pnl ORDER BY closed_at ASC)
+        FILTER (WHERE is_open = false) as closed_realized_pnl
+"""
+
 
 class PnLCalculator:
     """Calculate strategy P&L from trades and positions"""
@@ -232,6 +252,10 @@ class PnLCalculator:
         Returns:
             Win rate as percentage (0-100)
         """
+        return self._win_rate(winning_trades, losing_trades)
+
+    @staticmethod
+    def _win_rate(winning_trades: int, losing_trades: int) -> Decimal:
         total = winning_trades + losing_trades
         if total == 0:
             return Decimal('0')
@@ -446,6 +470,228 @@ class PnLCalculator:
             logger.error(f"Error calculating max consecutive losses: {e}")
             return 0
 
+    # ==================================================================================
+    # FUSED STRATEGY METRICS
+    # ==================================================================================
+
+    async def calculate_strategy_metrics_batch(
+        self,
+        strategy_ids: Iterable[int],
+        trading_day: Optional[date] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Calculate all strategy-day metrics for many strategies at once.
+
+        Runs one grouped query over positions and one over trades regardless
+        of the number of strategies; everything else is derived in Python.
+
+        Args:
+            strategy_ids: Strategy IDs
+            trading_day: Optional date filter (defaults to today)
+
+        Returns:
+            Dict of strategy_id -> metrics (zeroed for strategies with no rows)
+        """
+        if trading_day is None:
+            trading_day = date.today()
+
+        strategy_ids = list(dict.fromkeys(strategy_ids))
+        if not strategy_ids:
+            return {}
+
+        day_start = datetime.combine(trading_day, time.min)
+        params = {
+            "strategy_ids": strategy_ids,
+            "trading_day": trading_day,
+            "day_start": day_start,
+            "day_end": day_start + timedelta(days=1),
+        }
+
+        try:
+            result = await self.db.execute(
+                text(f"""
+                    SELECT strategy_id, {_POSITION_METRICS_COLUMNS}
+                    FROM order_service.positions
+                    WHERE strategy_id = ANY(:strategy_ids)
+                      AND trading_day = :trading_day
+                    GROUP BY strategy_id
+                """),
+                params
+            )
+            position_rows = {row.strategy_id: row for row in result.fetchall()}
+
+            result = await self.db.execute(
+                text("""
+                    SELECT strategy_id, COUNT(*) as total_trades
+                    FROM order_service.trades
+                    WHERE strategy_id = ANY(:strategy_ids)
+                      AND trade_time >= :day_start
+                      AND trade_time < :day_end
+                    GROUP BY strategy_id
+                """),
+                params
+            )
+            trade_counts = {row.strategy_id: row.total_trades for row in result.fetchall()}
+
+        except (ConnectionError, TimeoutError) as e:
+            logger.error(f"Database connection error calculating metrics for strategies {strategy_ids}: {e}")
+            from ..exceptions import DatabaseError
+            raise DatabaseError(f"Unable to calculate strategy metrics due to database connection error: {e}")
+        except Exception as e:
+            # INTENTIONAL FALLBACK: Final safety net for unexpected system errors
+            # This prevents silent P&L corruption by ensuring all failures are logged and surfaced
+            logger.critical(f"CRITICAL: Unexpected error calculating metrics for strategies {strategy_ids}: {e}", exc_info=True)
+            from ..exceptions import OrderServiceError
+            raise OrderServiceError(f"Critical strategy metrics calculation failure: {e}")
+
+        return {
+            strategy_id: self.build_strategy_metrics(
+                position_rows.get(strategy_id),
+                trade_counts.get(strategy_id, 0)
+            )
+            for strategy_id in strategy_ids
+        }
+
+    async def calculate_strategy_daily_metrics(
+        self,
+        strategy_id: int,
+        start_date: date,
+        end_date: date
+    ) -> Dict[date, Dict[str, Any]]:
+        """
+        Calculate strategy metrics for every trading day in a range.
+
+        Same metrics as calculate_strategy_metrics(), from one positions query
+        and one trades query grouped by day (used by the historical backfill).
+
+        Args:
+            strategy_id: Strategy ID
+            start_date: Start date (inclusive)
+            end_date: End date (inclusive)
+
+        Returns:
+            Dict of trading_day -> metrics, for days with positions or trades
+        """
+        params = {
+            "strategy_id": strategy_id,
+            "start_date": start_date,
+            "end_date": end_date,
+            "range_start": datetime.combine(start_date, time.min),
+            "range_end": datetime.combine(end_date + timedelta(days=1), time.min),
+        }
+
+        try:
+            result = await self.db.execute(
+                text(f"""
+                    SELECT trading_day, {_POSITION_METRICS_COLUMNS}
+                    FROM order_service.positions
+                    WHERE strategy_id = :strategy_id
+                      AND trading_day BETWEEN :start_date AND :end_date
+                    GROUP BY trading_day
+                """),
+                params
+            )
+            position_rows = {row.trading_day: row for row in result.fetchall()}
+
+            result = await self.db.execute(
+                text("""
+                    SELECT DATE(trade_time) as trading_day, COUNT(*) as total_trades
+                    FROM order_service.trades
+                    WHERE strategy_id = :strategy_id
+                      AND trade_time >= :range_start
+                      AND trade_time < :range_end
+                    GROUP BY DATE(trade_time)
+                """),
+                params
+            )
+            trade_counts = {row.trading_day: row.total_trades for row in result.fetchall()}
+
+        except (ConnectionError, TimeoutError) as e:
+            logger.error(f"Database connection error calculating daily metrics for strategy {strategy_id}: {e}")
+            from ..exceptions import DatabaseError
+            raise DatabaseError(f"Unable to calculate daily strategy metrics due to database connection error: {e}")
+        except Exception as e:
+            # INTENTIONAL FALLBACK: Final safety net for unexpected system errors
+            # This prevents silent P&L corruption by ensuring all failures are logged and surfaced
+            logger.critical(f"CRITICAL: Unexpected error calculating daily metrics for strategy {strategy_id}: {e}", exc_info=True)
+            from ..exceptions import OrderServiceError
+            raise OrderServiceError(f"Critical daily metrics calculation failure for strategy {strategy_id}: {e}")
+
+        return {
+            trading_day: self.build_strategy_metrics(
+                position_rows.get(trading_day),
+                trade_counts.get(trading_day, 0)
+            )
+            for trading_day in sorted(set(position_rows) | set(trade_counts))
+        }
+
+    async def calculate_strategy_metrics(
+        self,
+        strategy_id: int,
+        trading_day: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """
+        Calculate all strategy-day metrics for one strategy.
+
+        Args:
+            strategy_id: Strategy ID
+            trading_day: Optional date filter (defaults to today)
+
+        Returns:
+            Metrics dict (see build_strategy_metrics)
+        """
+        metrics = await self.calculate_strategy_metrics_batch([strategy_id], trading_day)
+        return metrics[strategy_id]
+
+    @classmethod
+    def build_strategy_metrics(cls, row: Any, total_trades: int) -> Dict[str, Any]:
+        """Derive every strategy-day metric from one aggregated positions row (None if no positions)."""
+        if row is None:
+            realized_pnl = unrealized_pnl = avg_position_size = capital_deployed = Decimal('0')
+            open_positions = closed_positions = winning_trades = losing_trades = 0
+            closed_realized_pnl: List[Any] = []
+        else:
+            realized_pnl = Decimal(str(row.realized_pnl))
+            unrealized_pnl = Decimal(str(row.unrealized_pnl))
+            avg_position_size = Decimal(str(row.avg_position_size))
+            capital_deployed = Decimal(str(row.capital_deployed))
+            open_positions = row.open_positions
+            closed_positions = row.closed_positions
+            winning_trades = row.winning_trades
+            losing_trades = row.losing_trades
+            closed_realized_pnl = row.closed_realized_pnl or []
+
+        total_pnl = realized_pnl + unrealized_pnl
+
+        roi_percent = Decimal('0')
+        if capital_deployed != 0:
+            roi_percent = ((total_pnl / capital_deployed) * Decimal('100')).quantize(Decimal('0.01'))
+
+        max_consecutive_losses = 0
+        current_consecutive = 0
+        for pnl in closed_realized_pnl:
+            if pnl is not None and Decimal(str(pnl)) < 0:
+                current_consecutive += 1
+                max_consecutive_losses = max(max_consecutive_losses, current_consecutive)
+            else:
+                current_consecutive = 0
+
+        return {
+            "realized_pnl": realized_pnl,
+            "unrealized_pnl": unrealized_pnl,
+            "total_pnl": total_pnl,
+            "open_positions": open_positions,
+            "closed_positions": closed_positions,
+            "total_trades": total_trades,
+            "winning_trades": winning_trades,
+            "losing_trades": losing_trades,
+            "win_rate": cls._win_rate(winning_trades, losing_trades),
+            "avg_position_size": avg_position_size,
+            "capital_deployed": capital_deployed,
+            "roi_percent": roi_percent,
+            "max_consecutive_losses": max_consecutive_losses,
+        }
+
     async def update_strategy_pnl_metrics(
         self,
         strategy_id: int,
@@ -469,84 +715,155 @@ class PnLCalculator:
         try:
             logger.info(f"Updating P&L metrics for strategy {strategy_id} on {trading_day}")
 
-            # Calculate all core metrics
-            realized_pnl = await self.calculate_realized_pnl(strategy_id, trading_day)
-            unrealized_pnl = await self.calculate_unrealized_pnl(strategy_id, trading_day)
-            total_pnl = realized_pnl + unrealized_pnl
+            metrics = await self.calculate_strategy_metrics(strategy_id, trading_day)
+            return await self._store_strategy_pnl_metrics(strategy_id, trading_day, metrics)
 
-            trade_metrics = await self.calculate_trade_metrics(strategy_id, trading_day)
-            position_counts = await self.calculate_position_counts(strategy_id, trading_day)
-
-            win_rate = await self.calculate_win_rate(
-                trade_metrics["winning_trades"],
-                trade_metrics["losing_trades"]
-            )
+        except Exception as e:
+            logger.error(f"Error updating P&L metrics for strategy {strategy_id}: {e}", exc_info=True)
+            await self.db.rollback()
+            return False
 
-            # Calculate day P&L (difference from previous day's cumulative)
-            previous_cumulative = await self._get_previous_cumulative_pnl(strategy_id, trading_day)
-            day_pnl = total_pnl - previous_cumulative
+    async def update_strategy_pnl_metrics_batch(
+        self,
+        strategy_ids: Iterable[int],
+        trading_day: Optional[date] = None,
+        max_concurrency: int = 8
+    ) -> Dict[int, bool]:
+        """
+        Update P&L metrics for many strategies on one trading day.
 
-            # Calculate additional performance metrics
-            avg_position_size = await self.calculate_avg_position_size(strategy_id, trading_day)
-            capital_deployed = await self.calculate_capital_deployed(strategy_id, trading_day)
-            max_drawdown = await self.calculate_max_drawdown(strategy_id)
-            roi_percent = await self.calculate_roi_percent(strategy_id, trading_day)
-            max_consecutive_losses = await self.calculate_max_consecutive_losses(strategy_id, trading_day)
+        Metrics for all strategies come from a single fused calculation; the
+        Analytics Service calls are then made concurrently.
 
-            # Note: margin_used would require broker API call - set to 0 for now
-            margin_used = Decimal('0')
+        Args:
+            strategy_ids: Strategy IDs
+            trading_day: Optional date filter (defaults to today)
+            max_concurrency: Maximum concurrent Analytics Service updates
 
-            # Note: sharpe_ratio and sortino_ratio require volatility calc - set to 0 for now
-            # These should be calculated separately with sufficient historical data
-            sharpe_ratio = Decimal('0')
-            sortino_ratio = Decimal('0')
+        Returns:
+            Dict of strategy_id -> True if stored successfully
+        """
+        if trading_day is None:
+            trading_day = date.today()
 
-            from ..clients.analytics_service_client import get_analytics_client
-            
-            # Prepare comprehensive P&L data for Analytics Service API
-            pnl_data = {
-                "day_pnl": float(day_pnl),
-                "cumulative_pnl": float(total_pnl),
-                "realized_pnl": float(realized_pnl),
-                "unrealized_pnl": float(unrealized_pnl),
-                "open_positions": position_counts["open_positions"],
-                "closed_positions": position_counts["closed_positions"],
-                "total_trades": trade_metrics["total_trades"],
-                "winning_trades": trade_metrics["winning_trades"],
-                "losing_trades": trade_metrics["losing_trades"],
-                "win_rate": float(win_rate),
-                "avg_position_size": float(avg_position_size),
-                "capital_deployed": float(capital_deployed),
-                "margin_used": float(margin_used),
-                "max_drawdown": float(max_drawdown),
-                "sharpe_ratio": float(sharpe_ratio),
-                "sortino_ratio": float(sortino_ratio),
-                "max_consecutive_losses": max_consecutive_losses,
-                "roi_percent": float(roi_percent),
-            }
-            
-            # Send to Analytics Service API (replaces direct public.strategy_pnl_metrics access)
-            analytics_client = await get_analytics_client()
-            success = await analytics_client.calculate_and_store_pnl_metrics(
-                strategy_id=str(strategy_id),
-                metric_date=trading_day,
-                pnl_data=pnl_data
-            )
-            
-            if success:
-                logger.info(
-                    f"✅ Updated P&L metrics for strategy {strategy_id}: "
-                    f"Realized={realized_pnl}, Unrealized={unrealized_pnl}, Total={total_pnl}"
-                )
-                return True
-            else:
-                logger.error(f"Analytics Service failed to store P&L metrics for strategy {strategy_id}")
-                return False
+        strategy_ids = list(dict.fromkeys(strategy_ids))
+        if not strategy_ids:
+            return {}
 
+        try:
+            all_metrics = await self.calculate_strategy_metrics_batch(strategy_ids, trading_day)
         except Exception as e:
-            logger.error(f"Error updating P&L metrics for strategy {strategy_id}: {e}", exc_info=True)
+            logger.error(f"Error calculating P&L metrics for {len(strategy_ids)} strategies: {e}", exc_info=True)
             await self.db.rollback()
-            return False
+            return {strategy_id: False for strategy_id in strategy_ids}
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def store(strategy_id: int) -> bool:
+            async with semaphore:
+                try:
+                    return await self._store_strategy_pnl_metrics(strategy_id, trading_day, all_metrics[strategy_id])
+                except Exception as e:
+                    logger.error(f"Error updating P&L metrics for strategy {strategy_id}: {e}", exc_info=True)
+                    return False
+
+        results = await asyncio.gather(*(store(strategy_id) for strategy_id in strategy_ids))
+        return dict(zip(strategy_ids, results))
+
+    async def _store_strategy_pnl_metrics(
+        self,
+        strategy_id: int,
+        trading_day: date,
+        metrics: Dict[str, Any]
+    ) -> bool:
+        """
+        Send computed strategy metrics to the Analytics Service.
+
+        Args:
+            strategy_id: Strategy ID
+            trading_day: Metric date
+            metrics: Output of calculate_strategy_metrics()
+
+        Returns:
+            True if stored successfully
+        """
+        # Day P&L (difference from previous day's cumulative) and drawdown come
+        # from the Analytics Service and don't depend on each other
+        previous_cumulative, max_drawdown = await asyncio.gather(
+            self._get_previous_cumulative_pnl(strategy_id, trading_day),
+            self.calculate_max_drawdown(strategy_id)
+        )
+        pnl_data = self.build_pnl_data(metrics, previous_cumulative, max_drawdown)
+
+        from ..clients.analytics_service_client import get_analytics_client
+
+        # Send to Analytics Service API (replaces direct public.strategy_pnl_metrics access)
+        analytics_client = await get_analytics_client()
+        success = await analytics_client.calculate_and_store_pnl_metrics(
+            strategy_id=str(strategy_id),
+            metric_date=trading_day,
+            pnl_data=pnl_data
+        )
+
+        if success:
+            logger.info(
+                f"✅ Updated P&L metrics for strategy {strategy_id}: "
+                f"Realized={metrics['realized_pnl']}, Unrealized={metrics['unrealized_pnl']}, "
+                f"Total={metrics['total_pnl']}"
+            )
+            return True
+
+        logger.error(f"Analytics Service failed to store P&L metrics for strategy {strategy_id}")
+        return False
+
+    @staticmethod
+    def build_pnl_data(
+        metrics: Dict[str, Any],
+        previous_cumulative: Decimal,
+        max_drawdown: Decimal
+    ) -> Dict[str, Any]:
+        """
+        Build the Analytics Service P&L payload for one strategy-day.
+
+        Args:
+            metrics: Output of calculate_strategy_metrics()
+            previous_cumulative: Cumulative P&L of the previous metric day
+            max_drawdown: Maximum drawdown
+
+        Returns:
+            pnl_data dict for calculate_and_store_pnl_metrics()
+        """
+        total_pnl = metrics["total_pnl"]
+        day_pnl = total_pnl - previous_cumulative
+
+        # Note: margin_used would require broker API call - set to 0 for now
+        margin_used = Decimal('0')
+
+        # Note: sharpe_ratio and sortino_ratio require volatility calc - set to 0 for now
+        # These should be calculated separately with sufficient historical data
+        sharpe_ratio = Decimal('0')
+        sortino_ratio = Decimal('0')
+
+        return {
+            "day_pnl": float(day_pnl),
+            "cumulative_pnl": float(total_pnl),
+            "realized_pnl": float(metrics["realized_pnl"]),
+            "unrealized_pnl": float(metrics["unrealized_pnl"]),
+            "open_positions": metrics["open_positions"],
+            "closed_positions": metrics["closed_positions"],
+            "total_trades": metrics["total_trades"],
+            "winning_trades": metrics["winning_trades"],
+            "losing_trades": metrics["losing_trades"],
+            "win_rate": float(metrics["win_rate"]),
+            "avg_position_size": float(metrics["avg_position_size"]),
+            "capital_deployed": float(metrics["capital_deployed"]),
+            "margin_used": float(margin_used),
+            "max_drawdown": float(max_drawdown),
+            "sharpe_ratio": float(sharpe_ratio),
+            "sortino_ratio": float(sortino_ratio),
+            "max_consecutive_losses": metrics["max_consecutive_losses"],
+            "roi_percent": float(metrics["roi_percent"]),
+        }
 
     async def _get_previous_cumulative_pnl(self, strategy_id: int, trading_day: date) -> Decimal:
         """
@@ -586,27 +903,20 @@ class PnLCalculator:
         """
         trading_day = date.today()
 
-        realized_pnl = await self.calculate_realized_pnl(strategy_id, trading_day)
-        unrealized_pnl = await self.calculate_unrealized_pnl(strategy_id, trading_day)
-        trade_metrics = await self.calculate_trade_metrics(strategy_id, trading_day)
-        position_counts = await self.calculate_position_counts(strategy_id, trading_day)
-        win_rate = await self.calculate_win_rate(
-            trade_metrics["winning_trades"],
-            trade_metrics["losing_trades"]
-        )
+        metrics = await self.calculate_strategy_metrics(strategy_id, trading_day)
 
         return {
             "strategy_id": strategy_id,
             "trading_day": trading_day.isoformat(),
-            "realized_pnl": float(realized_pnl),
-            "unrealized_pnl": float(unrealized_pnl),
-            "total_pnl": float(realized_pnl + unrealized_pnl),
-            "open_positions": position_counts["open_positions"],
-            "closed_positions": position_counts["closed_positions"],
-            "total_trades": trade_metrics["total_trades"],
-            "winning_trades": trade_metrics["winning_trades"],
-            "losing_trades": trade_metrics["losing_trades"],
-            "win_rate": float(win_rate),
+            "realized_pnl": float(metrics["realized_pnl"]),
+            "unrealized_pnl": float(metrics["unrealized_pnl"]),
+            "total_pnl": float(metrics["total_pnl"]),
+            "open_positions": metrics["open_positions"],
+            "closed_positions": metrics["closed_positions"],
+            "total_trades": metrics["total_trades"],
+            "winning_trades": metrics["winning_trades"],
+            "losing_trades": metrics["losing_trades"],
+            "win_rate": float(metrics["win_rate"]),
         }
 
     # ==================================================================================
@@ -0,0 +1,341 @@
+"""
+In-Memory Position Book
+
+Holds open positions in process, keyed by instrument_token, so ticks can
+re-mark unrealized P&L without a database round trip.
+
+Architecture:
+- Position fields live in parallel typed arrays (one slot per position)
+  instead of ORM objects, keeping the book compact for tens of thousands
+  of F&O positions
+- Prices and money are held as integers in 1/10000 units, so marks are
+  exact and readers get Decimals rounded to cents like the Numeric(18, 2)
+  columns
+- TickListener applies coalesced LTPs to the book on every batch and only
+  persists marks to Postgres on a slower cadence or on large price moves
+- Readers (position summary, account aggregation) overlay book marks on
+  DB rows so P&L stays current even while persistence lags
+
+P&L semantics match the TickListener flush SQL:
+- quantity > 0: unrealized = (ltp - buy_price) * quantity
+- quantity < 0: unrealized = (sell_price - ltp) * |quantity|
+- total = realized + unrealized, net = total - total_charges
+"""
+import logging
+import time
+from array import array
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# Fixed-point scale for prices and P&L (covers 0.0025 currency tick sizes)
+UNITS_PER_RUPEE = 10_000
+_CENT = Decimal("0.01")
+
+
+def _to_units(value: Any) -> int:
+    """Convert a Numeric/Decimal/number/None value to fixed-point units."""
+    if value is None:
+        return 0
+    return int((Decimal(str(value)) * UNITS_PER_RUPEE).to_integral_value(ROUND_HALF_UP))
+
+
+def _to_money(units: int) -> Decimal:
+    """Fixed-point units as a Decimal rounded to cents (as Numeric(18, 2) stores it)."""
+    return (Decimal(units) / UNITS_PER_RUPEE).quantize(_CENT, ROUND_HALF_UP)
+
+
+class PositionBook:
+    """
+    Array-backed book of open positions for tick-driven P&L.
+
+    Slots are packed: removing a position moves the last slot into the hole,
+    so iteration never skips tombstones.
+    """
+
+    def __init__(self):
+        # Numeric columns (one entry per slot); money in UNITS_PER_RUPEE units
+        self._position_ids = array('q')
+        self._tokens = array('q')
+        self._quantity = array('q')
+        self._buy_price = array('q')
+        self._sell_price = array('q')
+        self._realized = array('q')
+        self._charges = array('q')
+        self._last_price = array('q')
+        self._unrealized = array('q')
+
+        # Indexes
+        self._slot_by_position: Dict[int, int] = {}
+        self._slots_by_token: Dict[int, Set[int]] = {}
+
+        self._ready = False
+        self.loaded_at: Optional[float] = None
+
+        # Statistics
+        self._total_loads = 0
+        self._total_marks_applied = 0
+        self._last_load_ms = 0.0
+
+    # ==========================================
+    # LOADING & MAINTENANCE
+    # ==========================================
+
+    @property
+    def is_ready(self) -> bool:
+        """True once the book has been loaded from the database."""
+        return self._ready
+
+    def __len__(self) -> int:
+        return len(self._position_ids)
+
+    def tokens(self) -> Set[int]:
+        """Instrument tokens with at least one open position in the book."""
+        return set(self._slots_by_token)
+
+    async def load(self, session: AsyncSession) -> int:
+        """
+        Replace the book contents with all open positions from the database.
+
+        Args:
+            session: Database session
+
+        Returns:
+            Number of positions loaded
+        """
+        start = time.perf_counter()
+        result = await session.execute(text("""
+            SELECT
+                id, instrument_token, quantity, buy_price, sell_price, realized_pnl, total_charges,
+                last_price, unrealized_pnl
+            FROM order_service.positions
+            WHERE is_open = true
+              AND quantity != 0
+              AND instrument_token IS NOT NULL
+        """))
+        rows = result.fetchall()
+
+        self._clear()
+        for row in rows:
+            self._append(row._mapping)
+
+        self._ready = True
+        self.loaded_at = time.monotonic()
+        self._total_loads += 1
+        self._last_load_ms = (time.perf_counter() - start) * 1000
+
+        logger.debug(f"Position book loaded {len(rows)} positions in {self._last_load_ms:.1f}ms")
+        return len(rows)
+
+    def upsert(self, position: Any):
+        """
+        Add or refresh a position after a fill.
+
+        Closed or flat positions are removed from the book.
+
+        Args:
+            position: Position ORM object or mapping with position columns
+        """
+        data = position if isinstance(position, dict) else {
+            "id": position.id,
+            "instrument_token": position.instrument_token,
+            "is_open": position.is_open,
+            "quantity": position.quantity,
+            "buy_price": position.buy_price,
+            "sell_price": position.sell_price,
+            "realized_pnl": position.realized_pnl,
+            "total_charges": position.total_charges,
+            "last_price": position.last_price,
+            "unrealized_pnl": position.unrealized_pnl,
+        }
+
+        position_id = data.get("id")
+        if position_id is None:
+            return
+
+        self.remove(position_id)
+
+        if not data.get("quantity") or data.get("is_open") is False or not data.get("instrument_token"):
+            return
+
+        self._append(data)
+
+    def remove(self, position_id: int) -> bool:
+        """Remove a position from the book. Returns True if it was present."""
+        slot = self._slot_by_position.get(position_id)
+        if slot is None:
+            return False
+
+        self._unindex(slot)
+        last = len(self._position_ids) - 1
+
+        if slot != last:
+            # Move the last slot into the hole and re-point its indexes
+            self._unindex(last)
+            for column in self._columns():
+                column[slot] = column[last]
+            self._index(slot)
+
+        for column in self._columns():
+            column.pop()
+
+        return True
+
+    def _columns(self) -> Tuple[Any, ...]:
+        return (
+            self._position_ids, self._tokens, self._quantity,
+            self._buy_price, self._sell_price, self._realized, self._charges,
+            self._last_price, self._unrealized,
+        )
+
+    def _clear(self):
+        for column in self._columns():
+            del column[:]
+        self._slot_by_position.clear()
+        self._slots_by_token.clear()
+
+    def _append(self, data: Any):
+        self._position_ids.append(int(data["id"]))
+        self._tokens.append(int(data["instrument_token"]))
+        self._quantity.append(int(data["quantity"]))
+        self._buy_price.append(_to_units(data.get("buy_price")))
+        self._sell_price.append(_to_units(data.get("sell_price")))
+        self._realized.append(_to_units(data.get("realized_pnl")))
+        self._charges.append(_to_units(data.get("total_charges")))
+        self._last_price.append(_to_units(data.get("last_price")))
+        self._unrealized.append(_to_units(data.get("unrealized_pnl")))
+
+        self._index(len(self._position_ids) - 1)
+
+    def _index(self, slot: int):
+        self._slot_by_position[self._position_ids[slot]] = slot
+        self._slots_by_token.setdefault(self._tokens[slot], set()).add(slot)
+
+    def _unindex(self, slot: int):
+        self._slot_by_position.pop(self._position_ids[slot], None)
+
+        token_slots = self._slots_by_token.get(self._tokens[slot])
+        if token_slots is not None:
+            token_slots.discard(slot)
+            if not token_slots:
+                del self._slots_by_token[self._tokens[slot]]
+
+    # ==========================================
+    # MARKING
+    # ==========================================
+
+    def apply_marks(self, prices: Dict[int, Any]) -> int:
+        """
+        Re-mark every position on the given instrument tokens.
+
+        Args:
+            prices: {instrument_token: last_price}
+
+        Returns:
+            Number of positions re-marked
+        """
+        marked = 0
+        slots_by_token = self._slots_by_token
+        quantity = self._quantity
+        buy_price = self._buy_price
+        sell_price = self._sell_price
+        last_price = self._last_price
+        unrealized = self._unrealized
+
+        for token, price in prices.items():
+            slots = slots_by_token.get(token)
+            if not slots:
+                continue
+
+            ltp = _to_units(price)
+            for slot in slots:
+                qty = quantity[slot]
+                last_price[slot] = ltp
+                if qty > 0:
+                    unrealized[slot] = (ltp - buy_price[slot]) * qty
+                elif qty < 0:
+                    unrealized[slot] = (sell_price[slot] - ltp) * -qty
+                else:
+                    unrealized[slot] = 0
+                marked += 1
+
+        self._total_marks_applied += marked
+        return marked
+
+    # ==========================================
+    # READERS
+    # ==========================================
+
+    def get_mark(self, position_id: int) -> Optional[Dict[str, Decimal]]:
+        """
+        Get the current mark for a position.
+
+        Returns:
+            Dict with last_price, unrealized_pnl, total_pnl and net_pnl (Decimal,
+            rounded to cents), or None if the position is not in the book or
+            has no price yet
+        """
+        slot = self._slot_by_position.get(position_id)
+        if slot is None or not self._last_price[slot]:
+            return None
+
+        unrealized = self._unrealized[slot]
+        total = self._realized[slot] + unrealized
+        return {
+            "last_price": _to_money(self._last_price[slot]),
+            "unrealized_pnl": _to_money(unrealized),
+            "total_pnl": _to_money(total),
+            "net_pnl": _to_money(total - self._charges[slot]),
+        }
+
+    def overlay_marks(self, positions: Iterable[Any]) -> int:
+        """
+        Overwrite last_price and P&L columns on loaded Position objects with
+        the book's current marks.
+
+        Values are set as committed state so the session never flushes them
+        back; the DB copy is maintained by TickListener persistence.
+
+        Returns:
+            Number of positions overlaid
+        """
+        overlaid = 0
+        for position in positions:
+            mark = self.get_mark(position.id)
+            if mark is None:
+                continue
+            for field, value in mark.items():
+                set_committed_value(position, field, value)
+            overlaid += 1
+        return overlaid
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get position book statistics."""
+        return {
+            "ready": self._ready,
+            "positions": len(self._position_ids),
+            "tokens": len(self._slots_by_token),
+            "total_loads": self._total_loads,
+            "last_load_ms": round(self._last_load_ms, 3),
+            "total_marks_applied": self._total_marks_applied,
+            "age_seconds": round(time.monotonic() - self.loaded_at, 1) if self.loaded_at else None,
+        }
+
+
+# Singleton instance
+_position_book: Optional[PositionBook] = None
+
+
+def get_position_book() -> PositionBook:
+    """Get or create the position book singleton."""
+    global _position_book
+
+    if _position_book is None:
+        _position_book = PositionBook()
+
+    return _position_book
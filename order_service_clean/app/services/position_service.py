@@ -4,20 +4,30 @@ Position Service Business Logic
 Handles position tracking, updates, and queries.
 """
 import logging
+import uuid
 from datetime import datetime, date
-from typing import List, Optional, Dict, Any, Union
-from sqlalchemy import select, and_, text
+from typing import List, Optional, Dict, Any, Iterable, Tuple, Union
+from sqlalchemy import select, and_, text, case, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 
 from ..models.position import Position, PositionSource
 from ..database.redis_client import (
-    invalidate_position_cache
+    invalidate_position_cache,
+    invalidate_dashboard_cache
+)
+from ..utils.pagination import (
+    APPROXIMATE_COUNT_THRESHOLD,
+    estimate_count,
+    keyset_condition,
 )
 from .kite_client_multi import get_kite_client_for_account
 from .brokerage_service import BrokerageService
 from .default_strategy_service import get_or_create_default_strategy
 from .subscription_manager import SubscriptionManager
+from .position_book import get_position_book
+from .risk_snapshot import get_risk_snapshot_cache
 from decimal import Decimal
 
 logger = logging.getLogger(__name__)
@@ -170,20 +180,19 @@ class PositionService:
             }
 
             # Sync net positions (contains complete data including day positions)
-            for broker_pos in net_positions:
-                try:
-                    await self._sync_position(broker_pos, is_day_position=False)
-                    await self.db.flush()  # Ensure position is visible for next iteration
-                    stats['net_positions_synced'] += 1
-                except Exception as e:
-                    logger.error(f"Failed to sync net position {broker_pos.get('tradingsymbol')}: {e}")
-                    stats['errors'].append(str(e))
+            # in one batch: one lookup, one upsert
+            batch = await self._sync_positions_batch(net_positions)
+            stats['net_positions_synced'] = batch['upserted']
+            stats['positions_created'] = batch['created']
+            stats['positions_updated'] = batch['updated']
+            stats['errors'] = batch['errors']
 
             # Day positions are skipped because net positions already contain complete data
             # and syncing both causes duplicate key violations on the unique constraint
             stats['day_positions_synced'] = len(day_positions)  # Count but don't sync
 
             await self.db.commit()
+            await self._apply_subscription_diff(batch['opened'], batch['closed'])
 
             logger.info(f"Position sync completed: {stats}")
             return stats
@@ -192,51 +201,53 @@ class PositionService:
             logger.error(f"Position sync failed: {e}")
             raise HTTPException(500, f"Position sync failed: {str(e)}")
 
-    async def _sync_position(
-        self,
-        broker_position: Dict[str, Any],
-        is_day_position: bool,
-        strategy_id: Optional[int] = None
-    ) -> Position:
+    async def _load_day_positions(self, trading_day: date) -> Dict[Tuple[str, str, str], Position]:
         """
-        Sync a single position from broker data.
-
-        If position is new and has no strategy_id, it's tagged to the default
-        strategy as an external position.
-
-        Args:
-            broker_position: Position data from broker
-            is_day_position: Whether this is a day position
-            strategy_id: Optional strategy ID to assign (if None, uses default strategy)
+        Load all of the account's positions for a trading day in one query.
 
         Returns:
-            Updated or created Position object
+            Dict mapping (symbol, exchange, product_type) to Position
         """
-        symbol = broker_position["symbol"]
-        exchange = broker_position['exchange']
-        product = broker_position['product']
-        trading_day = date.today()
-
-        # Find existing position
-        # ACL check already verified at endpoint level
         result = await self.db.execute(
             select(Position).where(
                 and_(
                     Position.trading_account_id == self.trading_account_id,
-                    Position.symbol == symbol,
-                    Position.exchange == exchange,
-                    Position.product_type == product,
                     Position.trading_day == trading_day
                 )
             )
         )
-        position = result.scalar_one_or_none()
+        return {
+            (p.symbol, p.exchange, p.product_type): p
+            for p in result.scalars().all()
+        }
 
-        # Calculate values
+    async def _resolve_instrument_tokens(
+        self,
+        instruments: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], Optional[int]]:
+        """
+        Resolve instrument tokens for many (symbol, exchange) pairs in one call.
+
+        Returns:
+            Dict mapping (symbol, exchange) to instrument token (None if unknown)
+        """
+        instruments = list(instruments)
+        if not instruments:
+            return {}
+
+        try:
+            from ..clients.market_data_service_client import get_market_data_client
+
+            market_client = await get_market_data_client()
+            return await market_client.get_instrument_tokens(instruments)
+
+        except Exception as e:
+            logger.warning(f"Market Data Service bulk token lookup failed for {len(instruments)} instruments: {e}")
+            return {key: None for key in instruments}
+
+    def _broker_position_row(self, broker_position: Dict[str, Any], trading_day: date, now: datetime) -> Dict[str, Any]:
+        """Map a broker net position to a positions row (without strategy/token)."""
         quantity = broker_position.get('quantity', 0)
-        average_price = broker_position.get('average_price', 0.0)
-        last_price = broker_position.get('last_price', 0.0)
-        is_open = quantity != 0
 
         # Calculate buy/sell prices from broker data
         buy_quantity = broker_position.get('buy_quantity', 0)
@@ -244,94 +255,180 @@ class PositionService:
         buy_value = broker_position.get('buy_value', 0.0)
         sell_value = broker_position.get('sell_value', 0.0)
 
-        buy_price = (buy_value / buy_quantity) if buy_quantity > 0 else None
-        sell_price = (sell_value / sell_quantity) if sell_quantity > 0 else None
-
         # P&L values
         realized_pnl = broker_position.get('realised', 0.0)
         unrealized_pnl = broker_position.get('unrealised', 0.0)
-        total_pnl = realized_pnl + unrealized_pnl
-
-        # Look up instrument_token for WebSocket subscriptions
-        instrument_token = await self._get_instrument_token(symbol, exchange)
-
-        if position:
-            # Update existing position
-            position.quantity = quantity
-            position.buy_quantity = buy_quantity
-            position.sell_quantity = sell_quantity
-            position.buy_value = buy_value
-            position.sell_value = sell_value
-            position.buy_price = buy_price
-            position.sell_price = sell_price
-            position.last_price = last_price
-            position.realized_pnl = realized_pnl
-            position.unrealized_pnl = unrealized_pnl
-            position.total_pnl = total_pnl
-            position.is_open = is_open
-            position.updated_at = datetime.utcnow()
-
-            # Update instrument_token if not set or if we found a new one
-            if instrument_token and not position.instrument_token:
-                position.instrument_token = instrument_token
-
-            # If position exists but has no strategy_id, tag to default strategy
-            if position.strategy_id is None:
-                default_strategy_id = await get_or_create_default_strategy(
-                    self.db, str(self.trading_account_id), self.user_id
-                )
-                position.strategy_id = default_strategy_id
-                position.source = PositionSource.EXTERNAL
-                logger.info(f"Tagged orphan position {symbol} to default strategy {default_strategy_id}")
 
-            logger.debug(f"Updated position for {symbol}")
+        return {
+            "user_id": self.user_id,
+            "trading_account_id": self.trading_account_id,
+            "symbol": broker_position["symbol"],
+            "exchange": broker_position['exchange'],
+            "product_type": broker_position['product'],
+            "trading_day": trading_day,
+            "quantity": quantity,
+            "buy_quantity": buy_quantity,
+            "sell_quantity": sell_quantity,
+            "buy_value": buy_value,
+            "sell_value": sell_value,
+            "buy_price": (buy_value / buy_quantity) if buy_quantity > 0 else None,
+            "sell_price": (sell_value / sell_quantity) if sell_quantity > 0 else None,
+            "last_price": broker_position.get('last_price', 0.0),
+            "realized_pnl": realized_pnl,
+            "unrealized_pnl": unrealized_pnl,
+            "total_pnl": realized_pnl + unrealized_pnl,
+            "is_open": quantity != 0,
+            "source": PositionSource.EXTERNAL,
+            "opened_at": now,
+            "updated_at": now,
+        }
 
-        else:
-            # Create new position - this is from broker sync, so it's external
-            # Get the default strategy for this trading account
-            if strategy_id is None:
-                default_strategy_id = await get_or_create_default_strategy(
-                    self.db, str(self.trading_account_id), self.user_id
-                )
-                logger.info(f"New external position {symbol} tagged to default strategy {default_strategy_id}")
-            else:
-                default_strategy_id = strategy_id
+    async def _sync_positions_batch(
+        self,
+        broker_positions: List[Dict[str, Any]],
+        existing: Optional[Dict[Tuple[str, str, str], Position]] = None
+    ) -> Dict[str, Any]:
+        """
+        Upsert many broker positions for today in one statement.
 
-            position = Position(
-                user_id=self.user_id,
-                trading_account_id=self.trading_account_id,
-                symbol=symbol,
-                exchange=exchange,
-                product_type=product,
-                trading_day=trading_day,
-                quantity=quantity,
-                buy_quantity=buy_quantity,
-                sell_quantity=sell_quantity,
-                buy_value=buy_value,
-                sell_value=sell_value,
-                buy_price=buy_price,
-                sell_price=sell_price,
-                last_price=last_price,
-                realized_pnl=realized_pnl,
-                unrealized_pnl=unrealized_pnl,
-                total_pnl=total_pnl,
-                is_open=is_open,
-                strategy_id=default_strategy_id,
-                source=PositionSource.EXTERNAL,
-                instrument_token=instrument_token,
+        Replaces the per-row SELECT / token lookup / default strategy lookup /
+        cache invalidation / subscription call with:
+        - one query for all of today's positions (skipped if `existing` is given)
+        - one bulk instrument token resolution for rows that still need a token
+        - one default strategy lookup, only if some row has no strategy
+        - one INSERT ... ON CONFLICT ON CONSTRAINT unique_account_position DO UPDATE
+        - one cache invalidation
+
+        Rows with no strategy are tagged to the account's default strategy as
+        external positions; existing strategy, execution and instrument token
+        are never overwritten.
+
+        Args:
+            broker_positions: Net positions from broker
+            existing: Today's positions keyed by (symbol, exchange, product_type)
+
+        Returns:
+            Dict with upserted/created/updated counts, errors, and the
+            (symbol, exchange) pairs that opened or closed
+        """
+        trading_day = date.today()
+        now = datetime.utcnow()
+        batch = {'upserted': 0, 'created': 0, 'updated': 0, 'errors': [], 'opened': [], 'closed': []}
+
+        # Build rows, keeping the last broker row per unique key
+        rows: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        for broker_pos in broker_positions:
+            try:
+                row = self._broker_position_row(broker_pos, trading_day, now)
+            except Exception as e:
+                logger.error(f"Failed to sync net position {broker_pos.get('tradingsymbol')}: {e}")
+                batch['errors'].append(str(e))
+                continue
+            rows[(row['symbol'], row['exchange'], row['product_type'])] = row
+
+        if not rows:
+            return batch
+
+        if existing is None:
+            existing = await self._load_day_positions(trading_day)
+
+        # Bulk-resolve tokens only for positions that don't have one yet
+        missing_tokens = {
+            (symbol, exchange)
+            for (symbol, exchange, product), _ in rows.items()
+            if not getattr(existing.get((symbol, exchange, product)), 'instrument_token', None)
+        }
+        tokens = await self._resolve_instrument_tokens(missing_tokens)
+
+        # Resolve the default strategy once, and only if a row needs it
+        default_strategy_id = None
+        default_execution_id = None
+        if any(getattr(existing.get(key), 'strategy_id', None) is None for key in rows):
+            default_strategy_id, execution_id = await get_or_create_default_strategy(
+                self.db, str(self.trading_account_id), self.user_id
             )
+            default_execution_id = uuid.UUID(str(execution_id)) if execution_id else None
+
+        for key, row in rows.items():
+            row['instrument_token'] = tokens.get((row['symbol'], row['exchange']))
+            row['strategy_id'] = default_strategy_id
+            row['execution_id'] = default_execution_id
+
+            previous = existing.get(key)
+            was_open = bool(previous and previous.is_open)
+            if row['is_open'] and not was_open:
+                batch['opened'].append((row['symbol'], row['exchange']))
+            elif was_open and not row['is_open']:
+                batch['closed'].append((row['symbol'], row['exchange']))
+
+            if previous is None:
+                batch['created'] += 1
+                logger.info(
+                    f"New external position {row['symbol']} tagged to default strategy {default_strategy_id}"
+                )
+            else:
+                batch['updated'] += 1
+                if previous.strategy_id is None:
+                    logger.info(f"Tagged orphan position {row['symbol']} to default strategy {default_strategy_id}")
+
+        stmt = pg_insert(Position).values(list(rows.values()))
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            # (trading_account_id, symbol, exchange, product_type, trading_day):
+            # matches the batch's de-duplication key, since account and day are fixed
+            constraint="unique_account_position",
+            set_={
+                "quantity": excluded.quantity,
+                "buy_quantity": excluded.buy_quantity,
+                "sell_quantity": excluded.sell_quantity,
+                "buy_value": excluded.buy_value,
+                "sell_value": excluded.sell_value,
+                "buy_price": excluded.buy_price,
+                "sell_price": excluded.sell_price,
+                "last_price": excluded.last_price,
+                "realized_pnl": excluded.realized_pnl,
+                "unrealized_pnl": excluded.unrealized_pnl,
+                "total_pnl": excluded.total_pnl,
+                "is_open": excluded.is_open,
+                "updated_at": excluded.updated_at,
+                # Never overwrite an existing token, strategy or execution
+                "instrument_token": func.coalesce(Position.instrument_token, excluded.instrument_token),
+                "strategy_id": func.coalesce(Position.strategy_id, excluded.strategy_id),
+                "execution_id": func.coalesce(Position.execution_id, excluded.execution_id),
+                "source": case(
+                    (Position.strategy_id.is_(None), excluded.source),
+                    else_=Position.source
+                ),
+            }
+        )
+        await self.db.execute(stmt)
+        batch['upserted'] = len(rows)
 
-            self.db.add(position)
-            logger.debug(f"Created new external position for {symbol} (token={instrument_token})")
+        # Invalidate cache once for the whole batch
+        await invalidate_position_cache(f"user:{self.user_id}")
+        await invalidate_dashboard_cache(self.trading_account_id)
 
-        # Invalidate cache
-        if position.id:
-            await invalidate_position_cache(f"user:{self.user_id}")
+        logger.debug(
+            f"Upserted {len(rows)} positions for account {self.trading_account_id} "
+            f"(created={batch['created']}, updated={batch['updated']}, tokens_resolved={len(missing_tokens)})"
+        )
+        return batch
 
-        # Manage real-time tick subscription based on position state
-        await self._manage_position_subscription(symbol, exchange, is_open)
+    async def _apply_subscription_diff(
+        self,
+        opened: List[Tuple[str, str]],
+        closed: List[Tuple[str, str]]
+    ) -> None:
+        """
+        Subscribe newly opened and unsubscribe newly closed positions.
 
-        return position
+        Positions whose open state did not change keep their existing
+        subscription, so a steady-state sync makes no subscription calls.
+        """
+        for symbol, exchange in opened:
+            await self._manage_position_subscription(symbol, exchange, is_open=True)
+        for symbol, exchange in closed:
+            await self._manage_position_subscription(symbol, exchange, is_open=False)
 
     # ==========================================
     # POSITION QUERIES
@@ -375,7 +472,8 @@ class PositionService:
         limit: int = 100,
         offset: int = 0,
         position_ids: Optional[List[int]] = None,
-        execution_id: Optional[str] = None
+        execution_id: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> List[Position]:
         """
         List user's positions with optional filtering.
@@ -386,53 +484,129 @@ class PositionService:
             only_open: Only return open positions (default True)
             trading_day: Filter by trading day (default today)
             limit: Maximum number of positions to return
-            offset: Number of positions to skip
+            offset: Number of positions to skip (ignored when cursor is given)
             position_ids: Optional list of position IDs to filter to (for granular ACL)
             execution_id: Optional execution ID to filter by (for unified execution architecture)
+            cursor: Opaque keyset cursor from the previous page
 
         Returns:
             List of Position objects
+
+        Raises:
+            InvalidCursorError: If cursor is malformed
         """
+        filters = self._build_position_filter_conditions(
+            symbol=symbol,
+            exchange=exchange,
+            only_open=only_open,
+            trading_day=trading_day,
+            position_ids=position_ids,
+            execution_id=execution_id
+        )
+
+        if filters is None:
+            # Empty position_ids means no access to any positions
+            return []
+
+        query = (
+            select(Position)
+            .where(*filters)
+            # opened_at never changes once a row exists (unlike updated_at, which
+            # every re-mark bumps), so rows cannot move across the cursor between pages
+            .order_by(Position.opened_at.desc(), Position.id.desc())
+            .limit(limit)
+        )
+
+        if cursor:
+            query = query.where(keyset_condition(Position.opened_at, Position.id, cursor))
+        elif offset:
+            query = query.offset(offset)
+
+        result = await self.db.execute(query)
+        positions = result.scalars().all()
+
+        logger.debug(f"Retrieved {len(positions)} positions for user {self.user_id}")
+
+        return list(positions)
+
+    def _build_position_filter_conditions(
+        self,
+        symbol: Optional[str],
+        exchange: Optional[str],
+        only_open: bool,
+        trading_day: Optional[date],
+        position_ids: Optional[List[int]],
+        execution_id: Optional[str]
+    ) -> Optional[List[Any]]:
+        """Build reusable filter conditions for positions queries."""
         # ACL check already verified at endpoint level - only filter by trading_account_id
         # user_id represents who created/imported the data, not who owns the account
-        query = select(Position).where(
+        conditions = [
             Position.trading_account_id == self.trading_account_id
-        )
+        ]
 
         # Granular ACL filtering - only return positions user has access to
         if position_ids is not None:
             if not position_ids:
-                # Empty list means no access to any positions
-                return []
-            query = query.where(Position.position_id.in_(position_ids))
+                return None
+            conditions.append(Position.id.in_(position_ids))
 
         if symbol:
-            query = query.where(Position.symbol == symbol)
+            conditions.append(Position.symbol == symbol)
 
         if exchange:
-            query = query.where(Position.exchange == exchange)
+            conditions.append(Position.exchange == exchange)
 
         if only_open:
-            query = query.where(Position.is_open == True)
+            conditions.append(Position.is_open == True)
 
         if trading_day:
-            query = query.where(Position.trading_day == trading_day)
+            conditions.append(Position.trading_day == trading_day)
         # Note: If only_open=True and no trading_day specified, we return ALL open positions
         # across all days. This is the expected behavior for dashboard/P&L displays.
         # If you need today's positions specifically, pass trading_day explicitly.
 
         # Filter by execution_id if provided (unified execution architecture)
         if execution_id:
-            query = query.where(Position.execution_id == execution_id)
+            conditions.append(Position.execution_id == execution_id)
 
-        query = query.order_by(Position.updated_at.desc()).limit(limit).offset(offset)
+        return conditions
 
-        result = await self.db.execute(query)
-        positions = result.scalars().all()
+    async def count_positions(
+        self,
+        symbol: Optional[str] = None,
+        exchange: Optional[str] = None,
+        only_open: bool = True,
+        trading_day: Optional[date] = None,
+        position_ids: Optional[List[int]] = None,
+        execution_id: Optional[str] = None,
+        approximate: bool = False
+    ) -> int:
+        """
+        Count positions matching the same filters (ignoring pagination).
 
-        logger.debug(f"Retrieved {len(positions)} positions for user {self.user_id}")
+        With approximate=True the planner's estimate is returned for large
+        result sets instead of running COUNT(*) over every matching row.
+        """
+        filters = self._build_position_filter_conditions(
+            symbol=symbol,
+            exchange=exchange,
+            only_open=only_open,
+            trading_day=trading_day,
+            position_ids=position_ids,
+            execution_id=execution_id
+        )
 
-        return list(positions)
+        if filters is None:
+            return 0
+
+        if approximate:
+            estimate = await estimate_count(self.db, select(Position.id).where(*filters))
+            if estimate >= APPROXIMATE_COUNT_THRESHOLD:
+                return estimate
+
+        result = await self.db.execute(select(func.count()).where(*filters))
+        return int(result.scalar() or 0)
 
     async def get_position_summary(
         self,
@@ -462,6 +636,11 @@ class PositionService:
         if strategy_id is not None:
             positions = [p for p in positions if p.strategy_id == strategy_id]
 
+        # Prefer live tick marks from the in-memory book over persisted values
+        position_book = get_position_book()
+        if position_book.is_ready:
+            position_book.overlay_marks(positions)
+
         total_pnl = sum(float(p.total_pnl) for p in positions if p.total_pnl)
         total_realized = sum(float(p.realized_pnl) for p in positions if p.realized_pnl)
         total_unrealized = sum(float(p.unrealized_pnl) for p in positions if p.unrealized_pnl)
@@ -655,6 +834,15 @@ class PositionService:
 
         # Invalidate cache
         await invalidate_position_cache(f"user:{self.user_id}")
+        await invalidate_dashboard_cache(self.trading_account_id)
+
+        # Reload pre-trade risk inputs on the next order check
+        get_risk_snapshot_cache().invalidate(self.trading_account_id)
+
+        # Keep the tick-driven position book in step with the fill
+        position_book = get_position_book()
+        if position_book.is_ready:
+            position_book.upsert(position)
 
         logger.info(
             f"Position updated: {symbol} qty={position.quantity} "
@@ -693,12 +881,15 @@ class PositionService:
             broker_positions_data = await self.kite_client.get_positions()
             broker_net = broker_positions_data.get('net', [])
 
-            # Get our calculated positions
-            our_positions = await self.list_positions(only_open=True, trading_day=date.today())
+            # Get all of today's positions in one query
+            day_positions = await self._load_day_positions(date.today())
             our_positions_dict = {
-                (p.symbol, p.product_type): p for p in our_positions
+                (p.symbol, p.product_type): p for p in day_positions.values() if p.is_open
             }
 
+            # Broker rows to correct from, applied in one upsert at the end
+            corrections: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
             # Check broker positions against ours
             for broker_pos in broker_net:
                 symbol = broker_pos["symbol"]
@@ -727,7 +918,7 @@ class PositionService:
                         })
 
                         # Correct from broker (source of truth)
-                        await self._sync_position(broker_pos, is_day_position=False)
+                        corrections[key] = broker_pos
                         stats["positions_corrected"] += 1
 
                     # Check P&L drift (with tolerance)
@@ -747,7 +938,7 @@ class PositionService:
                         })
 
                         # Recalculate P&L
-                        await self._sync_position(broker_pos, is_day_position=False)
+                        corrections[key] = broker_pos
                         stats["positions_corrected"] += 1
 
                 else:
@@ -763,9 +954,13 @@ class PositionService:
                         })
 
                         # Add from broker
-                        await self._sync_position(broker_pos, is_day_position=False)
+                        corrections[key] = broker_pos
                         stats["positions_corrected"] += 1
 
+            # Apply broker corrections in one upsert (before closing extras, so the
+            # subscription diff still sees their previous open state)
+            batch = await self._sync_positions_batch(list(corrections.values()), existing=day_positions)
+
             # Check for positions in our DB but not in broker (shouldn't happen)
             broker_keys = {(p["symbol"], p['product']) for p in broker_net if p.get('quantity', 0) != 0}
             for key, our_pos in our_positions_dict.items():
@@ -785,6 +980,7 @@ class PositionService:
                     stats["positions_corrected"] += 1
 
             await self.db.commit()
+            await self._apply_subscription_diff(batch['opened'], batch['closed'])
 
             logger.info(
                 f"Position validation complete: checked={stats['positions_checked']} "
@@ -1106,11 +1302,8 @@ class PositionService:
             await self.db.commit()
 
             # Invalidate cache
-            await invalidate_position_cache(
-                self.user_id,
-                self.trading_account_id,
-                position_id
-            )
+            await invalidate_position_cache(str(position_id))
+            await invalidate_position_cache(f"user:{self.user_id}")
 
             logger.info(
                 f"Moved position {position_id} ({symbol}) from order_service.strategy {old_strategy_id} "
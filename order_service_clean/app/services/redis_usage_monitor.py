@@ -7,12 +7,13 @@ Provides metrics and alerts for Redis data plane monitoring.
 
 import logging
 import asyncio
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import time
 from enum import Enum
 
+from ..config.settings import settings
 from ..database.redis_client import get_redis
 
 logger = logging.getLogger(__name__)
@@ -57,6 +58,17 @@ class RedisHealthStatus:
     critical_messages: List[str] = field(default_factory=list)
 
 
+# Key prefixes owned by each usage pattern
+PATTERN_PREFIXES: Dict[RedisUsagePattern, Tuple[str, ...]] = {
+    RedisUsagePattern.IDEMPOTENCY: ("idempotency:",),
+    RedisUsagePattern.RATE_LIMITING: ("rate_limit:",),
+    RedisUsagePattern.CACHING: ("cache:", "order:", "position:", "trade:", "dashboard:", "positions:summary:", "tags:"),
+    RedisUsagePattern.SESSION_STORAGE: ("session:",),
+    RedisUsagePattern.REAL_TIME_DATA: ("ticker:",),
+    RedisUsagePattern.WORKER_COORDINATION: ("worker:",),
+}
+
+
 class RedisUsageMonitor:
     """
     Monitors Redis usage patterns and detects saturation.
@@ -67,7 +79,7 @@ class RedisUsageMonitor:
 
     def __init__(self):
         self.usage_patterns: Dict[RedisUsagePattern, RedisUsageMetrics] = {}
-        self.monitoring_interval = 60  # seconds
+        self.monitoring_interval = settings.redis_usage_monitor_interval  # seconds
         self.last_health_check = datetime.now()
         self._monitoring_task: Optional[asyncio.Task] = None
         self._redis_client = None
@@ -79,6 +91,14 @@ class RedisUsageMonitor:
         self.latency_warning_threshold_ms = 100  # 100ms
         self.ops_per_second_warning = 10000  # 10k ops/sec
 
+        # Key sampling (SCAN MATCH per prefix; KEYS would block the shared server)
+        self.scan_batch_size = 1000
+        self.max_keys_per_prefix = settings.redis_usage_monitor_max_keys_per_prefix  # counts are lower bounds beyond this
+        self.max_scan_calls_per_prefix = 50  # bounds server work for sparse prefixes
+        self.sample_size = 100  # keys per pattern sampled for MEMORY USAGE / TTL
+        self.last_scan_complete = True
+        self.last_scan_keys = 0
+
     async def start_monitoring(self):
         """Start background monitoring of Redis usage"""
         if self._monitoring_task and not self._monitoring_task.done():
@@ -130,67 +150,118 @@ class RedisUsageMonitor:
             self._redis_client = get_redis()
         return self._redis_client
 
+    async def _count_prefix(self, redis_client, prefix: str, samples: List[Any]) -> Tuple[int, bool]:
+        """
+        Count keys under one prefix with SCAN MATCH, up to the per-prefix caps.
+
+        Only matching key names come back to the client; the first keys seen
+        are kept in `samples` (up to sample_size).
+
+        Returns:
+            Tuple of (key_count, complete); the count is a lower bound when not complete
+        """
+        count = 0
+        cursor = 0
+        for _ in range(self.max_scan_calls_per_prefix):
+            cursor, keys = await redis_client.scan(cursor, match=f"{prefix}*", count=self.scan_batch_size)
+            count += len(keys)
+            room = self.sample_size - len(samples)
+            if room > 0:
+                samples.extend(keys[:room])
+            if cursor == 0:
+                return count, True
+            if count >= self.max_keys_per_prefix:
+                break
+        return count, False
+
     async def _collect_usage_metrics(self):
-        """Collect Redis usage metrics by pattern"""
+        """
+        Collect Redis usage metrics by pattern.
+
+        One capped SCAN MATCH per owner prefix (instead of KEYS, or pulling
+        every key name in the keyspace), keeping the first `sample_size` keys
+        per pattern for memory/TTL sampling.
+        """
         try:
             redis_client = await self._get_redis_client()
-            
-            # Define key patterns for each usage type
-            pattern_prefixes = {
-                RedisUsagePattern.IDEMPOTENCY: "idempotency:",
-                RedisUsagePattern.RATE_LIMITING: "rate_limit:",
-                RedisUsagePattern.CACHING: "cache:",
-                RedisUsagePattern.SESSION_STORAGE: "session:",
-                RedisUsagePattern.REAL_TIME_DATA: "ticker:",
-                RedisUsagePattern.WORKER_COORDINATION: "worker:",
-            }
-            
-            for pattern, prefix in pattern_prefixes.items():
-                await self._collect_pattern_metrics(redis_client, pattern, prefix)
-                
+
+            complete = True
+            scanned = 0
+
+            for pattern, prefixes in PATTERN_PREFIXES.items():
+                key_count = 0
+                samples: List[Any] = []
+                for prefix in prefixes:
+                    prefix_count, prefix_complete = await self._count_prefix(redis_client, prefix, samples)
+                    key_count += prefix_count
+                    complete = complete and prefix_complete
+                scanned += key_count
+                await self._collect_pattern_metrics(
+                    redis_client, pattern, prefixes[0], key_count, samples
+                )
+
+            if not complete:
+                logger.debug("Redis usage scan hit its per-prefix cap; pattern key counts are lower bounds")
+            self.last_scan_complete = complete
+            self.last_scan_keys = scanned
+
         except Exception as e:
             logger.error(f"Error collecting Redis usage metrics: {e}")
 
-    async def _collect_pattern_metrics(self, redis_client, pattern: RedisUsagePattern, prefix: str):
-        """Collect metrics for a specific usage pattern"""
+    async def _collect_pattern_metrics(
+        self,
+        redis_client,
+        pattern: RedisUsagePattern,
+        prefix: str,
+        key_count: int,
+        sample_keys: List[Any]
+    ):
+        """
+        Collect metrics for a specific usage pattern.
+
+        MEMORY USAGE and TTL for the sampled keys go out in one pipeline; memory
+        and expiring-key counts are extrapolated from the sample to key_count.
+        """
         try:
-            # Get keys matching pattern
-            keys = await redis_client.keys(f"{prefix}*")
-            
-            # Calculate memory usage for this pattern
             memory_usage = 0
             expiration_count = 0
-            
-            if keys:
-                # Sample subset for performance (max 100 keys)
-                sample_keys = keys[:100] if len(keys) > 100 else keys
-                
+
+            if sample_keys:
+                pipe = redis_client.pipeline(transaction=False)
                 for key in sample_keys:
-                    try:
-                        # Get memory usage
-                        memory_usage += await redis_client.memory_usage(key) or 0
-                        
-                        # Check if key has expiration
-                        ttl = await redis_client.ttl(key)
-                        if ttl > 0:
-                            expiration_count += 1
-                    except Exception:
-                        # Skip keys that might have been deleted
+                    pipe.memory_usage(key)
+                    pipe.ttl(key)
+                results = await pipe.execute(raise_on_error=False)
+
+                sampled = 0
+                sampled_memory = 0
+                sampled_expiring = 0
+                for key_memory, ttl in zip(results[0::2], results[1::2]):
+                    # Skip keys deleted since the scan (or commands that errored)
+                    if isinstance(key_memory, Exception) or isinstance(ttl, Exception) or key_memory is None:
                         continue
-            
+                    sampled += 1
+                    sampled_memory += key_memory
+                    if ttl > 0:
+                        sampled_expiring += 1
+
+                if sampled:
+                    memory_usage = int(sampled_memory / sampled * key_count)
+                    expiration_count = round(sampled_expiring / sampled * key_count)
+
             # Update metrics
             if pattern not in self.usage_patterns:
                 self.usage_patterns[pattern] = RedisUsageMetrics(
                     pattern=pattern,
                     key_prefix=prefix
                 )
-            
+
             metrics = self.usage_patterns[pattern]
-            metrics.key_count = len(keys)
+            metrics.key_count = key_count
             metrics.memory_usage_bytes = memory_usage
             metrics.expiration_usage = expiration_count
             metrics.last_updated = datetime.now()
-            
+
         except Exception as e:
             logger.error(f"Error collecting metrics for pattern {pattern}: {e}")
 
@@ -303,6 +374,8 @@ class RedisUsageMonitor:
             "total_memory_mb": total_memory / (1024 * 1024),
             "total_errors": total_errors,
             "patterns": pattern_breakdown,
+            "scan_complete": self.last_scan_complete,
+            "keys_scanned": self.last_scan_keys,
             "last_health_check": self.last_health_check.isoformat()
         }
 
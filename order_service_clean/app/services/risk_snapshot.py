@@ -0,0 +1,188 @@
+"""
+Pre-Trade Risk Snapshot
+
+Per-account view of the inputs to OrderService._perform_risk_checks:
+per-symbol exposure, total exposure, today's net P&L and available margin.
+
+Previously every order (and every order in a batch) issued three aggregate
+queries over positions plus a margin fetch. The snapshot is loaded with a
+single grouped query, cached per account for a short TTL, and adjusted in
+place as orders are accepted, so back-to-back orders and batch legs are
+checked against each other without further database round trips.
+
+Exposure values keep unpriced quantity (positions with no last/close/buy/sell
+price) separately so the caller's order price can still be used as the
+fallback price, exactly as the per-query implementation did.
+
+Usage:
+    cache = get_risk_snapshot_cache()
+    snapshot = await cache.get(trading_account_id, loader)
+    exposure = snapshot.symbol_exposure("INFY", fallback_price=1500.0)
+"""
+import asyncio
+import copy
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SymbolExposure:
+    """Exposure for one symbol: priced value plus quantity with no known price."""
+    priced_value: float = 0.0
+    unpriced_quantity: float = 0.0
+
+    def value(self, fallback_price: float) -> float:
+        return self.priced_value + self.unpriced_quantity * (fallback_price or 0.0)
+
+
+@dataclass
+class RiskSnapshot:
+    """Point-in-time risk inputs for one trading account."""
+    trading_account_id: str
+    symbols: Dict[str, SymbolExposure] = field(default_factory=dict)
+    today_net_pnl: float = 0.0
+    available_margin: Dict[str, float] = field(default_factory=dict)
+    loaded_at: float = field(default_factory=time.monotonic)
+
+    def symbol_exposure(self, symbol: str, fallback_price: float) -> float:
+        """Current exposure for a symbol (abs(quantity) * price)."""
+        exposure = self.symbols.get(symbol)
+        return exposure.value(fallback_price) if exposure else 0.0
+
+    def total_exposure(self, fallback_price: float) -> float:
+        """Total exposure across all positions."""
+        return sum(exposure.value(fallback_price) for exposure in self.symbols.values())
+
+    def reserve(self, symbol: str, order_value: float, segment: Optional[str] = None, required_margin: float = 0.0):
+        """
+        Apply an accepted order to the snapshot.
+
+        Adds the order value to the symbol's exposure and, if margin for the
+        segment has been loaded, deducts the required margin from it.
+        """
+        self.symbols.setdefault(symbol, SymbolExposure()).priced_value += order_value
+        if segment is not None and segment in self.available_margin:
+            self.available_margin[segment] -= required_margin
+
+    def copy(self) -> "RiskSnapshot":
+        """Independent copy (for batches that may be rolled back)."""
+        return copy.deepcopy(self)
+
+
+class RiskSnapshotCache:
+    """
+    Short-TTL, per-account cache of risk snapshots.
+
+    Concurrent misses for the same account share one load.
+    """
+
+    def __init__(self, ttl_seconds: float = 2.0):
+        """
+        Initialize cache.
+
+        Args:
+            ttl_seconds: How long a snapshot is reused before reloading
+        """
+        self.ttl_seconds = ttl_seconds
+        self._snapshots: Dict[str, RiskSnapshot] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+        # Statistics
+        self._hits = 0
+        self._misses = 0
+        self._reservations = 0
+        self._invalidations = 0
+        self._last_load_ms = 0.0
+
+    def _fresh(self, trading_account_id: str) -> Optional[RiskSnapshot]:
+        snapshot = self._snapshots.get(trading_account_id)
+        if snapshot is not None and (time.monotonic() - snapshot.loaded_at) < self.ttl_seconds:
+            return snapshot
+        return None
+
+    async def get(
+        self,
+        trading_account_id: str,
+        loader: Callable[[], Awaitable[RiskSnapshot]]
+    ) -> RiskSnapshot:
+        """
+        Get the account's snapshot, loading it with `loader` if missing or expired.
+
+        Args:
+            trading_account_id: Trading account ID
+            loader: Coroutine function that builds a fresh snapshot
+
+        Returns:
+            Shared RiskSnapshot for the account
+        """
+        snapshot = self._fresh(trading_account_id)
+        if snapshot is not None:
+            self._hits += 1
+            return snapshot
+
+        lock = self._locks.setdefault(trading_account_id, asyncio.Lock())
+        async with lock:
+            snapshot = self._fresh(trading_account_id)
+            if snapshot is not None:
+                self._hits += 1
+                return snapshot
+
+            self._misses += 1
+            start = time.perf_counter()
+            snapshot = await loader()
+            self._last_load_ms = (time.perf_counter() - start) * 1000
+            self._snapshots[trading_account_id] = snapshot
+            return snapshot
+
+    def record_order(
+        self,
+        trading_account_id: str,
+        symbol: str,
+        order_value: float,
+        segment: Optional[str] = None,
+        required_margin: float = 0.0
+    ):
+        """Apply an order accepted by the broker to the cached snapshot (if any)."""
+        snapshot = self._fresh(trading_account_id)
+        if snapshot is not None:
+            snapshot.reserve(symbol, order_value, segment, required_margin)
+            self._reservations += 1
+
+    def invalidate(self, trading_account_id: Optional[str] = None):
+        """Drop cached snapshots so the next check reloads from the database."""
+        self._invalidations += 1
+        if trading_account_id is None:
+            self._snapshots.clear()
+        else:
+            self._snapshots.pop(str(trading_account_id), None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            "accounts": len(self._snapshots),
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self._hits,
+            "misses": self._misses,
+            "reservations": self._reservations,
+            "invalidations": self._invalidations,
+            "last_load_ms": round(self._last_load_ms, 3),
+        }
+
+
+# Singleton instance
+_risk_snapshot_cache: Optional[RiskSnapshotCache] = None
+
+
+def get_risk_snapshot_cache() -> RiskSnapshotCache:
+    """Get or create the risk snapshot cache singleton."""
+    global _risk_snapshot_cache
+
+    if _risk_snapshot_cache is None:
+        from ..config.settings import settings
+        _risk_snapshot_cache = RiskSnapshotCache(ttl_seconds=settings.risk_snapshot_ttl_seconds)
+
+    return _risk_snapshot_cache
@@ -11,6 +11,8 @@ import httpx
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from .http_client_registry import get_http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -455,18 +457,19 @@ class SubscriptionManager:
         Notify ticker_service_v2 to refresh its subscription list.
         """
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    f"{self.ticker_service_url}/admin/subscriptions/refresh"
-                )
+            client = get_http_client("ticker_service")
+            response = await client.post(
+                f"{self.ticker_service_url}/admin/subscriptions/refresh",
+                timeout=10.0
+            )
 
-                if response.status_code == 200:
-                    logger.info("Ticker service subscription refresh triggered")
-                else:
-                    logger.warning(
-                        f"Failed to trigger subscription refresh: "
-                        f"HTTP {response.status_code}"
-                    )
+            if response.status_code == 200:
+                logger.info("Ticker service subscription refresh triggered")
+            else:
+                logger.warning(
+                    f"Failed to trigger subscription refresh: "
+                    f"HTTP {response.status_code}"
+                )
 
         except httpx.RequestError as e:
             logger.warning(f"Could not reach ticker service: {e}")
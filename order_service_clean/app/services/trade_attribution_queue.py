@@ -0,0 +1,145 @@
+"""
+External Trade Attribution Queue
+
+Attribution for external trades (exit context matching, partial exit
+allocation, transfers, manual cases) is slow and touches several tables.
+Running it inline made bulk trade sync as slow as the per-row path, so the
+bulk path enqueues newly inserted external trades here and a background
+consumer attributes them one at a time on its own session.
+
+The queue is bounded; when it is full the trade is left unattributed and
+logged, and can be picked up by reconciliation later.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ExternalTradeAttributionQueue:
+    """
+    Bounded in-process queue with a single background consumer.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        """
+        Initialize queue.
+
+        Args:
+            max_size: Maximum pending attribution jobs
+        """
+        self.max_size = max_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_task: Optional[asyncio.Task] = None
+
+        # Statistics
+        self._total_enqueued = 0
+        self._total_dropped = 0
+        self._total_processed = 0
+        self._total_errors = 0
+
+    def enqueue(self, user_id: int, trading_account_id: str, trade_id: int, broker_trade: Dict[str, Any]) -> bool:
+        """
+        Queue a newly created external trade for attribution.
+
+        Returns:
+            True if queued, False if the queue is full
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_size)
+
+        try:
+            self._queue.put_nowait((user_id, trading_account_id, trade_id, broker_trade))
+        except asyncio.QueueFull:
+            self._total_dropped += 1
+            logger.warning(
+                f"Attribution queue full ({self.max_size}) - external trade {trade_id} left unattributed"
+            )
+            return False
+
+        self._total_enqueued += 1
+        self._ensure_worker()
+        return True
+
+    def _ensure_worker(self):
+        if self._worker_task is None or self._worker_task.done():
+            self._worker_task = asyncio.create_task(self._worker())
+
+    async def _worker(self):
+        while True:
+            user_id, trading_account_id, trade_id, broker_trade = await self._queue.get()
+            try:
+                await self._attribute(user_id, trading_account_id, trade_id, broker_trade)
+                self._total_processed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._total_errors += 1
+                logger.error(f"Attribution failed for external trade {trade_id}: {e}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    async def _attribute(self, user_id: int, trading_account_id: str, trade_id: int, broker_trade: Dict[str, Any]):
+        from ..database.connection import get_async_session
+        from ..models.trade import Trade
+        from .trade_service import TradeService
+
+        async for session in get_async_session():
+            trade = await session.get(Trade, trade_id)
+            if trade is None:
+                logger.warning(f"External trade {trade_id} not found for attribution")
+                return
+
+            trade_service = TradeService(session, user_id, trading_account_id)
+            await trade_service._trigger_attribution_for_external_trade(trade, broker_trade)
+            await session.commit()
+
+    async def drain(self):
+        """Wait until all queued attribution jobs have been processed."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self):
+        """Cancel the consumer (pending jobs are dropped)."""
+        if self._worker_task and not self._worker_task.done():
+            self._worker_task.cancel()
+            try:
+                await self._worker_task
+            except asyncio.CancelledError:
+                pass
+        self._worker_task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue statistics."""
+        return {
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "max_size": self.max_size,
+            "total_enqueued": self._total_enqueued,
+            "total_dropped": self._total_dropped,
+            "total_processed": self._total_processed,
+            "total_errors": self._total_errors,
+        }
+
+
+# Singleton instance
+_attribution_queue: Optional[ExternalTradeAttributionQueue] = None
+
+
+def get_attribution_queue() -> ExternalTradeAttributionQueue:
+    """Get or create the external trade attribution queue singleton."""
+    global _attribution_queue
+
+    if _attribution_queue is None:
+        _attribution_queue = ExternalTradeAttributionQueue()
+
+    return _attribution_queue
+
+
+async def shutdown_attribution_queue():
+    """Stop the attribution consumer (called on service shutdown)."""
+    global _attribution_queue
+
+    if _attribution_queue is not None:
+        await _attribution_queue.stop()
+        _attribution_queue = None
@@ -6,7 +6,8 @@ Handles trade tracking, synchronization, and analytics.
 import logging
 from datetime import datetime, date, timedelta
 from typing import List, Optional, Dict, Any
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, any_, cast, func, String
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 
@@ -14,10 +15,20 @@ from ..models.trade import Trade
 from ..database.redis_client import (
     invalidate_trade_cache
 )
+from ..utils.pagination import (
+    APPROXIMATE_COUNT_THRESHOLD,
+    day_bounds,
+    estimate_count,
+    keyset_condition,
+)
 from .kite_client_multi import get_kite_client_for_account
 
 logger = logging.getLogger(__name__)
 
+# Rows per INSERT statement in bulk sync (keeps bind parameters well under
+# the asyncpg 32767 limit)
+BULK_INSERT_CHUNK_SIZE = 1000
+
 
 class TradeService:
     """Trade tracking and analytics service"""
@@ -41,10 +52,15 @@ class TradeService:
     # TRADE SYNC FROM BROKER
     # ==========================================
 
-    async def sync_trades_from_broker(self) -> Dict[str, Any]:
+    async def sync_trades_from_broker(self, bulk: bool = False) -> Dict[str, Any]:
         """
         Sync trades from broker API.
 
+        Args:
+            bulk: Use the set-based path (two lookups + one INSERT ... ON CONFLICT
+                  per chunk, one cache invalidation, queued attribution) instead of
+                  per-trade queries
+
         Returns:
             Dictionary with sync statistics
 
@@ -57,6 +73,11 @@ class TradeService:
             # Fetch trades from broker
             broker_trades = await self.kite_client.get_trades()
 
+            if bulk:
+                stats = await self._sync_trades_bulk(broker_trades)
+                logger.info(f"Trade sync completed: {stats}")
+                return stats
+
             stats = {
                 'trades_synced': 0,
                 'trades_created': 0,
@@ -82,6 +103,134 @@ class TradeService:
             logger.error(f"Trade sync failed: {e}")
             raise HTTPException(500, f"Trade sync failed: {str(e)}")
 
+    async def _sync_trades_bulk(self, broker_trades: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Set-based trade sync for the whole broker tradebook.
+
+        - One query for trade IDs already stored
+        - One query for the orders the new trades link to
+        - INSERT ... ON CONFLICT (broker_trade_id) DO NOTHING in chunks, one commit
+        - One cache invalidation for the account
+        - External trades queued for attribution instead of attributed inline
+
+        Args:
+            broker_trades: Trades from the broker API
+
+        Returns:
+            Dictionary with sync statistics
+        """
+        from ..models.order import Order
+        from .trade_attribution_queue import get_attribution_queue
+
+        stats = {
+            'trades_synced': 0,
+            'trades_created': 0,
+            'trades_updated': 0,
+            'errors': []
+        }
+
+        # Deduplicate the tradebook by broker trade ID
+        trades_by_id: Dict[str, Dict[str, Any]] = {}
+        for broker_trade in broker_trades:
+            broker_trade_id = broker_trade.get('trade_id')
+            if not broker_trade_id:
+                stats['errors'].append("Broker trade missing trade_id")
+                continue
+            trades_by_id[str(broker_trade_id)] = broker_trade
+
+        if not trades_by_id:
+            return stats
+
+        result = await self.db.execute(
+            select(Trade.broker_trade_id).where(
+                Trade.trading_account_id == self.trading_account_id,
+                Trade.broker_trade_id == any_(cast(list(trades_by_id), ARRAY(String)))
+            )
+        )
+        existing_ids = {row[0] for row in result.fetchall()}
+
+        new_trades = {tid: t for tid, t in trades_by_id.items() if tid not in existing_ids}
+        stats['trades_synced'] = len(existing_ids)
+
+        if not new_trades:
+            return stats
+
+        # Link new trades to orders in one lookup
+        broker_order_ids = list({str(t.get('order_id')) for t in new_trades.values() if t.get('order_id')})
+        orders_by_broker_id: Dict[str, tuple] = {}
+        if broker_order_ids:
+            order_result = await self.db.execute(
+                select(Order.broker_order_id, Order.id, Order.source).where(
+                    Order.trading_account_id == self.trading_account_id,
+                    Order.broker_order_id == any_(cast(broker_order_ids, ARRAY(String)))
+                )
+            )
+            orders_by_broker_id = {
+                broker_order_id: (order_id, source)
+                for broker_order_id, order_id, source in order_result.fetchall()
+            }
+
+        rows = []
+        for broker_trade_id, broker_trade in new_trades.items():
+            try:
+                broker_order_id = str(broker_trade.get('order_id', '') or '')
+                order_id, order_source = orders_by_broker_id.get(broker_order_id, (None, None))
+                if broker_order_id and order_id is None:
+                    logger.warning(
+                        f"Trade {broker_trade_id} has no matching order "
+                        f"(broker_order_id={broker_order_id}). Creating unlinked trade."
+                    )
+
+                rows.append({
+                    "order_id": order_id,  # Link to order (None if not found)
+                    "user_id": self.user_id,
+                    "trading_account_id": self.trading_account_id,
+                    "broker_trade_id": broker_trade_id,
+                    "broker_order_id": broker_order_id,
+                    "symbol": broker_trade["symbol"],
+                    "exchange": broker_trade['exchange'],
+                    "transaction_type": broker_trade['transaction_type'],
+                    "product_type": broker_trade['product'],
+                    "quantity": broker_trade['quantity'],
+                    "price": broker_trade['average_price'],
+                    "trade_time": broker_trade.get('fill_timestamp') or broker_trade.get('exchange_timestamp'),
+                    "trade_value": broker_trade['quantity'] * broker_trade['average_price'],
+                    "source": order_source or 'internal',  # Inherit from order or default to 'internal'
+                    "created_at": datetime.utcnow(),
+                })
+            except Exception as e:
+                logger.error(f"Failed to sync trade {broker_trade_id}: {e}")
+                stats['errors'].append(str(e))
+
+        inserted = []
+        for start in range(0, len(rows), BULK_INSERT_CHUNK_SIZE):
+            chunk = rows[start:start + BULK_INSERT_CHUNK_SIZE]
+            insert_result = await self.db.execute(
+                pg_insert(Trade)
+                .values(chunk)
+                .on_conflict_do_nothing(index_elements=[Trade.broker_trade_id])
+                .returning(Trade.id, Trade.broker_trade_id, Trade.source)
+            )
+            inserted.extend(insert_result.fetchall())
+
+        await self.db.commit()
+
+        stats['trades_created'] = len(inserted)
+        stats['trades_synced'] += len(rows)
+
+        # One invalidation for the whole batch
+        await invalidate_trade_cache(f"user:{self.user_id}")
+
+        # Sprint 7A: Attribution for external trades/partial exits runs off the sync path
+        attribution_queue = get_attribution_queue()
+        for trade_id, broker_trade_id, source in inserted:
+            if source == 'external':
+                attribution_queue.enqueue(
+                    self.user_id, self.trading_account_id, trade_id, new_trades[broker_trade_id]
+                )
+
+        return stats
+
     async def _sync_trade(self, broker_trade: Dict[str, Any]) -> Trade:
         """
         Sync a single trade from broker data.
@@ -377,7 +526,8 @@ class TradeService:
         end_date: Optional[date] = None,
         limit: int = 100,
         offset: int = 0,
-        trade_ids: Optional[List[int]] = None
+        trade_ids: Optional[List[int]] = None,
+        cursor: Optional[str] = None
     ) -> List[Trade]:
         """
         List user's trades with optional filtering.
@@ -387,50 +537,124 @@ class TradeService:
             exchange: Filter by exchange
             transaction_type: Filter by BUY or SELL
             start_date: Filter trades from this date
-            end_date: Filter trades until this date
+            end_date: Filter trades until this date (inclusive)
             limit: Maximum number of trades to return
-            offset: Number of trades to skip
+            offset: Number of trades to skip (ignored when cursor is given)
             trade_ids: Optional list of trade IDs to filter to (for granular ACL)
+            cursor: Opaque keyset cursor from the previous page
 
         Returns:
             List of Trade objects
+
+        Raises:
+            InvalidCursorError: If cursor is malformed
         """
+        filters = self._build_trade_filter_conditions(
+            symbol=symbol,
+            exchange=exchange,
+            transaction_type=transaction_type,
+            start_date=start_date,
+            end_date=end_date,
+            trade_ids=trade_ids
+        )
+
+        if filters is None:
+            # Empty trade_ids means no access to any trades
+            return []
+
+        query = (
+            select(Trade)
+            .where(*filters)
+            .order_by(Trade.trade_time.desc(), Trade.id.desc())
+            .limit(limit)
+        )
+
+        if cursor:
+            query = query.where(keyset_condition(Trade.trade_time, Trade.id, cursor))
+        elif offset:
+            query = query.offset(offset)
+
+        result = await self.db.execute(query)
+        trades = result.scalars().all()
+
+        logger.debug(f"Retrieved {len(trades)} trades for user {self.user_id}")
+
+        return list(trades)
+
+    def _build_trade_filter_conditions(
+        self,
+        symbol: Optional[str],
+        exchange: Optional[str],
+        transaction_type: Optional[str],
+        start_date: Optional[date],
+        end_date: Optional[date],
+        trade_ids: Optional[List[int]]
+    ) -> Optional[List[Any]]:
+        """Build reusable filter conditions for trades queries."""
         # ACL check already verified at endpoint level - only filter by trading_account_id
         # user_id represents who created/imported the trade, not who owns the account
-        query = select(Trade).where(
+        conditions = [
             Trade.trading_account_id == self.trading_account_id
-        )
+        ]
 
         # Granular ACL filtering - only return trades user has access to
         if trade_ids is not None:
             if not trade_ids:
-                # Empty list means no access to any trades
-                return []
-            query = query.where(Trade.trade_id.in_(trade_ids))
+                return None
+            conditions.append(Trade.id.in_(trade_ids))
 
         if symbol:
-            query = query.where(Trade.symbol == symbol)
+            conditions.append(Trade.symbol == symbol)
 
         if exchange:
-            query = query.where(Trade.exchange == exchange)
+            conditions.append(Trade.exchange == exchange)
 
         if transaction_type:
-            query = query.where(Trade.transaction_type == transaction_type)
+            conditions.append(Trade.transaction_type == transaction_type)
 
         if start_date:
-            query = query.where(Trade.trade_time >= datetime.combine(start_date, datetime.min.time()))
+            conditions.append(Trade.trade_time >= day_bounds(start_date)[0])
 
         if end_date:
-            query = query.where(Trade.trade_time <= datetime.combine(end_date, datetime.max.time()))
+            conditions.append(Trade.trade_time < day_bounds(end_date)[1])
 
-        query = query.order_by(Trade.trade_time.desc()).limit(limit).offset(offset)
+        return conditions
 
-        result = await self.db.execute(query)
-        trades = result.scalars().all()
+    async def count_trades(
+        self,
+        symbol: Optional[str] = None,
+        exchange: Optional[str] = None,
+        transaction_type: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        trade_ids: Optional[List[int]] = None,
+        approximate: bool = False
+    ) -> int:
+        """
+        Count trades matching the same filters (ignoring pagination).
 
-        logger.debug(f"Retrieved {len(trades)} trades for user {self.user_id}")
+        With approximate=True the planner's estimate is returned for large
+        result sets instead of running COUNT(*) over every matching row.
+        """
+        filters = self._build_trade_filter_conditions(
+            symbol=symbol,
+            exchange=exchange,
+            transaction_type=transaction_type,
+            start_date=start_date,
+            end_date=end_date,
+            trade_ids=trade_ids
+        )
 
-        return list(trades)
+        if filters is None:
+            return 0
+
+        if approximate:
+            estimate = await estimate_count(self.db, select(Trade.id).where(*filters))
+            if estimate >= APPROXIMATE_COUNT_THRESHOLD:
+                return estimate
+
+        result = await self.db.execute(select(func.count()).where(*filters))
+        return int(result.scalar() or 0)
 
     async def get_trades_for_order(self, order_id: int) -> List[Trade]:
         """
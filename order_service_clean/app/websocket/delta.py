@@ -0,0 +1,209 @@
+"""
+Delta-Encoded Position Stream
+
+Throttled, field-level delta frames for WebSocket position dashboards.
+
+At market open a dashboard can receive far more position updates than it
+can render. A DeltaStreamConnection keeps the latest state of each position
+and, at most max_rate times per second, sends one frame containing only the
+fields that changed since the last frame it sent that client:
+
+    {"type": "positions_delta", "seq": 42,
+     "positions": {"1:RELIANCE": {"last_price": 2451.5, "pnl": 1250.5}}}
+
+Fields dropped from a position are sent as null. A position that closes
+(quantity 0 or is_open false) gets one last delta and is then forgotten, so
+per-client state only covers open positions. Every snapshot_interval
+seconds (or when the client sends "resync") a full snapshot frame of the
+open positions replaces the client's state:
+
+    {"type": "positions_snapshot", "seq": 43, "positions": {"1:RELIANCE": {...}}}
+
+Frames are JSON text, or msgpack binary when requested and the msgpack
+package is installed.
+"""
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Hashable, Optional, Union
+
+from fastapi import WebSocket
+
+from .fanout import ClientConnection, FanoutRouter
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+ENCODING_JSON = "json"
+ENCODING_MSGPACK = "msgpack"
+
+_MISSING = object()
+
+
+def resolve_encoding(requested: Optional[str]) -> str:
+    """Encoding actually used for a requested one (msgpack falls back to JSON if unavailable)."""
+    if requested == ENCODING_MSGPACK and MSGPACK_AVAILABLE:
+        return ENCODING_MSGPACK
+    return ENCODING_JSON
+
+
+def encode_frame(frame: Dict[str, Any], encoding: str) -> Union[str, bytes]:
+    if encoding == ENCODING_MSGPACK:
+        return msgpack.packb(frame, use_bin_type=True, default=str)
+    return json.dumps(frame, separators=(",", ":"), default=str)
+
+
+def diff_fields(previous: Optional[Dict[str, Any]], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Fields of `current` that differ from `previous`; removed fields map to None."""
+    if previous is None:
+        return dict(current)
+    delta = {field: value for field, value in current.items() if previous.get(field, _MISSING) != value}
+    for field in previous.keys() - current.keys():
+        delta[field] = None
+    return delta
+
+
+def is_closed(data: Dict[str, Any]) -> bool:
+    """Whether a position update reports the position as closed."""
+    return data.get("quantity") == 0 or data.get("is_open") is False
+
+
+def _frame_key(key: Hashable) -> str:
+    if isinstance(key, tuple):
+        return ":".join(str(part) for part in key)
+    return str(key)
+
+
+class DeltaStreamConnection(ClientConnection):
+    """
+    Connection that sends throttled field-level deltas instead of every update.
+
+    Position updates only mark the position dirty, so the work per update is
+    O(1) however slow the client is; diffing and encoding happen once per
+    frame. Control messages (welcome, pong) still use the plain queue.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        user_id: int,
+        trading_account_id: Optional[int],
+        router: FanoutRouter,
+        max_rate: float = 4.0,
+        snapshot_interval: float = 30.0,
+        encoding: str = ENCODING_JSON,
+    ):
+        """
+        Args:
+            max_rate: Maximum frames per second sent to this client
+            snapshot_interval: Seconds between full snapshot frames
+            encoding: "json" or "msgpack" (see resolve_encoding)
+        """
+        super().__init__(websocket, user_id, trading_account_id, router)
+        self.max_rate = max_rate
+        self.snapshot_interval = snapshot_interval
+        self.encoding = resolve_encoding(encoding)
+
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self._sent_state: Dict[str, Dict[str, Any]] = {}
+        # Insertion-ordered set of positions changed since the last frame
+        self._dirty: Dict[str, None] = {}
+        self._snapshot_due = False
+        self._seq = 0
+
+        # Statistics
+        self.updates_received = 0
+        self.frames = 0
+        self.snapshots = 0
+
+    def enqueue(self, payload: str, key: Optional[Hashable] = None, data: Optional[dict] = None) -> bool:
+        if data is None or key is None:
+            return super().enqueue(payload, key)
+        if self.closed:
+            return False
+
+        position_key = _frame_key(key)
+        self.updates_received += 1
+        if position_key in self._dirty:
+            self.coalesced += 1
+            self.router._coalesced += 1
+        self._latest[position_key] = data
+        self._dirty[position_key] = None
+        self._ready.set()
+        return True
+
+    def request_snapshot(self) -> None:
+        """Send a full snapshot with the next frame (client resync)."""
+        self._snapshot_due = True
+        self._ready.set()
+
+    def _build_frame(self, snapshot: bool) -> Optional[Dict[str, Any]]:
+        if snapshot:
+            frame_type = "positions_snapshot"
+            for key in self._dirty:
+                if is_closed(self._latest[key]):
+                    del self._latest[key]
+            positions = dict(self._latest)
+            self._sent_state = dict(self._latest)
+        else:
+            frame_type = "positions_delta"
+            positions = {}
+            for key in self._dirty:
+                current = self._latest[key]
+                delta = diff_fields(self._sent_state.get(key), current)
+                if delta:
+                    positions[key] = delta
+                if is_closed(current):
+                    # Last frame for this position; don't keep its state
+                    del self._latest[key]
+                    self._sent_state.pop(key, None)
+                else:
+                    self._sent_state[key] = current
+        self._dirty.clear()
+
+        if not positions and not snapshot:
+            return None
+        self._seq += 1
+        return {"type": frame_type, "seq": self._seq, "positions": positions}
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        min_interval = 1.0 / self.max_rate
+        last_snapshot = loop.time()
+
+        while True:
+            remaining = last_snapshot + self.snapshot_interval - loop.time()
+            if remaining > 0 and not self._ready.is_set():
+                try:
+                    await asyncio.wait_for(self._ready.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    pass
+            self._ready.clear()
+
+            await self._drain_pending()
+
+            snapshot = self._snapshot_due or loop.time() - last_snapshot >= self.snapshot_interval
+            if snapshot:
+                self._snapshot_due = False
+                last_snapshot = loop.time()
+                if not self._latest:
+                    continue
+            elif not self._dirty:
+                continue
+
+            frame = self._build_frame(snapshot)
+            if frame is None:
+                continue
+            await self._send(encode_frame(frame, self.encoding))
+            self.frames += 1
+            if snapshot:
+                self.snapshots += 1
+
+            # Throttle: updates arriving meanwhile are merged into the next frame
+            await asyncio.sleep(min_interval)
@@ -0,0 +1,279 @@
+"""
+WebSocket Fan-Out
+
+Per-connection outbound queues and writer tasks for broadcast streams.
+
+Awaiting send_text() for each socket in turn lets one slow client stall
+delivery to everyone else. Here a broadcast only enqueues an already
+serialized payload; each connection's own writer task drains its queue:
+
+- Bounded queue per connection (max_queue pending messages)
+- Coalescing: a message with a key (e.g. a position) replaces the pending,
+  unsent message with the same key, so a lagging client gets the latest
+  state instead of a backlog
+- Slow consumers are dropped: a connection whose queue is full of distinct
+  keys, or whose send takes longer than send_timeout, is closed
+- Routing by (user_id, trading_account_id) subscription; connections
+  without an account filter receive every account of their user. Account
+  IDs are compared as strings (query filters are ints, published messages
+  carry the String(100) column value)
+
+Usage:
+    router = FanoutRouter(max_queue=256, send_timeout=5.0)
+    connection = router.add(websocket, user_id=7, trading_account_id=1)
+    router.broadcast(json.dumps(message), user_id=7, trading_account_id=1, key="1:RELIANCE")
+"""
+import asyncio
+import itertools
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterator, Optional, Set, Tuple, Type
+
+from fastapi import WebSocket
+
+logger = logging.getLogger(__name__)
+
+# WebSocket close code for "try again later" (server overloaded)
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+RouteKey = Tuple[int, Optional[str]]
+
+
+def account_key(trading_account_id: Any) -> Optional[str]:
+    """Routing form of a trading account ID (int and str IDs match)."""
+    return None if trading_account_id is None else str(trading_account_id)
+
+
+class ClientConnection:
+    """
+    One WebSocket with its bounded outbound queue and writer task.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        user_id: int,
+        trading_account_id: Optional[Any],
+        router: "FanoutRouter",
+    ):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.trading_account_id = account_key(trading_account_id)
+        self.router = router
+
+        # key -> payload; unkeyed messages get a unique key so they are never coalesced
+        self._pending: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._ready = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+        self.closed = False
+
+        # Statistics
+        self.sent = 0
+        self.coalesced = 0
+
+    @property
+    def route(self) -> RouteKey:
+        return (self.user_id, self.trading_account_id)
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    def start(self) -> None:
+        self._writer = asyncio.create_task(self._write_loop())
+
+    def enqueue(self, payload: str, key: Optional[Hashable] = None, data: Optional[dict] = None) -> bool:
+        """
+        Queue a serialized message without blocking.
+
+        `data` is the decoded message, for connections that re-encode it
+        (see delta.DeltaStreamConnection); plain connections send `payload`.
+
+        Returns:
+            False if the connection is closed or was dropped as a slow consumer
+        """
+        if self.closed:
+            return False
+
+        if key is not None and key in self._pending:
+            self._pending[key] = payload
+            self.coalesced += 1
+            self.router._coalesced += 1
+            return True
+
+        if len(self._pending) >= self.router.max_queue:
+            self.router._drop(self, "queue full")
+            return False
+
+        self._pending[key if key is not None else next(self.router._sequence)] = payload
+        self._ready.set()
+        return True
+
+    async def _send(self, payload: Any) -> None:
+        send = self.websocket.send_bytes if isinstance(payload, bytes) else self.websocket.send_text
+        await asyncio.wait_for(send(payload), timeout=self.router.send_timeout)
+        self.sent += 1
+
+    async def _drain_pending(self) -> None:
+        while self._pending:
+            _, payload = self._pending.popitem(last=False)
+            await self._send(payload)
+
+    async def _run(self) -> None:
+        while True:
+            await self._ready.wait()
+            await self._drain_pending()
+            self._ready.clear()
+
+    async def _write_loop(self) -> None:
+        try:
+            await self._run()
+        except asyncio.CancelledError:
+            pass
+        except asyncio.TimeoutError:
+            self.router._drop(self, f"send exceeded {self.router.send_timeout}s")
+        except Exception as e:
+            self.router._send_errors += 1
+            logger.debug(f"WebSocket send failed for user {self.user_id}: {e}")
+            self.router.remove(self)
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        """Stop the writer and close the socket."""
+        self.closed = True
+        self._pending.clear()
+        if self._writer and not self._writer.done() and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+        try:
+            await self.websocket.close(code=code, reason=reason)
+        except Exception:
+            pass
+
+
+class FanoutRouter:
+    """
+    Routes serialized messages to subscribed connections by (user, account).
+    """
+
+    def __init__(self, max_queue: int = 256, send_timeout: float = 5.0):
+        """
+        Initialize router.
+
+        Args:
+            max_queue: Pending messages per connection before it is dropped
+            send_timeout: Max seconds for one send before the client is dropped
+        """
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+
+        self._connections: Dict[WebSocket, ClientConnection] = {}
+        self._routes: Dict[RouteKey, Set[ClientConnection]] = {}
+        self._sequence = itertools.count()
+        self._closing: Set[asyncio.Task] = set()
+
+        # Statistics
+        self._broadcasts = 0
+        self._deliveries = 0
+        self._coalesced = 0
+        self._slow_consumers_dropped = 0
+        self._send_errors = 0
+
+    def add(
+        self,
+        websocket: WebSocket,
+        user_id: int,
+        trading_account_id: Optional[Any] = None,
+        connection_cls: Type[ClientConnection] = ClientConnection,
+        **options: Any,
+    ) -> ClientConnection:
+        """Register an accepted WebSocket and start its writer."""
+        connection = connection_cls(websocket, user_id, trading_account_id, self, **options)
+        self._connections[websocket] = connection
+        self._routes.setdefault(connection.route, set()).add(connection)
+        connection.start()
+        return connection
+
+    def get(self, websocket: WebSocket) -> Optional[ClientConnection]:
+        return self._connections.get(websocket)
+
+    def remove(self, connection: ClientConnection) -> None:
+        """Unregister a connection and stop its writer (the socket is not closed)."""
+        connection.closed = True
+        if self._connections.get(connection.websocket) is connection:
+            del self._connections[connection.websocket]
+        subscribers = self._routes.get(connection.route)
+        if subscribers is not None:
+            subscribers.discard(connection)
+            if not subscribers:
+                del self._routes[connection.route]
+        writer = connection._writer
+        if writer and not writer.done() and writer is not asyncio.current_task():
+            writer.cancel()
+
+    def _drop(self, connection: ClientConnection, reason: str) -> None:
+        if connection.closed:
+            return
+        self._slow_consumers_dropped += 1
+        logger.warning(
+            f"Dropping slow WebSocket consumer (user={connection.user_id}, "
+            f"account={connection.trading_account_id}): {reason}"
+        )
+        self.remove(connection)
+        task = asyncio.create_task(connection.close(SLOW_CONSUMER_CLOSE_CODE, "slow consumer"))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def subscribers(self, user_id: int, trading_account_id: Optional[Any]) -> Iterator[ClientConnection]:
+        """Connections that should receive a message for (user, account)."""
+        yield from tuple(self._routes.get((user_id, None), ()))
+        if trading_account_id is not None:
+            yield from tuple(self._routes.get((user_id, account_key(trading_account_id)), ()))
+
+    def broadcast(
+        self,
+        payload: str,
+        user_id: int,
+        trading_account_id: Optional[Any] = None,
+        key: Optional[Hashable] = None,
+        data: Optional[dict] = None,
+    ) -> int:
+        """
+        Enqueue one serialized message for every matching connection.
+
+        Never awaits a socket, so a slow client cannot delay other clients.
+
+        Returns:
+            Number of connections the message was queued for
+        """
+        self._broadcasts += 1
+        delivered = 0
+        for connection in self.subscribers(user_id, trading_account_id):
+            if connection.enqueue(payload, key, data):
+                delivered += 1
+        self._deliveries += delivered
+        return delivered
+
+    async def close_all(self) -> None:
+        """Close every connection (service shutdown)."""
+        connections = list(self._connections.values())
+        for connection in connections:
+            self.remove(connection)
+        await asyncio.gather(*(connection.close(1001, "server shutdown") for connection in connections))
+
+    def connection_count(self) -> int:
+        return len(self._connections)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get fan-out statistics."""
+        depths = [connection.queue_depth for connection in self._connections.values()]
+        return {
+            "connections": len(self._connections),
+            "routes": len(self._routes),
+            "max_queue": self.max_queue,
+            "queued": sum(depths),
+            "max_queue_depth": max(depths, default=0),
+            "broadcasts": self._broadcasts,
+            "deliveries": self._deliveries,
+            "coalesced": self._coalesced,
+            "slow_consumers_dropped": self._slow_consumers_dropped,
+            "send_errors": self._send_errors,
+        }
@@ -1,19 +1,66 @@
+# WebSocket module for real-time updates
 import asyncio
 import json
 import logging
-from typing import Dict, Set, Optional
+from typing import Any, Dict, Hashable, Optional
 from fastapi import WebSocket
 import redis.asyncio as redis
 
+from .delta import DeltaStreamConnection, resolve_encoding
+from .fanout import FanoutRouter, account_key
+
 logger = logging.getLogger(__name__)
 
+POSITIONS_CHANNEL = "positions:updates"
+
+STREAM_FULL = "full"
+STREAM_DELTA = "delta"
+
+
+def _position_of(message: dict) -> Optional[dict]:
+    """The position dict carried by an update message, if any."""
+    data = message.get("data")
+    if not isinstance(data, dict):
+        return None
+    return data.get("position") if isinstance(data.get("position"), dict) else data
+
+
+def _position_key(message: dict) -> Optional[Hashable]:
+    """Coalescing key for a position update: (account, position), if identifiable."""
+    position = _position_of(message)
+    if position is None:
+        return None
+    ident = position.get("position_id") or position.get("id") or position.get("symbol")
+    if ident is None:
+        return None
+    return (account_key(message.get("trading_account_id")), ident)
 
-class ConnectionManager:
-    """Manages WebSocket connections and Redis pub/sub for multi-server support."""
 
-    def __init__(self, redis_url: str):
-        self.active_connections: Dict[int, Set[WebSocket]] = {}  # user_id -> set of WebSockets
+class ConnectionManager:
+    """
+    Manages WebSocket connections and Redis pub/sub for multi-server support.
+
+    Delivery goes through a FanoutRouter: each connection has its own bounded
+    queue and writer task, so a slow client never blocks the Redis listener
+    or other clients. Messages are serialized once and routed by
+    (user_id, trading_account_id).
+
+    Connections opened in delta mode get throttled field-level deltas with
+    periodic snapshots instead of every full update (see delta.py).
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        max_queue: int = 256,
+        send_timeout: float = 5.0,
+        max_update_rate: float = 10.0,
+        snapshot_interval: float = 30.0,
+    ):
         self.redis_url = redis_url
+        self.router = FanoutRouter(max_queue=max_queue, send_timeout=send_timeout)
+        self.max_update_rate = max_update_rate
+        self.snapshot_interval = snapshot_interval
         self.redis_client: Optional[redis.Redis] = None
         self.pubsub: Optional[redis.client.PubSub] = None
         self._listen_task: Optional[asyncio.Task] = None
@@ -22,7 +69,7 @@ class ConnectionManager:
         """Initialize Redis connection and start listening."""
         self.redis_client = redis.from_url(self.redis_url, decode_responses=True)
         self.pubsub = self.redis_client.pubsub()
-        await self.pubsub.subscribe("positions:updates")
+        await self.pubsub.subscribe(POSITIONS_CHANNEL)
         self._listen_task = asyncio.create_task(self._listen_redis())
         logger.info("WebSocket connection manager started")
 
@@ -30,47 +77,97 @@ class ConnectionManager:
         """Clean up Redis connections."""
         if self._listen_task:
             self._listen_task.cancel()
+        await self.router.close_all()
         if self.pubsub:
-            await self.pubsub.unsubscribe("positions:updates")
+            await self.pubsub.unsubscribe(POSITIONS_CHANNEL)
             await self.pubsub.close()
         if self.redis_client:
             await self.redis_client.close()
         logger.info("WebSocket connection manager shutdown")
 
-    async def connect(self, websocket: WebSocket, user_id: int):
-        """Register a new WebSocket connection."""
+    async def connect(
+        self,
+        websocket: WebSocket,
+        user_id: int,
+        trading_account_id: Optional[int] = None,
+        mode: str = STREAM_FULL,
+        max_rate: Optional[float] = None,
+        encoding: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Register a new WebSocket connection, optionally filtered to one trading account.
+
+        Args:
+            mode: "full" (every update) or "delta" (throttled field-level deltas)
+            max_rate: Delta frames per second, capped at max_update_rate
+            encoding: Delta frame encoding, "json" or "msgpack"
+
+        Returns:
+            Effective stream settings (reported to the client)
+        """
         await websocket.accept()
-        if user_id not in self.active_connections:
-            self.active_connections[user_id] = set()
-        self.active_connections[user_id].add(websocket)
+        if mode == STREAM_DELTA:
+            rate = min(max_rate or self.max_update_rate, self.max_update_rate)
+            stream = {
+                "mode": STREAM_DELTA,
+                "max_rate": rate,
+                "snapshot_interval": self.snapshot_interval,
+                "encoding": resolve_encoding(encoding),
+            }
+            self.router.add(
+                websocket, user_id, trading_account_id,
+                connection_cls=DeltaStreamConnection,
+                max_rate=rate,
+                snapshot_interval=self.snapshot_interval,
+                encoding=stream["encoding"],
+            )
+        else:
+            stream = {"mode": STREAM_FULL}
+            self.router.add(websocket, user_id, trading_account_id)
         logger.info(f"User {user_id} connected. Total connections: {self.get_connection_count()}")
+        return stream
 
     def disconnect(self, websocket: WebSocket, user_id: int):
         """Remove a WebSocket connection."""
-        if user_id in self.active_connections:
-            self.active_connections[user_id].discard(websocket)
-            if not self.active_connections[user_id]:
-                del self.active_connections[user_id]
+        connection = self.router.get(websocket)
+        if connection is not None:
+            self.router.remove(connection)
         logger.info(f"User {user_id} disconnected. Total connections: {self.get_connection_count()}")
 
-    async def send_personal_message(self, message: dict, user_id: int):
-        """Send message to all connections for a specific user."""
-        if user_id not in self.active_connections:
-            return
-
-        message_str = json.dumps(message)
-        disconnected = set()
-
-        for connection in self.active_connections[user_id]:
-            try:
-                await connection.send_text(message_str)
-            except Exception as e:
-                logger.error(f"Error sending to user {user_id}: {e}")
-                disconnected.add(connection)
-
-        # Clean up disconnected clients
-        for connection in disconnected:
-            self.disconnect(connection, user_id)
+    def send_to_connection(self, websocket: WebSocket, message: Any) -> bool:
+        """Queue a message for one connection (ordered with its broadcasts)."""
+        connection = self.router.get(websocket)
+        if connection is None:
+            return False
+        return connection.enqueue(message if isinstance(message, str) else json.dumps(message))
+
+    def request_snapshot(self, websocket: WebSocket) -> bool:
+        """Ask a delta-mode connection to resync with a full snapshot."""
+        connection = self.router.get(websocket)
+        if not isinstance(connection, DeltaStreamConnection):
+            return False
+        connection.request_snapshot()
+        return True
+
+    async def send_personal_message(self, message: dict, user_id: int, raw: Optional[str] = None):
+        """
+        Send message to a user's connections subscribed to its trading account.
+
+        Only enqueues - never waits on a client socket.
+
+        Args:
+            message: Message dict (used for routing)
+            user_id: Target user
+            raw: Already-serialized message, to avoid serializing again
+        """
+        payload = raw if raw is not None else json.dumps(message)
+        self.router.broadcast(
+            payload,
+            user_id,
+            account_key(message.get("trading_account_id")),
+            key=_position_key(message),
+            data=_position_of(message),
+        )
 
     async def publish_position_update(self, user_id: int, trading_account_id: int, data: dict):
         """Publish position update to Redis (for multi-server support)."""
@@ -83,7 +180,7 @@ class ConnectionManager:
             "data": data,
         }
 
-        await self.redis_client.publish("positions:updates", json.dumps(message))
+        await self.redis_client.publish(POSITIONS_CHANNEL, json.dumps(message))
 
     async def _listen_redis(self):
         """Listen for Redis pub/sub messages and forward to WebSocket clients."""
@@ -95,8 +192,8 @@ class ConnectionManager:
                 if message["type"] == "message":
                     try:
                         data = json.loads(message["data"])
-                        user_id = data["user_id"]
-                        await self.send_personal_message(data, user_id)
+                        # The published JSON is forwarded as-is: serialized once for all clients
+                        await self.send_personal_message(data, data["user_id"], raw=message["data"])
                     except Exception as e:
                         logger.error(f"Error processing Redis message: {e}")
         except asyncio.CancelledError:
@@ -106,4 +203,8 @@ class ConnectionManager:
 
     def get_connection_count(self) -> int:
         """Get total number of active connections."""
-        return sum(len(conns) for conns in self.active_connections.values())
+        return self.router.connection_count()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get connection and fan-out statistics."""
+        return self.router.get_stats()
@@ -56,6 +56,9 @@ async def positions_websocket(
     websocket: WebSocket,
     token: str = Query(..., description="JWT authentication token"),
     trading_account_id: Optional[int] = Query(None, description="Filter by trading account"),
+    mode: str = Query("full", pattern="^(full|delta)$", description="full: every update; delta: throttled field-level deltas"),
+    max_rate: Optional[float] = Query(None, gt=0, description="Delta mode: max frames per second"),
+    encoding: str = Query("json", pattern="^(json|msgpack)$", description="Delta mode: frame encoding"),
 ):
     """
     WebSocket endpoint for real-time position updates.
@@ -63,6 +66,10 @@ async def positions_websocket(
     Query params:
     - token: JWT authentication token
     - trading_account_id: Optional filter for specific account
+    - mode: "full" (default) or "delta"
+    - max_rate: Delta mode frame rate (capped server-side)
+    - encoding: Delta mode frame encoding, "json" or "msgpack" (binary frames;
+      falls back to json if unavailable - see "stream" in the welcome message)
 
     Message format:
     {
@@ -76,6 +83,10 @@ async def positions_websocket(
         },
         "timestamp": "2025-12-03T10:30:00Z"
     }
+
+    Delta mode sends "positions_delta" frames with only changed fields per
+    position and periodic "positions_snapshot" frames; send "resync" to get
+    a snapshot immediately.
     """
     cm = get_connection_manager()
     user_id = None
@@ -84,17 +95,18 @@ async def positions_websocket(
         # Authenticate
         user_id = await authenticate_websocket(token)
 
-        # Connect
-        await cm.connect(websocket, user_id)
+        # Connect (updates are routed server-side by user and trading account)
+        stream = await cm.connect(websocket, user_id, trading_account_id, mode=mode, max_rate=max_rate, encoding=encoding)
 
-        # Send welcome message
-        await websocket.send_json({
+        # Send welcome message (all sends go through the connection's writer)
+        cm.send_to_connection(websocket, {
             "type": "connected",
             "user_id": user_id,
             "message": "Connected to position updates",
             "filters": {
                 "trading_account_id": trading_account_id
-            }
+            },
+            "stream": stream
         })
 
         # Keep connection alive
@@ -103,7 +115,9 @@ async def positions_websocket(
                 # Receive ping/pong messages
                 data = await websocket.receive_text()
                 if data == "ping":
-                    await websocket.send_text("pong")
+                    cm.send_to_connection(websocket, "pong")
+                elif data == "resync":
+                    cm.request_snapshot(websocket)
             except WebSocketDisconnect:
                 break
 
@@ -0,0 +1,246 @@
+"""
+Per-Account Fan-Out Scheduler
+
+Runs one sync job (order sync, trade sync, position validation, ...) across
+all trading accounts concurrently instead of one account at a time.
+
+Design:
+- One task per account, each with its own database session, so a failure
+  or rollback in one account never poisons the others
+- A global semaphore bounds how many accounts run at once (keeps DB pool
+  and Kite executor usage predictable)
+- Rate-limit-aware dispatch: before taking a global slot, an account checks
+  KiteAccountRateLimiterManager and sleeps out its own throttle window, so a
+  throttled account never holds a slot that another account could use
+- Per-account timeout and timing, so one slow account cannot delay the rest
+  and the slowest accounts are visible in metrics
+
+Usage:
+    fanout = AccountFanout(max_concurrency=16, account_timeout=45.0)
+
+    async def sync_one(session, trading_account_id, account_info):
+        return await TradeService(session, user_id, trading_account_id).sync_trades_from_broker()
+
+    run = await fanout.run("trade_sync", account_mapping, sync_one)
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database.connection import get_async_session
+from ..services.kite_account_rate_limiter import KiteOperation, get_rate_limiter_manager_sync
+
+logger = logging.getLogger(__name__)
+
+AccountHandler = Callable[[AsyncSession, int, Dict[str, Any]], Awaitable[Any]]
+
+
+@dataclass
+class AccountRunResult:
+    """Outcome of one account's job."""
+    trading_account_id: int
+    account_nickname: str
+    result: Any = None
+    error: Optional[str] = None
+    timed_out: bool = False
+    wait_ms: float = 0.0
+    duration_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class FanoutRun:
+    """Outcome of one job across all accounts."""
+    job_name: str
+    results: List[AccountRunResult] = field(default_factory=list)
+    duration_ms: float = 0.0
+
+    @property
+    def succeeded(self) -> List[AccountRunResult]:
+        return [r for r in self.results if r.ok]
+
+    @property
+    def failed(self) -> List[AccountRunResult]:
+        return [r for r in self.results if not r.ok]
+
+    def total(self, key: str) -> int:
+        """Sum an integer stat across successful account results that are dicts."""
+        return sum(
+            r.result.get(key, 0) or 0
+            for r in self.succeeded
+            if isinstance(r.result, dict)
+        )
+
+
+class AccountFanout:
+    """
+    Bounded-concurrency scheduler for per-account sync jobs.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        account_timeout: float = 45.0,
+        rate_limit_operation: KiteOperation = KiteOperation.API_GET,
+        max_rate_limit_wait: float = 10.0,
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            max_concurrency: Maximum accounts processed at the same time
+            account_timeout: Per-account job timeout in seconds
+            rate_limit_operation: Kite operation checked before dispatching an account
+            max_rate_limit_wait: Cap on how long dispatch waits for an account's throttle window
+        """
+        self.max_concurrency = max_concurrency
+        self.account_timeout = account_timeout
+        self.rate_limit_operation = rate_limit_operation
+        self.max_rate_limit_wait = max_rate_limit_wait
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        # Statistics (per job name)
+        self._job_stats: Dict[str, Dict[str, Any]] = {}
+        self._account_last_ms: Dict[int, float] = {}
+
+    async def run(
+        self,
+        job_name: str,
+        account_mapping: Dict[int, Dict[str, Any]],
+        handler: AccountHandler,
+        use_session: bool = True,
+    ) -> FanoutRun:
+        """
+        Run handler for every account concurrently.
+
+        Args:
+            job_name: Job name for logging and stats
+            account_mapping: {trading_account_id: account_info} from get_all_trading_accounts()
+            handler: async handler(session, trading_account_id, account_info)
+            use_session: Open a dedicated session per account (handler gets None otherwise)
+
+        Returns:
+            FanoutRun with per-account results and timings
+        """
+        start = time.perf_counter()
+
+        results = await asyncio.gather(*[
+            self._run_account(job_name, trading_account_id, account_info or {}, handler, use_session)
+            for trading_account_id, account_info in account_mapping.items()
+        ])
+
+        run = FanoutRun(
+            job_name=job_name,
+            results=list(results),
+            duration_ms=(time.perf_counter() - start) * 1000,
+        )
+        self._record_run(run)
+        return run
+
+    async def _wait_for_rate_limit(self, trading_account_id: int) -> None:
+        """Sleep out the account's current throttle window before taking a slot."""
+        manager = get_rate_limiter_manager_sync()
+        if manager is None:
+            return
+
+        try:
+            allowed, wait_time = await manager.check_limit(trading_account_id, self.rate_limit_operation)
+        except Exception as e:
+            logger.debug(f"Rate limit check failed for account {trading_account_id}: {e}")
+            return
+
+        if not allowed and wait_time > 0:
+            await asyncio.sleep(min(wait_time, self.max_rate_limit_wait))
+
+    async def _run_account(
+        self,
+        job_name: str,
+        trading_account_id: int,
+        account_info: Dict[str, Any],
+        handler: AccountHandler,
+        use_session: bool,
+    ) -> AccountRunResult:
+        account_nickname = account_info.get('nickname', f'account_{trading_account_id}')
+        outcome = AccountRunResult(
+            trading_account_id=trading_account_id,
+            account_nickname=account_nickname,
+        )
+
+        queued_at = time.perf_counter()
+        await self._wait_for_rate_limit(trading_account_id)
+
+        async with self._semaphore:
+            started_at = time.perf_counter()
+            outcome.wait_ms = (started_at - queued_at) * 1000
+
+            try:
+                if use_session:
+                    async for session in get_async_session():
+                        outcome.result = await asyncio.wait_for(
+                            handler(session, trading_account_id, account_info),
+                            timeout=self.account_timeout
+                        )
+                else:
+                    outcome.result = await asyncio.wait_for(
+                        handler(None, trading_account_id, account_info),
+                        timeout=self.account_timeout
+                    )
+            except asyncio.TimeoutError:
+                outcome.timed_out = True
+                outcome.error = f"timed out after {self.account_timeout}s"
+                logger.warning(f"{job_name} timed out for {account_nickname} after {self.account_timeout}s")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                outcome.error = str(e)
+                logger.error(f"{job_name} failed for {account_nickname}: {e}")
+            finally:
+                outcome.duration_ms = (time.perf_counter() - started_at) * 1000
+                self._account_last_ms[trading_account_id] = outcome.duration_ms
+
+        return outcome
+
+    def _record_run(self, run: FanoutRun):
+        stats = self._job_stats.setdefault(run.job_name, {
+            "runs": 0,
+            "account_runs": 0,
+            "account_errors": 0,
+            "account_timeouts": 0,
+        })
+        stats["runs"] += 1
+        stats["account_runs"] += len(run.results)
+        stats["account_errors"] += len(run.failed)
+        stats["account_timeouts"] += sum(1 for r in run.results if r.timed_out)
+        stats["last_duration_ms"] = round(run.duration_ms, 3)
+        stats["last_accounts"] = len(run.results)
+
+        if run.results:
+            slowest = max(run.results, key=lambda r: r.duration_ms)
+            stats["last_slowest_account"] = slowest.trading_account_id
+            stats["last_slowest_ms"] = round(slowest.duration_ms, 3)
+            stats["last_max_wait_ms"] = round(max(r.wait_ms for r in run.results), 3)
+
+            if slowest.duration_ms > run.duration_ms / 2 and len(run.results) > 1:
+                logger.debug(
+                    f"{run.job_name}: {slowest.account_nickname} took {slowest.duration_ms:.0f}ms "
+                    f"of {run.duration_ms:.0f}ms cycle"
+                )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get fan-out scheduler statistics."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "account_timeout": self.account_timeout,
+            "jobs": {name: dict(stats) for name, stats in self._job_stats.items()},
+            "account_last_ms": {
+                account_id: round(ms, 3) for account_id, ms in self._account_last_ms.items()
+            },
+        }
@@ -2,7 +2,8 @@
 Order Reconciliation Background Worker
 
 Periodically reconciles order state between database and broker.
-Runs every 5 minutes to detect and correct drift.
+Runs every 5 minutes to detect and correct drift. Capital ledger running
+balances are reconciled against the full ledger on a slower interval.
 """
 import asyncio
 import logging
@@ -11,7 +12,9 @@ from typing import Optional
 from contextlib import asynccontextmanager
 
 
+from ..config.settings import settings
 from ..database import get_session_maker
+from ..services.capital_ledger_service import CapitalLedgerService
 from ..services.reconciliation_service import ReconciliationService
 
 logger = logging.getLogger(__name__)
@@ -56,6 +59,8 @@ class ReconciliationWorker:
         self.total_errors = 0
         self.last_run_at: Optional[datetime] = None
         self.last_run_result: Optional[dict] = None
+        self.last_capital_reconcile_at: Optional[datetime] = None
+        self.last_capital_reconcile_result: Optional[dict] = None
 
     async def start(self):
         """
@@ -203,6 +208,50 @@ class ReconciliationWorker:
                 "timestamp": run_start.isoformat()
             }
 
+        await self._reconcile_capital_balances()
+
+    async def _reconcile_capital_balances(self):
+        """
+        Reconcile capital ledger running balances when the interval has elapsed.
+
+        Balances are maintained incrementally on every committed entry; this
+        full-ledger pass only catches drift (manual SQL, partial failures).
+        """
+        now = datetime.utcnow()
+        if (
+            self.last_capital_reconcile_at
+            and (now - self.last_capital_reconcile_at).total_seconds() < settings.capital_balance_reconcile_interval
+        ):
+            return
+
+        try:
+            async with self._get_db_session() as db:
+                ledger = CapitalLedgerService(db, settings.system_user_id)
+                result = await ledger.reconcile_balances()
+
+            self.last_capital_reconcile_at = now
+            self.last_capital_reconcile_result = {
+                "checked": result["checked"],
+                "drifted": result["drifted"],
+            }
+
+            if result["drifted"]:
+                logger.warning(
+                    f"CAPITAL DRIFT ALERT: {result['drifted']} portfolio balances corrected. "
+                    f"Corrections: {result['corrections']}"
+                )
+            else:
+                logger.info(f"Capital balances reconciled: checked={result['checked']}, no drift")
+
+        except Exception as e:
+            logger.error(f"Capital balance reconciliation failed: {e}", exc_info=True)
+            self.total_errors += 1
+            self.last_capital_reconcile_at = now
+            self.last_capital_reconcile_result = {
+                "error": str(e),
+                "timestamp": now.isoformat()
+            }
+
     @asynccontextmanager
     async def _get_db_session(self):
         """
@@ -238,6 +287,10 @@ class ReconciliationWorker:
             "total_errors": self.total_errors,
             "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
             "last_run_result": self.last_run_result,
+            "last_capital_reconcile_at": (
+                self.last_capital_reconcile_at.isoformat() if self.last_capital_reconcile_at else None
+            ),
+            "last_capital_reconcile_result": self.last_capital_reconcile_result,
             "next_run_in_seconds": (
                 self.interval_seconds - (
                     datetime.utcnow() - self.last_run_at
@@ -6,6 +6,10 @@ Periodic tasks for synchronizing orders, positions, and trades from broker.
 Supports two modes:
 - WebSocket mode (during market hours): Real-time order updates via Redis pub/sub
 - REST polling mode (after market hours): Periodic polling from broker API
+
+Per-account work (order sync, trade sync, position validation, holdings and
+margin polling) is fanned out across accounts by AccountFanout, with one
+session per account and a global concurrency limit.
 """
 import logging
 import asyncio
@@ -24,8 +28,8 @@ from ..services.margin_service import MarginService
 from ..services.pnl_calculator import PnLCalculator
 from ..services.kite_client_multi import get_kite_client_for_account, get_all_trading_accounts
 from ..services.market_hours import MarketHoursService, MarketSegment
-from ..services.default_strategy_service import get_or_create_default_strategy
-from ..models.order import OrderSource
+from ..services.external_order_detector import ExternalOrderDetector
+from .account_fanout import AccountFanout
 
 logger = logging.getLogger(__name__)
 
@@ -74,6 +78,15 @@ class SyncWorkerManager:
         # Tier worker instance
         self._tier_worker = None
 
+        # Incremental external order detection (per-account seen-set for the trading day)
+        self._external_order_detector = ExternalOrderDetector(normalize_status=normalize_broker_status)
+
+        # Per-account fan-out scheduler shared by all polling workers
+        self._fanout = AccountFanout(
+            max_concurrency=settings.sync_fanout_max_concurrency,
+            account_timeout=settings.sync_fanout_account_timeout,
+        )
+
         # Metrics
         self.websocket_updates_received = 0
         self.rest_polls_executed = 0
@@ -292,13 +305,9 @@ class SyncWorkerManager:
                 else:
                     logger.debug("REST polling (after hours mode)")
 
-                # Get all active orders from database
-                async for session in get_async_session():
-                    try:
-                        await self._sync_active_orders(session)
-                        self.rest_polls_executed += 1
-                    finally:
-                        pass  # Session cleanup handled by context manager
+                # Sync active orders for all accounts (one session per account)
+                await self._sync_active_orders()
+                self.rest_polls_executed += 1
 
             except asyncio.CancelledError:
                 logger.info("Order status sync worker cancelled")
@@ -651,6 +660,9 @@ class SyncWorkerManager:
         Detect orders from broker that don't exist in our database (external orders)
         and tag them to the default strategy.
 
+        Incremental: only broker order IDs not yet seen today are looked up,
+        and new external orders are tagged in one transaction.
+
         Args:
             session: Database session
             trading_account_id: Trading account ID
@@ -659,249 +671,111 @@ class SyncWorkerManager:
         Returns:
             Number of external orders detected and tagged
         """
-        from ..models.order import Order
-        from sqlalchemy import select
-
-        external_orders_count = 0
-
-        # Get all our broker_order_ids for this account
-        result = await session.execute(
-            select(Order.broker_order_id).where(
-                Order.trading_account_id == trading_account_id
-            )
+        return await self._external_order_detector.detect_and_tag(
+            session, trading_account_id, broker_orders
         )
-        our_order_ids = {str(row[0]) for row in result.fetchall() if row[0]}
-
-        # Find broker orders that don't exist in our database
-        for broker_order in broker_orders:
-            broker_order_id = str(broker_order.get('order_id', ''))
-            if not broker_order_id:
-                continue
-
-            if broker_order_id not in our_order_ids:
-                # This is an external order - tag to default strategy
-                logger.info(
-                    f"Detected external order: {broker_order_id} "
-                    f"({broker_order.get('tradingsymbol', 'N/A')})"
-                )
-
-                try:
-                    # GAP-REC-15: Use idempotency service to prevent duplicate external order processing
-                    from ..services.external_order_tagging_idempotency import ExternalOrderTaggingIdempotencyService
-                    
-                    idempotency_service = ExternalOrderTaggingIdempotencyService(session)
-                    
-                    # Prepare operation data for idempotency check
-                    operation_data = {
-                        "trading_account_id": trading_account_id,
-                        "broker_order_id": broker_order_id,
-                        "order_data": {
-                            "symbol": broker_order.get('tradingsymbol'),
-                            "transaction_type": broker_order.get('transaction_type'),
-                            "quantity": broker_order.get('quantity'),
-                            "price": broker_order.get('price'),
-                            "order_type": broker_order.get('order_type'),
-                            "status": broker_order.get('status'),
-                            "order_timestamp": broker_order.get('order_timestamp', datetime.utcnow().isoformat())
-                        }
-                    }
-                    
-                    # Check if this operation has already been processed
-                    idempotency_key = f"external_order_tag_{trading_account_id}_{broker_order_id}"
-                    
-                    idempotency_result = await idempotency_service.ensure_idempotent_operation(
-                        operation_type="external_order_tagging",
-                        client_id=f"sync_worker_{trading_account_id}",
-                        idempotency_key=idempotency_key,
-                        request_data=operation_data
-                    )
-                    
-                    if not idempotency_result.should_proceed:
-                        logger.info(
-                            f"External order {broker_order_id} already processed, skipping "
-                            f"(operation_id: {idempotency_result.operation_id})"
-                        )
-                        continue
-                    
-                    logger.info(
-                        f"Processing external order {broker_order_id} with idempotency "
-                        f"(operation_id: {idempotency_result.operation_id})"
-                    )
-                    
-                    # Get default strategy and user-managed execution for this account
-                    default_strategy_id, default_execution_id = await get_or_create_default_strategy(
-                        session, trading_account_id
-                    )
-                    
-                    # Use DefaultPortfolioService to get or create appropriate portfolio
-                    from order_service.app.services.default_portfolio_service import DefaultPortfolioService
-                    portfolio_service = DefaultPortfolioService(session)
-                    
-                    # Get default portfolio for external orders (returns tuple: portfolio_id, strategy_id)
-                    portfolio_id, _ = await portfolio_service.get_or_create_default_portfolio(
-                        trading_account_id=trading_account_id,
-                        user_id=settings.system_user_id
-                    )
 
-                    # Create order record for tracking
-                    new_order = Order(
-                        user_id=settings.system_user_id,
-                        trading_account_id=trading_account_id,
-                        broker_order_id=broker_order_id,
-                        strategy_id=default_strategy_id,
-                        execution_id=default_execution_id,  # Set execution_id
-                        portfolio_id=portfolio_id,  # NEW: Set portfolio_id via DefaultPortfolioService
-                        source=OrderSource.EXTERNAL,
-                        symbol=broker_order.get('tradingsymbol', ''),
-                        exchange=broker_order.get('exchange', ''),
-                        transaction_type=broker_order.get('transaction_type', 'BUY'),
-                        order_type=broker_order.get('order_type', 'MARKET'),
-                        product_type=broker_order.get('product', 'MIS'),
-                        variety=broker_order.get('variety', 'regular'),
-                        quantity=broker_order.get('quantity', 0),
-                        filled_quantity=broker_order.get('filled_quantity', 0),
-                        pending_quantity=broker_order.get('pending_quantity', 0),
-                        cancelled_quantity=broker_order.get('cancelled_quantity', 0),
-                        price=broker_order.get('price'),
-                        trigger_price=broker_order.get('trigger_price'),
-                        average_price=broker_order.get('average_price'),
-                        status=normalize_broker_status(broker_order.get('status', 'OPEN')),
-                        status_message=broker_order.get('status_message'),
-                        validity=broker_order.get('validity', 'DAY'),
-                    )
-                    session.add(new_order)
-                    external_orders_count += 1
-
-                    # Mark idempotent operation as successful
-                    await idempotency_service.mark_operation_complete(
-                        operation_id=idempotency_result.operation_id,
-                        success=True,
-                        result_data={
-                            "order_id": str(new_order.id) if hasattr(new_order, 'id') else None,
-                            "default_strategy_id": default_strategy_id,
-                            "execution_id": str(default_execution_id),
-                            "portfolio_id": portfolio_id
-                        }
-                    )
+    async def _sync_active_orders(self):
+        """Sync all active orders for all accounts AND detect external orders"""
+        # IMPORTANT: Always fetch orders for ALL accounts to detect external orders
+        # Even if we have no active orders in our DB, broker may have external orders
+        account_mapping = await get_all_trading_accounts()
 
-                    logger.info(
-                        f"Tagged external order {broker_order_id} to default strategy {default_strategy_id}, "
-                        f"execution {default_execution_id}, and portfolio {portfolio_id} "
-                        f"(idempotency: {idempotency_result.operation_id})"
-                    )
+        run = await self._fanout.run("order_sync", account_mapping, self._sync_account_orders)
 
-                except Exception as e:
-                    logger.error(f"Failed to tag external order {broker_order_id}: {e}")
-                    
-                    # Mark idempotent operation as failed if idempotency was started
-                    if 'idempotency_result' in locals():
-                        try:
-                            await idempotency_service.mark_operation_complete(
-                                operation_id=idempotency_result.operation_id,
-                                success=False,
-                                result_data={"error": str(e)}
-                            )
-                        except Exception as idempotency_error:
-                            logger.error(f"Failed to mark idempotent operation as failed: {idempotency_error}")
+        total_synced = run.total("orders_synced")
+        total_external = run.total("external_orders")
+        if total_synced > 0 or total_external > 0:
+            logger.info(
+                f"Order sync complete: synced={total_synced} external={total_external} "
+                f"across {len(account_mapping)} accounts ({run.duration_ms:.0f}ms)"
+            )
 
-        if external_orders_count > 0:
-            await session.commit()
-            logger.info(f"Tagged {external_orders_count} external orders to default strategy")
+    async def _sync_account_orders(
+        self,
+        session: AsyncSession,
+        trading_account_id: int,
+        account_info: dict
+    ) -> dict:
+        """
+        Sync active orders and detect external orders for one account.
 
-        return external_orders_count
+        Args:
+            session: Database session owned by this account's task
+            trading_account_id: Trading account ID
+            account_info: Account info from get_all_trading_accounts()
 
-    async def _sync_active_orders(self, session: AsyncSession):
-        """Sync all active orders for all accounts AND detect external orders"""
+        Returns:
+            Dict with orders_synced and external_orders counts
+        """
         from ..models.order import Order
         from sqlalchemy import select
-        from collections import defaultdict
+
+        account_nickname = account_info.get('nickname', f'account_{trading_account_id}')
 
         try:
-            # Get all active orders (not in terminal state)
+            # Get kite client for this account
+            kite_client = get_kite_client_for_account(trading_account_id)
+            broker_orders = await kite_client.get_orders()
+
+            # Detect and tag external orders (orders not in our database)
+            external_count = await self._detect_and_tag_external_orders(
+                session, str(trading_account_id), broker_orders
+            )
+
+            # Get account's active orders (not in terminal state) to update
             result = await session.execute(
                 select(Order).where(
+                    Order.trading_account_id == str(trading_account_id),
                     Order.status.in_(['PENDING', 'SUBMITTED', 'OPEN', 'TRIGGER_PENDING'])
                 ).limit(100)  # Limit to prevent overload
             )
-            active_orders = result.scalars().all()
+            account_orders = result.scalars().all()
 
-            # Group orders by trading_account_id
-            orders_by_account = defaultdict(list)
-            for order in active_orders:
-                orders_by_account[order.trading_account_id].append(order)
+            if not account_orders:
+                logger.debug(f"No active orders to update for {account_nickname} (checked {len(broker_orders)} broker orders)")
+                return {"orders_synced": 0, "external_orders": external_count}
 
-            # IMPORTANT: Always fetch orders for ALL accounts to detect external orders
-            # Even if we have no active orders in our DB, broker may have external orders
-            account_mapping = await get_all_trading_accounts()
-            total_synced = 0
-            total_external = 0
+            # Create lookup dict by broker_order_id
+            broker_orders_dict = {
+                str(order['order_id']): order
+                for order in broker_orders
+            }
 
-            for trading_account_id, account_info in account_mapping.items():
-                account_nickname = account_info.get('nickname', f'account_{trading_account_id}')
-                try:
-                    # Get kite client for this account
-                    kite_client = get_kite_client_for_account(trading_account_id)
-                    broker_orders = await kite_client.get_orders()
+            logger.debug(f"Fetched {len(broker_orders)} broker orders for {account_nickname}")
 
-                    # Detect and tag external orders (orders not in our database)
-                    external_count = await self._detect_and_tag_external_orders(
-                        session, str(trading_account_id), broker_orders
-                    )
-                    total_external += external_count
-
-                    # Get account's active orders to update
-                    account_orders = orders_by_account.get(str(trading_account_id), [])
-
-                    if not account_orders:
-                        logger.debug(f"No active orders to update for {account_nickname} (checked {len(broker_orders)} broker orders)")
-                        continue
-
-                    # Create lookup dict by broker_order_id
-                    broker_orders_dict = {
-                        str(order['order_id']): order
-                        for order in broker_orders
-                    }
-
-                    logger.debug(f"Fetched {len(broker_orders)} broker orders for {account_nickname}")
-
-                    # Update each order
-                    for order in account_orders:
-                        if not order.broker_order_id:
-                            continue
-
-                        broker_order = broker_orders_dict.get(str(order.broker_order_id))
-                        if not broker_order:
-                            logger.warning(f"Order {order.id} not found in broker API for {account_nickname}")
-                            continue
-
-                        # Update order status
-                        old_status = order.status
-                        new_broker_status = broker_order['status']
-                        order.status = normalize_broker_status(new_broker_status)
-                        order.filled_quantity = broker_order.get('filled_quantity', 0)
-                        order.pending_quantity = broker_order.get('pending_quantity', 0)
-                        order.cancelled_quantity = broker_order.get('cancelled_quantity', 0)
-                        order.average_price = broker_order.get('average_price')
-                        order.status_message = broker_order.get('status_message')
-                        order.exchange_timestamp = broker_order.get('exchange_timestamp')
-
-                        if old_status != order.status:
-                            logger.info(
-                                f"Order {order.id} status changed: {old_status} → {order.status} ({account_nickname})"
-                            )
-                        total_synced += 1
+            # Update each order
+            synced = 0
+            for order in account_orders:
+                if not order.broker_order_id:
+                    continue
 
-                except Exception as e:
-                    logger.error(f"Failed to sync orders for {account_nickname}: {e}")
-                    # Continue with other accounts
+                broker_order = broker_orders_dict.get(str(order.broker_order_id))
+                if not broker_order:
+                    logger.warning(f"Order {order.id} not found in broker API for {account_nickname}")
+                    continue
+
+                # Update order status
+                old_status = order.status
+                new_broker_status = broker_order['status']
+                order.status = normalize_broker_status(new_broker_status)
+                order.filled_quantity = broker_order.get('filled_quantity', 0)
+                order.pending_quantity = broker_order.get('pending_quantity', 0)
+                order.cancelled_quantity = broker_order.get('cancelled_quantity', 0)
+                order.average_price = broker_order.get('average_price')
+                order.status_message = broker_order.get('status_message')
+                order.exchange_timestamp = broker_order.get('exchange_timestamp')
+
+                if old_status != order.status:
+                    logger.info(
+                        f"Order {order.id} status changed: {old_status} → {order.status} ({account_nickname})"
+                    )
+                synced += 1
 
-            # Commit all changes
             await session.commit()
-            if total_synced > 0 or total_external > 0:
-                logger.info(f"Order sync complete: synced={total_synced} external={total_external} across {len(account_mapping)} accounts")
+            return {"orders_synced": synced, "external_orders": external_count}
 
-        except Exception as e:
-            logger.error(f"Failed to sync orders: {e}", exc_info=True)
+        except Exception:
             await session.rollback()
             raise
 
@@ -963,35 +837,26 @@ class SyncWorkerManager:
                 account_mapping = await get_all_trading_accounts()
                 user_id = settings.system_user_id
 
-                total_synced = 0
-                total_created = 0
+                async def sync_account_trades(session, trading_account_id, account_info):
+                    trade_service = TradeService(session, user_id, trading_account_id)
+                    stats = await trade_service.sync_trades_from_broker(bulk=settings.trade_sync_bulk)
 
-                async for session in get_async_session():
-                    try:
-                        for trading_account_id, account_info in account_mapping.items():
-                            account_nickname = account_info.get('nickname', f'account_{trading_account_id}')
-                            try:
-                                trade_service = TradeService(session, user_id, trading_account_id)
-                                stats = await trade_service.sync_trades_from_broker()
-
-                                total_synced += stats.get('trades_synced', 0)
-                                total_created += stats.get('trades_created', 0)
-
-                                if stats.get('trades_synced', 0) > 0:
-                                    logger.info(
-                                        f"Trade sync for {account_nickname}: "
-                                        f"synced={stats['trades_synced']}"
-                                    )
-                            except Exception as e:
-                                logger.error(f"Error syncing trades for {account_nickname}: {e}")
-
-                        if total_synced > 0:
-                            logger.info(
-                                f"Trade sync complete: synced={total_synced} "
-                                f"across {len(account_mapping)} accounts"
-                            )
-                    finally:
-                        pass  # Session cleanup handled by context manager
+                    if stats.get('trades_synced', 0) > 0:
+                        account_nickname = account_info.get('nickname', f'account_{trading_account_id}')
+                        logger.info(
+                            f"Trade sync for {account_nickname}: "
+                            f"synced={stats['trades_synced']}"
+                        )
+                    return stats
+
+                run = await self._fanout.run("trade_sync", account_mapping, sync_account_trades)
+
+                total_synced = run.total('trades_synced')
+                if total_synced > 0:
+                    logger.info(
+                        f"Trade sync complete: synced={total_synced} "
+                        f"across {len(account_mapping)} accounts ({run.duration_ms:.0f}ms)"
+                    )
 
             except asyncio.CancelledError:
                 logger.info("Trade sync worker cancelled")
@@ -1030,42 +895,30 @@ class SyncWorkerManager:
                 account_mapping = await get_all_trading_accounts()
                 user_id = settings.system_user_id  # Configurable via SYSTEM_USER_ID env var
 
-                async for session in get_async_session():
-                    try:
-                        total_checked = 0
-                        total_corrected = 0
-
-                        # Validate positions for each trading account
-                        for trading_account_id, account_info in account_mapping.items():
-                            account_nickname = account_info.get('nickname', f'account_{trading_account_id}')
-                            try:
-                                position_service = PositionService(session, user_id, trading_account_id)
-                                stats = await position_service.validate_positions()
-
-                                total_checked += stats.get('positions_checked', 0)
-                                total_corrected += stats.get('positions_corrected', 0)
-
-                                # Alert on drift for this account
-                                if stats.get('positions_corrected', 0) > 0:
-                                    logger.warning(
-                                        f"Position drift detected for {account_nickname}: "
-                                        f"quantity_drifts={len(stats.get('quantity_drifts', []))} "
-                                        f"pnl_drifts={len(stats.get('pnl_drifts', []))}"
-                                    )
-
-                            except Exception as e:
-                                logger.error(f"Error validating positions for {account_nickname}: {e}")
+                async def validate_account_positions(session, trading_account_id, account_info):
+                    position_service = PositionService(session, user_id, trading_account_id)
+                    stats = await position_service.validate_positions()
+
+                    # Alert on drift for this account
+                    if stats.get('positions_corrected', 0) > 0:
+                        account_nickname = account_info.get('nickname', f'account_{trading_account_id}')
+                        logger.warning(
+                            f"Position drift detected for {account_nickname}: "
+                            f"quantity_drifts={len(stats.get('quantity_drifts', []))} "
+                            f"pnl_drifts={len(stats.get('pnl_drifts', []))}"
+                        )
+                    return stats
 
-                        self.position_validations += 1
+                # Validate positions for each trading account
+                run = await self._fanout.run("position_validation", account_mapping, validate_account_positions)
 
-                        logger.info(
-                            f"Position validation complete: "
-                            f"checked={total_checked} corrected={total_corrected} "
-                            f"across {len(account_mapping)} accounts"
-                        )
+                self.position_validations += 1
 
-                    finally:
-                        pass  # Session cleanup handled by context manager
+                logger.info(
+                    f"Position validation complete: "
+                    f"checked={run.total('positions_checked')} corrected={run.total('positions_corrected')} "
+                    f"across {len(account_mapping)} accounts ({run.duration_ms:.0f}ms)"
+                )
 
             except asyncio.CancelledError:
                 logger.info("Position validation worker cancelled")
@@ -1102,36 +955,26 @@ class SyncWorkerManager:
                     account_mapping = await get_all_trading_accounts()
                     user_id = settings.system_user_id  # Configurable via SYSTEM_USER_ID env var
 
-                    async for session in get_async_session():
-                        try:
-                            total_synced = 0
-
-                            # Sync holdings for each trading account
-                            for trading_account_id, account_info in account_mapping.items():
-                                account_nickname = account_info.get('nickname', f'account_{trading_account_id}')
-                                try:
-                                    holding_service = HoldingService(session, user_id, trading_account_id)
-                                    stats = await holding_service.sync_holdings_daily()
+                    async def sync_account_holdings(session, trading_account_id, account_info):
+                        holding_service = HoldingService(session, user_id, trading_account_id)
+                        stats = await holding_service.sync_holdings_daily()
 
-                                    total_synced += stats.get('holdings_synced', 0)
-
-                                    logger.info(
-                                        f"Holdings sync for {account_nickname}: "
-                                        f"synced={stats.get('holdings_synced', 0)}"
-                                    )
-
-                                except Exception as e:
-                                    logger.error(f"Error syncing holdings for {account_nickname}: {e}")
+                        account_nickname = account_info.get('nickname', f'account_{trading_account_id}')
+                        logger.info(
+                            f"Holdings sync for {account_nickname}: "
+                            f"synced={stats.get('holdings_synced', 0)}"
+                        )
+                        return stats
 
-                            self.holdings_syncs += 1
+                    # Sync holdings for each trading account
+                    run = await self._fanout.run("holdings_sync", account_mapping, sync_account_holdings)
 
-                            logger.info(
-                                f"Holdings sync complete: synced={total_synced} "
-                                f"across {len(account_mapping)} accounts"
-                            )
+                    self.holdings_syncs += 1
 
-                        finally:
-                            pass  # Session cleanup handled by context manager
+                    logger.info(
+                        f"Holdings sync complete: synced={run.total('holdings_synced')} "
+                        f"across {len(account_mapping)} accounts ({run.duration_ms:.0f}ms)"
+                    )
 
                     # Wait 1 hour to avoid re-triggering
                     await asyncio.sleep(3600)
@@ -1174,49 +1017,43 @@ class SyncWorkerManager:
                 # (market hours are the same for all accounts)
                 primary_account_id = 1
 
+                # Get dynamic polling interval (short-lived session, not held across the sleep)
                 async for session in get_async_session():
-                    try:
-                        margin_service = MarginService(session, user_id, primary_account_id)
+                    margin_service = MarginService(session, user_id, primary_account_id)
+                    polling_interval = await margin_service.get_polling_interval()
 
-                        # Get dynamic polling interval
-                        polling_interval = await margin_service.get_polling_interval()
-
-                        if polling_interval == 0:
-                            # Weekend - no polling
-                            logger.debug("Weekend detected - skipping margin poll")
-                            await asyncio.sleep(3600)  # Check again in 1 hour
-                            continue
-
-                        # Wait for polling interval
-                        await asyncio.sleep(polling_interval)
+                if polling_interval == 0:
+                    # Weekend - no polling
+                    logger.debug("Weekend detected - skipping margin poll")
+                    await asyncio.sleep(3600)  # Check again in 1 hour
+                    continue
 
-                        if not self.is_running:
-                            break
+                # Wait for polling interval
+                await asyncio.sleep(polling_interval)
 
-                        # Fetch and cache margins for each trading account
-                        for trading_account_id, account_info in account_mapping.items():
-                            account_nickname = account_info.get('nickname', f'account_{trading_account_id}')
-                            try:
-                                account_margin_service = MarginService(session, user_id, trading_account_id)
-                                await account_margin_service.fetch_and_cache_margins()
+                if not self.is_running:
+                    break
 
-                                # Check for low margin alert for this account
-                                alert = await account_margin_service.check_low_margin_alert(threshold=10000.0)
-                                if alert.get("alert"):
-                                    logger.warning(f"Low margin alert for {account_nickname}: {alert}")
+                async def poll_account_margin(session, trading_account_id, account_info):
+                    account_margin_service = MarginService(session, user_id, trading_account_id)
+                    await account_margin_service.fetch_and_cache_margins()
 
-                            except Exception as e:
-                                logger.error(f"Error polling margin for {account_nickname}: {e}")
+                    # Check for low margin alert for this account
+                    alert = await account_margin_service.check_low_margin_alert(threshold=10000.0)
+                    if alert.get("alert"):
+                        account_nickname = account_info.get('nickname', f'account_{trading_account_id}')
+                        logger.warning(f"Low margin alert for {account_nickname}: {alert}")
+                    return alert
 
-                        self.margin_polls += 1
+                # Fetch and cache margins for each trading account
+                run = await self._fanout.run("margin_polling", account_mapping, poll_account_margin)
 
-                        logger.debug(
-                            f"Margin polled for {len(account_mapping)} accounts "
-                            f"(interval={polling_interval}s)"
-                        )
+                self.margin_polls += 1
 
-                    finally:
-                        pass  # Session cleanup handled by context manager
+                logger.debug(
+                    f"Margin polled for {len(account_mapping)} accounts "
+                    f"(interval={polling_interval}s, {run.duration_ms:.0f}ms)"
+                )
 
             except asyncio.CancelledError:
                 logger.info("Margin polling worker cancelled")
@@ -1266,6 +1103,8 @@ class SyncWorkerManager:
             "is_running": self.is_running,
             "active_tasks": len([t for t in self.tasks if t and not t.done()]),
             "websocket_connected": self.redis_client is not None and self.redis_pubsub is not None,
+            "account_fanout": self._fanout.get_stats(),
+            "external_order_detection": self._external_order_detector.get_stats(),
             "tier_worker": tier_metrics
         }
 
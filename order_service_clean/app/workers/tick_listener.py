@@ -8,7 +8,8 @@ real-time LTP updates instead of 5-minute polling.
 import asyncio
 import json
 import logging
-from typing import Dict, Set, Optional, Any
+import time
+from typing import Dict, List, Set, Optional, Any
 from datetime import datetime
 from decimal import Decimal
 import redis.asyncio as redis
@@ -16,6 +17,8 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
+from ..services.position_book import PositionBook
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,6 +30,11 @@ class TickListener:
     - Subscribes to Redis pub/sub channels for subscribed instruments
     - On each tick, updates position.last_price and recalculates unrealized_pnl
     - Batches updates to reduce database writes
+    - Bulk mode flushes a whole batch as one set-based UPDATE statement
+    - Tokens can be hash-partitioned across several pubsub connections
+      (shards) feeding one latest-price-wins coalescing buffer
+    - With a PositionBook attached, every batch re-marks the in-memory book
+      and DB persistence drops to a slower cadence (or large price moves)
     """
 
     def __init__(
@@ -34,7 +42,14 @@ class TickListener:
         redis_url: str = None,
         database_url: str = None,
         batch_size: int = 100,
-        batch_interval_ms: int = 500
+        batch_interval_ms: int = 500,
+        bulk_flush: bool = True,
+        num_shards: int = 1,
+        max_pending_tokens: int = 20000,
+        position_book: Optional[PositionBook] = None,
+        persist_interval_ms: int = 5000,
+        persist_threshold_pct: float = 0.5,
+        book_reload_interval_s: int = 30
     ):
         """
         Initialize tick listener.
@@ -44,6 +59,19 @@ class TickListener:
             database_url: Database connection URL
             batch_size: Maximum number of updates to batch
             batch_interval_ms: Maximum time (ms) to wait before flushing batch
+            bulk_flush: Flush each batch with a single UPDATE joined against
+                unnested (token, last_price) arrays instead of one UPDATE per token
+            num_shards: Number of Redis pubsub connections; each owns the
+                tokens where token % num_shards == shard index
+            max_pending_tokens: Bound on distinct tokens buffered between
+                flushes; ticks for new tokens beyond it are dropped and counted
+            position_book: In-memory book to mark on every batch; when set,
+                marks are persisted to the DB only every persist_interval_ms
+            persist_interval_ms: Cadence for persisting book marks to the DB
+            persist_threshold_pct: Persist a token immediately when its price
+                moved at least this much (%) since it was last persisted
+            book_reload_interval_s: How often to reload the book from the DB
+                to pick up position changes made outside this process
         """
         # Use settings from config-service for URL configuration
         from ..config.settings import settings
@@ -51,25 +79,60 @@ class TickListener:
         self.database_url = database_url or settings.database_url
         self.batch_size = batch_size
         self.batch_interval_ms = batch_interval_ms
+        self.bulk_flush = bulk_flush
+        self.num_shards = max(1, num_shards)
+        self.max_pending_tokens = max_pending_tokens
+        self.position_book = position_book
+        self.persist_interval_ms = persist_interval_ms
+        self.persist_threshold_pct = persist_threshold_pct
+        self.book_reload_interval_s = book_reload_interval_s
 
         self.redis_client: Optional[redis.Redis] = None
+        # One pubsub connection per shard; self.pubsub is shard 0
         self.pubsub: Optional[redis.client.PubSub] = None
+        self._pubsubs: List[redis.client.PubSub] = []
         self.engine = None
         self.async_session = None
 
         # Pending updates: {instrument_token: last_tick_data}
+        # Written only from the event loop thread without awaiting, so no lock
+        # is needed; the flusher swaps the dict out atomically.
         self._pending_updates: Dict[int, Dict[str, Any]] = {}
-        self._update_lock = asyncio.Lock()
+        self._flush_requested = asyncio.Event()
+
+        # Book marks not yet written to the DB, the last price written per token,
+        # and the latest price applied to the book per token
+        self._unpersisted: Dict[int, Decimal] = {}
+        self._persisted_prices: Dict[int, Decimal] = {}
+        self._latest_marks: Dict[int, Decimal] = {}
+        self._last_persist_at = time.monotonic()
 
         # Active subscriptions
         self._subscribed_tokens: Set[int] = set()
 
         # Running state
         self._running = False
-        self._listen_task: Optional[asyncio.Task] = None
+        self._listen_tasks: List[asyncio.Task] = []
         self._flush_task: Optional[asyncio.Task] = None
 
-        logger.info("TickListener initialized")
+        # Ingestion statistics
+        self._ticks_received = 0
+        self._ticks_merged = 0
+        self._ticks_dropped = 0
+
+        # Flush statistics
+        self._total_flushes = 0
+        self._total_flush_errors = 0
+        self._total_tokens_flushed = 0
+        self._total_rows_updated = 0
+        self._last_flush_latency_ms = 0.0
+        self._max_flush_latency_ms = 0.0
+        self._last_flush_tokens = 0
+        self._last_flush_rows = 0
+
+        logger.info(
+            f"TickListener initialized (bulk_flush={bulk_flush}, shards={self.num_shards})"
+        )
 
     async def connect(self):
         """Establish Redis and database connections."""
@@ -82,8 +145,9 @@ class TickListener:
         await self.redis_client.ping()
         logger.info("TickListener connected to Redis")
 
-        # Create pubsub
-        self.pubsub = self.redis_client.pubsub()
+        # Create one pubsub per shard (each holds its own connection)
+        self._pubsubs = [self.redis_client.pubsub() for _ in range(self.num_shards)]
+        self.pubsub = self._pubsubs[0]
 
         # Connect to database
         if self.database_url:
@@ -105,12 +169,13 @@ class TickListener:
         self._running = False
 
         # Cancel tasks
-        if self._listen_task:
-            self._listen_task.cancel()
+        for task in self._listen_tasks:
+            task.cancel()
             try:
-                await self._listen_task
+                await task
             except asyncio.CancelledError:
                 pass
+        self._listen_tasks = []
 
         if self._flush_task:
             self._flush_task.cancel()
@@ -119,13 +184,13 @@ class TickListener:
             except asyncio.CancelledError:
                 pass
 
-        # Flush any pending updates
-        await self._flush_updates()
+        # Flush any pending updates (including unpersisted book marks)
+        await self._flush_updates(force_persist=True)
 
-        # Close pubsub
-        if self.pubsub:
-            await self.pubsub.unsubscribe()
-            await self.pubsub.close()
+        # Close pubsubs
+        for pubsub in self._pubsubs:
+            await pubsub.unsubscribe()
+            await pubsub.close()
 
         # Close Redis
         if self.redis_client:
@@ -148,17 +213,24 @@ class TickListener:
         # Load subscriptions from database
         await self._load_subscriptions()
 
+        # Load position book
+        await self._reload_position_book()
+
         # Subscribe to channels
         await self._subscribe_to_channels()
 
-        # Start listener task
-        self._listen_task = asyncio.create_task(self._listen_loop())
+        # Start one listener task per shard
+        self._listen_tasks = [
+            asyncio.create_task(self._listen_loop(shard))
+            for shard in range(len(self._pubsubs))
+        ]
 
         # Start flush task
         self._flush_task = asyncio.create_task(self._flush_loop())
 
         logger.info(
-            f"TickListener started, listening to {len(self._subscribed_tokens)} tokens"
+            f"TickListener started, listening to {len(self._subscribed_tokens)} tokens "
+            f"on {len(self._pubsubs)} connection(s)"
         )
 
     async def stop(self):
@@ -182,24 +254,74 @@ class TickListener:
             self._subscribed_tokens = {row[0] for row in result.fetchall()}
             logger.info(f"Loaded {len(self._subscribed_tokens)} token subscriptions")
 
+    async def _reload_position_book(self):
+        """Reload the position book from the database."""
+        if self.position_book is None or not self.async_session:
+            return
+
+        try:
+            async with self.async_session() as session:
+                count = await self.position_book.load(session)
+            self._reapply_latest_marks()
+            logger.debug(f"Position book reloaded ({count} open positions)")
+        except Exception as e:
+            logger.error(f"Error reloading position book: {e}")
+
+    def _reapply_latest_marks(self):
+        """
+        Re-mark a freshly loaded book with the latest coalesced LTPs.
+
+        DB marks lag the book by design (persistence is deferred), so without
+        this every reload would briefly revert readers to stale P&L. Tokens
+        no longer held in the book are pruned from the per-token caches.
+        """
+        held = self.position_book.tokens()
+        for cache in (self._latest_marks, self._persisted_prices):
+            for token in [token for token in cache if token not in held]:
+                del cache[token]
+
+        if self._latest_marks:
+            self.position_book.apply_marks(self._latest_marks)
+
+    async def _maybe_reload_position_book(self):
+        """Reload the position book when it is missing or stale."""
+        book = self.position_book
+        if book is None:
+            return
+
+        if not book.is_ready or time.monotonic() - book.loaded_at >= self.book_reload_interval_s:
+            await self._reload_position_book()
+
+    def _shard_for(self, token: int) -> int:
+        """Return the shard index that owns an instrument token."""
+        return token % self.num_shards
+
+    def _channels_by_shard(self, tokens: Set[int]) -> Dict[int, List[str]]:
+        """Group tick channels for tokens by owning shard."""
+        channels: Dict[int, List[str]] = {}
+        for token in tokens:
+            channels.setdefault(self._shard_for(token), []).append(f"ticks:{token}")
+        return channels
+
     async def _subscribe_to_channels(self):
         """Subscribe to Redis channels for all tokens."""
-        if not self.pubsub:
+        if not self._pubsubs:
             return
 
-        if not self._subscribed_tokens:
-            # Subscribe to a dummy channel to keep pubsub connection alive
-            # This prevents errors when no tokens are subscribed yet
-            await self.pubsub.subscribe("__tick_listener_keepalive__")
-            logger.info("No tokens to subscribe, subscribed to keepalive channel")
-            return
+        channels_by_shard = self._channels_by_shard(self._subscribed_tokens)
 
-        # Subscribe to all tick channels
-        channels = [f"ticks:{token}" for token in self._subscribed_tokens]
+        for shard, pubsub in enumerate(self._pubsubs):
+            channels = channels_by_shard.get(shard)
 
-        if channels:
-            await self.pubsub.subscribe(*channels)
-            logger.info(f"Subscribed to {len(channels)} Redis channels")
+            if not channels:
+                # Subscribe to a dummy channel to keep pubsub connection alive
+                # This prevents errors when no tokens are subscribed yet
+                await pubsub.subscribe("__tick_listener_keepalive__")
+                logger.info(f"Shard {shard}: no tokens to subscribe, subscribed to keepalive channel")
+                continue
+
+            await pubsub.subscribe(*channels)
+            logger.info(f"Shard {shard}: subscribed to {len(channels)} Redis channels")
 
     async def refresh_subscriptions(self):
         """Refresh subscriptions from database."""
@@ -212,27 +334,28 @@ class TickListener:
         added = self._subscribed_tokens - old_tokens
         removed = old_tokens - self._subscribed_tokens
 
-        if self.pubsub:
+        if self._pubsubs:
             # Subscribe to new channels
+            for shard, channels in self._channels_by_shard(added).items():
+                await self._pubsubs[shard].subscribe(*channels)
             if added:
-                channels = [f"ticks:{token}" for token in added]
-                await self.pubsub.subscribe(*channels)
                 logger.info(f"Added {len(added)} channel subscriptions")
 
             # Unsubscribe from old channels
+            for shard, channels in self._channels_by_shard(removed).items():
+                await self._pubsubs[shard].unsubscribe(*channels)
             if removed:
-                channels = [f"ticks:{token}" for token in removed]
-                await self.pubsub.unsubscribe(*channels)
                 logger.info(f"Removed {len(removed)} channel subscriptions")
 
-    async def _listen_loop(self):
-        """Main loop for listening to tick messages."""
-        logger.info("Tick listener loop started")
+    async def _listen_loop(self, shard: int = 0):
+        """Main loop for listening to tick messages on one shard."""
+        logger.info(f"Tick listener loop started (shard {shard})")
+        pubsub = self._pubsubs[shard]
 
         try:
             while self._running:
                 try:
-                    message = await self.pubsub.get_message(
+                    message = await pubsub.get_message(
                         ignore_subscribe_messages=True,
                         timeout=1.0
                     )
@@ -243,13 +366,13 @@ class TickListener:
                 except asyncio.CancelledError:
                     break
                 except Exception as e:
-                    logger.error(f"Error in listen loop: {e}")
+                    logger.error(f"Error in listen loop (shard {shard}): {e}")
                     await asyncio.sleep(1)
 
         except asyncio.CancelledError:
             pass
 
-        logger.info("Tick listener loop stopped")
+        logger.info(f"Tick listener loop stopped (shard {shard})")
 
     async def _handle_tick_message(self, message: dict):
         """Handle incoming tick message."""
@@ -266,96 +389,280 @@ class TickListener:
 
             # Take the latest tick
             if ticks:
-                latest_tick = ticks[-1]
-
-                async with self._update_lock:
-                    self._pending_updates[instrument_token] = {
-                        'instrument_token': instrument_token,
-                        'last_price': latest_tick.get('last_price'),
-                        'timestamp': latest_tick.get('timestamp') or datetime.utcnow().isoformat(),
-                        'volume': latest_tick.get('volume'),
-                        'oi': latest_tick.get('oi'),
-                    }
-
-                # Flush if batch is full
-                if len(self._pending_updates) >= self.batch_size:
-                    await self._flush_updates()
+                self._buffer_tick(instrument_token, ticks[-1])
 
         except Exception as e:
             logger.error(f"Error handling tick message: {e}")
 
+    def _buffer_tick(self, instrument_token: int, tick: Dict[str, Any]):
+        """
+        Coalesce a tick into the pending buffer (latest price wins).
+
+        Never awaits, so it is atomic with respect to the flusher's buffer
+        swap. When the buffer already holds max_pending_tokens distinct
+        tokens, ticks for new tokens are dropped until the next flush.
+        """
+        self._ticks_received += 1
+        pending = self._pending_updates
+
+        if instrument_token in pending:
+            self._ticks_merged += 1
+        elif len(pending) >= self.max_pending_tokens:
+            self._ticks_dropped += 1
+            self._flush_requested.set()
+            return
+
+        pending[instrument_token] = {
+            'instrument_token': instrument_token,
+            'last_price': tick.get('last_price'),
+            'timestamp': tick.get('timestamp') or datetime.utcnow().isoformat(),
+            'volume': tick.get('volume'),
+            'oi': tick.get('oi'),
+        }
+
+        # Wake the flusher if batch is full
+        if len(pending) >= self.batch_size:
+            self._flush_requested.set()
+
     async def _flush_loop(self):
-        """Periodically flush pending updates."""
+        """Flush pending updates every interval, or sooner when a batch fills."""
         while self._running:
             try:
-                await asyncio.sleep(self.batch_interval_ms / 1000.0)
+                try:
+                    await asyncio.wait_for(
+                        self._flush_requested.wait(),
+                        timeout=self.batch_interval_ms / 1000.0
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                self._flush_requested.clear()
                 await self._flush_updates()
+                await self._maybe_reload_position_book()
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Error in flush loop: {e}")
 
-    async def _flush_updates(self):
-        """Flush pending updates to database."""
-        async with self._update_lock:
-            if not self._pending_updates:
-                return
+    def _drain_pending(self) -> Dict[int, Decimal]:
+        """Swap out the pending buffer and return {token: last_price}."""
+        if not self._pending_updates:
+            return {}
+
+        # Swap the buffer out; ticks arriving during the write land in a fresh dict
+        pending, self._pending_updates = self._pending_updates, {}
 
-            updates = list(self._pending_updates.values())
-            self._pending_updates.clear()
+        # Drop ticks without a price - nothing to mark
+        prices: Dict[int, Decimal] = {}
+        for update in pending.values():
+            last_price = update.get('last_price')
+            if last_price is None:
+                continue
+            prices[update['instrument_token']] = Decimal(str(last_price))
 
-        if not updates or not self.async_session:
+        return prices
+
+    def _select_for_persist(self, prices: Dict[int, Decimal], force: bool = False) -> Dict[int, Decimal]:
+        """
+        Decide which book marks to write to the DB on this flush.
+
+        Everything is written once per persist_interval_ms; in between only
+        tokens whose price moved at least persist_threshold_pct since their
+        last write (or that were never written) go out immediately.
+        """
+        self._unpersisted.update(prices)
+        now = time.monotonic()
+
+        if force or (now - self._last_persist_at) * 1000 >= self.persist_interval_ms:
+            due, self._unpersisted = self._unpersisted, {}
+            self._last_persist_at = now
+            return due
+
+        due: Dict[int, Decimal] = {}
+        threshold = Decimal(str(self.persist_threshold_pct))
+        for token, price in prices.items():
+            last = self._persisted_prices.get(token)
+            if not last or abs(price - last) / last * 100 >= threshold:
+                due[token] = price
+                self._unpersisted.pop(token, None)
+
+        return due
+
+    async def _flush_updates(self, force_persist: bool = False):
+        """Flush pending updates to the position book and/or database."""
+        prices = self._drain_pending()
+
+        if self.position_book is not None:
+            if prices:
+                self.position_book.apply_marks(prices)
+                self._latest_marks.update(prices)
+            prices = self._select_for_persist(prices, force=force_persist)
+
+        if not prices or not self.async_session:
             return
 
+        start = time.perf_counter()
         try:
             async with self.async_session() as session:
-                for update in updates:
-                    token = update['instrument_token']
-                    last_price = update.get('last_price')
-
-                    if last_price is None:
-                        continue
-
-                    # Update position with new LTP and recalculate P&L
-                    await session.execute(text("""
-                        UPDATE order_service.positions
-                        SET
-                            last_price = :last_price,
-                            unrealized_pnl = CASE
-                                WHEN quantity > 0 THEN
-                                    ((:last_price - buy_price) * quantity)
-                                WHEN quantity < 0 THEN
-                                    ((sell_price - :last_price) * ABS(quantity))
-                                ELSE 0
-                            END,
-                            total_pnl = realized_pnl + CASE
-                                WHEN quantity > 0 THEN
-                                    ((:last_price - buy_price) * quantity)
-                                WHEN quantity < 0 THEN
-                                    ((sell_price - :last_price) * ABS(quantity))
-                                ELSE 0
-                            END,
-                            net_pnl = realized_pnl + CASE
-                                WHEN quantity > 0 THEN
-                                    ((:last_price - buy_price) * quantity)
-                                WHEN quantity < 0 THEN
-                                    ((sell_price - :last_price) * ABS(quantity))
-                                ELSE 0
-                            END - total_charges,
-                            updated_at = NOW()
-                        WHERE instrument_token = :token
-                          AND is_open = true
-                          AND quantity != 0
-                    """), {
-                        "token": token,
-                        "last_price": Decimal(str(last_price))
-                    })
+                if self.bulk_flush:
+                    rows_updated = await self._flush_bulk(session, prices)
+                else:
+                    rows_updated = await self._flush_per_token(session, prices)
 
                 await session.commit()
-                logger.debug(f"Flushed {len(updates)} position updates")
 
         except Exception as e:
+            self._total_flush_errors += 1
             logger.error(f"Error flushing position updates: {e}")
+            if self.position_book is not None:
+                # Retry on the next cadence unless a newer price arrived
+                for token, price in prices.items():
+                    self._unpersisted.setdefault(token, price)
+            return
+
+        if self.position_book is not None:
+            self._persisted_prices.update(prices)
+
+        latency_ms = (time.perf_counter() - start) * 1000
+        self._record_flush(len(prices), rows_updated, latency_ms)
+        logger.debug(
+            f"Flushed {len(prices)} tokens ({rows_updated} positions) "
+            f"in {latency_ms:.1f}ms (bulk={self.bulk_flush})"
+        )
+
+    async def _flush_bulk(self, session: AsyncSession, prices: Dict[int, Decimal]) -> int:
+        """
+        Apply a batch of LTPs with one set-based UPDATE.
+
+        The batch is shipped as two parallel arrays and joined against
+        positions via unnest(), so the round trip count is constant
+        regardless of how many tokens ticked. P&L CASE semantics match
+        _flush_per_token.
+
+        Returns:
+            Number of position rows updated
+        """
+        result = await session.execute(text("""
+            UPDATE order_service.positions AS p
+            SET
+                last_price = t.last_price,
+                unrealized_pnl = CASE
+                    WHEN p.quantity > 0 THEN
+                        ((t.last_price - p.buy_price) * p.quantity)
+                    WHEN p.quantity < 0 THEN
+                        ((p.sell_price - t.last_price) * ABS(p.quantity))
+                    ELSE 0
+                END,
+                total_pnl = p.realized_pnl + CASE
+                    WHEN p.quantity > 0 THEN
+                        ((t.last_price - p.buy_price) * p.quantity)
+                    WHEN p.quantity < 0 THEN
+                        ((p.sell_price - t.last_price) * ABS(p.quantity))
+                    ELSE 0
+                END,
+                net_pnl = p.realized_pnl + CASE
+                    WHEN p.quantity > 0 THEN
+                        ((t.last_price - p.buy_price) * p.quantity)
+                    WHEN p.quantity < 0 THEN
+                        ((p.sell_price - t.last_price) * ABS(p.quantity))
+                    ELSE 0
+                END - p.total_charges,
+                updated_at = NOW()
+            FROM unnest(
+                CAST(:tokens AS bigint[]),
+                CAST(:prices AS numeric[])
+            ) AS t(instrument_token, last_price)
+            WHERE p.instrument_token = t.instrument_token
+              AND p.is_open = true
+              AND p.quantity != 0
+        """), {
+            "tokens": list(prices.keys()),
+            "prices": list(prices.values())
+        })
+
+        return max(result.rowcount or 0, 0)
+
+    async def _flush_per_token(self, session: AsyncSession, prices: Dict[int, Decimal]) -> int:
+        """
+        Apply a batch of LTPs with one UPDATE per instrument token.
+
+        Legacy path, kept for databases where array binds are unavailable.
+
+        Returns:
+            Number of position rows updated
+        """
+        rows_updated = 0
+
+        for token, last_price in prices.items():
+            # Update position with new LTP and recalculate P&L
+            result = await session.execute(text("""
+                UPDATE order_service.positions
+                SET
+                    last_price = :last_price,
+                    unrealized_pnl = CASE
+                        WHEN quantity > 0 THEN
+                            ((:last_price - buy_price) * quantity)
+                        WHEN quantity < 0 THEN
+                            ((sell_price - :last_price) * ABS(quantity))
+                        ELSE 0
+                    END,
+                    total_pnl = realized_pnl + CASE
+                        WHEN quantity > 0 THEN
+                            ((:last_price - buy_price) * quantity)
+                        WHEN quantity < 0 THEN
+                            ((sell_price - :last_price) * ABS(quantity))
+                        ELSE 0
+                    END,
+                    net_pnl = realized_pnl + CASE
+                        WHEN quantity > 0 THEN
+                            ((:last_price - buy_price) * quantity)
+                        WHEN quantity < 0 THEN
+                            ((sell_price - :last_price) * ABS(quantity))
+                        ELSE 0
+                    END - total_charges,
+                    updated_at = NOW()
+                WHERE instrument_token = :token
+                  AND is_open = true
+                  AND quantity != 0
+            """), {
+                "token": token,
+                "last_price": last_price
+            })
+            rows_updated += max(result.rowcount or 0, 0)
+
+        return rows_updated
+
+    def _record_flush(self, tokens: int, rows: int, latency_ms: float):
+        """Record statistics for a completed flush."""
+        self._total_flushes += 1
+        self._total_tokens_flushed += tokens
+        self._total_rows_updated += rows
+        self._last_flush_tokens = tokens
+        self._last_flush_rows = rows
+        self._last_flush_latency_ms = latency_ms
+        self._max_flush_latency_ms = max(self._max_flush_latency_ms, latency_ms)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get ingestion and flush statistics."""
+        return {
+            "bulk_flush": self.bulk_flush,
+            "num_shards": self.num_shards,
+            "subscribed_tokens": len(self._subscribed_tokens),
+            "pending_updates": len(self._pending_updates),
+            "max_pending_tokens": self.max_pending_tokens,
+            "ticks_received": self._ticks_received,
+            "ticks_merged": self._ticks_merged,
+            "ticks_dropped": self._ticks_dropped,
+            "total_flushes": self._total_flushes,
+            "total_flush_errors": self._total_flush_errors,
+            "total_tokens_flushed": self._total_tokens_flushed,
+            "total_rows_updated": self._total_rows_updated,
+            "last_flush_tokens": self._last_flush_tokens,
+            "last_flush_rows": self._last_flush_rows,
+            "last_flush_latency_ms": round(self._last_flush_latency_ms, 3),
+            "max_flush_latency_ms": round(self._max_flush_latency_ms, 3),
+            "unpersisted_tokens": len(self._unpersisted),
+            "position_book": self.position_book.get_stats() if self.position_book is not None else None,
+        }
 
 
 async def create_tick_listener(
@@ -383,9 +690,20 @@ async def create_tick_listener(
     if database_url and 'postgresql://' in database_url and '+asyncpg' not in database_url:
         database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://')
 
+    position_book = None
+    if settings.position_book_enabled:
+        from ..services.position_book import get_position_book
+        position_book = get_position_book()
+
     listener = TickListener(
         redis_url=redis_url,
-        database_url=database_url
+        database_url=database_url,
+        bulk_flush=settings.tick_listener_bulk_flush,
+        num_shards=settings.tick_listener_shards,
+        max_pending_tokens=settings.tick_listener_max_pending_tokens,
+        position_book=position_book,
+        persist_interval_ms=settings.position_book_persist_interval_ms,
+        persist_threshold_pct=settings.position_book_persist_threshold_pct
     )
 
     return listener
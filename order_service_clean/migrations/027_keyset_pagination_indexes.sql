@@ -0,0 +1,15 @@
+-- Migration: Composite indexes for keyset (cursor) pagination
+-- Purpose: Serve "WHERE trading_account_id = ? AND (ts, id) < (?, ?) ORDER BY ts DESC, id DESC"
+--          listings with a single backward index range scan instead of OFFSET scans
+-- Date: 2026-10-16
+
+CREATE INDEX IF NOT EXISTS idx_orders_account_created_id
+    ON order_service.orders (trading_account_id, created_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_trades_account_time_id
+    ON order_service.trades (trading_account_id, trade_time, id);
+
+-- Positions page on opened_at: updated_at changes on every re-mark, which would
+-- move rows across the cursor between page fetches
+CREATE INDEX IF NOT EXISTS idx_positions_account_opened_id
+    ON order_service.positions (trading_account_id, opened_at, id);
@@ -0,0 +1,51 @@
+-- Migration: Per-account uniqueness for positions
+-- Purpose: Broker position sync upserts ON CONFLICT per (account, symbol, exchange, product, day).
+--          unique_position (user_id, symbol, product_type, trading_day) ignores the account and
+--          exchange, so accounts synced under the same user overwrote each other's rows and an
+--          NSE and a BSE position in the same symbol collided.
+--          Rows that already duplicate the new key are merged into the most recently updated
+--          one first (orders are re-pointed to it), so adding the constraint cannot fail midway.
+-- Date: 2026-10-16
+
+BEGIN;
+
+CREATE TEMP TABLE position_duplicates ON COMMIT DROP AS
+SELECT id, keep_id
+FROM (
+    SELECT
+        id,
+        FIRST_VALUE(id) OVER (
+            PARTITION BY trading_account_id, symbol, exchange, product_type, trading_day
+            ORDER BY updated_at DESC, id DESC
+        ) AS keep_id
+    FROM order_service.positions
+) ranked
+WHERE id <> keep_id;
+
+UPDATE order_service.orders o
+SET position_id = d.keep_id
+FROM position_duplicates d
+WHERE o.position_id = d.id;
+
+DELETE FROM order_service.positions p
+USING position_duplicates d
+WHERE p.id = d.id;
+
+DO $$
+DECLARE
+    v_removed INTEGER;
+BEGIN
+    SELECT COUNT(*) INTO v_removed FROM position_duplicates;
+    IF v_removed > 0 THEN
+        RAISE NOTICE 'Removed % duplicate positions (kept the latest row per account/symbol/exchange/product/day)', v_removed;
+    END IF;
+END $$;
+
+ALTER TABLE order_service.positions
+    DROP CONSTRAINT IF EXISTS unique_position;
+
+ALTER TABLE order_service.positions
+    ADD CONSTRAINT unique_account_position
+    UNIQUE (trading_account_id, symbol, exchange, product_type, trading_day);
+
+COMMIT;
@@ -45,6 +45,8 @@ def register_order_service_parameters():
         # Redis
         "ORDER_SERVICE_REDIS_ORDER_TTL": {"value": 86400, "type": "int", "description": "Order TTL in Redis (seconds)"},
         "ORDER_SERVICE_REDIS_REQUIRED": {"value": True, "type": "bool", "description": "Redis required for production"},
+        "ORDER_SERVICE_REDIS_USAGE_MONITOR_INTERVAL": {"value": 60, "type": "int", "description": "Seconds between Redis usage metric collections"},
+        "ORDER_SERVICE_REDIS_USAGE_MONITOR_MAX_KEYS_PER_PREFIX": {"value": 10000, "type": "int", "description": "Keys counted per owner prefix per collection (counts are lower bounds beyond this)"},
         
         # Authentication
         "ORDER_SERVICE_AUTH_ENABLED": {"value": True, "type": "bool", "description": "Enable JWT authentication"},
@@ -77,10 +79,62 @@ def register_order_service_parameters():
         "ORDER_SERVICE_MAX_POSITION_EXPOSURE_VALUE": {"value": 10000000.0, "type": "float", "description": "Max position exposure"},
         "ORDER_SERVICE_MAX_POSITION_CONCENTRATION_PCT": {"value": 0.6, "type": "float", "description": "Max position concentration %"},
         "ORDER_SERVICE_DAILY_LOSS_LIMIT": {"value": -50000.0, "type": "float", "description": "Daily loss limit (negative)"},
+        "ORDER_SERVICE_RISK_SNAPSHOT_TTL_SECONDS": {"value": 2.0, "type": "float", "description": "Seconds a per-account pre-trade risk snapshot is reused"},
         
         # Position Tracking
         "ORDER_SERVICE_ENABLE_POSITION_TRACKING": {"value": True, "type": "bool", "description": "Enable position tracking"},
         "ORDER_SERVICE_POSITION_SYNC_INTERVAL": {"value": 60, "type": "int", "description": "Position sync interval (seconds)"},
+
+        # Tick Listener
+        "ORDER_SERVICE_TICK_LISTENER_BULK_FLUSH": {"value": True, "type": "bool", "description": "Flush tick batches with one set-based UPDATE"},
+        "ORDER_SERVICE_TICK_LISTENER_SHARDS": {"value": 4, "type": "int", "description": "Redis pubsub connections for tick ingestion"},
+        "ORDER_SERVICE_TICK_LISTENER_MAX_PENDING_TOKENS": {"value": 20000, "type": "int", "description": "Max distinct tokens buffered between flushes"},
+        "ORDER_SERVICE_POSITION_BOOK_ENABLED": {"value": True, "type": "bool", "description": "Mark P&L in an in-memory position book"},
+        "ORDER_SERVICE_POSITION_BOOK_PERSIST_INTERVAL_MS": {"value": 5000, "type": "int", "description": "Position book DB persist cadence (ms)"},
+        "ORDER_SERVICE_POSITION_BOOK_PERSIST_THRESHOLD_PCT": {"value": 0.5, "type": "float", "description": "Price move (%) that forces immediate persist"},
+
+        # Trade Sync
+        "ORDER_SERVICE_TRADE_SYNC_BULK": {"value": True, "type": "bool", "description": "Sync broker trades with set-based lookups and one INSERT ... ON CONFLICT"},
+
+        # Trading Account Registry
+        "ORDER_SERVICE_ACCOUNT_REGISTRY_TTL_SECONDS": {"value": 60.0, "type": "float", "description": "Trading account registry cache TTL (seconds)"},
+        "ORDER_SERVICE_ACCOUNT_REGISTRY_REFRESH_INTERVAL": {"value": 30.0, "type": "float", "description": "Trading account registry background refresh interval (seconds)"},
+
+        # Sync Worker Fan-Out
+        "ORDER_SERVICE_SYNC_FANOUT_MAX_CONCURRENCY": {"value": 16, "type": "int", "description": "Accounts synced concurrently by background workers"},
+        "ORDER_SERVICE_SYNC_FANOUT_ACCOUNT_TIMEOUT": {"value": 45.0, "type": "float", "description": "Per-account sync job timeout (seconds)"},
+
+        # Kite Call Executor
+        "ORDER_SERVICE_KITE_EXECUTOR_MAX_WORKERS": {"value": 32, "type": "int", "description": "Worker threads for blocking KiteConnect calls"},
+        "ORDER_SERVICE_KITE_EXECUTOR_PER_ACCOUNT_CONCURRENCY": {"value": 4, "type": "int", "description": "Max concurrent KiteConnect calls per trading account"},
+
+        # Kite Rate Limiter
+        "ORDER_SERVICE_KITE_RATE_LIMIT_DISTRIBUTED": {"value": True, "type": "bool", "description": "Share per-account Kite per-second/minute budgets across replicas via Redis"},
+        "ORDER_SERVICE_KITE_RATE_LIMIT_LEASE_SIZE": {"value": 3, "type": "int", "description": "Max Kite rate-limit slots leased per Redis round trip when the shared budget is ample (1 disables leasing)"},
+        "ORDER_SERVICE_KITE_RATE_LIMIT_BURST": {"value": 1, "type": "int", "description": "Kite requests allowed back to back per limit, capped at half the limit; each one above 1 lowers the sustained rate by one request per window (distributed leasing needs >= 5)"},
+
+        # HTTP Client Pool
+        "ORDER_SERVICE_HTTP_POOL_MAX_CONNECTIONS": {"value": 50, "type": "int", "description": "Default max connections per upstream service in the shared HTTP client pool"},
+        "ORDER_SERVICE_HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS": {"value": 20, "type": "int", "description": "Default idle keep-alive connections kept per upstream service"},
+        "ORDER_SERVICE_HTTP_POOL_KEEPALIVE_EXPIRY": {"value": 30.0, "type": "float", "description": "Seconds an idle pooled HTTP connection is kept open"},
+        "ORDER_SERVICE_HTTP_POOL_HTTP2": {"value": True, "type": "bool", "description": "Negotiate HTTP/2 with upstreams that support it (requires the h2 package)"},
+
+        # Config Snapshot
+        "ORDER_SERVICE_CONFIG_REFRESH_INTERVAL_SECONDS": {"value": 30.0, "type": "float", "description": "Seconds between background re-fetches of config values into the in-process settings snapshot"},
+
+        # Handoff Acknowledgements
+        "ORDER_SERVICE_HANDOFF_ACK_FALLBACK_POLL_SECONDS": {"value": 5.0, "type": "float", "description": "execution_contexts poll interval while algo engine acks arrive via pub/sub"},
+        "ORDER_SERVICE_HANDOFF_EMERGENCY_ACK_TIMEOUT": {"value": 2.0, "type": "float", "description": "Seconds to wait for the algo engine to confirm an emergency stop"},
+        
+        # Capital Ledger
+        "ORDER_SERVICE_CAPITAL_BALANCE_RECONCILE_INTERVAL": {"value": 3600, "type": "int", "description": "Seconds between full-ledger reconciliations of portfolio capital balances"},
+        
+        # Dashboard
+        "ORDER_SERVICE_DASHBOARD_CACHE_TTL": {"value": 30, "type": "int", "description": "Dashboard summary cache TTL (seconds); entries are also invalidated on order/position changes"},
+
+        # Secure Cache
+        "ORDER_SERVICE_SECURE_CACHE_L1_MAX_ENTRIES": {"value": 1024, "type": "int", "description": "In-process entries of decrypted values kept in front of Redis (0 disables)"},
+        "ORDER_SERVICE_SECURE_CACHE_L1_TTL": {"value": 30.0, "type": "float", "description": "Max age (seconds) of an in-process cache entry; bounds staleness if an invalidation is missed"},
         
         # System
         "ORDER_SERVICE_SYSTEM_USER_ID": {"value": 1, "type": "int", "description": "System user ID for background workers"},
@@ -4,8 +4,15 @@ Historical P&L Backfill Script
 
 Backfills strategy_pnl_metrics table with historical P&L data from past trades.
 
+Each strategy's whole date range is loaded with two grouped queries
+(PnLCalculator.calculate_strategy_daily_metrics), day P&L is derived from a
+rolling cumulative P&L, and results are pushed to the Analytics Service in
+bulk. Strategies run concurrently on a bounded worker pool; completed
+strategies are recorded in a checkpoint file so an interrupted run can resume.
+
 Usage:
     python backfill_historical_pnl.py [--strategy-id ID] [--start-date YYYY-MM-DD] [--end-date YYYY-MM-DD]
+                                      [--workers N] [--bulk-size N] [--checkpoint PATH] [--resume]
 
 Examples:
     # Backfill all strategies for last 30 days
@@ -16,12 +23,18 @@ Examples:
 
     # Backfill date range
     python backfill_historical_pnl.py --start-date 2025-11-01 --end-date 2025-11-24
+
+    # Resume an interrupted full backfill with 16 workers
+    python backfill_historical_pnl.py --workers 16 --resume
 """
 import asyncio
 import argparse
+import json
 import logging
+import os
 import sys
 from datetime import date, datetime, timedelta
+from decimal import Decimal
 from pathlib import Path
 
 # Add parent directory to path for imports
@@ -31,6 +44,7 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
+from app.clients.analytics_service_client import get_analytics_client, cleanup_analytics_client
 from app.config.settings import settings
 from app.services.pnl_calculator import PnLCalculator
 
@@ -41,13 +55,71 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+DEFAULT_CHECKPOINT = "backfill_pnl_checkpoint.json"
+
+
+class BackfillCheckpoint:
+    """Records completed strategies so an interrupted backfill can resume"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.completed = {}
+        self._lock = asyncio.Lock()
+
+    def load(self):
+        """Load completed strategies from disk (missing file = fresh run)"""
+        if self.path.exists():
+            with open(self.path) as f:
+                self.completed = json.load(f).get("completed", {})
+            logger.info(f"Resuming from checkpoint {self.path}: {len(self.completed)} strategies done")
+
+    def is_done(self, strategy_id: int, start_date: date, end_date: date) -> bool:
+        entry = self.completed.get(str(strategy_id))
+        return bool(entry) and entry["start_date"] <= start_date.isoformat() and entry["end_date"] >= end_date.isoformat()
+
+    async def mark_done(self, result: dict):
+        """Record a completed strategy and persist atomically"""
+        async with self._lock:
+            self.completed[str(result["strategy_id"])] = {
+                "start_date": result["start_date"].isoformat(),
+                "end_date": result["end_date"].isoformat(),
+                "dates_processed": result["dates_processed"],
+                "completed_at": datetime.utcnow().isoformat(),
+            }
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump({"completed": self.completed}, f, indent=2)
+            os.replace(tmp_path, self.path)
+
 
 class HistoricalPnLBackfill:
     """Backfill historical P&L metrics for strategies"""
 
-    def __init__(self, db_url: str):
-        """Initialize backfill service"""
-        self.engine = create_async_engine(db_url, echo=False)
+    def __init__(
+        self,
+        db_url: str,
+        workers: int = 8,
+        bulk_size: int = 100,
+        checkpoint: BackfillCheckpoint = None
+    ):
+        """
+        Initialize backfill service
+
+        Args:
+            db_url: Database URL
+            workers: Strategies backfilled concurrently
+            bulk_size: Metric days per Analytics Service bulk request
+            checkpoint: Optional resume checkpoint
+        """
+        self.workers = max(1, workers)
+        self.bulk_size = max(1, bulk_size)
+        self.checkpoint = checkpoint
+        self.engine = create_async_engine(
+            db_url,
+            echo=False,
+            pool_size=self.workers,
+            max_overflow=2
+        )
         self.async_session = sessionmaker(
             self.engine,
             class_=AsyncSession,
@@ -160,46 +232,63 @@ class HistoricalPnLBackfill:
         if not force:
             existing_dates = await self.get_existing_pnl_dates(strategy_id)
 
-        # Process each date
-        dates_processed = 0
+        # Whole range in two queries
+        async with self.async_session() as session:
+            pnl_calculator = PnLCalculator(session)
+            daily_metrics = await pnl_calculator.calculate_strategy_daily_metrics(
+                strategy_id, start_date, end_date
+            )
+            # Drawdown window is relative to today, so it is the same for every day
+            max_drawdown = await pnl_calculator.calculate_max_drawdown(strategy_id)
+
+        analytics_client = await get_analytics_client()
+        previous_cumulative = await analytics_client.get_previous_cumulative_pnl(
+            strategy_id=str(strategy_id),
+            before_date=start_date
+        ) or Decimal('0')
+
+        empty_metrics = PnLCalculator.build_strategy_metrics(None, 0)
+
+        calculations = []
         dates_skipped = 0
-        dates_failed = 0
 
         current_date = start_date
         while current_date <= end_date:
-            try:
-                # Skip weekends (markets closed)
-                if current_date.weekday() >= 5:  # Saturday=5, Sunday=6
-                    current_date += timedelta(days=1)
-                    continue
-
-                # Skip if already exists (unless forcing)
-                if not force and current_date in existing_dates:
-                    logger.debug(f"Skipping {current_date} (already exists)")
-                    dates_skipped += 1
-                    current_date += timedelta(days=1)
-                    continue
-
-                # Calculate P&L for this date
-                async with self.async_session() as session:
-                    pnl_calculator = PnLCalculator(session)
-                    success = await pnl_calculator.update_strategy_pnl_metrics(
-                        strategy_id=strategy_id,
-                        trading_day=current_date
-                    )
+            # Skip weekends (markets closed)
+            if current_date.weekday() >= 5:  # Saturday=5, Sunday=6
+                current_date += timedelta(days=1)
+                continue
+
+            metrics = daily_metrics.get(current_date, empty_metrics)
+            pnl_data = PnLCalculator.build_pnl_data(metrics, previous_cumulative, max_drawdown)
+            # Rolling cumulative: each day's day_pnl is relative to the previous weekday
+            previous_cumulative = metrics["total_pnl"]
+
+            # Skip if already exists (unless forcing)
+            if not force and current_date in existing_dates:
+                logger.debug(f"Skipping {current_date} (already exists)")
+                dates_skipped += 1
+            else:
+                calculations.append({
+                    "strategy_id": str(strategy_id),
+                    "metric_date": current_date.isoformat(),
+                    "pnl_data": pnl_data
+                })
 
-                    if success:
-                        dates_processed += 1
-                        logger.info(f"✅ Backfilled {current_date} for strategy {strategy_id}")
-                    else:
-                        dates_failed += 1
-                        logger.warning(f"⚠️  Failed to backfill {current_date}")
+            current_date += timedelta(days=1)
 
-            except Exception as e:
-                dates_failed += 1
-                logger.error(f"Error backfilling {current_date}: {e}", exc_info=True)
+        dates_processed = 0
+        dates_failed = 0
+        for i in range(0, len(calculations), self.bulk_size):
+            chunk = calculations[i:i + self.bulk_size]
+            processed = await self._push_calculations(analytics_client, chunk)
+            dates_processed += processed
+            dates_failed += len(chunk) - processed
 
-            current_date += timedelta(days=1)
+        logger.info(
+            f"✅ Backfilled strategy {strategy_id}: {dates_processed} processed, "
+            f"{dates_skipped} skipped, {dates_failed} failed"
+        )
 
         return {
             "strategy_id": strategy_id,
@@ -211,6 +300,36 @@ class HistoricalPnLBackfill:
             "total_dates": (end_date - start_date).days + 1
         }
 
+    async def _push_calculations(self, analytics_client, calculations: list) -> int:
+        """
+        Push a chunk of metric days to the Analytics Service.
+
+        Uses the bulk endpoint; falls back to one request per day if it fails.
+
+        Returns:
+            Number of metric days stored
+        """
+        try:
+            await analytics_client.bulk_calculate_pnl_metrics(calculations)
+            return len(calculations)
+        except Exception as e:
+            logger.warning(f"Bulk P&L push failed ({len(calculations)} days), retrying individually: {e}")
+
+        stored = 0
+        for calculation in calculations:
+            try:
+                if await analytics_client.calculate_and_store_pnl_metrics(
+                    strategy_id=calculation["strategy_id"],
+                    metric_date=date.fromisoformat(calculation["metric_date"]),
+                    pnl_data=calculation["pnl_data"]
+                ):
+                    stored += 1
+                else:
+                    logger.warning(f"⚠️  Failed to backfill {calculation['metric_date']}")
+            except Exception as e:
+                logger.error(f"Error backfilling {calculation['metric_date']}: {e}")
+        return stored
+
     async def backfill_all_strategies(
         self,
         start_date: date = None,
@@ -238,34 +357,47 @@ class HistoricalPnLBackfill:
             logger.warning("No strategies with trades found")
             return []
 
-        logger.info(f"Found {len(strategies)} strategies with trades")
+        logger.info(f"Found {len(strategies)} strategies with trades ({self.workers} workers)")
+
+        semaphore = asyncio.Semaphore(self.workers)
+        completed = 0
 
-        # Backfill each strategy
-        results = []
-        for strategy_info in strategies:
+        async def backfill(strategy_info: dict) -> dict:
+            nonlocal completed
             strategy_id = strategy_info["strategy_id"]
 
             # Use strategy's first trade date if no start_date provided
             strategy_start = start_date or strategy_info["first_trade_date"]
             strategy_end = min(end_date, strategy_info["last_trade_date"])
 
-            logger.info(
-                f"\n{'='*60}\n"
-                f"Strategy {strategy_id}: {strategy_info['trade_count']} trades "
-                f"({strategy_start} to {strategy_end})\n"
-                f"{'='*60}"
-            )
+            if self.checkpoint and self.checkpoint.is_done(strategy_id, strategy_start, strategy_end):
+                completed += 1
+                logger.info(f"[{completed}/{len(strategies)}] Strategy {strategy_id} already done (checkpoint)")
+                return {"strategy_id": strategy_id, "checkpointed": True}
 
-            result = await self.backfill_strategy_date_range(
-                strategy_id=strategy_id,
-                start_date=strategy_start,
-                end_date=strategy_end,
-                force=force
-            )
+            async with semaphore:
+                try:
+                    result = await self.backfill_strategy_date_range(
+                        strategy_id=strategy_id,
+                        start_date=strategy_start,
+                        end_date=strategy_end,
+                        force=force
+                    )
+                except Exception as e:
+                    logger.error(f"Error backfilling strategy {strategy_id}: {e}", exc_info=True)
+                    result = {"strategy_id": strategy_id, "error": str(e)}
 
-            results.append(result)
+            if self.checkpoint and "error" not in result and result["dates_failed"] == 0:
+                await self.checkpoint.mark_done(result)
 
-        return results
+            completed += 1
+            logger.info(
+                f"[{completed}/{len(strategies)}] Strategy {strategy_id}: "
+                f"{strategy_info['trade_count']} trades ({strategy_start} to {strategy_end})"
+            )
+            return result
+
+        return list(await asyncio.gather(*(backfill(info) for info in strategies)))
 
     async def backfill_single_strategy(
         self,
@@ -353,6 +485,29 @@ async def main():
         default=settings.DATABASE_URL,
         help="Database URL (default: from settings)"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Strategies to backfill concurrently (default: 8)"
+    )
+    parser.add_argument(
+        "--bulk-size",
+        type=int,
+        default=100,
+        help="Metric days per Analytics Service bulk request (default: 100)"
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        default=DEFAULT_CHECKPOINT,
+        help=f"Checkpoint file of completed strategies (default: {DEFAULT_CHECKPOINT})"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip strategies already completed in the checkpoint file"
+    )
 
     args = parser.parse_args()
 
@@ -375,7 +530,16 @@ async def main():
             return 1
 
     # Initialize backfill service
-    backfill = HistoricalPnLBackfill(args.db_url)
+    checkpoint = BackfillCheckpoint(args.checkpoint)
+    if args.resume:
+        checkpoint.load()
+
+    backfill = HistoricalPnLBackfill(
+        args.db_url,
+        workers=args.workers,
+        bulk_size=args.bulk_size,
+        checkpoint=checkpoint
+    )
 
     try:
         # Backfill
@@ -406,7 +570,9 @@ async def main():
         total_failed = sum(r.get("dates_failed", 0) for r in results)
 
         for result in results:
-            if "error" in result:
+            if result.get("checkpointed"):
+                print(f"\n⏭️  Strategy {result['strategy_id']}: already done (checkpoint)")
+            elif "error" in result:
                 print(f"\n❌ Strategy {result['strategy_id']}: {result['error']}")
             else:
                 print(
@@ -428,6 +594,7 @@ async def main():
 
     finally:
         await backfill.close()
+        await cleanup_analytics_client()
 
 
 if __name__ == "__main__":
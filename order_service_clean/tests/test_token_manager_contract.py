@@ -75,10 +75,10 @@ class TestOrderServiceTokenManagerIntegration:
             "timestamp": "2024-12-27T10:00:00Z"
         }
         
-        # Mock httpx.AsyncClient to return our test response
-        with patch('httpx.AsyncClient') as mock_client:
+        # Mock the shared token_manager client to return our test response
+        with patch('order_service.app.services.kite_client_multi.get_http_client') as mock_client:
             mock_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
             mock_instance.get.return_value.status_code = 200
             mock_instance.get.return_value.json.return_value = mock_response
             
@@ -133,9 +133,9 @@ class TestOrderServiceTokenManagerIntegration:
             "api_key": "test_api_key"
         }
         
-        with patch('httpx.AsyncClient') as mock_client:
+        with patch('order_service.app.services.kite_client_multi.get_http_client') as mock_client:
             mock_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
             
             # Mock both resolve and token endpoints
             def mock_get(url, **kwargs):
@@ -208,10 +208,10 @@ class TestOrderServiceTokenManagerIntegration:
         from order_service.app.services.kite_client_multi import resolve_trading_account_config
         from unittest.mock import patch, AsyncMock
         
-        # Mock the HTTP client to simulate token_manager response for unknown account
-        with patch('httpx.AsyncClient') as mock_client:
+        # Mock the shared HTTP client to simulate token_manager response for unknown account
+        with patch('order_service.app.services.kite_client_multi.get_http_client') as mock_client:
             mock_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
             
             # Mock 404 response for unknown account
             mock_response = AsyncMock()
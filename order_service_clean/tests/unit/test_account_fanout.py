@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from order_service.app.workers import account_fanout
+from order_service.app.workers.account_fanout import AccountFanout
+
+
+class DummySession:
+    pass
+
+
+@pytest.fixture(autouse=True)
+def per_account_sessions(monkeypatch):
+    opened = []
+
+    async def fake_get_async_session():
+        session = DummySession()
+        opened.append(session)
+        yield session
+
+    monkeypatch.setattr(account_fanout, "get_async_session", fake_get_async_session)
+    monkeypatch.setattr(account_fanout, "get_rate_limiter_manager_sync", lambda: None)
+    return opened
+
+
+@pytest.mark.asyncio
+async def test_fanout_bounds_concurrency_and_isolates_sessions(per_account_sessions):
+    fanout = AccountFanout(max_concurrency=3, account_timeout=5.0)
+    active = 0
+    peak = 0
+    seen_sessions = set()
+
+    async def handler(session, trading_account_id, account_info):
+        nonlocal active, peak
+        seen_sessions.add(id(session))
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return {"trades_synced": trading_account_id}
+
+    accounts = {i: {"nickname": f"acct{i}"} for i in range(1, 11)}
+    run = await fanout.run("trade_sync", accounts, handler)
+
+    assert peak == 3
+    assert len(seen_sessions) == 10
+    assert len(per_account_sessions) == 10
+    assert run.total("trades_synced") == sum(range(1, 11))
+    assert run.failed == []
+
+
+@pytest.mark.asyncio
+async def test_slow_or_failing_account_does_not_block_others():
+    fanout = AccountFanout(max_concurrency=4, account_timeout=0.05)
+
+    async def handler(session, trading_account_id, account_info):
+        if trading_account_id == 1:
+            await asyncio.sleep(1)
+        if trading_account_id == 2:
+            raise RuntimeError("broker down")
+        return {"positions_checked": 1}
+
+    run = await fanout.run("position_validation", {1: {}, 2: {}, 3: {}, 4: {}}, handler)
+
+    by_account = {r.trading_account_id: r for r in run.results}
+    assert by_account[1].timed_out
+    assert by_account[2].error == "broker down"
+    assert run.total("positions_checked") == 2
+    assert run.duration_ms < 500
+
+    stats = fanout.get_stats()["jobs"]["position_validation"]
+    assert stats["account_errors"] == 2
+    assert stats["account_timeouts"] == 1
+    assert stats["last_slowest_account"] == 1
+
+
+@pytest.mark.asyncio
+async def test_throttled_account_waits_before_taking_a_slot(monkeypatch):
+    class ThrottlingManager:
+        async def check_limit(self, trading_account_id, operation):
+            if trading_account_id == 1:
+                return False, 0.05
+            return True, 0.0
+
+    monkeypatch.setattr(account_fanout, "get_rate_limiter_manager_sync", lambda: ThrottlingManager())
+    fanout = AccountFanout(max_concurrency=1, account_timeout=5.0)
+    order = []
+
+    async def handler(session, trading_account_id, account_info):
+        order.append(trading_account_id)
+        return {}
+
+    await fanout.run("margin_polling", {1: {}, 2: {}, 3: {}}, handler)
+
+    # Account 1 sleeps out its throttle window without holding the only slot
+    assert order == [2, 3, 1]
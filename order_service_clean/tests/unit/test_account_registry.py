@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from order_service.app.services import kite_client_multi
+from order_service.app.services.account_registry import TradingAccountRegistry
+
+
+@pytest.fixture
+def token_manager(monkeypatch):
+    state = {"ids": [1, 2, 3], "calls": 0, "failing": set(), "clients": set()}
+
+    async def fake_resolve(trading_account_id, client=None):
+        state["calls"] += 1
+        state["clients"].add(id(client))
+        await asyncio.sleep(0.01)
+        if trading_account_id in state["failing"]:
+            raise ValueError("token_manager unavailable")
+        return {"nickname": f"acct{trading_account_id}", "is_active": True}
+
+    monkeypatch.setattr(kite_client_multi, "resolve_trading_account_config", fake_resolve)
+    monkeypatch.setattr(kite_client_multi, "get_configured_trading_account_ids", lambda: list(state["ids"]))
+    return state
+
+
+@pytest.mark.asyncio
+async def test_accounts_resolved_concurrently_over_one_client_and_cached(token_manager):
+    registry = TradingAccountRegistry(ttl_seconds=60)
+
+    try:
+        accounts = await registry.get_all()
+        again = await registry.get_all()
+    finally:
+        await registry.stop()
+
+    assert set(accounts) == {1, 2, 3}
+    assert again == accounts
+    assert token_manager["calls"] == 3
+    assert len(token_manager["clients"]) == 1
+    assert registry.get_stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_served_when_token_manager_fails(token_manager):
+    registry = TradingAccountRegistry(ttl_seconds=60)
+
+    try:
+        await registry.refresh()
+        token_manager["failing"] = {2}
+        registry.invalidate()
+
+        # Stale mapping is returned immediately while one refresh revalidates it
+        stale = await registry.get_all()
+        await registry._refresh_task
+        refreshed = await registry.get_all()
+    finally:
+        await registry.stop()
+
+    assert set(stale) == {1, 2, 3}
+    assert refreshed[2]["nickname"] == "acct2"
+    assert registry.get_stats()["resolve_errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_removed_account_stays_out_until_readmitted(token_manager):
+    registry = TradingAccountRegistry(ttl_seconds=60)
+
+    try:
+        await registry.refresh()
+        registry.remove(3)
+        assert set(await registry.get_all()) == {1, 2}
+
+        await registry.refresh()
+        assert 3 not in await registry.get_all()
+
+        registry.invalidate(3)
+        await registry.refresh()
+        assert 3 in await registry.get_all()
+    finally:
+        await registry.stop()
@@ -0,0 +1,120 @@
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from order_service.app.models.capital_ledger import PortfolioCapitalBalance
+from order_service.app.services.capital_ledger_service import CapitalLedgerService
+
+
+class FakeRedis:
+    async def get(self, key):
+        return None
+
+    async def setex(self, key, ttl, value):
+        pass
+
+    async def delete(self, key):
+        pass
+
+
+class FakeResult:
+    def __init__(self, value=None, rows=None):
+        self.value = value
+        self.rows = rows or []
+
+    def first(self):
+        return self.value
+
+    def scalar(self):
+        return self.value
+
+    def scalar_one(self):
+        return self.value
+
+    def all(self):
+        return self.rows
+
+
+class ScriptedDB:
+    """Returns queued results in order and records compiled SQL."""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, statement, params=None):
+        self.statements.append(statement.compile(dialect=postgresql.dialect()))
+        return self.results.pop(0) if self.results else FakeResult()
+
+    async def commit(self):
+        self.commits += 1
+
+
+def make_service(db):
+    svc = CapitalLedgerService(db, user_id=1)
+    svc.redis = FakeRedis()
+    return svc
+
+
+@pytest.mark.asyncio
+async def test_available_capital_reads_running_balance_not_ledger():
+    db = ScriptedDB([FakeResult((Decimal("1000000"), Decimal("250000")))])
+    svc = make_service(db)
+
+    available = await svc.get_available_capital("pf-1")
+
+    assert available == Decimal("750000")
+    assert len(db.statements) == 1
+    sql = str(db.statements[0])
+    assert "portfolio_capital_balances" in sql
+    assert "capital_ledger" not in sql
+
+
+@pytest.mark.asyncio
+async def test_release_delta_reduces_committed_capital():
+    db = ScriptedDB([FakeResult(Decimal("150"))])
+    svc = make_service(db)
+
+    running = await svc._apply_balance_delta("pf-1", "RELEASE", Decimal("50"))
+
+    assert running == Decimal("150")
+    params = db.statements[0].params
+    assert params["committed_releases"] == Decimal("50")
+    assert params["committed_capital"] == Decimal("-50")
+    assert "ON CONFLICT (portfolio_id) DO UPDATE" in str(db.statements[0])
+
+    # FAIL entries don't move the balance
+    assert await svc._apply_balance_delta("pf-1", "FAIL", Decimal("50")) is None
+    assert len(db.statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_reconcile_balances_corrects_drift():
+    balance = PortfolioCapitalBalance(
+        portfolio_id="pf-1",
+        committed_reserves=Decimal("100"),
+        committed_allocations=Decimal("0"),
+        committed_releases=Decimal("0"),
+        committed_capital=Decimal("100"),
+        committed_entries=1,
+    )
+    totals = [
+        SimpleNamespace(transaction_type="RESERVE", total_amount=Decimal("100"), transaction_count=1),
+        SimpleNamespace(transaction_type="RELEASE", total_amount=Decimal("40"), transaction_count=1),
+    ]
+    # ensure row, lock row, aggregate ledger
+    db = ScriptedDB([FakeResult(), FakeResult(balance), FakeResult(rows=totals)])
+    svc = make_service(db)
+
+    result = await svc.reconcile_balances(["pf-1"])
+
+    assert result["checked"] == 1
+    assert result["drifted"] == 1
+    assert result["corrections"][0]["drift"] == {"committed_releases": 40.0, "committed_capital": -40.0}
+    assert balance.committed_capital == Decimal("60")
+    assert balance.committed_entries == 2
+    assert balance.reconciled_at is not None
+    assert db.commits == 1
@@ -0,0 +1,75 @@
+import importlib
+
+import pytest
+
+from order_service.app.services.config_refresher import ConfigRefresher
+
+# `config.settings` the package attribute is the Settings instance, not the module
+settings_module = importlib.import_module("order_service.app.config.settings")
+
+
+class FakeConfigClient:
+    def __init__(self, values):
+        self.values = dict(values)
+        self.calls = 0
+        self.failing = False
+
+    def get_config(self, key):
+        self.calls += 1
+        if self.failing:
+            raise ConnectionError("config service down")
+        return self.values.get(key)
+
+    def get_secret(self, key, required=True):
+        return self.get_config(key)
+
+
+@pytest.fixture()
+def config_client(monkeypatch):
+    client = FakeConfigClient({"ORDER_SERVICE_MAX_ORDER_VALUE": "250000", "ORDER_SERVICE_ENABLE_RISK_CHECKS": "false"})
+    monkeypatch.setattr(settings_module, "_get_config_client", lambda: client)
+    monkeypatch.setattr(settings_module, "_snapshot", settings_module.ConfigSnapshot({}))
+    monkeypatch.setattr(settings_module, "_config_keys", {})
+    monkeypatch.setattr(settings_module, "_fetch_counts", {})
+    return client
+
+
+def test_properties_are_fetched_once_and_typed(config_client):
+    settings = settings_module.settings
+
+    for _ in range(3):
+        assert settings.max_order_value == 250000.0
+        assert settings.enable_risk_checks is False
+
+    assert config_client.calls == 2
+    assert settings_module.get_config_stats()["fetches"] == {"miss:ok": 2}
+    with pytest.raises(TypeError):
+        settings_module.get_config_snapshot().values["ORDER_SERVICE_MAX_ORDER_VALUE"] = 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_swaps_snapshot_only_on_change_and_survives_errors(config_client):
+    settings = settings_module.settings
+    refresher = ConfigRefresher(interval_seconds=60)
+    observed = []
+    refresher.on_refresh = lambda result, changed, seconds: observed.append((result, changed))
+
+    assert settings.max_order_value == 250000.0
+    before = settings_module.get_config_snapshot()
+
+    assert await refresher.refresh() == []
+    assert settings_module.get_config_snapshot() is before
+
+    config_client.values["ORDER_SERVICE_MAX_ORDER_VALUE"] = "500000"
+    assert await refresher.refresh() == ["ORDER_SERVICE_MAX_ORDER_VALUE"]
+    assert settings.max_order_value == 500000.0
+    assert settings_module.get_config_snapshot().version == before.version + 1
+    # Readers holding the old snapshot keep a consistent view
+    assert before.values["ORDER_SERVICE_MAX_ORDER_VALUE"] == 250000.0
+
+    config_client.failing = True
+    assert await refresher.refresh() == []
+    assert settings.max_order_value == 500000.0
+
+    assert observed == [("unchanged", 0), ("changed", 1), ("unchanged", 0)]
+    assert settings_module.get_config_stats()["fetches"]["refresh:error"] == 1
@@ -0,0 +1,127 @@
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from order_service.app.services import dashboard_summary
+
+
+class RowsResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeSession:
+    def __init__(self, log):
+        self.log = log
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, params=None):
+        sql = str(statement)
+        self.log.append(params["account_ids"])
+        if "FROM order_service.orders" in sql:
+            return RowsResult([SimpleNamespace(
+                trading_account_id="1", total_orders_today=4, pending_orders=1,
+                executed_orders=2, rejected_orders=1, cancelled_orders=0
+            )])
+        if "latest_positions" in sql:
+            return RowsResult([SimpleNamespace(
+                trading_account_id="2", total_positions=3, long_positions=2,
+                short_positions=1, active_positions=3, closed_positions=0
+            )])
+        if "FROM order_service.trades" in sql:
+            return RowsResult([SimpleNamespace(trading_account_id="1", day_pnl=-250)])
+        if "gross_exposure" in sql:
+            return RowsResult([SimpleNamespace(
+                trading_account_id="2", long_positions=2, long_value=12000, long_invested=10000,
+                unrealized_pnl=2000, gross_exposure=15000
+            )])
+        return RowsResult([SimpleNamespace(
+            trading_account_id="1", realized_pnl=500, unrealized_pnl=100, total_pnl=600
+        )])
+
+
+@pytest.mark.asyncio
+async def test_one_grouped_query_per_data_type_for_all_accounts(monkeypatch):
+    log = []
+
+    async def no_broker():
+        return None
+
+    monkeypatch.setattr(dashboard_summary, "fetch_broker_margins", no_broker)
+
+    summaries = await dashboard_summary.build_dashboard_summaries(
+        lambda: FakeSession(log), user_id=7, account_ids=[1, 2, 3], today=date(2024, 1, 1)
+    )
+
+    # orders, positions, P&L (positions + trades), open positions
+    assert len(log) == 5
+    assert all(account_ids == ["1", "2", "3"] for account_ids in log)
+
+    assert summaries["1"]["orders"]["executed_orders"] == 2
+    assert summaries["1"]["pnl"] == {
+        "total_pnl": 600.0, "realized_pnl": 500.0, "unrealized_pnl": 100.0,
+        "pnl_percentage": 120.0, "day_pnl": -250.0,
+    }
+    assert summaries["2"]["positions"]["short_positions"] == 1
+    assert summaries["2"]["holdings"]["pnl_percentage"] == 20.0
+    assert summaries["2"]["margins"]["used_margin"] == 3000.0
+    # Accounts with no rows get empty sections
+    assert summaries["3"]["orders"] == {} and summaries["3"]["holdings"] == {}
+
+
+@pytest.mark.asyncio
+async def test_only_uncached_accounts_are_computed(monkeypatch):
+    cache = {("1", 7): {"orders": {"total_orders_today": 9}}}
+    built = []
+
+    async def get_cached(account_id, user_id=None):
+        return cache.get((account_id, user_id))
+
+    async def set_cached(account_id, data, ttl=300, user_id=None):
+        cache[(account_id, user_id)] = data
+
+    async def build(session_maker, user_id, account_ids, today):
+        built.append(account_ids)
+        return {account_id: {"orders": {"total_orders_today": 1}} for account_id in account_ids}
+
+    monkeypatch.setattr(dashboard_summary, "get_cached_dashboard_overview", get_cached)
+    monkeypatch.setattr(dashboard_summary, "cache_dashboard_overview", set_cached)
+    monkeypatch.setattr(dashboard_summary, "build_dashboard_summaries", build)
+
+    summaries = await dashboard_summary.get_dashboard_summaries(None, 7, [1, "2"], date(2024, 1, 1))
+
+    assert built == [["2"]]
+    assert summaries["1"]["orders"]["total_orders_today"] == 9
+    assert ("2", 7) in cache
+
+
+@pytest.mark.asyncio
+async def test_broker_margins_come_from_the_kite_client(monkeypatch):
+    from order_service.app.services import kite_client
+
+    class StubKiteClient:
+        async def get_margins(self, segment=None):
+            return {"equity": {
+                "available": {"cash": 60000.0, "intraday_payin": 40000.0},
+                "utilised": {"debits": 25000.0},
+            }}
+
+    monkeypatch.setattr(kite_client, "get_kite_client_sync", lambda: StubKiteClient())
+
+    margins = await dashboard_summary.fetch_broker_margins()
+
+    assert margins == {
+        "available_margin": 40000.0,
+        "used_margin": 25000.0,
+        "total_margin": 100000.0,
+        "utilized_percentage": 25.0,
+    }
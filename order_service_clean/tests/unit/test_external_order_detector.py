@@ -0,0 +1,85 @@
+import pytest
+
+from order_service.app.services.external_order_detector import ExternalOrderDetector
+
+
+class DummyResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def fetchall(self):
+        return self._rows
+
+
+class DummySession:
+    def __init__(self, known_ids=()):
+        self.known_ids = set(known_ids)
+        self.lookups = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def execute(self, statement, params=None):
+        self.lookups.append(params["ids"])
+        return DummyResult([(oid,) for oid in params["ids"] if oid in self.known_ids])
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+def orderbook(*ids):
+    return [{"order_id": oid, "tradingsymbol": "INFY", "status": "COMPLETE"} for oid in ids]
+
+
+@pytest.mark.asyncio
+async def test_only_unseen_ids_are_looked_up_and_tagged_in_one_batch():
+    detector = ExternalOrderDetector()
+    batches = []
+
+    async def fake_tag_batch(session, trading_account_id, external):
+        batches.append(sorted(external))
+        return list(external)
+
+    detector._tag_batch = fake_tag_batch
+    session = DummySession(known_ids={"A1", "A2"})
+
+    tagged = await detector.detect_and_tag(session, "1", orderbook("A1", "A2", "X1", "X2"))
+
+    assert tagged == 2
+    assert session.lookups == [["A1", "A2", "X1", "X2"]]
+    assert batches == [["X1", "X2"]]
+
+    # Next poll: only the newly appeared order is queried
+    tagged = await detector.detect_and_tag(session, "1", orderbook("A1", "A2", "X1", "X2", "A3"))
+
+    assert tagged == 1
+    assert session.lookups[-1] == ["A3"]
+    assert batches[-1] == ["A3"]
+
+    # Nothing new: no database round trip at all
+    await detector.detect_and_tag(session, "1", orderbook("A1", "A2", "X1", "X2", "A3"))
+    assert len(session.lookups) == 2
+    assert detector.get_stats()["seen_orders"] == 5
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_retried_on_next_poll():
+    detector = ExternalOrderDetector()
+    attempts = []
+
+    async def flaky_tag_batch(session, trading_account_id, external):
+        attempts.append(sorted(external))
+        if len(attempts) == 1:
+            raise RuntimeError("strategy service down")
+        return list(external)
+
+    detector._tag_batch = flaky_tag_batch
+    session = DummySession()
+
+    assert await detector.detect_and_tag(session, "1", orderbook("X1")) == 0
+    assert session.rollbacks == 1
+    assert await detector.detect_and_tag(session, "1", orderbook("X1")) == 1
+    assert attempts == [["X1"], ["X1"]]
+    assert detector.get_stats()["total_errors"] == 1
@@ -0,0 +1,172 @@
+import asyncio
+
+import pytest
+
+from order_service.app.services import gcra_limiter
+from order_service.app.services.gcra_limiter import (
+    GcraLimiter,
+    RateLimitExceeded,
+    RedisGcraBackend,
+    acquire_all,
+)
+from order_service.app.services.kite_account_rate_limiter import (
+    AccountRateLimiter,
+    KiteAccountRateLimiterManager,
+    KiteOperation,
+)
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    """Frozen monotonic clock; sleeps are recorded instead of awaited."""
+    state = {"now": 1000.0, "sleeps": []}
+
+    async def fake_sleep(delay):
+        state["sleeps"].append(round(delay, 6))
+
+    monkeypatch.setattr(gcra_limiter.time, "monotonic", lambda: state["now"])
+    monkeypatch.setattr(gcra_limiter.asyncio, "sleep", fake_sleep)
+    return state
+
+
+@pytest.mark.asyncio
+async def test_fifo_spacing_at_the_full_rate(clock):
+    limiter = GcraLimiter(5, 1.0)
+
+    waits = [await acquire_all([limiter]) for _ in range(6)]
+
+    # Waiters are scheduled one emission interval apart, in call order
+    assert [round(w, 6) for w in waits] == [0.0, 0.2, 0.4, 0.6, 0.8, 1.0]
+    assert limiter.get_stats()["total_throttled"] == 5
+
+
+@pytest.mark.asyncio
+async def test_burst_lowers_the_sustained_rate(clock):
+    limiter = GcraLimiter(5, 1.0, burst=3)
+
+    waits = [await acquire_all([limiter]) for _ in range(6)]
+
+    assert waits[:3] == [0.0] * 3
+    assert [round(w, 6) for w in waits[3:]] == [0.333333, 0.666667, 1.0]
+
+
+@pytest.mark.parametrize("max_requests, window, burst", [
+    (10, 1.0, 1),
+    (10, 1.0, 4),
+    (10, 1.0, 10),
+    (200, 60.0, 1),
+    (200, 60.0, 50),
+])
+def test_no_sliding_window_exceeds_the_limit(max_requests, window, burst):
+    limiter = GcraLimiter(max_requests, window, burst=burst)
+    # Saturating demand with idle gaps that let the burst refill
+    now, grants = 0.0, []
+    for i in range(6 * max_requests):
+        if i % (2 * max_requests) == 0:
+            now += window
+        at = limiter.earliest(now)
+        limiter.reserve(at)
+        grants.append(at)
+        now = at
+
+    busiest = max(
+        sum(1 for t in grants if start <= t < start + window - 1e-9)
+        for start in grants
+    )
+    assert busiest == max_requests
+
+
+@pytest.mark.asyncio
+async def test_combined_limits_reserve_at_the_binding_limit(clock):
+    per_second = GcraLimiter(10, 1.0)
+    per_minute = GcraLimiter(2, 60.0, burst=2)
+
+    await acquire_all([per_second, per_minute])
+    await acquire_all([per_second, per_minute])
+
+    with pytest.raises(RateLimitExceeded) as exc:
+        await acquire_all([per_second, per_minute], wait=False)
+    assert exc.value.limit_type == "per_60s"
+    assert exc.value.retry_after == pytest.approx(60.0)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await acquire_all([per_second, per_minute], timeout=5.0)
+    # Rejected attempts don't consume budget
+    assert per_second.get_stats()["current"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_refunds_its_slot(monkeypatch, clock):
+    limiter = GcraLimiter(1, 1.0)
+    await acquire_all([limiter])
+
+    async def cancelled_sleep(delay):
+        raise asyncio.CancelledError()
+
+    monkeypatch.setattr(gcra_limiter.asyncio, "sleep", cancelled_sleep)
+    with pytest.raises(asyncio.CancelledError):
+        await acquire_all([limiter])
+
+    assert limiter.earliest(clock["now"]) == pytest.approx(clock["now"] + 1.0)
+
+
+class FakeScriptRedis:
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.calls = []
+
+    def register_script(self, source):
+        async def run(keys, args):
+            self.calls.append((keys, args))
+            reply = self.replies.pop(0)
+            if isinstance(reply, Exception):
+                raise reply
+            return reply
+        return run
+
+
+@pytest.mark.asyncio
+async def test_distributed_leases_skip_round_trips_and_fall_back_locally(clock):
+    redis = FakeScriptRedis([[1, 0, 2], ConnectionError("redis down")])
+    manager = KiteAccountRateLimiterManager(burst=5)
+    manager.set_distributed_backend(RedisGcraBackend(redis, lease_size=3))
+
+    for _ in range(2):
+        assert await manager.acquire(7, KiteOperation.ORDER_MODIFY)
+    assert len(redis.calls) == 1
+
+    keys, args = redis.calls[0]
+    assert keys == ["kite:gcra:7:orders:10:1", "kite:gcra:7:orders:200:60"]
+    # Leasing reduces burst tolerance by one emission interval
+    assert args[2:4] == [pytest.approx(166666.67), pytest.approx(666666.67)]
+    assert args[4:6] == [pytest.approx(306122.45), pytest.approx(1224489.80)]
+    # An idle account has 4 free slots per limit, so the script leases half of them
+    for emission, tolerance in (args[2:4], args[4:6]):
+        assert round(tolerance / emission) // 2 == 2
+
+    # Redis failure -> local limits still apply
+    assert await manager.acquire(7, KiteOperation.ORDER_MODIFY)
+    account = await manager._get_or_create_limiter(7)
+    assert account._distributed_fallback
+    assert account.orders_per_second.get_stats()["current"] == 3
+
+
+def test_burst_is_capped_at_half_of_small_limits():
+    account = AccountRateLimiter(trading_account_id=7, burst=5)
+
+    assert account.orders_per_second.burst == 5
+    assert account.historical_per_second.burst == 1
+    assert account.quote_per_second.burst == 1
+
+
+@pytest.mark.asyncio
+async def test_distributed_rejection_reports_shared_retry_after(clock):
+    redis = FakeScriptRedis([[0, 250000, 0]])
+    account = AccountRateLimiter(trading_account_id=7)
+    account._distributed = RedisGcraBackend(redis)
+
+    with pytest.raises(RateLimitExceeded) as exc:
+        await account.acquire(KiteOperation.QUOTE, wait=False)
+
+    assert exc.value.retry_after == pytest.approx(0.25)
+    assert redis.calls[0][1][0] == 0
@@ -0,0 +1,72 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from order_service.app.services.handoff_ack_listener import HandoffAckListener
+
+
+class PollingDB:
+    """Returns the ack row once `ack_after_polls` polls have been made."""
+
+    def __init__(self, ack_after_polls=None):
+        self.ack_after_polls = ack_after_polls
+        self.polls = 0
+
+    async def execute(self, statement, params=None):
+        self.polls += 1
+        row = None
+        if self.ack_after_polls is not None and self.polls >= self.ack_after_polls:
+            row = ("ready", {"engine": "v2"})
+        return type("R", (), {"fetchone": lambda self: row})()
+
+
+@pytest.mark.asyncio
+async def test_notification_resolves_wait_without_polling():
+    listener = HandoffAckListener(fallback_poll_interval=5.0)
+    listener._listen_task = asyncio.get_running_loop().create_future()  # pretend subscribed
+    db = PollingDB()
+
+    async def engine_ack():
+        await asyncio.sleep(0.02)
+        listener._dispatch("algo_engine:ack:exec-1", json.dumps({"status": "ready", "data": {"ok": True}}))
+
+    started = time.monotonic()
+    asyncio.create_task(engine_ack())
+    ack = await listener.wait_for_status(db, "exec-1", {"ready", "failed"}, timeout_seconds=30)
+    elapsed = time.monotonic() - started
+
+    assert ack == {"status": "ready", "data": {"ok": True}}
+    assert elapsed < 0.1
+    assert db.polls == 1  # only the up-front check
+    assert listener.get_stats()["in_flight"] == 0
+    listener._listen_task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_polling_when_not_listening():
+    listener = HandoffAckListener()
+    db = PollingDB(ack_after_polls=3)
+
+    ack = await listener.wait_for_status(db, "exec-2", {"ready"}, timeout_seconds=5, poll_interval=0.01)
+
+    assert ack["status"] == "ready"
+    assert db.polls == 3
+    assert listener.get_stats()["resolved_by_poll"] == 1
+
+
+@pytest.mark.asyncio
+async def test_waiter_registered_before_signal_sees_immediate_ack():
+    listener = HandoffAckListener()
+    future = listener.expect("exec-3", {"stopped"})
+
+    # Engine confirms before the caller starts waiting; other statuses are ignored
+    assert listener.resolve("exec-3", "ready") == 0
+    assert listener.resolve("exec-3", "stopped") == 1
+
+    ack = await listener.wait_for_status(None, "exec-3", {"stopped"}, timeout_seconds=0.5, future=future)
+    assert ack["status"] == "stopped"
+
+    assert await listener.wait_for_status(None, "exec-4", {"stopped"}, timeout_seconds=0.05) is None
+    assert listener.get_stats()["timeouts"] == 1
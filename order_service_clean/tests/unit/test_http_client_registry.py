@@ -0,0 +1,90 @@
+import asyncio
+
+import httpx
+import pytest
+
+from order_service.app.services.http_client_registry import HttpClientRegistry
+
+
+async def start_keepalive_server():
+    """Minimal HTTP/1.1 server that keeps connections open; counts accepted connections."""
+    state = {"connections": 0}
+
+    async def handle(reader, writer):
+        state["connections"] += 1
+        try:
+            while True:
+                await reader.readuntil(b"\r\n\r\n")
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nContent-Type: text/plain\r\n\r\nok")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    state["url"] = f"http://127.0.0.1:{port}"
+    return server, state
+
+
+@pytest.mark.asyncio
+async def test_one_client_per_upstream_closed_on_shutdown():
+    registry = HttpClientRegistry(http2=False)
+
+    token_manager = registry.get_client("token_manager")
+    assert registry.get_client("token_manager") is token_manager
+    assert registry.get_client("ticker_service") is not token_manager
+
+    await registry.close()
+    assert token_manager.is_closed
+    assert registry.get_client("token_manager") is not token_manager
+    await registry.close()
+
+
+def test_per_upstream_limits_override_defaults():
+    registry = HttpClientRegistry(max_connections=50, max_keepalive_connections=20)
+
+    assert registry._limits("ticker_service").max_connections == 4
+    assert registry._limits("token_manager").max_keepalive_connections == 32
+    assert registry._limits("analytics_service").max_connections == 50
+
+
+@pytest.mark.asyncio
+async def test_keepalive_connections_are_reused_and_reported():
+    server, keepalive_server = await start_keepalive_server()
+    registry = HttpClientRegistry(http2=False)
+    observed = []
+    registry.on_request = lambda *args: observed.append(args)
+
+    try:
+        client = registry.get_client("token_manager", base_url=keepalive_server["url"])
+        for _ in range(3):
+            response = await client.get("/api/v1/tokens/1")
+            assert response.text == "ok"
+    finally:
+        await registry.close()
+        server.close()
+
+    assert keepalive_server["connections"] == 1
+    stats = registry.get_stats()["upstreams"]["token_manager"]
+    assert stats["requests"] == 3
+    assert stats["new_connections"] == 1 and stats["reused_connections"] == 2
+    assert [(upstream, reused, status) for upstream, reused, status, _ in observed] == [
+        ("token_manager", False, "200"),
+        ("token_manager", True, "200"),
+        ("token_manager", True, "200"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_connection_errors_are_counted():
+    registry = HttpClientRegistry(http2=False)
+
+    try:
+        with pytest.raises(httpx.ConnectError):
+            await registry.get_client("user_service").get("http://127.0.0.1:1/check", timeout=1.0)
+    finally:
+        await registry.close()
+
+    assert registry.get_stats()["upstreams"]["user_service"]["errors"] == 1
@@ -27,6 +27,10 @@ class DummyRedis:
         # simplistic pattern support
         return list(self.store.keys())
 
+    async def scan_iter(self, match=None, count=None):
+        for key in list(self.store.keys()):
+            yield key
+
     async def close(self):
         pass
 
@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from order_service.app.services.kite_call_executor import KiteCallExecutor
+
+
+@pytest.mark.asyncio
+async def test_blocking_call_runs_off_event_loop():
+    executor = KiteCallExecutor(max_workers=2, per_account_concurrency=2)
+    loop_thread = threading.get_ident()
+
+    try:
+        thread_id = await executor.run(1, threading.get_ident, operation="orders")
+    finally:
+        executor.shutdown()
+
+    assert thread_id != loop_thread
+    stats = executor.get_stats()
+    assert stats["total_calls"] == 1
+    assert stats["in_flight"] == 0
+    assert stats["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_per_account_concurrency_is_capped():
+    executor = KiteCallExecutor(max_workers=8, per_account_concurrency=2)
+    active = {1: 0, 2: 0}
+    peak = {1: 0, 2: 0}
+    lock = threading.Lock()
+
+    def slow_call(account_id):
+        with lock:
+            active[account_id] += 1
+            peak[account_id] = max(peak[account_id], active[account_id])
+        time.sleep(0.02)
+        with lock:
+            active[account_id] -= 1
+        return account_id
+
+    try:
+        results = await asyncio.gather(*[
+            executor.run(account_id, slow_call, account_id, operation="positions")
+            for account_id in (1, 2) for _ in range(5)
+        ])
+    finally:
+        executor.shutdown()
+
+    assert sorted(results) == [1] * 5 + [2] * 5
+    assert peak == {1: 2, 2: 2}
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_and_are_counted():
+    executor = KiteCallExecutor(max_workers=1, per_account_concurrency=1)
+
+    def failing_call():
+        raise RuntimeError("broker down")
+
+    try:
+        with pytest.raises(RuntimeError):
+            await executor.run(1, failing_call, operation="place_order")
+    finally:
+        executor.shutdown()
+
+    assert executor.get_stats()["total_errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_order_client_margins_run_on_the_executor(monkeypatch):
+    from order_service.app.services import kite_client as kite_client_module
+
+    executor = KiteCallExecutor(max_workers=1, per_account_concurrency=1)
+    monkeypatch.setattr(kite_client_module, "get_kite_call_executor", lambda: executor)
+    loop_thread = threading.get_ident()
+
+    class Kite:
+        def margins(self, segment=None):
+            return {"segment": segment, "thread": threading.get_ident()}
+
+    client = kite_client_module.KiteOrderClient.__new__(kite_client_module.KiteOrderClient)
+    client.account_id = "primary"
+    client._access_token = "token"
+    client._kite = Kite()
+
+    try:
+        margins = await client.get_margins("equity")
+    finally:
+        executor.shutdown()
+
+    assert margins["segment"] == "equity"
+    assert margins["thread"] != loop_thread
+    assert executor.get_stats()["total_calls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_order_client_places_orders_on_the_executor(monkeypatch):
+    from order_service.app.services import kite_client as kite_client_module
+
+    executor = KiteCallExecutor(max_workers=1, per_account_concurrency=1)
+    monkeypatch.setattr(kite_client_module, "get_kite_call_executor", lambda: executor)
+    loop_thread = threading.get_ident()
+    placed = []
+
+    class Kite:
+        def place_order(self, **params):
+            placed.append((params["symbol"], threading.get_ident()))
+            return "240101000000001"
+
+    client = kite_client_module.KiteOrderClient.__new__(kite_client_module.KiteOrderClient)
+    client.account_id = "primary"
+    client._access_token = "token"
+    client._kite = Kite()
+
+    try:
+        order_id = await client.place_order("INFY", "NSE", "BUY", 1, "MARKET", "MIS")
+    finally:
+        executor.shutdown()
+
+    assert order_id == "240101000000001"
+    assert placed[0][0] == "INFY" and placed[0][1] != loop_thread
+    assert executor.get_stats()["accounts"] == 1
@@ -0,0 +1,121 @@
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from order_service.app.services.order_service import OrderService
+from order_service.app.services.position_service import PositionService
+from order_service.app.services.trade_service import TradeService
+from order_service.app.utils.pagination import (
+    InvalidCursorError,
+    day_bounds,
+    decode_cursor,
+    encode_cursor,
+    next_cursor,
+)
+
+
+class ScalarsResult:
+    def __init__(self, rows=None, value=None):
+        self.rows = rows or []
+        self.value = value
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+    def scalar(self):
+        return self.value
+
+
+class RecordingDB:
+    def __init__(self, results):
+        self.results = list(results)
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        self.statements.append((statement, params))
+        return self.results.pop(0)
+
+
+def compile_sql(statement):
+    return statement.compile(dialect=postgresql.dialect())
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    ts = datetime(2024, 3, 28, 15, 29, 59, 123456)
+    cursor = encode_cursor(ts, 42)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (ts, 42)
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor")
+
+
+def test_next_cursor_only_for_full_pages():
+    rows = [SimpleNamespace(id=i, created_at=datetime(2024, 1, 1, 10, i)) for i in (3, 2, 1)]
+
+    assert next_cursor(rows, 5, "created_at") is None
+    assert decode_cursor(next_cursor(rows, 3, "created_at")) == (datetime(2024, 1, 1, 10, 1), 1)
+
+
+def test_day_bounds_are_half_open():
+    assert day_bounds(date(2024, 1, 31), date(2024, 2, 1)) == (
+        datetime(2024, 1, 31), datetime(2024, 2, 2)
+    )
+
+
+@pytest.mark.asyncio
+async def test_list_orders_uses_keyset_and_sargable_day_filter():
+    svc = OrderService.__new__(OrderService)
+    svc.db = RecordingDB([ScalarsResult()])
+    svc.user_id = 1
+    svc.trading_account_id = "acct-1"
+
+    await svc.list_orders(limit=50, offset=500, cursor=encode_cursor(datetime(2024, 1, 1, 9, 30), 77))
+
+    compiled = compile_sql(svc.db.statements[0][0])
+    sql = str(compiled)
+    assert "date(" not in sql.lower()
+    assert "(orders.created_at, orders.id) <" in sql
+    assert "ORDER BY orders.created_at DESC, orders.id DESC" in sql
+    assert "OFFSET" not in sql
+    assert datetime(2024, 1, 1, 9, 30) in compiled.params.values()
+
+
+@pytest.mark.asyncio
+async def test_approximate_count_falls_back_to_exact_for_small_sets():
+    svc = TradeService.__new__(TradeService)
+    plan = '[{"Plan": {"Plan Rows": 12}}]'
+    svc.db = RecordingDB([ScalarsResult(value=plan), ScalarsResult(value=9)])
+    svc.user_id = 1
+    svc.trading_account_id = "acct-1"
+
+    total = await svc.count_trades(end_date=date(2024, 1, 31), approximate=True)
+
+    assert total == 9
+    explain, params = svc.db.statements[0]
+    assert str(explain).startswith("EXPLAIN (FORMAT JSON) SELECT trades.id")
+    assert datetime(2024, 2, 1) in params.values()
+
+    svc.db = RecordingDB([ScalarsResult(value=[{"Plan": {"Plan Rows": 250000}}])])
+    assert await svc.count_trades(trade_ids=[1, 2], approximate=True) == 250000
+
+
+@pytest.mark.asyncio
+async def test_list_positions_pages_on_immutable_opened_at():
+    svc = PositionService.__new__(PositionService)
+    svc.db = RecordingDB([ScalarsResult()])
+    svc.user_id = 1
+    svc.trading_account_id = "acct-1"
+
+    await svc.list_positions(only_open=False, cursor=encode_cursor(datetime(2024, 1, 1, 9, 15), 5))
+
+    sql = str(compile_sql(svc.db.statements[0][0]))
+    assert "(positions.opened_at, positions.id) <" in sql
+    assert "ORDER BY positions.opened_at DESC, positions.id DESC" in sql
+    assert "updated_at" not in sql.split("FROM")[1]
+
@@ -72,3 +72,111 @@ async def test_calculate_handles_exceptions(monkeypatch):
     assert await calc.calculate_unrealized_pnl(1) == Decimal("0")
     assert await calc.calculate_trade_metrics(1) == {"total_trades": 0, "winning_trades": 0, "losing_trades": 0}
     assert await calc.calculate_position_counts(1) == {"open_positions": 0, "closed_positions": 0}
+
+
+class RowsResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def fetchall(self):
+        return self._rows
+
+
+class FusedDB:
+    def __init__(self):
+        self.queries = []
+
+    async def execute(self, statement, params=None):
+        self.queries.append((str(statement), params))
+        if "FROM order_service.trades" in str(statement):
+            return RowsResult([type("Row", (), {"strategy_id": 1, "total_trades": 6})()])
+        row = type("Row", (), {
+            "strategy_id": 1,
+            "realized_pnl": Decimal("-30"),
+            "unrealized_pnl": Decimal("80"),
+            "open_positions": 1,
+            "closed_positions": 4,
+            "winning_trades": 1,
+            "losing_trades": 3,
+            "avg_position_size": Decimal("1250"),
+            "capital_deployed": Decimal("5000"),
+            "closed_realized_pnl": [Decimal("-10"), Decimal("40"), Decimal("-20"), Decimal("-40")],
+        })()
+        return RowsResult([row])
+
+
+@pytest.mark.asyncio
+async def test_fused_metrics_batch_uses_two_queries_for_all_strategies():
+    db = FusedDB()
+    calc = PnLCalculator(db)
+
+    metrics = await calc.calculate_strategy_metrics_batch([1, 2, 1], trading_day=date(2024, 1, 1))
+
+    assert len(db.queries) == 2
+    assert db.queries[0][1]["strategy_ids"] == [1, 2]
+    assert metrics[1]["total_pnl"] == Decimal("50")
+    assert metrics[1]["total_trades"] == 6
+    assert metrics[1]["win_rate"] == Decimal("25.00")
+    assert metrics[1]["roi_percent"] == Decimal("1.00")
+    assert metrics[1]["max_consecutive_losses"] == 2
+    # Strategies with no rows get zeroed metrics
+    assert metrics[2]["total_pnl"] == Decimal("0")
+    assert metrics[2]["open_positions"] == 0
+
+
+@pytest.mark.asyncio
+async def test_update_batch_stores_each_strategy(monkeypatch):
+    db = FusedDB()
+    calc = PnLCalculator(db)
+    stored = []
+
+    async def fake_store(strategy_id, trading_day, metrics):
+        stored.append((strategy_id, metrics["total_trades"]))
+        return strategy_id == 1
+
+    monkeypatch.setattr(calc, "_store_strategy_pnl_metrics", fake_store)
+
+    results = await calc.update_strategy_pnl_metrics_batch([1, 2], trading_day=date(2024, 1, 1))
+
+    assert results == {1: True, 2: False}
+    assert sorted(stored) == [(1, 6), (2, 0)]
+    assert len(db.queries) == 2
+
+
+@pytest.mark.asyncio
+async def test_daily_metrics_for_range_and_rolling_day_pnl():
+    class DailyDB:
+        def __init__(self):
+            self.queries = 0
+
+        async def execute(self, statement, params=None):
+            self.queries += 1
+            if "FROM order_service.trades" in str(statement):
+                return RowsResult([type("Row", (), {"trading_day": date(2024, 1, 3), "total_trades": 2})()])
+            row = type("Row", (), {
+                "trading_day": date(2024, 1, 2),
+                "realized_pnl": Decimal("100"),
+                "unrealized_pnl": Decimal("0"),
+                "open_positions": 0,
+                "closed_positions": 1,
+                "winning_trades": 1,
+                "losing_trades": 0,
+                "avg_position_size": Decimal("1000"),
+                "capital_deployed": Decimal("1000"),
+                "closed_realized_pnl": [Decimal("100")],
+            })()
+            return RowsResult([row])
+
+    db = DailyDB()
+    calc = PnLCalculator(db)
+
+    daily = await calc.calculate_strategy_daily_metrics(1, date(2024, 1, 1), date(2024, 1, 31))
+
+    assert db.queries == 2
+    assert list(daily) == [date(2024, 1, 2), date(2024, 1, 3)]
+    assert daily[date(2024, 1, 2)]["total_pnl"] == Decimal("100")
+    assert daily[date(2024, 1, 3)]["total_trades"] == 2
+
+    pnl_data = PnLCalculator.build_pnl_data(daily[date(2024, 1, 2)], Decimal("40"), Decimal("0"))
+    assert pnl_data["day_pnl"] == 60.0
+    assert pnl_data["cumulative_pnl"] == 100.0
@@ -0,0 +1,124 @@
+from decimal import Decimal
+
+import pytest
+
+from order_service.app.models.position import Position
+from order_service.app.services.position_book import PositionBook
+
+
+class DummyRow:
+    def __init__(self, **values):
+        self._mapping = values
+
+
+class DummyResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def fetchall(self):
+        return self._rows
+
+
+class DummySession:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def execute(self, statement, params=None):
+        return DummyResult(self.rows)
+
+
+def row(position_id, token, quantity, buy_price=None, sell_price=None, realized=0, charges=0):
+    return DummyRow(
+        id=position_id,
+        instrument_token=token,
+        quantity=quantity,
+        buy_price=buy_price,
+        sell_price=sell_price,
+        realized_pnl=realized,
+        total_charges=charges,
+        last_price=None,
+        unrealized_pnl=0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_apply_marks_matches_flush_sql_semantics():
+    book = PositionBook()
+    await book.load(DummySession([
+        row(1, 101, 10, buy_price=Decimal("100"), realized=Decimal("5"), charges=Decimal("2")),
+        row(2, 101, -4, sell_price=Decimal("110")),
+        row(3, 202, 1, buy_price=Decimal("50")),
+    ]))
+
+    assert book.is_ready
+    assert book.get_mark(1) is None  # No price yet
+
+    assert book.apply_marks({101: Decimal("105")}) == 2
+
+    assert book.get_mark(1) == {
+        "last_price": Decimal("105.00"),
+        "unrealized_pnl": Decimal("50.00"),
+        "total_pnl": Decimal("55.00"),
+        "net_pnl": Decimal("53.00"),
+    }
+    assert book.get_mark(2)["unrealized_pnl"] == Decimal("20.00")
+    assert book.get_mark(3) is None
+
+
+@pytest.mark.asyncio
+async def test_marks_are_exact_decimals_rounded_like_numeric_columns():
+    book = PositionBook()
+    await book.load(DummySession([
+        row(1, 101, 3, buy_price=Decimal("0.10"), realized=Decimal("0.20"), charges=Decimal("0.05")),
+        row(2, 202, 1000, buy_price=Decimal("83.1225")),
+    ]))
+
+    # Binary floats would give 0.30000000000000004 for (0.2 - 0.1) * 3
+    book.apply_marks({101: Decimal("0.20"), 202: Decimal("83.1250")})
+
+    assert book.get_mark(1) == {
+        "last_price": Decimal("0.20"),
+        "unrealized_pnl": Decimal("0.30"),
+        "total_pnl": Decimal("0.50"),
+        "net_pnl": Decimal("0.45"),
+    }
+    # Sub-paisa currency ticks are carried exactly, then rounded half up to cents
+    assert book.get_mark(2)["unrealized_pnl"] == Decimal("2.50")
+    assert book.get_mark(2)["last_price"] == Decimal("83.13")
+
+
+@pytest.mark.asyncio
+async def test_remove_and_upsert_keep_indexes_consistent():
+    book = PositionBook()
+    await book.load(DummySession([
+        row(1, 101, 10, buy_price=Decimal("100")),
+        row(2, 202, 5, buy_price=Decimal("50")),
+        row(3, 303, 2, buy_price=Decimal("10")),
+    ]))
+
+    assert book.remove(1)
+    assert not book.remove(1)
+    assert len(book) == 2
+
+    # Slot 0 now holds position 3 - it must still be marked by its own token
+    book.apply_marks({303: 12, 202: 51})
+    assert book.get_mark(3)["unrealized_pnl"] == Decimal("4.00")
+    assert book.get_mark(2)["unrealized_pnl"] == Decimal("5.00")
+
+    # A flat position is dropped on upsert
+    book.upsert({"id": 2, "instrument_token": 202, "quantity": 0})
+    assert book.get_mark(2) is None
+    assert len(book) == 1
+
+
+@pytest.mark.asyncio
+async def test_overlay_marks_does_not_dirty_orm_objects():
+    book = PositionBook()
+    await book.load(DummySession([row(7, 101, 10, buy_price=Decimal("100"))]))
+    book.apply_marks({101: 101.5})
+
+    position = Position(id=7, last_price=Decimal("99"), unrealized_pnl=Decimal("-10"))
+    assert book.overlay_marks([position]) == 1
+
+    assert position.last_price == Decimal("101.50")
+    assert position.unrealized_pnl == Decimal("15.00")
@@ -0,0 +1,211 @@
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from order_service.app.clients import market_data_service_client as market_data_module
+from order_service.app.models.position import Position
+from order_service.app.services import position_service as position_module
+from order_service.app.services.position_service import PositionService
+
+
+MIGRATIONS = Path(__file__).resolve().parents[2] / "migrations"
+
+
+class ScalarResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+class RecordingDB:
+    def __init__(self, existing):
+        self.existing = existing
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, statement, params=None):
+        self.statements.append(statement)
+        return ScalarResult(self.existing)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+
+def broker_position(symbol, quantity, product="MIS", exchange="NSE"):
+    return {
+        "symbol": symbol,
+        "exchange": exchange,
+        "product": product,
+        "quantity": quantity,
+        "buy_quantity": max(quantity, 0),
+        "buy_value": 100.0 * max(quantity, 0),
+        "realised": 0.0,
+        "unrealised": 5.0,
+        "pnl": 5.0,
+    }
+
+
+def stored_position(symbol, quantity, token):
+    return SimpleNamespace(
+        symbol=symbol, exchange="NSE", product_type="MIS", quantity=quantity,
+        total_pnl=0.0, is_open=quantity != 0, instrument_token=token, strategy_id=7,
+    )
+
+
+@pytest.fixture
+def service(monkeypatch):
+    calls = {"tokens": [], "strategy": 0, "invalidations": 0, "subscriptions": []}
+
+    class Kite:
+        async def get_positions(self):
+            return calls["broker"]
+
+    class MarketClient:
+        async def get_instrument_tokens(self, instruments):
+            calls["tokens"].append(sorted(instruments))
+            return {key: 1000 + i for i, key in enumerate(sorted(instruments))}
+
+    async def fake_market_client():
+        return MarketClient()
+
+    async def fake_default_strategy(db, trading_account_id, user_id=None):
+        calls["strategy"] += 1
+        return 42, None
+
+    async def fake_invalidate(pattern):
+        calls["invalidations"] += 1
+
+    monkeypatch.setattr(position_module, "get_kite_client_for_account", lambda acc: Kite())
+    monkeypatch.setattr(position_module, "get_or_create_default_strategy", fake_default_strategy)
+    monkeypatch.setattr(position_module, "invalidate_position_cache", fake_invalidate)
+    monkeypatch.setattr(
+        "order_service.app.clients.market_data_service_client.get_market_data_client", fake_market_client
+    )
+
+    def make(existing, trading_account_id="acc1"):
+        db = RecordingDB(existing)
+        svc = PositionService(db=db, user_id=1, trading_account_id=trading_account_id)
+
+        async def record_subscription(symbol, exchange, is_open):
+            calls["subscriptions"].append((symbol, is_open))
+
+        svc._manage_position_subscription = record_subscription
+        return svc, db
+
+    calls["make"] = make
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_validation_corrects_drift_with_one_load_and_one_upsert(service):
+    svc, db = service["make"]([
+        stored_position("INFY", 10, token=408065),
+        stored_position("TCS", 5, token=2953217),
+        stored_position("SBIN", 1, token=779521),
+    ])
+    service["broker"] = {"net": [
+        broker_position("INFY", 10),   # P&L drift
+        broker_position("TCS", 0),     # closed at broker
+        broker_position("RELIANCE", 3),  # missing in DB
+        broker_position("SBIN", 1),
+    ]}
+
+    stats = await svc.validate_positions()
+
+    # One SELECT for today's positions, one upsert for all corrections
+    assert len(db.statements) == 2
+    upsert = str(db.statements[1].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT ON CONSTRAINT unique_account_position DO UPDATE" in upsert
+    assert db.commits == 1
+
+    # Only the new position needed a token; default strategy resolved once
+    assert service["tokens"] == [[("RELIANCE", "NSE")]]
+    assert service["strategy"] == 1
+    assert service["invalidations"] == 1
+
+    # Subscriptions change only for positions whose open state changed
+    assert sorted(service["subscriptions"]) == [("RELIANCE", True), ("TCS", False)]
+    assert stats["missing_positions"][0]["symbol"] == "RELIANCE"
+
+
+@pytest.mark.asyncio
+async def test_steady_state_validation_makes_no_writes(service):
+    position = stored_position("INFY", 10, token=408065)
+    position.total_pnl = 5.0
+    svc, db = service["make"]([position])
+    service["broker"] = {"net": [broker_position("INFY", 10)]}
+
+    stats = await svc.validate_positions()
+
+    assert stats["positions_corrected"] == 0
+    assert len(db.statements) == 1
+    assert service["tokens"] == []
+    assert service["strategy"] == 0
+    assert service["invalidations"] == 0
+    assert service["subscriptions"] == []
+
+
+@pytest.mark.asyncio
+async def test_upsert_conflict_key_separates_accounts_and_exchanges(service):
+    model_constraint = next(
+        c for c in Position.__table__.constraints if c.name == "unique_account_position"
+    )
+    conflict_columns = [column.name for column in model_constraint.columns]
+    assert conflict_columns == ["trading_account_id", "symbol", "exchange", "product_type", "trading_day"]
+    migration = (MIGRATIONS / "028_position_account_unique_constraint.sql").read_text()
+    assert f"UNIQUE ({', '.join(conflict_columns)})" in migration
+
+    for account in ("acc1", "acc2"):
+        svc, db = service["make"]([], trading_account_id=account)
+        await svc._sync_positions_batch(
+            [broker_position("INFY", 10, exchange="NSE"), broker_position("INFY", 4, exchange="BSE")],
+            existing={},
+        )
+
+        upsert = db.statements[-1].compile(dialect=postgresql.dialect())
+        assert "ON CONFLICT ON CONSTRAINT unique_account_position DO UPDATE" in str(upsert)
+        # Same symbol on two exchanges stays two rows, each labelled with its own account
+        rows = {
+            (upsert.params[f"exchange_m{i}"], upsert.params[f"trading_account_id_m{i}"])
+            for i in range(2)
+        }
+        assert rows == {("NSE", account), ("BSE", account)}
+
+
+@pytest.mark.asyncio
+async def test_instrument_token_cache_starts_over_each_trading_day(monkeypatch):
+    day = {"now": datetime(2024, 1, 1, 10, 0)}
+    lookups = []
+
+    class FakeDatetime:
+        @staticmethod
+        def now(tz=None):
+            return day["now"]
+
+    async def fake_lookup(symbol, exchange):
+        lookups.append(symbol)
+        return 1000 + len(lookups)
+
+    monkeypatch.setattr(market_data_module, "datetime", FakeDatetime)
+    client = market_data_module.MarketDataServiceClient(base_url="http://unused")
+    monkeypatch.setattr(client, "get_instrument_token", fake_lookup)
+
+    assert await client.get_instrument_tokens([("INFY", "NSE")]) == {("INFY", "NSE"): 1001}
+    assert await client.get_instrument_tokens([("INFY", "NSE")]) == {("INFY", "NSE"): 1001}
+    assert lookups == ["INFY"]
+
+    day["now"] = datetime(2024, 1, 2, 10, 0)
+    assert await client.get_instrument_tokens([("TCS", "NSE")]) == {("TCS", "NSE"): 1002}
+    # Yesterday's tokens are dropped rather than kept for the life of the process
+    assert client._token_cache == {("TCS", "NSE"): 1002}
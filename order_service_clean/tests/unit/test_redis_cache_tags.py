@@ -0,0 +1,154 @@
+import fnmatch
+
+import pytest
+
+from order_service.app.database import redis_client
+from order_service.app.services.redis_usage_monitor import RedisUsageMonitor, RedisUsagePattern
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+        return queue
+
+    async def execute(self, raise_on_error=True):
+        self.redis.round_trips += 1
+        return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.round_trips = 0
+        self.scans = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    async def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(members)
+
+    async def srem(self, key, *members):
+        self.data.get(key, set()).difference_update(members)
+
+    async def smembers(self, key):
+        return set(self.data.get(key, set()))
+
+    async def expire(self, key, ttl):
+        return True
+
+    async def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def keys(self, pattern):
+        raise AssertionError("KEYS must not be used")
+
+    async def scan(self, cursor, match=None, count=None):
+        self.scans.append(match)
+        keys = sorted(self.data)
+        batch = keys[cursor:cursor + count]
+        next_cursor = cursor + count if cursor + count < len(keys) else 0
+        # Like SCAN MATCH, the filter applies to each batch after it is read
+        return next_cursor, [key for key in batch if match is None or fnmatch.fnmatchcase(key, match)]
+
+    async def memory_usage(self, key):
+        return 100
+
+    async def ttl(self, key):
+        return 60 if key.startswith("order:") else -1
+
+
+@pytest.fixture()
+def fake_redis(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(redis_client, "get_redis", lambda: redis)
+    return redis
+
+
+@pytest.mark.asyncio
+async def test_owner_invalidation_deletes_tagged_keys_only(fake_redis):
+    await redis_client.cache_order("1", {"qty": 1}, user_id=7, trading_account_id="ACC1")
+    await redis_client.cache_order("2", {"qty": 2}, user_id=7)
+    await redis_client.cache_order("3", {"qty": 3}, user_id=8)
+
+    fake_redis.round_trips = 0
+    await redis_client.invalidate_order_cache("user:7")
+
+    assert "order:1" not in fake_redis.data and "order:2" not in fake_redis.data
+    assert "order:3" in fake_redis.data
+    assert fake_redis.data["tags:order:user:7"] == set()
+    # smembers round trip + delete/srem round trip
+    assert fake_redis.round_trips == 2
+
+
+@pytest.mark.asyncio
+async def test_order_cache_supports_owner_and_id_invalidation(fake_redis):
+    await redis_client.cache_order("1", {"qty": 1}, user_id=7)
+    await redis_client.cache_order("2", {"qty": 2}, trading_account_id="ACC1")
+    await redis_client.cache_order("3", {"qty": 3}, user_id=8)
+
+    await redis_client.invalidate_order_cache("user:7")
+    await redis_client.invalidate_order_cache("2")
+
+    assert [key for key in fake_redis.data if key.startswith("order:")] == ["order:3"]
+
+
+@pytest.mark.asyncio
+async def test_dashboard_invalidation_clears_account_and_user_entries(fake_redis):
+    await redis_client.cache_dashboard_overview("ACC1", {"a": 1})
+    await redis_client.cache_dashboard_overview("ACC1", {"a": 2}, user_id=5)
+
+    await redis_client.invalidate_dashboard_cache("ACC1")
+
+    assert not [key for key in fake_redis.data if key.startswith("dashboard:ACC1")]
+
+
+@pytest.mark.asyncio
+async def test_usage_monitor_scans_each_prefix_with_pipelined_sampling():
+    redis = FakeRedis()
+    for i in range(30):
+        redis.data[f"ticker:NIFTY:{i}"] = "x"
+    for i in range(4):
+        redis.data[f"order:{i}"] = "x"
+    redis.data["unrelated"] = "x"
+
+    monitor = RedisUsageMonitor()
+    monitor._redis_client = redis
+    monitor.scan_batch_size = 10
+    monitor.sample_size = 5
+
+    await monitor._collect_usage_metrics()
+
+    ticks = monitor.usage_patterns[RedisUsagePattern.REAL_TIME_DATA]
+    cache = monitor.usage_patterns[RedisUsagePattern.CACHING]
+    assert ticks.key_count == 30 and ticks.memory_usage_bytes == 3000
+    assert cache.key_count == 4 and cache.expiration_usage == 4
+    assert monitor.last_scan_complete and monitor.last_scan_keys == 34
+    # Every SCAN is filtered server-side by an owner prefix
+    assert None not in redis.scans and "ticker:*" in redis.scans
+
+
+@pytest.mark.asyncio
+async def test_usage_monitor_stops_at_the_per_prefix_cap():
+    redis = FakeRedis()
+    for i in range(30):
+        redis.data[f"ticker:NIFTY:{i:02d}"] = "x"
+
+    monitor = RedisUsageMonitor()
+    monitor._redis_client = redis
+    monitor.scan_batch_size = 10
+    monitor.max_keys_per_prefix = 10
+
+    await monitor._collect_usage_metrics()
+
+    assert monitor.usage_patterns[RedisUsagePattern.REAL_TIME_DATA].key_count == 10
+    assert not monitor.last_scan_complete
+    assert redis.scans.count("ticker:*") == 1
@@ -0,0 +1,92 @@
+import pytest
+
+from order_service.app.services import order_service as order_module
+from order_service.app.services.order_service import OrderService
+from order_service.app.services.risk_snapshot import RiskSnapshotCache
+
+
+class GroupedResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class CountingDB:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    async def execute(self, *args, **kwargs):
+        self.queries += 1
+        return GroupedResult(self.rows)
+
+
+class FakeMarginService:
+    fetches = 0
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    async def get_available_margin(self, segment):
+        FakeMarginService.fetches += 1
+        return 1_000_000.0
+
+
+@pytest.fixture
+def order_service(monkeypatch):
+    # symbol, priced value, quantity with no price, today's net P&L
+    db = CountingDB([("INFY", 200_000.0, 0, -1000.0), ("TCS", 300_000.0, 100, 500.0)])
+    FakeMarginService.fetches = 0
+
+    monkeypatch.setattr(order_module, "MarginService", FakeMarginService)
+    monkeypatch.setattr(order_module, "get_risk_snapshot_cache", lambda: cache)
+    cache = RiskSnapshotCache(ttl_seconds=60)
+
+    # Only the attributes the risk checks use
+    svc = OrderService.__new__(OrderService)
+    svc.db = db
+    svc.user_id = 1
+    svc.trading_account_id_int = 1
+    svc.trading_account_id = "1"
+    return svc, db, cache
+
+
+@pytest.mark.asyncio
+async def test_checks_share_one_grouped_query_and_margin_fetch(order_service):
+    svc, db, cache = order_service
+
+    for _ in range(5):
+        passed, details = await svc._perform_risk_checks("INFY", "BUY", 10, 1500.0)
+        assert passed, details
+
+    snapshot = await svc._get_risk_snapshot()
+    assert db.queries == 1
+    assert FakeMarginService.fetches == 1
+    assert snapshot.today_net_pnl == -500.0
+    # Unpriced quantity falls back to the order price, as the per-query path did
+    assert snapshot.symbol_exposure("TCS", fallback_price=3000.0) == 600_000.0
+    assert cache.get_stats()["hits"] == 5
+
+
+@pytest.mark.asyncio
+async def test_batch_legs_are_checked_against_earlier_reservations(order_service, monkeypatch):
+    svc, db, cache = order_service
+    monkeypatch.setattr(order_module.settings.__class__, "max_position_exposure_value", property(lambda self: 1_000_000.0))
+
+    snapshot = (await svc._get_risk_snapshot()).copy()
+
+    first = await svc._perform_risk_checks("INFY", "BUY", 200, 1500.0, snapshot=snapshot)
+    assert first[0]
+    snapshot.reserve(*svc._risk_reservation("INFY", 200, 1500.0))
+
+    # 200k existing + 300k reserved + 600k new > 1M limit
+    second = await svc._perform_risk_checks("INFY", "BUY", 400, 1500.0, snapshot=snapshot)
+    assert not second[0]
+    assert "Position exposure" in second[1]
+
+    # The shared snapshot is untouched by the batch copy
+    shared = await svc._get_risk_snapshot()
+    assert shared.symbol_exposure("INFY", 1500.0) == 200_000.0
+    assert db.queries == 1
@@ -0,0 +1,110 @@
+import json
+
+import pytest
+from cryptography.fernet import Fernet
+
+from order_service.app.services.cache_service import LocalCache, SecureCacheService
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.gets = 0
+        self.published = []
+
+    async def get(self, key):
+        self.gets += 1
+        return self.data.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def scan_iter(self, match=None, count=None):
+        import fnmatch
+        for key in list(self.data):
+            if fnmatch.fnmatchcase(key, match):
+                yield key
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+def make_cache(redis_client, **kwargs):
+    return SecureCacheService(redis_client=redis_client, encryption_key=Fernet.generate_key(), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_repeat_reads_are_served_from_l1_without_redis():
+    r = FakeRedis()
+    cache = make_cache(r)
+    await cache.set("secret:prod:a", {"token": "x"})
+    cache.local.clear()
+
+    assert await cache.get("secret:prod:a") == {"token": "x"}
+    value = await cache.get("secret:prod:a")
+    value["token"] = "mutated"
+
+    assert await cache.get("secret:prod:a") == {"token": "x"}
+    assert r.gets == 1
+    stats = cache.get_stats()
+    assert stats["l1"]["hits"] == 2 and stats["l2"]["hits"] == 1
+    assert stats["cache_hits"] == 3
+
+
+@pytest.mark.asyncio
+async def test_remote_invalidation_evicts_l1_and_own_messages_are_ignored():
+    r = FakeRedis()
+    writer = make_cache(r)
+    reader = make_cache(r)
+    reader.cipher = writer.cipher
+
+    await writer.set("secret:prod:a", 1)
+    await writer.set("secret:dev:b", 2)
+    assert await reader.get("secret:prod:a") == 1
+    assert await reader.get("secret:dev:b") == 2
+
+    await writer.invalidate_pattern("secret:prod:*")
+    channel, message = r.published[-1]
+    assert json.loads(message)["pattern"] == "secret:prod:*"
+
+    reader._apply_invalidation(message)
+    writer._apply_invalidation(message)
+
+    assert "secret:prod:a" not in reader.local._entries
+    assert reader.local.get("secret:dev:b") is not None
+    assert reader.invalidations_received == 1
+    assert writer.invalidations_received == 0
+    assert await reader.get("secret:prod:a") is None
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_l2_read_does_not_repopulate_l1():
+    r = FakeRedis()
+    cache = make_cache(r)
+    await cache.set("k", "old")
+    cache.local.clear()
+
+    original_get = r.get
+
+    async def get_racing_invalidation(key):
+        value = await original_get(key)
+        cache._apply_invalidation(json.dumps({"origin": "other", "keys": [key]}))
+        return value
+
+    r.get = get_racing_invalidation
+    assert await cache.get("k") == "old"
+    assert cache.local.get("k") is None
+
+
+def test_local_cache_is_bounded_lru():
+    local = LocalCache(max_entries=2, ttl=30)
+    local.set("a", "1")
+    local.set("b", "2")
+    local.get("a")
+    local.set("c", "3")
+
+    assert local.get("b") is None
+    assert local.get("a") == "1" and local.get("c") == "3"
@@ -0,0 +1,211 @@
+from decimal import Decimal
+
+import pytest
+
+from order_service.app.workers.tick_listener import TickListener
+
+
+class DummyResult:
+    def __init__(self, rowcount):
+        self.rowcount = rowcount
+
+
+class DummySession:
+    def __init__(self, rowcount=1):
+        self.queries = []
+        self.commits = 0
+        self.rowcount = rowcount
+
+    async def execute(self, statement, params=None):
+        self.queries.append((str(statement), params))
+        return DummyResult(self.rowcount)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def make_listener(session, bulk_flush=True):
+    listener = TickListener(
+        redis_url="redis://localhost:6379/0",
+        database_url="postgresql+asyncpg://test@localhost/test",
+        bulk_flush=bulk_flush,
+    )
+    listener.async_session = lambda: session
+    return listener
+
+
+def queue_ticks(listener, prices):
+    for token, price in prices.items():
+        listener._pending_updates[token] = {"instrument_token": token, "last_price": price}
+
+
+@pytest.mark.asyncio
+async def test_bulk_flush_sends_one_statement_per_batch():
+    session = DummySession(rowcount=5)
+    listener = make_listener(session)
+    queue_ticks(listener, {101: 10.5, 102: 20.25, 103: None})
+
+    await listener._flush_updates()
+
+    assert len(session.queries) == 1
+    sql, params = session.queries[0]
+    assert "unnest" in sql
+    assert params["tokens"] == [101, 102]
+    assert params["prices"] == [Decimal("10.5"), Decimal("20.25")]
+    assert session.commits == 1
+
+    stats = listener.get_stats()
+    assert stats["total_flushes"] == 1
+    assert stats["last_flush_tokens"] == 2
+    assert stats["last_flush_rows"] == 5
+    assert listener._pending_updates == {}
+
+
+@pytest.mark.asyncio
+async def test_per_token_flush_keeps_legacy_shape():
+    session = DummySession(rowcount=1)
+    listener = make_listener(session, bulk_flush=False)
+    queue_ticks(listener, {101: 10.5, 102: 20.25})
+
+    await listener._flush_updates()
+
+    assert len(session.queries) == 2
+    assert {params["token"] for _, params in session.queries} == {101, 102}
+    assert listener.get_stats()["total_rows_updated"] == 2
+
+
+@pytest.mark.asyncio
+async def test_flush_error_is_counted_and_not_raised():
+    class FailingSession(DummySession):
+        async def execute(self, statement, params=None):
+            raise RuntimeError("db down")
+
+    listener = make_listener(FailingSession())
+    queue_ticks(listener, {101: 10.5})
+
+    await listener._flush_updates()
+
+    stats = listener.get_stats()
+    assert stats["total_flush_errors"] == 1
+    assert stats["total_flushes"] == 0
+
+
+class DummyPubSub:
+    def __init__(self):
+        self.channels = set()
+
+    async def subscribe(self, *channels):
+        self.channels.update(channels)
+
+    async def unsubscribe(self, *channels):
+        self.channels.difference_update(channels)
+
+
+@pytest.mark.asyncio
+async def test_sharded_subscriptions_partition_tokens_by_hash():
+    listener = make_listener(DummySession())
+    listener.num_shards = 3
+    listener._pubsubs = [DummyPubSub() for _ in range(3)]
+    listener._subscribed_tokens = {0, 1, 2, 3, 4, 5}
+
+    await listener._subscribe_to_channels()
+
+    assert listener._pubsubs[0].channels == {"ticks:0", "ticks:3"}
+    assert listener._pubsubs[1].channels == {"ticks:1", "ticks:4"}
+    assert listener._pubsubs[2].channels == {"ticks:2", "ticks:5"}
+
+
+@pytest.mark.asyncio
+async def test_tick_buffer_merges_and_drops_when_full():
+    listener = make_listener(DummySession())
+    listener.max_pending_tokens = 2
+
+    for token, price in [(1, 10), (2, 20), (1, 11), (3, 30)]:
+        await listener._handle_tick_message(
+            {"channel": f"ticks:{token}", "data": f'{{"last_price": {price}}}'}
+        )
+
+    assert set(listener._pending_updates) == {1, 2}
+    assert listener._pending_updates[1]["last_price"] == 11
+    stats = listener.get_stats()
+    assert stats["ticks_received"] == 4
+    assert stats["ticks_merged"] == 1
+    assert stats["ticks_dropped"] == 1
+    assert listener._flush_requested.is_set()
+
+
+@pytest.mark.asyncio
+async def test_position_book_defers_persistence_to_cadence():
+    class RecordingBook:
+        def __init__(self):
+            self.marks = []
+
+        def apply_marks(self, prices):
+            self.marks.append(dict(prices))
+            return len(prices)
+
+    session = DummySession(rowcount=1)
+    listener = make_listener(session)
+    listener.position_book = RecordingBook()
+    listener.persist_interval_ms = 60_000
+    listener.persist_threshold_pct = 1.0
+    listener._persisted_prices = {101: Decimal("100"), 102: Decimal("100")}
+
+    # 101 moves 0.5% (deferred), 102 moves 2% (persisted immediately)
+    queue_ticks(listener, {101: 100.5, 102: 102})
+    await listener._flush_updates()
+
+    assert listener.position_book.marks == [{101: Decimal("100.5"), 102: Decimal("102")}]
+    assert session.queries[0][1]["tokens"] == [102]
+    assert listener._unpersisted == {101: Decimal("100.5")}
+
+    # Shutdown forces everything outstanding to the DB
+    await listener._flush_updates(force_persist=True)
+    assert session.queries[1][1]["tokens"] == [101]
+    assert listener._unpersisted == {}
+
+
+@pytest.mark.asyncio
+async def test_book_reload_keeps_latest_marks_and_prunes_closed_tokens():
+    from order_service.app.services.position_book import PositionBook
+
+    class BookRow:
+        def __init__(self, position_id, token):
+            self._mapping = {
+                "id": position_id, "instrument_token": token, "quantity": 10,
+                "buy_price": Decimal("100"), "sell_price": None, "realized_pnl": 0,
+                "total_charges": 0, "last_price": Decimal("100"), "unrealized_pnl": 0,
+            }
+
+    class BookSession(DummySession):
+        def __init__(self, rows):
+            super().__init__()
+            self.rows = rows
+
+        async def execute(self, statement, params=None):
+            result = DummyResult(len(self.rows))
+            result.fetchall = lambda: self.rows
+            return result
+
+    session = BookSession([BookRow(1, 101), BookRow(2, 102)])
+    listener = make_listener(session)
+    listener.position_book = PositionBook()
+    listener.persist_interval_ms = 60_000
+    await listener._reload_position_book()
+
+    queue_ticks(listener, {101: 110, 102: 90})
+    await listener._flush_updates()
+
+    # DB still holds the old marks; the reload must not revert the book to them
+    session.rows = [BookRow(1, 101)]
+    await listener._reload_position_book()
+
+    assert listener.position_book.get_mark(1)["last_price"] == 110.0
+    assert set(listener._latest_marks) == {101}
+    assert 102 not in listener._persisted_prices
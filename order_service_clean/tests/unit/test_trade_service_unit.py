@@ -81,3 +81,73 @@ async def test_list_trades_filters_and_limits(monkeypatch):
     monkeypatch.setattr(db, "execute", fake_execute)
     trades = await svc.list_trades(symbol="ABC", start_date=date(2024, 1, 1), end_date=date(2024, 1, 2), limit=10, offset=0)
     assert trades == []
+
+
+class RowsResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def fetchall(self):
+        return self._rows
+
+
+class BulkDB(DummyDB):
+    """Answers the bulk path's lookups and INSERT ... RETURNING in order."""
+
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = list(responses)
+
+    async def execute(self, stmt):
+        self.executed.append(stmt)
+        return RowsResult(self.responses.pop(0))
+
+
+@pytest.mark.asyncio
+async def test_bulk_sync_uses_set_queries_and_single_invalidation(monkeypatch):
+    def broker_trade(trade_id, order_id, transaction_type="SELL"):
+        return {
+            "trade_id": trade_id,
+            "order_id": order_id,
+            "symbol": "ABC",
+            "exchange": "NSE",
+            "transaction_type": transaction_type,
+            "product": "MIS",
+            "quantity": 5,
+            "average_price": 100,
+            "fill_timestamp": None,
+            "exchange_timestamp": "2024-01-01T00:00:00Z",
+        }
+
+    broker_trades = [broker_trade("t1", "o1"), broker_trade("t2", "o2"), broker_trade("t3", "o3")]
+    db = BulkDB([
+        [("t1",)],                                  # existing trade ids
+        [("o2", 20, "manual"), ("o3", 30, "external")],  # linked orders
+        [(102, "t2", "manual"), (103, "t3", "external")],  # INSERT ... RETURNING
+    ])
+    invalidations = []
+    queued = []
+
+    async def fake_invalidate(key):
+        invalidations.append(key)
+
+    class FakeQueue:
+        def enqueue(self, user_id, trading_account_id, trade_id, broker_trade):
+            queued.append(trade_id)
+
+    monkeypatch.setattr("order_service.app.services.trade_service.get_kite_client_for_account",
+                        lambda acc: DummyKite(broker_trades))
+    monkeypatch.setattr("order_service.app.services.trade_service.invalidate_trade_cache", fake_invalidate)
+    monkeypatch.setattr("order_service.app.services.trade_attribution_queue.get_attribution_queue", lambda: FakeQueue())
+
+    svc = TradeService(db=db, user_id=1, trading_account_id=1)
+    stats = await svc.sync_trades_from_broker(bulk=True)
+
+    assert len(db.executed) == 3
+    assert "ON CONFLICT" in str(db.executed[2])
+    assert db.added == []
+    assert db.commits == 1
+    assert stats["trades_created"] == 2
+    assert stats["trades_synced"] == 3
+    assert invalidations == ["user:1"]
+    assert queued == [103]
@@ -0,0 +1,135 @@
+import asyncio
+import json
+
+import pytest
+
+from order_service.app.websocket import delta
+from order_service.app.websocket.delta import DeltaStreamConnection, diff_fields
+from order_service.app.websocket.manager import ConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, payload):
+        self.sent.append(json.loads(payload))
+
+    async def send_bytes(self, payload):
+        self.sent.append(delta.msgpack.unpackb(payload))
+
+    async def close(self, code=1000, reason=""):
+        pass
+
+
+async def drain():
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+def update(symbol, **fields):
+    return {"user_id": 7, "trading_account_id": 1, "data": {"symbol": symbol, **fields}}
+
+
+def test_diff_fields_reports_changed_and_removed_fields():
+    previous = {"symbol": "INFY", "quantity": 10, "pnl": 5.0, "tag": "x"}
+    current = {"symbol": "INFY", "quantity": 10, "pnl": 7.5, "last_price": 1500.0}
+
+    assert diff_fields(previous, current) == {"pnl": 7.5, "last_price": 1500.0, "tag": None}
+    assert diff_fields(None, current) == current
+    assert diff_fields(current, dict(current)) == {}
+
+
+@pytest.mark.asyncio
+async def test_throttle_merges_updates_into_one_delta_frame():
+    manager = ConnectionManager("redis://unused", max_update_rate=10.0)
+    ws = FakeWebSocket()
+    stream = await manager.connect(ws, 7, mode="delta", max_rate=50.0)
+    assert stream["max_rate"] == 10.0 and stream["encoding"] == "json"
+
+    await manager.send_personal_message(update("INFY", quantity=10, pnl=1.0), 7)
+    await drain()
+    # While the writer is throttled, several updates arrive
+    for pnl in (2.0, 3.0, 4.0):
+        await manager.send_personal_message(update("INFY", quantity=10, pnl=pnl), 7)
+    await manager.send_personal_message(update("TCS", quantity=5, pnl=0.5), 7)
+    await asyncio.sleep(0.15)
+
+    assert ws.sent == [
+        {"type": "positions_delta", "seq": 1, "positions": {"1:INFY": {"symbol": "INFY", "quantity": 10, "pnl": 1.0}}},
+        {"type": "positions_delta", "seq": 2, "positions": {
+            "1:INFY": {"pnl": 4.0},
+            "1:TCS": {"symbol": "TCS", "quantity": 5, "pnl": 0.5},
+        }},
+    ]
+    assert manager.get_stats()["coalesced"] == 2
+    await manager.router.close_all()
+
+
+@pytest.mark.asyncio
+async def test_resync_and_periodic_snapshots_send_full_state():
+    manager = ConnectionManager("redis://unused", max_update_rate=100.0, snapshot_interval=0.1)
+    ws = FakeWebSocket()
+    await manager.connect(ws, 7, mode="delta")
+
+    await manager.send_personal_message(update("INFY", quantity=10), 7)
+    await drain()
+    assert manager.request_snapshot(ws)
+    await asyncio.sleep(0.02)
+    assert ws.sent[-1] == {"type": "positions_snapshot", "seq": 2, "positions": {"1:INFY": {"symbol": "INFY", "quantity": 10}}}
+
+    await asyncio.sleep(0.15)
+    assert ws.sent[-1]["type"] == "positions_snapshot" and ws.sent[-1]["seq"] == 3
+    await manager.router.close_all()
+
+
+@pytest.mark.asyncio
+async def test_closed_positions_get_a_last_delta_and_are_forgotten():
+    manager = ConnectionManager("redis://unused", max_update_rate=100.0)
+    ws = FakeWebSocket()
+    await manager.connect(ws, 7, mode="delta")
+    conn = manager.router.get(ws)
+
+    await manager.send_personal_message(update("INFY", quantity=10, pnl=1.0), 7)
+    await manager.send_personal_message(update("TCS", quantity=5, is_open=True), 7)
+    await drain()
+    await asyncio.sleep(0.02)
+    await manager.send_personal_message(update("INFY", quantity=0, pnl=3.0), 7)
+    await manager.send_personal_message(update("TCS", quantity=5, is_open=False), 7)
+    await asyncio.sleep(0.02)
+
+    assert ws.sent[-1] == {"type": "positions_delta", "seq": 2, "positions": {
+        "1:INFY": {"quantity": 0, "pnl": 3.0},
+        "1:TCS": {"is_open": False},
+    }}
+    assert conn._latest == {} and conn._sent_state == {}
+
+    # A position closed before its delta went out is left out of snapshots
+    await manager.send_personal_message(update("SBIN", quantity=1), 7)
+    await asyncio.sleep(0.02)
+    await manager.send_personal_message(update("SBIN", quantity=0), 7)
+    assert manager.request_snapshot(ws)
+    await asyncio.sleep(0.02)
+    assert ws.sent[-1] == {"type": "positions_snapshot", "seq": 4, "positions": {}}
+    assert conn._latest == {} and conn._sent_state == {}
+    await manager.router.close_all()
+
+
+@pytest.mark.asyncio
+async def test_msgpack_falls_back_to_json_when_unavailable(monkeypatch):
+    monkeypatch.setattr(delta, "MSGPACK_AVAILABLE", False)
+    manager = ConnectionManager("redis://unused")
+    ws = FakeWebSocket()
+    stream = await manager.connect(ws, 7, mode="delta", encoding="msgpack")
+
+    assert stream["encoding"] == "json"
+    assert isinstance(manager.router.get(ws), DeltaStreamConnection)
+    # Control messages still go through the plain queue
+    manager.send_to_connection(ws, {"type": "pong"})
+    await manager.send_personal_message(update("INFY", quantity=1), 7)
+    await drain()
+    assert ws.sent == [{"type": "pong"}, {"type": "positions_delta", "seq": 1, "positions": {"1:INFY": {"symbol": "INFY", "quantity": 1}}}]
+    await manager.router.close_all()
@@ -0,0 +1,130 @@
+import asyncio
+import json
+
+import pytest
+
+from order_service.app.websocket.fanout import SLOW_CONSUMER_CLOSE_CODE, FanoutRouter
+from order_service.app.websocket.manager import ConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self, blocked=False):
+        self.sent = []
+        self.closed_with = None
+        self.gate = asyncio.Event()
+        if not blocked:
+            self.gate.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, payload):
+        await self.gate.wait()
+        self.sent.append(payload)
+
+    async def close(self, code=1000, reason=""):
+        self.closed_with = code
+
+
+async def drain():
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+def update(user_id, account_id, symbol, qty):
+    return {"user_id": user_id, "trading_account_id": account_id, "data": {"symbol": symbol, "quantity": qty}}
+
+
+@pytest.mark.asyncio
+async def test_updates_are_routed_by_account_and_serialized_once():
+    manager = ConnectionManager("redis://unused")
+    all_accounts, account_1, account_2, other_user = (FakeWebSocket() for _ in range(4))
+    await manager.connect(all_accounts, 7)
+    await manager.connect(account_1, 7, trading_account_id=1)
+    await manager.connect(account_2, 7, trading_account_id=2)
+    await manager.connect(other_user, 8)
+
+    raw = json.dumps(update(7, 1, "INFY", 10))
+    await manager.send_personal_message(json.loads(raw), 7, raw=raw)
+    await drain()
+
+    assert all_accounts.sent == [raw] and account_1.sent == [raw]
+    assert account_2.sent == [] and other_user.sent == []
+    # The same string object is handed to every socket
+    assert all_accounts.sent[0] is account_1.sent[0]
+
+
+@pytest.mark.asyncio
+async def test_int_account_filter_matches_string_account_ids():
+    manager = ConnectionManager("redis://unused")
+    int_filter, str_filter, other_account = (FakeWebSocket() for _ in range(3))
+    # Query-string filters arrive as ints; published messages carry the String(100) column
+    await manager.connect(int_filter, 7, trading_account_id=123)
+    await manager.connect(str_filter, 7, trading_account_id="123")
+    await manager.connect(other_account, 7, trading_account_id=124)
+
+    await manager.send_personal_message(update(7, "123", "INFY", 10), 7)
+    await drain()
+    # Same position under either ID type, so it would coalesce without the drain
+    await manager.send_personal_message(update(7, 123, "INFY", 11), 7)
+    await drain()
+
+    assert [json.loads(m)["data"]["quantity"] for m in int_filter.sent] == [10, 11]
+    assert str_filter.sent == int_filter.sent
+    assert other_account.sent == []
+    assert manager.router.get_stats()["routes"] == 2
+
+
+@pytest.mark.asyncio
+async def test_lagging_client_gets_latest_state_per_position_without_blocking_others():
+    manager = ConnectionManager("redis://unused")
+    slow, fast = FakeWebSocket(blocked=True), FakeWebSocket()
+    await manager.connect(slow, 7)
+    await manager.connect(fast, 7)
+
+    for qty in (1, 2, 3):
+        await manager.send_personal_message(update(7, 1, "INFY", qty), 7)
+        await manager.send_personal_message(update(7, 1, "TCS", qty), 7)
+        await drain()
+
+    assert len(fast.sent) == 6
+
+    slow.gate.set()
+    await drain()
+    # First INFY went to the (blocked) socket; the rest coalesced to the latest per symbol
+    assert [(m["data"]["symbol"], m["data"]["quantity"]) for m in map(json.loads, slow.sent)] == [
+        ("INFY", 1), ("TCS", 3), ("INFY", 3)
+    ]
+    assert manager.get_stats()["coalesced"] == 3
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_is_dropped_when_queue_overflows():
+    router = FanoutRouter(max_queue=2, send_timeout=5.0)
+    slow, fast = FakeWebSocket(blocked=True), FakeWebSocket()
+    router.add(slow, 7)
+    router.add(fast, 7)
+    await drain()
+
+    for i in range(4):
+        router.broadcast(f"m{i}", 7, 1)
+        await drain()
+
+    assert slow.closed_with == SLOW_CONSUMER_CLOSE_CODE
+    assert fast.sent == ["m0", "m1", "m2", "m3"]
+    stats = router.get_stats()
+    assert stats["connections"] == 1 and stats["slow_consumers_dropped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_send_timeout_drops_stalled_client():
+    router = FanoutRouter(max_queue=10, send_timeout=0.01)
+    stalled = FakeWebSocket(blocked=True)
+    router.add(stalled, 7)
+
+    router.broadcast("m0", 7)
+    await asyncio.sleep(0.05)
+    await drain()
+
+    assert stalled.closed_with == SLOW_CONSUMER_CLOSE_CODE
+    assert router.connection_count() == 0